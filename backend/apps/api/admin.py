@@ -1,3 +1,159 @@
 from django.contrib import admin
+from django.db import transaction
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from django.utils.translation import gettext_lazy as _
+from unfold.admin import ModelAdmin
+from unfold.contrib.filters.admin import (
+    RangeDateFilter,
+)
+from unfold.decorators import display
+from .models import DetailDocument, RequestProfile, RevalidationRequest
 
-# Register your models here.
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(ModelAdmin):
+    """Админка для профілів запитів"""
+    list_display = [
+        'path',
+        'method',
+        'view_name',
+        'status_code',
+        'duration_display',
+        'query_count',
+        'trigger_display',
+        'backend',
+        'created_at',
+        'flamegraph_link',
+    ]
+    list_filter = [
+        'trigger',
+        'backend',
+        'method',
+        'status_code',
+        ('created_at', RangeDateFilter),
+    ]
+    search_fields = ['path', 'view_name', 'query_string']
+    ordering = ['-created_at']
+    date_hierarchy = 'created_at'
+    exclude = ['collapsed_stacks', 'flamegraph_svg']
+    readonly_fields = [
+        'created_at', 'method', 'path', 'query_string', 'view_name', 'status_code',
+        'trigger', 'backend', 'duration_ms', 'cpu_ms', 'query_count', 'query_time_ms',
+        'sample_count', 'sample_unit', 'flamegraph_preview',
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path(
+                '<int:pk>/flamegraph.svg',
+                self.admin_site.admin_view(self.flamegraph_view),
+                name='api_requestprofile_flamegraph',
+            ),
+            path(
+                '<int:pk>/stacks.txt',
+                self.admin_site.admin_view(self.collapsed_view),
+                name='api_requestprofile_collapsed',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def flamegraph_view(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(profile.flamegraph_svg, content_type='image/svg+xml; charset=utf-8')
+        # SVG генерується з назв функцій - забороняємо скрипти про всяк випадок
+        response['Content-Security-Policy'] = "default-src 'none'; style-src 'unsafe-inline'"
+        return response
+
+    def collapsed_view(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(profile.collapsed_stacks, content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="profile-{profile.pk}.folded"'
+        return response
+
+    @display(description=_("Тривалість"), ordering='duration_ms')
+    def duration_display(self, obj):
+        color = 'green' if obj.duration_ms < 200 else 'orange' if obj.duration_ms < 1000 else 'red'
+        return format_html(
+            '<span class="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-{}-100 text-{}-800">{} мс</span>',
+            color, color, f'{obj.duration_ms:.1f}'
+        )
+
+    @display(description=_("Причина"), ordering='trigger')
+    def trigger_display(self, obj):
+        color = 'blue' if obj.trigger == 'header' else 'gray'
+        return format_html(
+            '<span class="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-{}-100 text-{}-800">{}</span>',
+            color, color, obj.get_trigger_display()
+        )
+
+    @display(description=_("Flamegraph"))
+    def flamegraph_link(self, obj):
+        return format_html(
+            '<a href="{}" target="_blank" rel="noopener">SVG</a> · <a href="{}">stacks</a>',
+            reverse('admin:api_requestprofile_flamegraph', args=[obj.pk]),
+            reverse('admin:api_requestprofile_collapsed', args=[obj.pk]),
+        )
+
+    @display(description=_("Flamegraph"))
+    def flamegraph_preview(self, obj):
+        if not obj.flamegraph_svg:
+            return '-'
+        url = reverse('admin:api_requestprofile_flamegraph', args=[obj.pk])
+        return format_html(
+            '<object data="{}" type="image/svg+xml" style="width:100%;max-width:1200px"></object>'
+            '<p><a href="{}" target="_blank" rel="noopener">Відкрити окремо</a> · '
+            '<a href="{}">Завантажити collapsed stacks</a></p>',
+            url, url, reverse('admin:api_requestprofile_collapsed', args=[obj.pk]),
+        )
+
+
+@admin.register(DetailDocument)
+class DetailDocumentAdmin(ModelAdmin):
+    """Документи детальних відповідей (лише перегляд, перебудовуються сигналами)"""
+    list_display = ['model_label', 'object_id', 'locale', 'base_url', 'updated_at']
+    list_filter = ['model_label', 'locale', 'base_url']
+    search_fields = ['=object_id']
+    ordering = ['model_label', 'object_id', 'locale']
+    readonly_fields = ['model_label', 'object_id', 'locale', 'base_url', 'version', 'body', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+
+@admin.register(RevalidationRequest)
+class RevalidationRequestAdmin(ModelAdmin):
+    """Outbox ревалідації сторінок фронтенду"""
+    list_display = ['path', 'locale', 'status', 'attempts', 'available_at', 'created_at']
+    list_filter = ['status', 'locale']
+    search_fields = ['path', 'last_error']
+    ordering = ['available_at', 'id']
+    readonly_fields = ['path', 'locale', 'status', 'attempts', 'available_at', 'last_error', 'created_at']
+    actions = ['retry_now']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description=_("Відправити повторно зараз"))
+    def retry_now(self, request, queryset):
+        from .revalidation import Revalidator
+
+        updated = queryset.update(status='pending', attempts=0, available_at=timezone.now())
+        transaction.on_commit(Revalidator.wake)
+        self.message_user(request, _("Поставлено в чергу: %(count)s") % {'count': updated})
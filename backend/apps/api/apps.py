@@ -7,3 +7,14 @@ class ApiConfig(AppConfig):
 
     def ready(self):
         import apps.api.signals  # 👈 Додайте цей рядок
+        # Реєстрація viewset з DetailDocumentMixin до першого сигналу
+        import apps.api.views  # noqa: F401
+
+        # Підписка воркера на гаряче перезавантаження перекладів - з першим запитом
+        from django.core.signals import request_started
+        from .hot_reload import TranslationReloader
+        from .metrics import Metrics
+        if Metrics.get_config()['enabled']:
+            request_started.connect(Metrics.on_request_started, dispatch_uid='metrics_flush_at_exit')
+        if TranslationReloader.get_config()['enabled']:
+            request_started.connect(TranslationReloader.on_request_started, dispatch_uid='translation_hot_reload')
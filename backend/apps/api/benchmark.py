@@ -0,0 +1,371 @@
+# backend/apps/api/benchmark.py
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.utils import translation
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from functools import partial
+from urllib.parse import urlencode
+import json
+import math
+import platform
+import re
+import subprocess
+import threading
+import time
+import django
+import logging
+from .metrics import QueryCounter
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/v1/'
+TRANSLATION_NAMESPACES = (None, 'services', 'projects')
+RETRIEVE_SAMPLE_SIZE = 20
+URL_GROUP_RE = re.compile(r'\(\?P<(?P<name>\w+)>[^)]*\)')
+
+
+class Scenario:
+    """Один сценарій навантаження: метод, шлях, параметри та мова"""
+
+    def __init__(self, name, path, method='get', params=None, locale=None, data_factory=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.params = params or {}
+        self.locale = locale
+        self.data_factory = data_factory
+
+    def paths(self):
+        """Шлях або список шляхів, між якими чергуються запити"""
+        paths = self.path if isinstance(self.path, (list, tuple)) else [self.path]
+        query = f'?{urlencode(self.params)}' if self.params else ''
+        return [f'{path}{query}' for path in paths]
+
+    def request(self, client, path, iteration):
+        headers = {}
+        if self.locale:
+            headers['HTTP_ACCEPT_LANGUAGE'] = self.locale
+        if self.method == 'get':
+            return client.get(path, **headers)
+
+        data = self.data_factory(iteration)
+        return client.post(path, json.dumps(data), content_type='application/json', **headers)
+
+
+# ---- сценарії ----
+
+def discover_scenarios(locales=None, include_writes=False):
+    """
+    Сценарії для всіх ендпоінтів роутера apps.api.urls та API перекладів:
+    list (+ пошук), retrieve на вибірці записів, додаткові GET дії viewset,
+    для кожної мови; create-ендпоінти - лише з include_writes
+    """
+    from .urls import router
+    from .translations_views import UnifiedTranslationsAPIView
+
+    locales = locales or [code for code, _ in settings.LANGUAGES]
+    scenarios = []
+    for prefix, viewset, basename in router.registry:
+        base = f'{API_PREFIX}{prefix}/'
+        read_scenarios = []
+
+        if hasattr(viewset, 'list'):
+            read_scenarios.append((f'{basename}.list', base, {}))
+            search_fields = getattr(viewset, 'search_fields', None)
+            if search_fields:
+                read_scenarios.append((f'{basename}.search', base, {'search': sample_search_term(viewset)}))
+
+        if hasattr(viewset, 'retrieve'):
+            pks = list(viewset.queryset.values_list('pk', flat=True)[:RETRIEVE_SAMPLE_SIZE])
+            if pks:
+                read_scenarios.append((f'{basename}.retrieve', [f'{base}{pk}/' for pk in pks], {}))
+
+        for action in viewset.get_extra_actions():
+            if action.detail or 'get' not in action.mapping:
+                continue
+            name = f'{basename}.{action.__name__}'
+            if URL_GROUP_RE.search(action.url_path):
+                # Параметри в шляху (slug/<slug>) - реальні значення для кожної мови
+                if action.__name__ not in ACTION_PATHS:
+                    logger.warning(f"Сценарій {name} пропущено: немає фабрики шляхів для {action.url_path}")
+                    continue
+                read_scenarios.append((name, partial(ACTION_PATHS[action.__name__], viewset, base, action), {}))
+                continue
+            params = ACTION_PARAMS[name]() if name in ACTION_PARAMS else {}
+            read_scenarios.append((name, f'{base}{action.url_path}/', params))
+
+        for locale in locales:
+            for name, path, params in read_scenarios:
+                if callable(path):
+                    path = path(locale)
+                    if not path:
+                        continue
+                scenarios.append(Scenario(f'{name}[{locale}]', path, params=params, locale=locale))
+
+        if include_writes and hasattr(viewset, 'create') and basename in WRITE_PAYLOADS:
+            scenarios.append(Scenario(
+                f'{basename}.create', base, method='post', data_factory=WRITE_PAYLOADS[basename],
+            ))
+
+    for locale in locales:
+        for source in UnifiedTranslationsAPIView.SUPPORTED_SOURCES:
+            for namespace in TRANSLATION_NAMESPACES:
+                params = {'source': source}
+                if namespace:
+                    params['namespace'] = namespace
+                scenarios.append(Scenario(
+                    f"translations[{locale}:{source}:{namespace or 'all'}]",
+                    f'{API_PREFIX}translations/{locale}/',
+                    params=params,
+                ))
+    return scenarios
+
+
+def sample_search_term(viewset):
+    """Слово з першого запису - щоб пошук щось знаходив"""
+    field = viewset.search_fields[0].lstrip('^=@$')
+    value = viewset.queryset.values_list(field, flat=True).first() or ''
+    return value.split()[0] if value.split() else 'test'
+
+
+def category_params():
+    """Найбільша активна категорія для projects/by_category"""
+    from django.db.models import Count
+    from apps.projects.models import ProjectCategory
+    category = (
+        ProjectCategory.objects.filter(is_active=True)
+        .annotate(projects_total=Count('projects'))
+        .order_by('-projects_total')
+        .values_list('slug', flat=True)
+        .first()
+    )
+    return {'category': category or ''}
+
+
+# Обов'язкові параметри додаткових дій: {basename.action: фабрика параметрів}
+ACTION_PARAMS = {
+    'projects.by_category': category_params,
+}
+
+
+def fill_url_path(url_path, **values):
+    """url_path дії з підставленими значеннями груп regex"""
+    return URL_GROUP_RE.sub(lambda match: str(values[match.group('name')]), url_path)
+
+
+def slug_paths(viewset, base, action, locale):
+    """Шляхи by_slug для вибірки записів слагами мови сценарію (з fallback)"""
+    with translation.override(locale):
+        slugs = [obj.slug for obj in viewset.queryset.order_by('pk')[:RETRIEVE_SAMPLE_SIZE]]
+    return [f'{base}{fill_url_path(action.url_path, slug=slug)}/' for slug in slugs if slug]
+
+
+# Дії з параметрами в шляху: {назва дії: фабрика шляхів (viewset, base, action, locale)}
+ACTION_PATHS = {
+    'by_slug': slug_paths,
+}
+
+
+def contact_inquiry_payload(iteration):
+    return {
+        'name': f'Bench {iteration}',
+        'email': f'bench{iteration}@example.com',
+        'phone': '+380000000000',
+        'inquiry_type': 'general',
+        'subject': 'Benchmark',
+        'message': 'Benchmark message',
+    }
+
+
+def partner_inquiry_payload(iteration):
+    return {
+        'company_name': f'Bench {iteration}',
+        'contact_person': 'Bench',
+        'email': f'bench{iteration}@example.com',
+        'phone': '+380000000000',
+        'inquiry_type': 'cooperation',
+        'message': 'Benchmark message',
+    }
+
+
+# {basename: фабрика даних}; job-applications вимагає автентифікації та multipart
+WRITE_PAYLOADS = {
+    'contactinquiries': contact_inquiry_payload,
+    'partnerinquiries': partner_inquiry_payload,
+}
+
+
+# ---- прогін ----
+
+def percentile(values, share):
+    """Перцентиль методом найближчого рангу"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(share * len(ordered)))
+    return ordered[rank - 1]
+
+
+class BenchmarkRunner:
+    """
+    Проганяє сценарії через Django test Client (у процесі, без HTTP сервера):
+    warmup запитів не враховуються, далі `iterations` запитів у `concurrency`
+    потоків. Для кожного запиту міряється час та кількість SQL запитів.
+    """
+
+    def __init__(self, scenarios, iterations=50, warmup=5, concurrency=1, stdout=None):
+        self.scenarios = scenarios
+        self.iterations = iterations
+        self.warmup = warmup
+        self.concurrency = max(1, concurrency)
+        self.stdout = stdout
+        self._local = threading.local()
+
+    def client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client(HTTP_HOST='localhost')
+        return client
+
+    def run(self):
+        results = {}
+        for scenario in self.scenarios:
+            results[scenario.name] = self.run_scenario(scenario)
+            if self.stdout is not None:
+                self.stdout.write(format_result_line(scenario.name, results[scenario.name]))
+        return results
+
+    def run_scenario(self, scenario):
+        paths = scenario.paths()
+        for iteration in range(self.warmup):
+            self.execute(scenario, paths[iteration % len(paths)], iteration)
+
+        started = time.perf_counter()
+        if self.concurrency == 1:
+            samples = [
+                self.execute(scenario, paths[iteration % len(paths)], iteration)
+                for iteration in range(self.iterations)
+            ]
+        else:
+            def worker(offset):
+                try:
+                    return [
+                        self.execute(scenario, paths[iteration % len(paths)], iteration)
+                        for iteration in range(offset, self.iterations, self.concurrency)
+                    ]
+                finally:
+                    # У кожного потоку власне з'єднання з БД
+                    connections.close_all()
+
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                samples = [sample for chunk in pool.map(worker, range(self.concurrency)) for sample in chunk]
+        elapsed = time.perf_counter() - started
+        return summarize(samples, elapsed)
+
+    def execute(self, scenario, path, iteration):
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            # Рахуємо і читання з реплік, інакше маршрутизатор занижує кількість запитів
+            for database in connections.all():
+                stack.enter_context(database.execute_wrapper(counter))
+            response = scenario.request(self.client(), path, iteration)
+        latency = time.perf_counter() - started
+        return {'latency': latency, 'queries': counter.count, 'status': response.status_code}
+
+
+def summarize(samples, elapsed):
+    latencies = [sample['latency'] * 1000 for sample in samples]
+    queries = [sample['queries'] for sample in samples]
+    statuses = {}
+    for sample in samples:
+        statuses[str(sample['status'])] = statuses.get(str(sample['status']), 0) + 1
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample['status'] >= 400),
+        'statuses': statuses,
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            'p50': round(percentile(latencies, 0.50), 3),
+            'p95': round(percentile(latencies, 0.95), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+            'max': round(max(latencies), 3) if latencies else 0.0,
+        },
+        'queries_per_request': {
+            'mean': round(sum(queries) / len(queries), 2) if queries else 0.0,
+            'max': max(queries) if queries else 0,
+        },
+    }
+
+
+def format_result_line(name, result):
+    latency = result['latency_ms']
+    errors = f"  ⚠️ {result['errors']} помилок" if result['errors'] else ''
+    return (
+        f"{name:<55} {result['throughput_rps']:>9.1f} rps  "
+        f"p50 {latency['p50']:>8.2f}  p95 {latency['p95']:>8.2f}  p99 {latency['p99']:>8.2f} ms  "
+        f"q {result['queries_per_request']['mean']:>5.1f}{errors}"
+    )
+
+
+# ---- звіт ----
+
+def environment_info():
+    cache_backend = settings.CACHES['default']['BACKEND']
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5, cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'cache': cache_backend,
+        'platform': platform.platform(),
+    }
+
+
+def compare_results(current, baseline, threshold=0.2, noise_floor_ms=1.0):
+    """
+    Порівнює з базовим прогоном. Регресія - p95 гірший більш ніж на `threshold`
+    (і більш ніж на noise_floor_ms) або більше SQL запитів на запит.
+    Повертає [(сценарій, статус, опис)].
+    """
+    rows = []
+    baseline_results = baseline.get('results', {})
+    for name, result in current.get('results', {}).items():
+        previous = baseline_results.get(name)
+        if previous is None:
+            rows.append((name, 'new', ''))
+            continue
+
+        p95, previous_p95 = result['latency_ms']['p95'], previous['latency_ms']['p95']
+        queries = result['queries_per_request']['mean']
+        previous_queries = previous['queries_per_request']['mean']
+        change = (p95 - previous_p95) / previous_p95 if previous_p95 else 0.0
+        description = (
+            f'p95 {previous_p95:.2f} → {p95:.2f} ms ({change:+.0%}), '
+            f'SQL {previous_queries:g} → {queries:g}'
+        )
+
+        if queries > previous_queries or (change > threshold and p95 - previous_p95 > noise_floor_ms):
+            status = 'regression'
+        elif change < -threshold and previous_p95 - p95 > noise_floor_ms:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((name, status, description))
+
+    for name in baseline_results:
+        if name not in current.get('results', {}):
+            rows.append((name, 'missing', ''))
+    return rows
@@ -0,0 +1,225 @@
+# backend/apps/api/cache_policy.py
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.translation import get_supported_language_variant
+import json
+import logging
+import requests
+from apps.common.jobs import DebouncedWorker, PartialFailure
+
+logger = logging.getLogger(__name__)
+
+
+class CachePolicy:
+    """
+    HTTP політика кешування відповіді:
+    max_age - браузер, s_maxage - CDN, stale_while_revalidate - скільки CDN
+    може віддавати застарілу копію, поки оновлює її у фоні
+    """
+
+    def __init__(self, max_age=0, s_maxage=None, stale_while_revalidate=None, stale_if_error=None):
+        self.max_age = max_age
+        self.s_maxage = s_maxage
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.header = self.build_header()
+        # Відповідь, мову якої CDN не бачить у запиті - лише для браузера
+        self.private_header = f'private, max-age={self.max_age}'
+
+    def build_header(self):
+        directives = ['public', f'max-age={self.max_age}']
+        if self.s_maxage is not None:
+            directives.append(f's-maxage={self.s_maxage}')
+        if self.stale_while_revalidate:
+            directives.append(f'stale-while-revalidate={self.stale_while_revalidate}')
+        if self.stale_if_error:
+            directives.append(f'stale-if-error={self.stale_if_error}')
+        return ', '.join(directives)
+
+    def __repr__(self):
+        return f'CachePolicy({self.header})'
+
+
+# Типові політики для публічного контенту
+CONTENT_POLICY = CachePolicy(max_age=60, s_maxage=60 * 60, stale_while_revalidate=60 * 60 * 24, stale_if_error=60 * 60 * 24)
+LISTING_POLICY = CachePolicy(max_age=60, s_maxage=60 * 10, stale_while_revalidate=60 * 60, stale_if_error=60 * 60 * 24)
+TRANSLATIONS_POLICY = CachePolicy(max_age=60 * 30, s_maxage=60 * 60, stale_while_revalidate=60 * 60 * 24)
+
+
+class CachePolicyRegistry:
+    """Реєстр політик кешування: {view клас: {дія: CachePolicy}}"""
+
+    _policies = {}
+
+    @classmethod
+    def register(cls, view_class, policies):
+        cls._policies[view_class] = dict(policies)
+
+    @classmethod
+    def get(cls, view_class, action):
+        return cls._policies.get(view_class, {}).get(action)
+
+    @classmethod
+    def all(cls):
+        """[(view клас, дія, політика)] для документації та перевірок"""
+        return [
+            (view_class, action, policy)
+            for view_class, policies in cls._policies.items()
+            for action, policy in policies.items()
+        ]
+
+
+class SurrogateKeys:
+    """Surrogate-Key для CDN: ключ моделі для списків, ключ об'єкта для деталей"""
+
+    GLOBAL_KEY = 'api'
+    TRANSLATIONS_KEY = 'translations'
+
+    @staticmethod
+    def for_model(model):
+        return model._meta.concrete_model._meta.label_lower
+
+    @classmethod
+    def for_object(cls, model, pk):
+        return f'{cls.for_model(model)}:{pk}'
+
+    @classmethod
+    def for_instance(cls, instance):
+        """Ключі, які треба очистити при зміні об'єкта"""
+        return [cls.for_model(type(instance)), cls.for_object(type(instance), instance.pk)]
+
+
+class CachePolicyMixin:
+    """
+    Заголовки Cache-Control та Surrogate-Key для API view.
+
+    `cache_policy` - {дія: CachePolicy} (для APIView дія - HTTP метод).
+    Списки позначаються ключами всіх моделей, від яких залежать,
+    детальні відповіді - ключем об'єкта та ключами вкладених моделей.
+    """
+
+    cache_policy = {}
+    cache_dependencies = ()
+    # Мова відповіді задана в URL (переклади), cookie мови на неї не впливає
+    cache_language_in_url = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_policy:
+            CachePolicyRegistry.register(cls, cls.cache_policy)
+
+    def get_cache_policy_action(self):
+        return getattr(self, 'action', None) or self.request.method.lower()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        policy = CachePolicyRegistry.get(type(self), self.get_cache_policy_action())
+        if policy is not None and request.method in ('GET', 'HEAD') and response.status_code == 200:
+            response['Cache-Control'] = policy.private_header if self.language_from_cookie(request) else policy.header
+            response['Surrogate-Key'] = ' '.join(self.get_surrogate_keys(response))
+            response.cache_policy = policy
+            patch_vary_headers(response, ('Accept-Language',))
+        return response
+
+    def language_from_cookie(self, request):
+        """
+        LocaleMiddleware бере мову з cookie раніше за Accept-Language, а CDN
+        розрізняє копії лише за Vary: Accept-Language - така відповідь не public
+        """
+        if self.cache_language_in_url:
+            return False
+        value = request.COOKIES.get(settings.LANGUAGE_COOKIE_NAME)
+        if not value:
+            return False
+        try:
+            get_supported_language_variant(value)
+        except LookupError:
+            return False
+        return True
+
+    def get_surrogate_keys(self, response):
+        keys = [SurrogateKeys.GLOBAL_KEY]
+        models = self.get_cache_dependency_models()
+        lookup = self.kwargs.get(getattr(self, 'lookup_url_kwarg', None) or getattr(self, 'lookup_field', 'pk'))
+
+        if lookup is not None:
+            # Очищення йде за pk, тому беремо id з відповіді, а не значення з URL
+            if isinstance(response.data, dict):
+                lookup = response.data.get('id', lookup)
+            model = self.get_queryset().model
+            keys.append(SurrogateKeys.for_object(model, lookup))
+            models = [related for related in models if related is not model]
+        keys.extend(sorted(SurrogateKeys.for_model(model) for model in models))
+        return keys
+
+    def get_cache_dependency_models(self):
+        from .response_cache import view_dependency_models
+        return view_dependency_models(self)
+
+
+class SurrogateKeyPurger:
+    """
+    Диспетчер очищення CDN за Surrogate-Key.
+
+    Ключі ставляться в чергу після коміту транзакції, а фоновий потік
+    через BATCH_DELAY відправляє їх пакетом, щоб серія збережень в адмінці
+    давала один запит до CDN і не гальмувала відповідь.
+    """
+
+    @staticmethod
+    def get_config():
+        purge_settings = getattr(settings, 'CDN_PURGE_SETTINGS', {})
+        return {
+            'enabled': purge_settings.get('ENABLED', False),
+            'url': purge_settings.get('URL', ''),
+            'token': purge_settings.get('TOKEN', ''),
+            'timeout': purge_settings.get('TIMEOUT', 5),
+            'async': purge_settings.get('ASYNC', True),
+            'delay': purge_settings.get('BATCH_DELAY', 0.5),
+            'max_keys': purge_settings.get('MAX_KEYS_PER_REQUEST', 256),
+        }
+
+    worker = DebouncedWorker(
+        'cdn-purge', lambda keys: SurrogateKeyPurger.run_pending(keys), lambda: SurrogateKeyPurger.get_config(),
+    )
+
+    @classmethod
+    def purge(cls, keys):
+        """Ставить ключі в чергу очищення після коміту транзакції"""
+        config = cls.get_config()
+        if not config['enabled'] or not config['url']:
+            return
+        cls.worker.add_on_commit(set(keys))
+
+    @classmethod
+    def run_pending(cls, keys):
+        failed = cls.send(sorted(keys))
+        if failed:
+            # Повторюються лише ключі невдалих пакетів
+            raise PartialFailure(f"не очищено {len(failed)} ключів", set(failed))
+
+    @classmethod
+    def send(cls, keys):
+        """Синхронно відправляє запити очищення; повертає ключі, які очистити не вдалося"""
+        config = cls.get_config()
+        headers = {'Content-Type': 'application/json'}
+        if config['token']:
+            headers['Authorization'] = f"Bearer {config['token']}"
+
+        failed = []
+        for start in range(0, len(keys), config['max_keys']):
+            batch = keys[start:start + config['max_keys']]
+            try:
+                response = requests.post(
+                    config['url'],
+                    data=json.dumps({'surrogate_keys': batch}),
+                    headers={**headers, 'Surrogate-Key': ' '.join(batch)},
+                    timeout=config['timeout'],
+                )
+                response.raise_for_status()
+                logger.info(f"CDN очищено за ключами: {' '.join(batch)}")
+            except requests.RequestException as e:
+                failed.extend(batch)
+                logger.error(f"Помилка очищення CDN ({len(batch)} ключів): {str(e)}")
+        return failed
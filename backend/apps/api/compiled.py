@@ -0,0 +1,341 @@
+# backend/apps/api/compiled.py
+"""
+Скомпільована серіалізація списків лише для читання.
+
+ModelSerializer на кожен рядок створює об'єкт моделі та проходить усі Field
+(get_attribute, дескриптори modeltranslation, FieldFile.url, build_absolute_uri).
+CompiledSerializer один раз для серіалізатора та мови будує план полів:
+які колонки взяти через values_list() і як з кортежу отримати значення.
+Результат побайтово збігається з серіалізатором; поля, які план не вміє
+відтворити, вимикають компіляцію - тоді працює звичайний серіалізатор.
+"""
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.storage import FileSystemStorage
+from django.db.models import FileField as ModelFileField
+from django.utils import translation
+from modeltranslation import utils as mt_utils
+from modeltranslation.fields import NONE
+from modeltranslation.translator import translator, NotRegistered
+from modeltranslation.utils import build_localized_fieldname, resolution_order
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+import re
+import threading
+import logging
+from .serializers import RenderedHTMLField
+
+logger = logging.getLogger(__name__)
+
+# Імена файлів, для яких storage.url() та build_absolute_uri() зводяться до префікса + імені
+SIMPLE_MEDIA_NAME = re.compile(r'^[A-Za-z0-9_~-][A-Za-z0-9_.~/-]*$')
+
+
+class NotCompilable(Exception):
+    """Серіалізатор має поле, яке план не відтворює побайтово"""
+
+
+class RowObject:
+    """
+    Замість екземпляра моделі для SerializerMethodField:
+    pk та колонки рівня (без префікса зв'язку); анотацій queryset немає
+    """
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+
+def is_simple_media_name(name):
+    return (
+        SIMPLE_MEDIA_NAME.match(name) is not None
+        and '//' not in name
+        and '/./' not in name and '/../' not in name
+        and not name.endswith(('/.', '/..'))
+        and name not in ('.', '..')
+        and not name.startswith(('./', '../'))
+    )
+
+
+def value_converter(field):
+    """to_representation поля; базові реалізації DRF замінюються вбудованими типами"""
+    method = type(field).to_representation
+    if method is serializers.CharField.to_representation:
+        return str
+    if method is serializers.IntegerField.to_representation:
+        return int
+    return field.to_representation
+
+
+class CompiledSerializer:
+    """
+    План серіалізації для (серіалізатор, мова).
+
+        plan = CompiledSerializer.for_serializer(ServiceListSerializer)
+        data = plan.serialize(plan.rows(queryset), context)
+
+    for_serializer повертає None, якщо серіалізатор не компілюється.
+    """
+
+    _plans = {}
+    _lock = threading.Lock()
+
+    def __init__(self, serializer_class, language, field_language):
+        self.serializer_class = serializer_class
+        self.language = language
+        self.field_language = field_language
+        self.columns = []
+        self.steps = self.compile(serializer_class, '')
+
+    @classmethod
+    def for_serializer(cls, serializer_class):
+        # Мова дескрипторів modeltranslation та мова rendered_html можуть різнитися
+        key = (
+            serializer_class,
+            translation.get_language() or settings.LANGUAGE_CODE,
+            mt_utils.get_language(),
+            mt_utils.fallbacks_enabled(),
+        )
+        if key not in cls._plans:
+            with cls._lock:
+                if key not in cls._plans:
+                    try:
+                        cls._plans[key] = cls(serializer_class, key[1], key[2])
+                    except NotCompilable as e:
+                        logger.info(f'{serializer_class.__name__} не компілюється: {e}')
+                        cls._plans[key] = None
+        return cls._plans[key]
+
+    # ---- компіляція ----
+
+    def column(self, name):
+        if name not in self.columns:
+            self.columns.append(name)
+        return self.columns.index(name)
+
+    def compile(self, serializer_class, prefix):
+        meta = getattr(serializer_class, 'Meta', None)
+        model = getattr(meta, 'model', None)
+        if model is None:
+            raise NotCompilable(f'{serializer_class.__name__} не ModelSerializer')
+        try:
+            translated = translator.get_options_for_model(model).all_fields
+        except NotRegistered:
+            translated = {}
+
+        pk_index = self.column(f'{prefix}{model._meta.pk.name}')
+        level = {'pk': pk_index, 'attrs': {}}
+        steps = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            steps.append(self.compile_field(model, translated, prefix, name, field, level))
+
+        level['attrs']['pk'] = level['attrs'][model._meta.pk.attname] = pk_index
+        for step in steps:
+            if step[0] == 'method':
+                step[4].update(level['attrs'])
+        return steps
+
+    def compile_field(self, model, translated, prefix, name, field, level):
+        if isinstance(field, RenderedHTMLField):
+            source = field.field_name
+            richtext_fields = model.get_richtext_fields()
+            keys = [
+                build_localized_fieldname(source, lang)
+                for lang in resolution_order(self.language, getattr(model, source).fallback_languages)
+            ] if richtext_fields.get(source) else None
+            return ('rendered', name, self.column(f'{prefix}rendered_html'), source, keys)
+
+        if isinstance(field, serializers.SerializerMethodField):
+            return ('method', name, type(field.parent), field.method_name, {})
+
+        source_attrs = field.source_attrs
+        if field.source == '*' or len(source_attrs) != 1:
+            raise NotCompilable(f'поле {name} з source={field.source!r}')
+        source = source_attrs[0]
+
+        if isinstance(field, serializers.BaseSerializer):
+            if getattr(field, 'many', False) or isinstance(field, serializers.ListSerializer):
+                raise NotCompilable(f'вкладений список {name}')
+            try:
+                relation = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                raise NotCompilable(f'{name} не поле моделі')
+            if not (relation.many_to_one or relation.one_to_one) or not relation.concrete:
+                raise NotCompilable(f'{name} не ForeignKey')
+            fk_index = self.column(f'{prefix}{source}')
+            return ('nested', name, fk_index, self.compile(type(field), f'{prefix}{source}__'))
+
+        if source in translated:
+            descriptor = getattr(model, source)
+            if isinstance(descriptor.field, ModelFileField) or isinstance(field, serializers.FileField):
+                raise NotCompilable(f'перекладне файлове поле {name}')
+            indexes = [
+                self.column(f'{prefix}{build_localized_fieldname(source, lang)}')
+                for lang in resolution_order(self.field_language, descriptor.fallback_languages)
+            ]
+            undefined = descriptor.fallback_undefined
+            default = descriptor.field.get_default()
+            if undefined is NONE:
+                undefined = default
+            fallback = descriptor.fallback_value if mt_utils.fallbacks_enabled() else NONE
+            if fallback is not NONE:
+                default = fallback
+            for index in indexes:
+                level['attrs'][self.columns[index][len(prefix):]] = index
+            return ('translated', name, indexes, undefined, default, value_converter(field))
+
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            raise NotCompilable(f'{name} не поле моделі')
+        if not model_field.concrete or model_field.is_relation:
+            raise NotCompilable(f'{name} не колонка моделі')
+
+        index = self.column(f'{prefix}{source}')
+        level['attrs'][source] = index
+        if isinstance(field, serializers.FileField):
+            if not isinstance(model_field, ModelFileField):
+                raise NotCompilable(f'{name} не файлове поле')
+            use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+            return ('media', name, index, model_field.storage, use_url)
+        return ('value', name, index, value_converter(field))
+
+    # ---- виконання ----
+
+    def rows(self, queryset):
+        return queryset.values_list(*self.columns)
+
+    def serialize(self, rows, context):
+        """Список dict, ідентичний serializer_class(queryset, many=True).data"""
+        bound = self.bind(self.steps, context)
+        return [{name: getter(row) for name, getter in bound} for row in rows]
+
+    def bind(self, steps, context):
+        request = context.get('request')
+        bound = []
+        for step in steps:
+            kind, name = step[0], step[1]
+            if kind == 'value':
+                bound.append((name, self.value_getter(step[2], step[3])))
+            elif kind == 'translated':
+                bound.append((name, self.translated_getter(*step[2:])))
+            elif kind == 'media':
+                bound.append((name, self.media_getter(step[2], step[3], step[4], request)))
+            elif kind == 'rendered':
+                bound.append((name, self.rendered_getter(*step[2:])))
+            elif kind == 'method':
+                method = getattr(step[2](context=context), step[3])
+                bound.append((name, self.method_getter(method, step[4])))
+            else:
+                bound.append((name, self.nested_getter(step[2], self.bind(step[3], context))))
+        return bound
+
+    @staticmethod
+    def value_getter(index, convert):
+        def getter(row):
+            value = row[index]
+            return None if value is None else convert(value)
+        return getter
+
+    @staticmethod
+    def translated_getter(indexes, undefined, default, convert):
+        """Як TranslationFieldDescriptor.__get__: перше непорожнє значення за порядком fallback"""
+        def getter(row):
+            for index in indexes:
+                value = row[index]
+                if value is not None and value != undefined:
+                    return convert(value)
+            return None if default is None else convert(default)
+        return getter
+
+    @staticmethod
+    def media_getter(index, storage, use_url, request):
+        """Як FileField.to_representation DRF, з префіксом MEDIA для простих імен"""
+        prefix = None
+        if use_url and isinstance(storage, FileSystemStorage) and (storage.base_url or '').endswith('/'):
+            prefix = request.build_absolute_uri(storage.base_url) if request is not None else storage.base_url
+
+        def getter(row):
+            name = row[index]
+            if not name:
+                return None
+            if not use_url:
+                return name
+            if prefix is not None and is_simple_media_name(name):
+                return prefix + name
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+        return getter
+
+    @staticmethod
+    def rendered_getter(index, source, keys):
+        """Як RenderedRichTextMixin.get_rendered_html для мови плану"""
+        def getter(row):
+            # Невідрендерений запис: сирих колонок у плані немає, як і в проєкції серіалізатора
+            rendered = row[index] or {}
+            if keys is None:
+                return rendered.get(source, '')
+            for key in keys:
+                value = rendered.get(key)
+                if value:
+                    return value
+            return ''
+        return getter
+
+    @staticmethod
+    def method_getter(method, attrs):
+        def getter(row):
+            return method(RowObject({attr: row[index] for attr, index in attrs.items()}))
+        return getter
+
+    @staticmethod
+    def nested_getter(fk_index, bound):
+        # Той самий пов'язаний об'єкт (категорія) у межах відповіді серіалізується один раз
+        serialized = {}
+
+        def getter(row):
+            pk = row[fk_index]
+            if pk is None:
+                return None
+            if pk not in serialized:
+                serialized[pk] = {name: nested(row) for name, nested in bound}
+            return dict(serialized[pk])
+        return getter
+
+
+class CompiledSerializerMixin:
+    """
+    Списки viewset через CompiledSerializer.
+
+    `compiled_actions` - дії, що віддають список серіалізатора viewset;
+    додаткові дії викликають serialize_many(). Якщо серіалізатор
+    не компілюється, працює звичайний DRF шлях.
+    """
+
+    compiled_actions = ()
+
+    def get_compiled_plan(self, serializer_class=None):
+        if self.action not in self.compiled_actions:
+            return None
+        return CompiledSerializer.for_serializer(serializer_class or self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_compiled_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = plan.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.serialize(page, self.get_serializer_context()))
+        return Response(plan.serialize(rows, self.get_serializer_context()))
+
+    def serialize_many(self, queryset, serializer_class):
+        """Дані списку для додаткових дій"""
+        context = {'request': self.request}
+        plan = self.get_compiled_plan(serializer_class)
+        if plan is None:
+            return serializer_class(queryset, many=True, context=context).data
+        return plan.serialize(plan.rows(queryset), context)
@@ -0,0 +1,342 @@
+# backend/apps/api/documents.py
+"""
+Денормалізовані документи детальних відповідей (read model).
+
+Детальна відповідь проєкту - це JOIN категорії, агрегат projects_count
+та окремий запит зображень. DetailDocumentMixin зберігає готовий JSON
+на (об'єкт, мова, базовий URL) у таблиці DetailDocument, і retrieve
+стає одним пошуком за унікальним ключем.
+
+Документи будуються лише сигналами (після коміту транзакції, для об'єкта
+та його залежностей `document_dependencies`) і командою прогріву -
+для всіх мов та базових URL з DETAIL_DOCUMENT_SETTINGS['BASE_URLS'].
+Читання документ не створює: запит з довільним Host не додає рядків у
+БД, а запит до неналаштованого базового URL йде звичайним шляхом.
+Прогрів: python manage.py build_detail_documents
+"""
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpRequest
+from django.utils.translation import get_language, override
+from rest_framework import serializers
+from rest_framework.response import Response
+import hashlib
+import threading
+import logging
+from .json_codec import JSONCodec
+from .metrics import Metrics
+from .models import DetailDocument
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentRequest(HttpRequest):
+    """Запит для серіалізації поза HTTP: build_absolute_uri() дає посилання базового URL"""
+
+    def __init__(self, base_url):
+        super().__init__()
+        parts = urlsplit(base_url)
+        self._scheme = parts.scheme or 'http'
+        self.META['HTTP_HOST'] = parts.netloc
+        self.path = self.path_info = '/'
+
+    def _get_scheme(self):
+        return self._scheme
+
+
+def delete_documents(queryset):
+    """Видалення без сигналів: документи не інвалідують кеші й CDN, як моделі контенту"""
+    return queryset._raw_delete(queryset.db)
+
+
+def serializer_signature(serializer_class, seen=None):
+    """Дерево полів серіалізатора - зміна полів робить старі документи недійсними"""
+    seen = set() if seen is None else seen
+    if serializer_class in seen:
+        return serializer_class.__name__
+    seen.add(serializer_class)
+
+    parts = []
+    for name, field in serializer_class().fields.items():
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, serializers.BaseSerializer):
+            parts.append(f'{name}({serializer_signature(type(field), seen)})')
+        else:
+            parts.append(f'{name}:{type(field).__name__}')
+    return f"{serializer_class.__name__}[{','.join(parts)}]"
+
+
+class DetailDocumentStore:
+    """
+    Збереження та перебудова документів.
+
+    Зареєстровані viewset (DetailDocumentMixin) визначають модель, queryset,
+    серіалізатор retrieve та залежності. Зміни накопичуються до коміту
+    транзакції, тож збереження проєкту з inline зображеннями в адмінці
+    дає одну перебудову.
+    """
+
+    _views = {}
+    _versions = {}
+    _pending = {}
+    _previous = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_config():
+        document_settings = getattr(settings, 'DETAIL_DOCUMENT_SETTINGS', {})
+        return {
+            'enabled': document_settings.get('ENABLED', True),
+            'version': document_settings.get('VERSION', 1),
+            'batch_size': document_settings.get('BATCH_SIZE', 200),
+            'base_urls': [
+                url if url.endswith('/') else f'{url}/' for url in document_settings.get('BASE_URLS', ())
+            ],
+        }
+
+    @classmethod
+    def is_enabled(cls):
+        return cls.get_config()['enabled']
+
+    @classmethod
+    def register(cls, view_class):
+        cls._views[view_class.queryset.model._meta.label_lower] = view_class
+
+    @classmethod
+    def views(cls):
+        return list(cls._views.values())
+
+    @staticmethod
+    def label(view_class):
+        return view_class.queryset.model._meta.label_lower
+
+    # ---- серіалізація ----
+
+    @staticmethod
+    def retrieve_view(view_class, base_url):
+        """Екземпляр viewset для дії retrieve поза HTTP запитом"""
+        view = view_class()
+        view.action = 'retrieve'
+        view.format_kwarg = None
+        view.kwargs = {}
+        view.request = DocumentRequest(base_url)
+        return view
+
+    @classmethod
+    def version(cls, view_class):
+        if view_class not in cls._versions:
+            serializer_class = cls.retrieve_view(view_class, 'http://localhost/').get_serializer_class()
+            signature = f"{cls.get_config()['version']}:{serializer_signature(serializer_class)}"
+            cls._versions[view_class] = hashlib.md5(signature.encode('utf-8')).hexdigest()
+        return cls._versions[view_class]
+
+    @classmethod
+    def build(cls, view_class, pks, locale, base_url):
+        """{pk: JSON} для об'єктів queryset viewset; неактивних об'єктів у результаті немає"""
+        with override(locale):
+            view = cls.retrieve_view(view_class, base_url)
+            queryset = view.get_queryset().filter(pk__in=list(pks))
+            if view.document_prefetch:
+                queryset = queryset.prefetch_related(*view.document_prefetch)
+            serializer = view.get_serializer(queryset, many=True)
+            return {item['id']: JSONCodec.dumps(item).decode('utf-8') for item in serializer.data}
+
+    # ---- таблиця ----
+
+    @classmethod
+    def get(cls, view_class, pk, locale, base_url):
+        """JSON документа або None"""
+        bodies = DetailDocument.objects.filter(
+            model_label=cls.label(view_class),
+            object_id=pk,
+            locale=locale,
+            base_url=base_url,
+            version=cls.version(view_class),
+        ).values_list('body', flat=True)[:1]
+        return bodies[0] if bodies else None
+
+    @classmethod
+    def save(cls, view_class, bodies, locale, base_url):
+        label = cls.label(view_class)
+        version = cls.version(view_class)
+        DetailDocument.objects.bulk_create(
+            [
+                DetailDocument(
+                    model_label=label, object_id=pk, locale=locale,
+                    base_url=base_url, version=version, body=body,
+                )
+                for pk, body in bodies.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['model_label', 'object_id', 'locale', 'base_url'],
+            update_fields=['version', 'body', 'updated_at'],
+        )
+
+    @classmethod
+    def variants(cls):
+        """[(мова, базовий URL)], для яких будуються документи"""
+        return [
+            (locale, base_url)
+            for locale, _ in settings.LANGUAGES
+            for base_url in cls.get_config()['base_urls']
+        ]
+
+    @classmethod
+    def rebuild(cls, view_class, pks, variants=None):
+        """Будує документи об'єктів для всіх варіантів; повертає кількість записаних"""
+        label = cls.label(view_class)
+        batch_size = cls.get_config()['batch_size']
+        variants = cls.variants() if variants is None else variants
+        base_urls = {base_url for _, base_url in variants}
+        pks = sorted(pks)
+        written = 0
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start:start + batch_size]
+            built = set()
+            for locale, base_url in variants:
+                bodies = cls.build(view_class, batch, locale, base_url)
+                cls.save(view_class, bodies, locale, base_url)
+                built.update(bodies)
+                written += len(bodies)
+            # Видалені чи деактивовані об'єкти та базові URL, яких більше немає в налаштуваннях
+            documents = DetailDocument.objects.filter(model_label=label, object_id__in=batch)
+            delete_documents(documents.exclude(object_id__in=built, base_url__in=base_urls))
+        return written
+
+    @classmethod
+    def clear(cls):
+        """Видаляє всі документи (після масових змін без сигналів)"""
+        return delete_documents(DetailDocument.objects.all())
+
+    # ---- сигнали ----
+
+    @classmethod
+    def remember(cls, instance):
+        """pre_save: значення полів `document_siblings` до збереження"""
+        view_class = cls._views.get(type(instance)._meta.label_lower)
+        if view_class is None or not view_class.document_siblings or instance.pk is None:
+            return
+        previous = view_class.queryset.filter(pk=instance.pk).values(*view_class.document_siblings).first()
+        cls._previous[(view_class, instance.pk)] = previous
+
+    @classmethod
+    def object_changed(cls, instance, created=False, deleted=False):
+        """post_save / post_delete: планує перебудову документів, що містять об'єкт"""
+        model = type(instance)
+        for view_class in cls.views():
+            root = view_class.queryset.model
+            if model is root:
+                cls.schedule(view_class, {instance.pk})
+                cls.schedule(view_class, cls.sibling_pks(view_class, instance, created, deleted))
+
+            lookup = view_class.document_dependencies.get(model)
+            if lookup is None:
+                continue
+            field = lookup.split('__')[0]
+            if any(f.name == field for f in model._meta.get_fields() if f.concrete):
+                # Дочірній об'єкт (зображення проєкту) посилається на корінь
+                cls.schedule(view_class, {getattr(instance, f'{field}_id')})
+            else:
+                # Батьківський об'єкт (категорія) - усі корені, що на нього посилаються
+                cls.schedule(view_class, root._base_manager.filter(**{lookup: instance.pk}).values_list('pk', flat=True))
+
+    @classmethod
+    def sibling_pks(cls, view_class, instance, created, deleted):
+        """
+        Об'єкти, чиї документи агрегують цей (projects_count категорії):
+        лише якщо об'єкт з'явився, зник або змінив групу
+        """
+        if not view_class.document_siblings:
+            return set()
+        previous = cls._previous.pop((view_class, instance.pk), None)
+        current = None
+        if not deleted:
+            current = view_class.queryset.filter(pk=instance.pk).values(*view_class.document_siblings).first()
+        if not created and not deleted and previous == current:
+            return set()
+
+        groups = [values for values in (previous, current) if values]
+        if not groups and deleted:
+            groups = [{field: getattr(instance, field) for field in view_class.document_siblings}]
+        pks = set()
+        for values in groups:
+            pks.update(view_class.queryset.filter(**values).values_list('pk', flat=True))
+        pks.discard(instance.pk)
+        return pks
+
+    @classmethod
+    def schedule(cls, view_class, pks):
+        pks = {pk for pk in pks if pk is not None}
+        if not pks or not cls.is_enabled():
+            return
+        with cls._lock:
+            cls._pending.setdefault(view_class, set()).update(pks)
+        # Кожен коміт забирає все накопичене, повторні виклики нічого не роблять
+        transaction.on_commit(cls.flush)
+
+    @classmethod
+    def flush(cls):
+        with cls._lock:
+            pending = cls._pending
+            cls._pending = {}
+        for view_class, pks in pending.items():
+            try:
+                written = cls.rebuild(view_class, pks)
+                logger.debug(f"Документи {cls.label(view_class)} перебудовано: {len(pks)} об'єктів, {written} записів")
+            except Exception as e:
+                # Застарілі документи гірші за їх відсутність
+                logger.error(f"Помилка перебудови документів {cls.label(view_class)}: {str(e)}")
+                delete_documents(DetailDocument.objects.filter(model_label=cls.label(view_class), object_id__in=pks))
+
+
+class DetailDocumentMixin:
+    """
+    retrieve через DetailDocumentStore.
+
+    `document_dependencies` - {модель: lookup}: для дочірніх моделей - FK на
+    корінь ('project'), для батьківських - lookup кореня ('category').
+    `document_siblings` - поля кореня, за якими документи інших об'єктів
+    агрегують цей (projects_count категорії в документі проєкту).
+    `document_prefetch` - prefetch_related для пакетної перебудови.
+    Запити з параметрами (фільтри, пошук) та до неналаштованих базових URL
+    йдуть звичайним шляхом; відсутній документ читання не створює.
+    """
+
+    document_dependencies = {}
+    document_siblings = ()
+    document_prefetch = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if getattr(cls, 'queryset', None) is not None:
+            DetailDocumentStore.register(cls)
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = str(self.kwargs.get(self.lookup_url_kwarg or self.lookup_field, ''))
+        if (
+            not DetailDocumentStore.is_enabled()
+            or self.lookup_field != 'pk'
+            or request.query_params
+            or not pk.isdigit()
+        ):
+            return super().retrieve(request, *args, **kwargs)
+
+        base_url = request.build_absolute_uri('/')
+        if base_url not in DetailDocumentStore.get_config()['base_urls']:
+            return super().retrieve(request, *args, **kwargs)
+
+        view_class = type(self)
+        locale = get_language() or settings.LANGUAGE_CODE
+        body = DetailDocumentStore.get(view_class, int(pk), locale, base_url)
+        Metrics.cache_access('detail_document', body is not None)
+        if body is not None:
+            response = Response(JSONCodec.loads(body))
+            response['X-Detail-Document'] = 'HIT'
+            return response
+
+        # Документ з'явиться після збереження об'єкта або прогріву
+        response = super().retrieve(request, *args, **kwargs)
+        response['X-Detail-Document'] = 'MISS'
+        return response
@@ -0,0 +1,216 @@
+# backend/apps/api/hot_reload.py
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+import gettext as gettext_module
+import glob
+import json
+import os
+import threading
+import time
+import logging
+import polib
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationReloader:
+    """
+    Гаряче перезавантаження перекладів у всіх воркерах без рестарту.
+
+    Watcher після зміни файлів публікує повідомлення в Redis pub/sub,
+    а кожен воркер слухає канал і атомарно підміняє gettext каталоги
+    та індекс статичних перекладів.
+    """
+
+    _subscriber = None
+    _unsupported = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_config():
+        """Налаштування з TRANSLATION_HOT_RELOAD"""
+        reload_settings = getattr(settings, 'TRANSLATION_HOT_RELOAD', {})
+        return {
+            'enabled': reload_settings.get('ENABLED', False),
+            'channel': reload_settings.get('CHANNEL', 'ugc:translations:reload'),
+            'poll_interval': reload_settings.get('POLL_INTERVAL', 2),
+        }
+
+    @staticmethod
+    def reload_local(locale=None, kind='all'):
+        """Атомарно підміняє каталоги перекладів у поточному процесі"""
+        from django.utils.translation import trans_real
+        from .translations_views import StaticTranslationIndex
+
+        if kind in ('all', 'po'):
+            # Скидаємо кеш .mo файлів модуля gettext, щоб прочитати нові файли
+            gettext_module._translations = {}
+
+            # Django 5.2: trans_real.translation() заповнює _translations ліниво, а gettext()
+            # відновлює _default. Підміняємо словник одним присвоєнням: запити, що вже
+            # виконуються, дограють на своїх активованих каталогах, нові - завантажать свіжі.
+            # setting_changed тут не підходить - він також скидає активну мову всіх потоків.
+            # Перевірити при оновленні Django.
+            trans_real._translations = {}
+            trans_real._default = None
+
+        if kind in ('all', 'static'):
+            StaticTranslationIndex.reload()
+
+        logger.info(f"Переклади перезавантажено в процесі {os.getpid()}: {locale or 'all'} ({kind})")
+
+    @classmethod
+    def publish(cls, locale=None, kind='all'):
+        """Розсилає сигнал перезавантаження всім воркерам"""
+        from .snapshots import SnapshotJob
+        from .utils import TranslationManager
+
+        # Спільний кеш очищуємо один раз, до розсилки
+        TranslationManager.invalidate_translations_cache(locale)
+        SnapshotJob.translations_changed()
+
+        message = json.dumps({'locale': locale, 'kind': kind, 'origin': os.getpid()})
+        try:
+            from django_redis import get_redis_connection
+            con = get_redis_connection('default')
+            receivers = con.publish(cls.get_config()['channel'], message)
+            logger.info(f"Сигнал перезавантаження перекладів отримали {receivers} воркерів")
+            return receivers
+        except Exception as e:
+            # Без Redis перезавантажуємо хоча б поточний процес
+            logger.warning(f"Redis pub/sub недоступний, локальне перезавантаження: {str(e)}")
+            cls.reload_local(locale, kind)
+            return 0
+
+    @classmethod
+    def on_request_started(cls, **kwargs):
+        """request_started: підписка стартує з першим запитом воркера, не в management командах"""
+        if cls._unsupported or (cls._subscriber is not None and cls._subscriber.is_alive()):
+            return
+        cls.start_subscriber()
+
+    @classmethod
+    def start_subscriber(cls):
+        """Запускає фоновий потік, що слухає канал перезавантаження"""
+        with cls._lock:
+            if cls._unsupported or (cls._subscriber is not None and cls._subscriber.is_alive()):
+                return
+            cls._subscriber = threading.Thread(
+                target=cls._listen,
+                name='translation-reload-subscriber',
+                daemon=True,
+            )
+            cls._subscriber.start()
+
+    @classmethod
+    def _listen(cls):
+        """Слухає Redis канал, перепідключається при помилках"""
+        channel = cls.get_config()['channel']
+
+        while True:
+            try:
+                from django_redis import get_redis_connection
+                con = get_redis_connection('default')
+                pubsub = con.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+
+                # get_message з таймаутом: SOCKET_TIMEOUT кешу не обриває тиху підписку
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    try:
+                        payload = json.loads(message['data'])
+                    except (TypeError, ValueError):
+                        continue
+                    cls.reload_local(payload.get('locale'), payload.get('kind', 'all'))
+
+            except NotImplementedError:
+                logger.warning("Кеш не є django_redis, pub/sub перезавантаження вимкнено")
+                cls._unsupported = True
+                return
+            except Exception as e:
+                logger.error(f"Помилка підписки на перезавантаження перекладів: {str(e)}")
+                time.sleep(5)
+
+
+class TranslationFileWatcher:
+    """
+    Стежить за .po та статичними JSON файлами перекладів (опитування mtime).
+    Після зміни .po компілює .mo для цієї локалі і розсилає перезавантаження.
+    """
+
+    def __init__(self, interval=None, stdout=None):
+        self.interval = interval or TranslationReloader.get_config()['poll_interval']
+        self.stdout = stdout
+        self.mtimes = self.snapshot()
+
+    def tracked_files(self):
+        """Повертає {шлях: (тип, локаль)} для всіх файлів перекладів"""
+        files = {}
+        for locale_path in settings.LOCALE_PATHS:
+            pattern = os.path.join(str(locale_path), '*', 'LC_MESSAGES', 'django.po')
+            for po_path in glob.glob(pattern):
+                locale = po_path.split(os.sep)[-3]
+                files[po_path] = ('po', locale)
+
+        from .translations_views import static_translations_dir
+
+        for json_path in glob.glob(os.path.join(static_translations_dir(), '*.json')):
+            locale = os.path.splitext(os.path.basename(json_path))[0]
+            files[json_path] = ('static', locale)
+
+        return files
+
+    def snapshot(self):
+        """Знімок часу модифікації файлів"""
+        mtimes = {}
+        for path in self.tracked_files():
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return mtimes
+
+    def poll_once(self):
+        """Одна перевірка змін; повертає список оброблених змін"""
+        current = self.snapshot()
+        files = self.tracked_files()
+        changes = []
+
+        for path, mtime in current.items():
+            if self.mtimes.get(path) == mtime:
+                continue
+            kind, locale = files[path]
+            if kind == 'po':
+                self.compile(locale, path)
+            TranslationReloader.publish(locale, kind)
+            changes.append((kind, locale))
+            self._log(f'🔄 Змінено {kind} переклади для {locale}: {path}')
+
+        self.mtimes = current
+        return changes
+
+    def run_forever(self):
+        """Нескінченний цикл опитування"""
+        self._log(f'👀 Стежимо за файлами перекладів (інтервал {self.interval}с)')
+        while True:
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Помилка перевірки файлів перекладів: {str(e)}")
+            time.sleep(self.interval)
+
+    def compile(self, locale, po_path):
+        """Компілює .mo для локалі; без gettext утиліт використовує polib"""
+        try:
+            call_command('compilemessages', locale=[locale], verbosity=0)
+        except CommandError as e:
+            logger.warning(f"compilemessages недоступний ({str(e)}), компілюємо через polib")
+            polib.pofile(po_path).save_as_mofile(os.path.splitext(po_path)[0] + '.mo')
+
+    def _log(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+        logger.info(message)
@@ -0,0 +1,217 @@
+# backend/apps/api/json_codec.py
+"""
+Швидкий JSON кодек: orjson або msgspec, якщо встановлені, інакше стандартний json.
+
+Використовується рендерером і парсером DRF, кешем перекладів (серіалізатор
+django-redis) та командами експорту. Типи, яких кодек не знає (Decimal,
+lazy рядки перекладів, datetime), перетворює той самий default, що й раніше:
+JSONEncoder DRF для API, DjangoJSONEncoder для кешу.
+"""
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis.serializers.base import BaseSerializer
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# DRF екранує ці символи, бо вони ламають JSON всередині <script>
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class JSONCodecError(ValueError):
+    """Некоректний JSON (однаковий тип помилки для всіх бекендів)"""
+
+
+def reject_constant(name):
+    # NaN та Infinity не є JSON - як strict режим парсера DRF
+    raise JSONCodecError(f'Invalid JSON constant {name}')
+
+
+class StdlibBackend:
+    name = 'json'
+
+    def dumps(self, value, default, indent):
+        return json.dumps(
+            value,
+            default=default,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=2 if indent else None,
+            separators=(',', ': ') if indent else (',', ':'),
+        ).encode('utf-8')
+
+    def loads(self, data):
+        try:
+            return json.loads(data, parse_constant=reject_constant)
+        except ValueError as e:
+            raise JSONCodecError(str(e)) from e
+
+
+class OrjsonBackend:
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+
+        self.orjson = orjson
+        # datetime йде через default - формат як у DRF/Django, а не RFC 3339 orjson
+        self.options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, value, default, indent):
+        options = self.options | self.orjson.OPT_INDENT_2 if indent else self.options
+        return self.orjson.dumps(value, default=default, option=options)
+
+    def loads(self, data):
+        try:
+            return self.orjson.loads(data)
+        except self.orjson.JSONDecodeError as e:
+            raise JSONCodecError(str(e)) from e
+
+
+class MsgspecBackend:
+    name = 'msgspec'
+
+    def __init__(self):
+        import msgspec
+
+        self.msgspec = msgspec
+        self.decoder = msgspec.json.Decoder()
+        self._encoders = {}
+
+    def encoder(self, default):
+        # Encoder з enc_hook створюється один раз на функцію default
+        if default not in self._encoders:
+            self._encoders[default] = self.msgspec.json.Encoder(enc_hook=default, decimal_format='number')
+        return self._encoders[default]
+
+    def dumps(self, value, default, indent):
+        content = self.encoder(default).encode(value)
+        return self.msgspec.json.format(content, indent=2) if indent else content
+
+    def loads(self, data):
+        try:
+            return self.decoder.decode(data)
+        except self.msgspec.DecodeError as e:
+            raise JSONCodecError(str(e)) from e
+
+
+class JSONCodec:
+    """
+    Вибір бекенду за JSON_CODEC_SETTINGS['BACKEND']: auto (orjson, msgspec, json),
+    або конкретний; якщо його не встановлено - стандартний json з попередженням
+    """
+
+    BACKENDS = {
+        'orjson': OrjsonBackend,
+        'msgspec': MsgspecBackend,
+        'json': StdlibBackend,
+    }
+    AUTO_ORDER = ('orjson', 'msgspec', 'json')
+
+    _backend = None
+
+    @staticmethod
+    def get_config():
+        return getattr(settings, 'JSON_CODEC_SETTINGS', {}).get('BACKEND', 'auto')
+
+    @classmethod
+    def backend(cls):
+        if cls._backend is None:
+            cls._backend = cls.load_backend(cls.get_config())
+        return cls._backend
+
+    @classmethod
+    def load_backend(cls, name):
+        candidates = cls.AUTO_ORDER if name == 'auto' else (name,)
+        for candidate in candidates:
+            if candidate not in cls.BACKENDS:
+                logger.warning(f"Невідомий JSON кодек '{candidate}', використовується json")
+                continue
+            try:
+                return cls.BACKENDS[candidate]()
+            except ImportError:
+                if name != 'auto':
+                    logger.warning(f"JSON кодек '{candidate}' не встановлено, використовується json")
+        return StdlibBackend()
+
+    @classmethod
+    def reset(cls):
+        """Повторний вибір бекенду (після зміни налаштувань)"""
+        cls._backend = None
+
+    @classmethod
+    def dumps(cls, value, default=None, indent=False):
+        """UTF-8 bytes; indent - відступ 2 пробіли, як json.dump(indent=2)"""
+        return cls.backend().dumps(value, default or JSONEncoder().default, indent)
+
+    @classmethod
+    def loads(cls, data):
+        """Приймає bytes або str; некоректний JSON - JSONCodecError (ValueError)"""
+        return cls.backend().loads(data)
+
+    @classmethod
+    def dump_file(cls, value, path):
+        with open(path, 'wb') as f:
+            f.write(cls.dumps(value, indent=True))
+
+    @classmethod
+    def load_file(cls, path):
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer через JSONCodec. Запити з ?indent / ; indent=N, а також
+    UNICODE_JSON=False чи COMPACT_JSON=False йдуть стандартним шляхом DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (
+            self.get_indent(accepted_media_type, renderer_context) is not None
+            or self.ensure_ascii
+            or not self.compact
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = JSONCodec.dumps(data, default=self.encoder_class().default)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in content:
+                content = content.replace(raw, escaped)
+        return content
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser через JSONCodec (NaN/Infinity відхиляються, як strict режим DRF)"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read()
+            if encoding.lower().replace('-', '').replace('_', '') != 'utf8':
+                data = data.decode(encoding)
+            return JSONCodec.loads(data)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class RedisJSONSerializer(BaseSerializer):
+    """Серіалізатор django-redis: той самий формат, що JSONSerializer, але через JSONCodec"""
+
+    encoder_default = DjangoJSONEncoder().default
+
+    def dumps(self, value):
+        return JSONCodec.dumps(value, default=self.encoder_default)
+
+    def loads(self, value):
+        return JSONCodec.loads(value)
@@ -0,0 +1,74 @@
+# backend/apps/api/management/commands/bench_compiled_serializers.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.utils import translation
+from rest_framework.renderers import JSONRenderer
+from apps.api.compiled import CompiledSerializer
+from apps.api.serializers import ProjectListSerializer, ServiceListSerializer, WorkplacePhotoSerializer
+from apps.jobs.models import WorkplacePhoto
+from apps.projects.models import Project
+from apps.services.models import Service
+import statistics
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        'Мікробенчмарк серіалізації списків: ModelSerializer проти CompiledSerializer '
+        '(разом із вибіркою з БД) з перевіркою побайтової ідентичності JSON. '
+        'Дані: python manage.py generate_load_data'
+    )
+
+    SCENARIOS = (
+        ('services', ServiceListSerializer, lambda: Service.objects.filter(is_active=True).order_by('order')),
+        ('projects', ProjectListSerializer, lambda: Project.objects.filter(is_active=True).order_by('-created_at')),
+        ('workplace-photos', WorkplacePhotoSerializer, lambda: WorkplacePhoto.objects.filter(is_active=True).order_by('order')),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Рядків на серіалізацію')
+        parser.add_argument('--repeat', type=int, default=7, help='Повторів для медіани')
+        parser.add_argument('--locales', help='Мови через кому (за замовчуванням усі LANGUAGES)')
+
+    def handle(self, *args, **options):
+        locales = options['locales'].split(',') if options['locales'] else [code for code, _ in settings.LANGUAGES]
+        request = RequestFactory().get('/api/v1/', HTTP_HOST='localhost')
+        renderer = JSONRenderer()
+
+        self.stdout.write(f'{options["rows"]} рядків × {options["repeat"]} повторів, мс (медіана, з SQL)\n')
+        self.stdout.write(f'{"сценарій":<24}{"рядків":>8}{"DRF":>10}{"compiled":>10}{"виграш":>9}')
+        for locale in locales:
+            with translation.override(locale):
+                for name, serializer_class, queryset_factory in self.SCENARIOS:
+                    plan = CompiledSerializer.for_serializer(serializer_class)
+                    if plan is None:
+                        raise CommandError(f'{serializer_class.__name__} не компілюється')
+
+                    def drf():
+                        queryset = serializer_class.project_queryset(queryset_factory())[:options['rows']]
+                        return serializer_class(queryset, many=True, context={'request': request}).data
+
+                    def compiled():
+                        rows = plan.rows(queryset_factory()[:options['rows']])
+                        return plan.serialize(rows, {'request': request})
+
+                    expected, actual = drf(), compiled()
+                    if renderer.render(expected) != renderer.render(actual):
+                        raise CommandError(f'{name}[{locale}]: JSON відрізняється від ModelSerializer')
+
+                    old = self._measure(drf, options['repeat'])
+                    new = self._measure(compiled, options['repeat'])
+                    speedup = f'{old / new:.1f}×' if new > 0 else '-'
+                    self.stdout.write(f'{name + f"[{locale}]":<24}{len(actual):>8}{old:>10.2f}{new:>10.2f}{speedup:>9}')
+
+        self.stdout.write(self.style.SUCCESS('✅ Вивід ідентичний ModelSerializer'))
+
+    @staticmethod
+    def _measure(function, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
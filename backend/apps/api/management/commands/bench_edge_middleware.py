@@ -0,0 +1,64 @@
+# backend/apps/api/management/commands/bench_edge_middleware.py
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from corsheaders.middleware import CorsMiddleware as CorsHeadersMiddleware
+from apps.api.middleware import ApiEdgeMiddleware, TranslationsCacheMiddleware
+import statistics
+import time
+
+
+def inner_view(request):
+    """Заглушка решти стеку: лише створює відповідь"""
+    return HttpResponse(b'{}', content_type='application/json')
+
+
+class Command(BaseCommand):
+    help = 'Мікробенчмарк накладних витрат ApiEdgeMiddleware проти попереднього ланцюжка middleware'
+
+    SCENARIOS = (
+        ('api GET + Origin', 'get', '/api/v1/services/', {'HTTP_ORIGIN': 'http://localhost:3000'}),
+        ('api GET без Origin', 'get', '/api/v1/projects/?page=2', {}),
+        ('не-API GET', 'get', '/admin/login/', {}),
+        ('preflight OPTIONS', 'options', '/api/v1/contact-inquiries/', {
+            'HTTP_ORIGIN': 'http://localhost:3000',
+            'HTTP_ACCESS_CONTROL_REQUEST_METHOD': 'POST',
+        }),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000, help='Запитів на сценарій')
+        parser.add_argument('--repeat', type=int, default=5, help='Повторів для медіани')
+
+    def handle(self, *args, **options):
+        chains = {
+            'попередній': CorsHeadersMiddleware(TranslationsCacheMiddleware(inner_view)),
+            'ApiEdge': ApiEdgeMiddleware(inner_view),
+        }
+        baseline = inner_view
+
+        factory = RequestFactory()
+        iterations = options['iterations']
+        self.stdout.write(f'{iterations} запитів × {options["repeat"]} повторів, мкс на запит (медіана, без вартості view)\n')
+        self.stdout.write(f'{"сценарій":<22}{"попередній":>12}{"ApiEdge":>12}{"виграш":>10}')
+
+        for title, method, path, extra in self.SCENARIOS:
+            requests = [getattr(factory, method)(path, **extra) for _ in range(iterations)]
+            base = self._measure(baseline, requests, options['repeat'])
+            results = {
+                name: self._measure(chain, requests, options['repeat']) - base
+                for name, chain in chains.items()
+            }
+            old, new = results['попередній'], results['ApiEdge']
+            speedup = f'{old / new:.1f}×' if new > 0 else '-'
+            self.stdout.write(f'{title:<22}{old:>12.2f}{new:>12.2f}{speedup:>10}')
+
+    @staticmethod
+    def _measure(handler, requests, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for request in requests:
+                handler(request)
+            timings.append((time.perf_counter() - started) / len(requests) * 1_000_000)
+        return statistics.median(timings)
@@ -0,0 +1,53 @@
+# backend/apps/api/management/commands/build_detail_documents.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import time
+from apps.api.documents import DetailDocumentStore
+
+
+class Command(BaseCommand):
+    help = (
+        'Будує документи детальних відповідей (DetailDocumentMixin) для всіх активних '
+        'об\'єктів і мов. Потрібно після масових змін без сигналів або зміни налаштувань перекладів'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url', action='append',
+            help='Базовий URL API як у запитах (за замовчуванням DETAIL_DOCUMENT_SETTINGS BASE_URLS), можна кілька разів',
+        )
+        parser.add_argument('--locales', help='Мови через кому (за замовчуванням усі LANGUAGES)')
+        parser.add_argument('--clear', action='store_true', help='Спершу видалити всі документи')
+
+    def handle(self, *args, **options):
+        locales = options['locales'].split(',') if options['locales'] else [code for code, _ in settings.LANGUAGES]
+        base_urls = [
+            url if url.endswith('/') else f'{url}/'
+            for url in options['base_url'] or DetailDocumentStore.get_config()['base_urls']
+        ]
+        if not base_urls:
+            raise CommandError('Не задано базових URL (--base-url або DETAIL_DOCUMENT_SETTINGS BASE_URLS)')
+        for url in base_urls:
+            if not url.startswith(('http://', 'https://')):
+                raise CommandError(f'Базовий URL має бути абсолютним: {url}')
+
+        if options['clear']:
+            deleted = DetailDocumentStore.clear()
+            self.stdout.write(self.style.WARNING(f'🧹 Видалено документів: {deleted}'))
+
+        batch_size = DetailDocumentStore.get_config()['batch_size']
+        for view_class in DetailDocumentStore.views():
+            started = time.perf_counter()
+            pks = list(view_class.queryset.order_by('pk').values_list('pk', flat=True))
+            written = 0
+            for start in range(0, len(pks), batch_size):
+                batch = pks[start:start + batch_size]
+                for locale in locales:
+                    for base_url in base_urls:
+                        bodies = DetailDocumentStore.build(view_class, batch, locale, base_url)
+                        DetailDocumentStore.save(view_class, bodies, locale, base_url)
+                        written += len(bodies)
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {DetailDocumentStore.label(view_class)}: {written} документів '
+                f'({len(pks)} об\'єктів) за {time.perf_counter() - started:.1f} с'
+            ))
@@ -0,0 +1,36 @@
+# backend/apps/api/management/commands/build_recommendations.py
+from django.core.management.base import BaseCommand, CommandError
+from modeltranslation import settings as mt_settings
+import time
+from apps.common.recommendations import RecommendationBuilder, specs
+
+
+class Command(BaseCommand):
+    help = (
+        'Перебудовує схожі проєкти та послуги (TF-IDF) для всіх мов. '
+        'Після масових змін без сигналів та періодично - оновлює idf усього корпусу'
+    )
+
+    def add_arguments(self, parser):
+        names = [spec.name for spec in specs()]
+        parser.add_argument('--model', choices=names, action='append', help='Лише ці рекомендації')
+        parser.add_argument('--language', action='append', help='Лише ці мови')
+        parser.add_argument('--top-k', type=int, help='Кількість схожих об\'єктів (за замовчуванням TOP_K)')
+
+    def handle(self, *args, **options):
+        languages = options['language'] or list(mt_settings.AVAILABLE_LANGUAGES)
+        unknown = set(languages) - set(mt_settings.AVAILABLE_LANGUAGES)
+        if unknown:
+            raise CommandError(f'Невідомі мови: {", ".join(sorted(unknown))}')
+
+        for spec in specs():
+            if options['model'] and spec.name not in options['model']:
+                continue
+            for language in languages:
+                started = time.perf_counter()
+                builder = RecommendationBuilder(spec, language, top_k=options['top_k'])
+                links = builder.build()
+                self.stdout.write(self.style.SUCCESS(
+                    f'✅ {spec.name} [{language}]: {links} зв\'язків '
+                    f'({len(builder.ids)} об\'єктів) за {time.perf_counter() - started:.1f} с'
+                ))
@@ -0,0 +1,25 @@
+# backend/apps/api/management/commands/build_sitemaps.py
+from django.core.management.base import BaseCommand
+import time
+from apps.common.sitemaps import SitemapGenerator, get_config, sections
+
+
+class Command(BaseCommand):
+    help = (
+        'Будує файли sitemap (індекс та <розділ>-<мова>-<блок>.xml) для всіх мов. '
+        'Після масових змін без сигналів; окремі зміни оновлюються сигналами'
+    )
+
+    def add_arguments(self, parser):
+        names = [section.name for section in sections()]
+        parser.add_argument('--section', choices=names, action='append', help='Лише ці розділи')
+
+    def handle(self, *args, **options):
+        generator = SitemapGenerator()
+        started = time.perf_counter()
+        result = generator.build(options['section'])
+        for name, (files, urls) in result.items():
+            self.stdout.write(self.style.SUCCESS(f'✅ {name}: {urls} адрес у {files} файлах'))
+        self.stdout.write(self.style.SUCCESS(
+            f'🗺️ Індекс {get_config()["root"] / "sitemap.xml"} за {time.perf_counter() - started:.1f} с'
+        ))
@@ -1,10 +1,10 @@
 # backend/apps/api/management/commands/export_translations.py
 import os
-import json
 import polib
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from django.utils import translation
+from apps.api.json_codec import JSONCodec
 
 
 class Command(BaseCommand):
@@ -75,8 +75,7 @@ class Command(BaseCommand):
                 
                 # 5. Збереження файлу
                 output_file = os.path.join(output_dir, f'{locale}.json')
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(translations, f, ensure_ascii=False, indent=2)
+                JSONCodec.dump_file(translations, output_file)
                 
                 self.stdout.write(
                     self.style.SUCCESS(
@@ -94,8 +93,7 @@ class Command(BaseCommand):
         file_path = os.path.join(output_dir, f'{locale}.json')
         if os.path.exists(file_path):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return JSONCodec.load_file(file_path)
             except Exception as e:
                 self.stdout.write(f'Помилка читання існуючого файлу: {e}')
         return {}
@@ -1,11 +1,11 @@
 # backend/apps/api/management/commands/fix_translations.py
 import os
-import json
 import polib
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from django.utils import translation
 from django.core.cache import cache
+from apps.api.json_codec import JSONCodec
 
 
 class Command(BaseCommand):
@@ -152,8 +152,7 @@ class Command(BaseCommand):
         
         # Зберігаємо у JSON файл
         output_file = os.path.join(static_dir, f'{locale}.json')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(static_translations, f, ensure_ascii=False, indent=2)
+        JSONCodec.dump_file(static_translations, output_file)
         
         self.stdout.write(f'   ✅ Експортовано {len(static_translations)} перекладів у {output_file}')
 
@@ -322,8 +321,7 @@ class Command(BaseCommand):
         static_file = os.path.join(settings.BASE_DIR, 'static_translations', f'{locale}.json')
         if os.path.exists(static_file):
             try:
-                with open(static_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = JSONCodec.load_file(static_file)
                 
                 # Перевіряємо на порожні значення
                 for key, value in data.items():
@@ -332,7 +330,7 @@ class Command(BaseCommand):
                 
                 self.stdout.write(f'   📄 Статичні переклади: {len(data)} ключів')
                 
-            except json.JSONDecodeError as e:
+            except ValueError as e:
                 errors.append(f"Помилка JSON у статичних перекладах: {str(e)}")
         else:
             warnings.append(f"Файл статичних перекладів не знайдено: {static_file}")
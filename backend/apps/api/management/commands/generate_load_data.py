@@ -0,0 +1,49 @@
+# backend/apps/api/management/commands/generate_load_data.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+import time
+from apps.common.loadgen import SCALES, LoadDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерує великий синтетичний набір даних (uk та en, заглушки зображень) '
+        'для профілювання N+1, планів запитів та поведінки кешу'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small', help='Обсяг даних')
+        for name in SCALES['small']:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int, help=f'{name} замість значення масштабу')
+        parser.add_argument('--seed', type=int, default=42, help='Seed (однаковий seed - однакові дані)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Розмір пакета bulk_create')
+        parser.add_argument('--flush', action='store_true', help='Спершу видалити наявні записи цих моделей')
+        parser.add_argument('--no-images', action='store_true', help='Не створювати файли заглушок у MEDIA')
+        parser.add_argument('--force', action='store_true', help='Дозволити запуск при DEBUG=False')
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or getattr(settings, 'BENCHMARK_SETTINGS', None) or options['force']):
+            raise CommandError(
+                'DEBUG=False: схоже на робоче середовище. Використайте ugc_backend.settings_bench або --force'
+            )
+
+        generator = LoadDataGenerator(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            stdout=self.stdout,
+            images=not options['no_images'],
+        )
+        started = time.perf_counter()
+        if options['flush']:
+            self.stdout.write(self.style.WARNING('🧹 Видалення наявних даних'))
+            generator.flush()
+
+        self.stdout.write(self.style.SUCCESS(f"🌱 Генерація даних ({options['scale']}, seed {options['seed']})"))
+        try:
+            counts = generator.generate(options['scale'], **{name: options[name] for name in SCALES[options['scale']]})
+        except IntegrityError as e:
+            raise CommandError(f'Згенеровані дані вже існують ({e}). Запустіть з --flush')
+
+        summary = ', '.join(f'{name}={value}' for name, value in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'✅ Готово за {time.perf_counter() - started:.1f} с: {summary}'))
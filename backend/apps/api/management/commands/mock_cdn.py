@@ -0,0 +1,36 @@
+# backend/apps/api/management/commands/mock_cdn.py
+from django.core.management.base import BaseCommand
+from apps.api.mock_cdn import MockCDNServer
+
+
+class Command(BaseCommand):
+    help = 'Запускає локальний mock CDN, що приймає та журналює запити очищення кешу і ревалідації'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Адреса сервера')
+        parser.add_argument('--port', type=int, default=8787, help='Порт сервера')
+        parser.add_argument('--log-file', help='JSONL файл для запису отриманих запитів')
+
+    def handle(self, *args, **options):
+        server = MockCDNServer(
+            (options['host'], options['port']),
+            log_file=options.get('log_file'),
+            on_request=self._print_request,
+        )
+        url = f"http://{options['host']}:{options['port']}/"
+        self.stdout.write(self.style.SUCCESS(f'🛰  Mock CDN слухає {url}'))
+        self.stdout.write(f'   CDN_PURGE_ENABLED=True CDN_PURGE_URL={url}purge')
+        self.stdout.write(f'   REVALIDATION_ENABLED=True REVALIDATION_URL={url}revalidate')
+        self.stdout.write(f'   Журнал запитів: GET {url}_requests')
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('👋 Зупинено'))
+        finally:
+            server.server_close()
+
+    def _print_request(self, record):
+        body = record['body'] if isinstance(record['body'], dict) else {}
+        keys = ' '.join(record['surrogate_keys'] or body.get('paths') or []) or '-'
+        self.stdout.write(f"🧹 {record['path']}: {keys}")
@@ -0,0 +1,21 @@
+# backend/apps/api/management/commands/profile_header.py
+from django.core.management.base import BaseCommand
+from apps.api.profiling import ProfileSignature, get_profiling_config
+
+
+class Command(BaseCommand):
+    help = 'Генерує підписаний заголовок для примусового профілювання API запиту'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Шлях запиту, напр. /api/v1/projects/')
+
+    def handle(self, *args, **options):
+        config = get_profiling_config()
+        if not config['enabled']:
+            self.stdout.write(self.style.WARNING('⚠️  Профілювання вимкнене (PROFILING_ENABLED=False)'))
+
+        signature = ProfileSignature.sign(options['path'])
+        self.stdout.write(f"{config['header']}: {signature}")
+        self.stdout.write(
+            f"   Дійсний {config['signature_max_age']} с, лише для шляху {options['path']}"
+        )
@@ -0,0 +1,54 @@
+# backend/apps/api/management/commands/revalidate_pages.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from modeltranslation import settings as mt_settings
+from apps.api.models import RevalidationRequest
+from apps.api.revalidation import RevalidationPaths, Revalidator, get_config, is_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        'Відправляє накопичені запити ревалідації сторінок фронтенду. '
+        'З --path/--all спершу додає сторінки в outbox, з --retry-failed повертає невдалі в чергу'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', default=[], help='Шлях сторінки, наприклад /uk/work/')
+        parser.add_argument(
+            '--locale', choices=list(mt_settings.AVAILABLE_LANGUAGES),
+            help='Мова для --path (за замовчуванням - перший сегмент шляху)',
+        )
+        parser.add_argument('--all', action='store_true', help='Усі сторінки: списки та активні об\'єкти')
+        parser.add_argument('--retry-failed', action='store_true', help='Повторити запити зі статусом failed')
+
+    def handle(self, *args, **options):
+        if not is_enabled():
+            raise CommandError('Ревалідація вимкнена: REVALIDATION_ENABLED=True та REVALIDATION_URL')
+
+        paths = [(path, options['locale'] or self.locale_of(path)) for path in options['path']]
+        if options['all']:
+            paths.extend(RevalidationPaths.all())
+
+        with transaction.atomic():
+            if options['retry_failed']:
+                retried = RevalidationRequest.objects.filter(status='failed').update(
+                    status='pending', attempts=0, available_at=timezone.now(),
+                )
+                self.stdout.write(self.style.SUCCESS(f'🔁 Повернуто в чергу: {retried}'))
+            if paths:
+                self.stdout.write(self.style.SUCCESS(f'📝 Додано в outbox: {Revalidator.record(paths)}'))
+
+        sent = Revalidator.drain()
+        pending = RevalidationRequest.objects.filter(status='pending').count()
+        failed = RevalidationRequest.objects.filter(status='failed').count()
+        self.stdout.write(self.style.SUCCESS(f'✅ Ревалідовано сторінок: {sent} ({get_config()["url"]})'))
+        if pending or failed:
+            self.stdout.write(self.style.WARNING(f'⚠️ В черзі: {pending}, з помилкою: {failed}'))
+
+    @staticmethod
+    def locale_of(path):
+        prefix = path.strip('/').split('/', 1)[0]
+        if prefix not in mt_settings.AVAILABLE_LANGUAGES:
+            raise CommandError(f'Не вдалося визначити мову для {path}: вкажіть --locale')
+        return prefix
@@ -0,0 +1,129 @@
+# backend/apps/api/management/commands/run_benchmark.py
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from pathlib import Path
+import json
+from apps.api.benchmark import BenchmarkRunner, compare_results, discover_scenarios, environment_info
+from apps.common.loadgen import SCALES, LoadDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        'Бенчмарк усіх публічних API ендпоінтів: throughput, p50/p95/p99 та SQL запити. '
+        'Запуск: DJANGO_SETTINGS_MODULE=ugc_backend.settings_bench python manage.py run_benchmark'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small', help='Обсяг синтетичних даних')
+        for name in SCALES['small']:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int, help=f'{name} замість значення масштабу')
+        parser.add_argument('--seed', type=int, default=42, help='Seed генератора даних')
+        parser.add_argument('--skip-seed', action='store_true', help='Використати наявні дані')
+        parser.add_argument('--iterations', type=int, default=50, help='Запитів на сценарій')
+        parser.add_argument('--warmup', type=int, default=5, help='Запитів прогріву на сценарій')
+        parser.add_argument('--concurrency', type=int, default=1, help='Паралельних потоків')
+        parser.add_argument('--locales', help='Мови через кому (за замовчуванням усі LANGUAGES)')
+        parser.add_argument('--only', help='Лише сценарії, назва яких містить цей рядок')
+        parser.add_argument('--include-writes', action='store_true', help='Додати POST ендпоінти форм')
+        parser.add_argument('--keep-cache', action='store_true', help='Не очищати кеш перед прогоном')
+        parser.add_argument('--output', help='JSON файл результатів')
+        parser.add_argument('--baseline', help='JSON базового прогону для порівняння')
+        parser.add_argument('--save-baseline', action='store_true', help='Зберегти результати як базові')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Допустиме погіршення p95 (частка)')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Код виходу 1 при регресії')
+
+    def handle(self, *args, **options):
+        bench_settings = getattr(settings, 'BENCHMARK_SETTINGS', None)
+        if bench_settings is None:
+            raise CommandError(
+                'Бенчмарк перезаписує дані - запускайте з DJANGO_SETTINGS_MODULE=ugc_backend.settings_bench'
+            )
+
+        if not options['skip_seed']:
+            self.stdout.write(self.style.SUCCESS(f"🌱 Генерація даних ({options['scale']}, seed {options['seed']})"))
+            generator = LoadDataGenerator(seed=options['seed'], stdout=self.stdout)
+            generator.flush()
+            counts = generator.generate(options['scale'], **{
+                name: options[name] for name in SCALES[options['scale']]
+            })
+        else:
+            counts = None
+
+        if not options['keep_cache']:
+            cache.clear()
+
+        locales = options['locales'].split(',') if options['locales'] else None
+        scenarios = discover_scenarios(locales=locales, include_writes=options['include_writes'])
+        if options['only']:
+            scenarios = [scenario for scenario in scenarios if options['only'] in scenario.name]
+        if not scenarios:
+            raise CommandError('Немає сценаріїв для запуску')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"🚀 {len(scenarios)} сценаріїв × {options['iterations']} запитів "
+            f"(warmup {options['warmup']}, потоків {options['concurrency']})"
+        ))
+        runner = BenchmarkRunner(
+            scenarios,
+            iterations=options['iterations'],
+            warmup=options['warmup'],
+            concurrency=options['concurrency'],
+            stdout=self.stdout,
+        )
+        report = {
+            'meta': {
+                **environment_info(),
+                'scale': options['scale'],
+                'counts': counts,
+                'seed': options['seed'],
+                'iterations': options['iterations'],
+                'warmup': options['warmup'],
+                'concurrency': options['concurrency'],
+            },
+            'results': runner.run(),
+        }
+
+        results_dir = Path(bench_settings['RESULTS_DIR'])
+        output = Path(options['output']) if options['output'] else (
+            results_dir / f"{report['meta']['timestamp'].replace(':', '-')}.json"
+        )
+        self.write_json(output, report)
+        self.stdout.write(self.style.SUCCESS(f'💾 Результати: {output}'))
+
+        baseline_path = Path(options['baseline'] or bench_settings['BASELINE'])
+        if options['save_baseline']:
+            self.write_json(baseline_path, report)
+            self.stdout.write(self.style.SUCCESS(f'📌 Базовий прогін оновлено: {baseline_path}'))
+        elif baseline_path.exists():
+            self.compare(report, baseline_path, options)
+        elif options['baseline']:
+            raise CommandError(f'Базовий прогін не знайдено: {baseline_path}')
+
+    def compare(self, report, baseline_path, options):
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        rows = compare_results(report, baseline, threshold=options['threshold'])
+        self.stdout.write(f"\n📊 Порівняння з {baseline_path} ({baseline['meta'].get('git_commit') or '-'})")
+        styles = {
+            'regression': self.style.ERROR,
+            'improvement': self.style.SUCCESS,
+            'new': self.style.WARNING,
+            'missing': self.style.WARNING,
+        }
+        for name, status, description in rows:
+            if status != 'ok':
+                self.stdout.write(styles[status](f'  {status:<12} {name:<55} {description}'))
+
+        regressions = [row for row in rows if row[1] == 'regression']
+        summary = f"Регресій: {len(regressions)}, сценаріїв у порівнянні: {len(rows)}"
+        if regressions and options['fail_on_regression']:
+            raise CommandError(summary)
+        self.stdout.write(self.style.ERROR(summary) if regressions else self.style.SUCCESS(summary))
+
+    @staticmethod
+    def write_json(path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,33 @@
+# backend/apps/api/management/commands/snapshot_api.py
+from django.core.management.base import BaseCommand, CommandError
+import shutil
+import time
+from apps.api.snapshots import SnapshotWriter, get_config
+
+
+class Command(BaseCommand):
+    help = (
+        'Рендерить усі публічні GET маршрути API для всіх мов у статичні JSON файли з маніфестом '
+        '(SNAPSHOT_SETTINGS[\'ROOT\']). Незмінені файли не перезаписуються'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', help='Базовий URL API для посилань (за замовчуванням SNAPSHOT_SETTINGS[\'BASE_URL\'])')
+        parser.add_argument('--clear', action='store_true', help='Спершу видалити попередній знімок')
+
+    def handle(self, *args, **options):
+        base_url = options['base_url']
+        if base_url and not base_url.startswith(('http://', 'https://')):
+            raise CommandError(f'Базовий URL має бути абсолютним: {base_url}')
+
+        root = get_config()['root']
+        if options['clear'] and root.exists():
+            shutil.rmtree(root)
+            self.stdout.write(self.style.WARNING(f'🧹 Видалено {root}'))
+
+        started = time.perf_counter()
+        stats = SnapshotWriter(base_url).build()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Знімок API {root}: {stats['rendered']} відповідей, {stats['written']} записано, "
+            f"{stats['deleted']} видалено за {time.perf_counter() - started:.1f} с"
+        ))
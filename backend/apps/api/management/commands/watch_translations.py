@@ -0,0 +1,22 @@
+# backend/apps/api/management/commands/watch_translations.py
+from django.core.management.base import BaseCommand
+from apps.api.hot_reload import TranslationFileWatcher
+
+
+class Command(BaseCommand):
+    help = 'Стежить за .po та JSON перекладами і перезавантажує їх у всіх воркерах'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Інтервал опитування файлів у секундах',
+        )
+
+    def handle(self, *args, **options):
+        watcher = TranslationFileWatcher(interval=options.get('interval'), stdout=self.stdout)
+        
+        try:
+            watcher.run_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('👋 Зупинено'))
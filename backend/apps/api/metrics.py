@@ -0,0 +1,369 @@
+# backend/apps/api/metrics.py
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.urls import Resolver404, resolve
+from contextlib import ExitStack
+from collections import defaultdict
+import atexit
+import hmac
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# name: (тип, опис)
+METRIC_FAMILIES = {
+    'ugc_http_requests_total': ('counter', 'HTTP запити за view, дією, методом та статусом'),
+    'ugc_http_request_duration_seconds': ('histogram', 'Тривалість обробки запиту'),
+    'ugc_db_queries_total': ('counter', 'Кількість SQL запитів'),
+    'ugc_db_query_duration_seconds_total': ('counter', 'Сумарний час SQL запитів'),
+    'ugc_db_queries_per_request': ('histogram', 'SQL запитів на один HTTP запит'),
+    # response_cache замінив cache_page та кеш featured_services: мітка view - ServiceViewSet.featured тощо
+    'ugc_cache_requests_total': ('counter', 'Звернення до кешу за сімейством ключів та результатом'),
+    'ugc_throttled_requests_total': ('counter', 'Запити, відхилені обмеженням частоти (429)'),
+    'ugc_db_pool_connections': ('gauge', "З'єднання пулу БД процесу: size, available, min, max"),
+    'ugc_db_pool_requests_waiting': ('gauge', "Запити, що чекають на з'єднання пулу"),
+    'ugc_db_pool_requests_total': ('counter', "Видачі з'єднань з пулу"),
+    'ugc_db_pool_requests_queued_total': ('counter', "Видачі з'єднань, що чекали в черзі"),
+    'ugc_db_pool_wait_seconds_total': ('counter', "Сумарне очікування з'єднання пулу"),
+    'ugc_db_pool_connections_opened_total': ('counter', "Нові з'єднання пулу з PostgreSQL"),
+    'ugc_db_pool_connect_seconds_total': ('counter', "Сумарний час відкриття з'єднань"),
+    'ugc_db_pool_errors_total': ('counter', 'Помилки пулу: timeout, connect, lost, bad_return'),
+    'ugc_cache_breaker_state': ('gauge', 'Запобіжник кешу процесу: 0 - closed, 1 - half_open, 2 - open'),
+    'ugc_cache_breaker_transitions_total': ('counter', 'Переходи запобіжника кешу за новим станом'),
+    'ugc_cache_fallback_total': ('counter', 'Операції кешу, виконані в локальному кеші (open - запобіжник, error - збій)'),
+    'ugc_db_read_routing_total': ('counter', 'Вибір БД для читань запиту: репліка чи основна та причина'),
+}
+
+# Лічильники psycopg_pool.ConnectionPool.pop_stats(): {ключ: (метрика, множник, мітки)}
+POOL_COUNTERS = {
+    'requests_num': ('ugc_db_pool_requests_total', 1, ()),
+    'requests_queued': ('ugc_db_pool_requests_queued_total', 1, ()),
+    'requests_wait_ms': ('ugc_db_pool_wait_seconds_total', 0.001, ()),
+    'connections_num': ('ugc_db_pool_connections_opened_total', 1, ()),
+    'connections_ms': ('ugc_db_pool_connect_seconds_total', 0.001, ()),
+    'requests_errors': ('ugc_db_pool_errors_total', 1, (('kind', 'timeout'),)),
+    'connections_errors': ('ugc_db_pool_errors_total', 1, (('kind', 'connect'),)),
+    'connections_lost': ('ugc_db_pool_errors_total', 1, (('kind', 'lost'),)),
+    'returns_bad': ('ugc_db_pool_errors_total', 1, (('kind', 'bad_return'),)),
+}
+POOL_GAUGES = {
+    'pool_size': ('ugc_db_pool_connections', (('state', 'size'),)),
+    'pool_available': ('ugc_db_pool_connections', (('state', 'available'),)),
+    'pool_min': ('ugc_db_pool_connections', (('state', 'min'),)),
+    'pool_max': ('ugc_db_pool_connections', (('state', 'max'),)),
+    'requests_waiting': ('ugc_db_pool_requests_waiting', ()),
+}
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class Metrics:
+    """
+    Метрики процесу з агрегацією між воркерами через Redis.
+
+    Кожен процес накопичує прирости лічильників у пам'яті і раз на
+    FLUSH_INTERVAL додає їх у спільний Redis hash (HINCRBYFLOAT).
+    Гістограми зберігаються як лічильники _bucket/_sum/_count.
+    Gauge (стан пулу з'єднань) - останнє значення процесу з міткою pid
+    в окремому hash, що зникає разом із процесом (EXPIRE).
+    Без Redis endpoint показує метрики лише поточного процесу, а прирости,
+    накопичені під час збою, дописуються в Redis першим вдалим flush.
+    """
+
+    _lock = threading.Lock()
+    _pending = defaultdict(float)
+    _local_totals = defaultdict(float)
+    _gauges = {}
+    _last_flush = time.monotonic()
+    _exit_registered = False
+
+    @staticmethod
+    def get_config():
+        metrics_settings = getattr(settings, 'METRICS_SETTINGS', {})
+        return {
+            'enabled': metrics_settings.get('ENABLED', True),
+            'token': metrics_settings.get('TOKEN', ''),
+            'flush_interval': metrics_settings.get('FLUSH_INTERVAL', 5),
+            'redis_key': metrics_settings.get('REDIS_KEY', 'ugc:metrics'),
+        }
+
+    # ---- запис ----
+
+    @classmethod
+    def inc(cls, name, labels=(), value=1.0):
+        key = (name, tuple(labels))
+        with cls._lock:
+            cls._pending[key] += value
+
+    @classmethod
+    def observe(cls, name, value, labels=(), buckets=LATENCY_BUCKETS):
+        labels = tuple(labels)
+        with cls._lock:
+            # Порожні бакети теж записуються, щоб серії гістограми були повними
+            for bound in buckets:
+                cls._pending[(f'{name}_bucket', labels + (('le', repr(float(bound))),))] += value <= bound
+            cls._pending[(f'{name}_bucket', labels + (('le', '+Inf'),))] += 1
+            cls._pending[(f'{name}_sum', labels)] += value
+            cls._pending[(f'{name}_count', labels)] += 1
+
+    @classmethod
+    def set_gauge(cls, name, labels, value):
+        with cls._lock:
+            cls._gauges[(name, tuple(labels) + (('pid', os.getpid()),))] = value
+
+    @classmethod
+    def sample_database_pools(cls):
+        """Стан пулів psycopg3 поточного процесу (лише вже створених)"""
+        for connection in connections.all(initialized_only=True):
+            pool = getattr(connection, '_connection_pools', {}).get(connection.alias)
+            if pool is None:
+                continue
+            alias = (('alias', connection.alias),)
+            try:
+                stats = pool.pop_stats()
+            except Exception as e:
+                logger.warning(f"Не вдалося отримати статистику пулу {connection.alias}: {str(e)}")
+                continue
+            for key, (name, labels) in POOL_GAUGES.items():
+                cls.set_gauge(name, alias + labels, stats.get(key, 0))
+            for key, (name, factor, labels) in POOL_COUNTERS.items():
+                if stats.get(key):
+                    cls.inc(name, alias + labels, stats[key] * factor)
+
+    @classmethod
+    def cache_access(cls, family, hit, view=None):
+        """Облік влучань у кеш для сімейства ключів (trans_cache, response_cache, ...)"""
+        labels = (('family', family), ('result', 'hit' if hit else 'miss'))
+        if view:
+            labels += (('view', view),)
+        cls.inc('ugc_cache_requests_total', labels)
+
+    # ---- агрегація ----
+
+    @classmethod
+    def _redis(cls):
+        try:
+            from django_redis import get_redis_connection
+            from .resilient_cache import CircuitBreaker
+
+            if not CircuitBreaker.is_available():
+                # Під час збою Redis не чекаємо таймаутів - метрики процесу
+                return None
+            return get_redis_connection('default')
+        except (ImportError, NotImplementedError):
+            return None
+
+    @classmethod
+    def on_request_started(cls, **kwargs):
+        """request_started: прирости дописуються при завершенні воркера, не management команд"""
+        if cls._exit_registered:
+            return
+        with cls._lock:
+            if cls._exit_registered:
+                return
+            cls._exit_registered = True
+        atexit.register(cls.flush)
+
+    @classmethod
+    def maybe_flush(cls):
+        if time.monotonic() - cls._last_flush >= cls.get_config()['flush_interval']:
+            cls.flush()
+
+    @classmethod
+    def flush(cls):
+        """Переносить накопичені прирости в Redis (або в підсумки процесу до відновлення Redis)"""
+        cls.sample_database_pools()
+        with cls._lock:
+            pending = cls._pending
+            cls._pending = defaultdict(float)
+            cls._last_flush = time.monotonic()
+            gauges = dict(cls._gauges)
+            has_unsent = bool(cls._local_totals)
+        if not pending and not gauges and not has_unsent:
+            return
+
+        redis = cls._redis()
+        if redis is not None:
+            # Прирости, що не потрапили в Redis під час збою, йдуть разом з новими
+            with cls._lock:
+                unsent = cls._local_totals
+                cls._local_totals = defaultdict(float)
+            for key, value in unsent.items():
+                pending[key] += value
+            try:
+                pipe = redis.pipeline(transaction=False)
+                config = cls.get_config()
+                for (name, labels), value in pending.items():
+                    pipe.hincrbyfloat(config['redis_key'], f'{name}{format_labels(labels)}', value)
+                if gauges:
+                    gauges_key = f"{config['redis_key']}:gauges:{os.getpid()}"
+                    pipe.hset(gauges_key, mapping={
+                        f'{name}{format_labels(labels)}': value for (name, labels), value in gauges.items()
+                    })
+                    pipe.expire(gauges_key, int(config['flush_interval'] * 3) + 1)
+                pipe.execute()
+                return
+            except Exception as e:
+                logger.warning(f"Не вдалося записати метрики в Redis: {str(e)}")
+
+        with cls._lock:
+            for key, value in pending.items():
+                cls._local_totals[key] += value
+
+    @classmethod
+    def collect(cls):
+        """{серія: значення} для всіх воркерів (або поточного процесу без Redis)"""
+        cls.flush()
+
+        redis = cls._redis()
+        if redis is not None:
+            try:
+                redis_key = cls.get_config()['redis_key']
+                raw = redis.hgetall(redis_key)
+                for gauges_key in redis.scan_iter(match=f'{redis_key}:gauges:*'):
+                    raw.update(redis.hgetall(gauges_key))
+                return {
+                    series.decode('utf-8'): float(value)
+                    for series, value in raw.items()
+                }
+            except Exception as e:
+                logger.warning(f"Не вдалося прочитати метрики з Redis: {str(e)}")
+
+        with cls._lock:
+            return {
+                f'{name}{format_labels(labels)}': value
+                for (name, labels), value in (*cls._local_totals.items(), *cls._gauges.items())
+            }
+
+    @classmethod
+    def render_prometheus(cls):
+        """Текстовий формат Prometheus 0.0.4"""
+        series = cls.collect()
+        by_family = defaultdict(list)
+        for line, value in series.items():
+            name = line.split('{', 1)[0]
+            family = next(
+                (family for family in METRIC_FAMILIES if name == family or name in (
+                    f'{family}_bucket', f'{family}_sum', f'{family}_count',
+                )),
+                name,
+            )
+            by_family[family].append((line, value))
+
+        output = []
+        for family in sorted(by_family):
+            metric_type, help_text = METRIC_FAMILIES.get(family, ('untyped', ''))
+            output.append(f'# HELP {family} {help_text}')
+            output.append(f'# TYPE {family} {metric_type}')
+            for line, value in sorted(by_family[family], key=lambda item: _series_sort_key(item[0])):
+                output.append(f'{line} {_format_value(value)}')
+        return '\n'.join(output) + '\n'
+
+
+def _series_sort_key(line):
+    """Бакети гістограми у числовому порядку, +Inf останнім"""
+    if 'le="' not in line:
+        return (line, 0.0)
+    head, _, rest = line.partition('le="')
+    bound = rest.split('"', 1)[0]
+    return (head, float('inf') if bound == '+Inf' else float(bound))
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class QueryCounter:
+    """execute_wrapper, що рахує кількість та час SQL запитів"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """
+    Вимірює кожен запит: тривалість, SQL запити та відмови throttle
+    з мітками view/action (для viewset - дія, для інших - HTTP метод)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = Metrics.get_config()['enabled']
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        view, action = self.resolve_labels(request)
+        labels = (('view', view), ('action', action))
+        Metrics.inc('ugc_http_requests_total', labels + (('method', request.method), ('status', response.status_code)))
+        Metrics.observe('ugc_http_request_duration_seconds', duration, labels)
+        Metrics.inc('ugc_db_queries_total', labels, counter.count)
+        Metrics.inc('ugc_db_query_duration_seconds_total', labels, counter.duration)
+        Metrics.observe('ugc_db_queries_per_request', counter.count, labels, buckets=QUERY_COUNT_BUCKETS)
+        if response.status_code == 429:
+            Metrics.inc('ugc_throttled_requests_total', labels)
+
+        Metrics.maybe_flush()
+        return response
+
+    @staticmethod
+    def resolve_labels(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            # Відповідь віддана middleware до маршрутизації (напр. кеш перекладів)
+            try:
+                match = resolve(request.path_info)
+            except Resolver404:
+                return 'unresolved', request.method.lower()
+
+        func = match.func
+        view_class = getattr(func, 'cls', None) or getattr(func, 'view_class', None)
+        view = view_class.__name__ if view_class else match.view_name or func.__name__
+        actions = getattr(func, 'actions', None) or {}
+        return view, actions.get(request.method.lower(), request.method.lower())
+
+
+def metrics_view(request):
+    """Prometheus endpoint /metrics: Bearer токен з METRICS_SETTINGS, без токена - вимкнений"""
+    config = Metrics.get_config()
+    if not config['enabled'] or not config['token']:
+        raise Http404
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {config['token']}"):
+        return HttpResponseForbidden('Forbidden')
+
+    response = HttpResponse(Metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+    response['Cache-Control'] = 'no-store'
+    return response
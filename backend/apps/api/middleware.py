@@ -1,12 +1,16 @@
 # backend/apps/api/middleware.py - ВИПРАВЛЕНИЙ
-from django.utils.cache import add_never_cache_headers
+from django.utils.cache import add_never_cache_headers, patch_vary_headers
 from django.core.cache import cache
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from urllib.parse import urlsplit
 import hashlib
-import json
+import re
 import time
 import logging
+from .cache_policy import SurrogateKeys, TRANSLATIONS_POLICY
+from .json_codec import JSONCodec
+from .metrics import Metrics
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +23,7 @@ class TranslationsCacheMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
         self.rate_limit_window = 60  # 1 хвилина
-        self.max_requests_per_window = 100  # максимум 100 запитів за хвилину (збільшено)
+        self.max_requests_per_window = getattr(settings, 'TRANSLATIONS_RATE_LIMIT', 100)  # запитів за хвилину
 
     def __call__(self, request):
         # Перевіряємо чи це запит до API перекладів
@@ -55,9 +59,10 @@ class TranslationsCacheMiddleware:
         # Перевіряємо кеш тільки для GET запитів
         if request.method == 'GET':
             cached_response = cache.get(cache_key)
+            Metrics.cache_access('trans_cache', bool(cached_response))
             if cached_response:
                 logger.info(f"Cache HIT для: {cache_key[:30]}...")
-                response = JsonResponse(cached_response)
+                response = HttpResponse(JSONCodec.dumps(cached_response), content_type='application/json')
                 response['X-Cache'] = 'HIT'
                 response['X-Cache-Key'] = cache_key[:20] + '...'
                 return response
@@ -71,7 +76,7 @@ class TranslationsCacheMiddleware:
             hasattr(response, 'content')):
             
             try:
-                response_data = json.loads(response.content.decode('utf-8'))
+                response_data = JSONCodec.loads(response.content)
                 
                 # Визначаємо час кешування залежно від типу перекладів
                 if 'dynamic' in request.path:
@@ -86,7 +91,7 @@ class TranslationsCacheMiddleware:
                 response['X-Cache-Timeout'] = str(timeout)
                 logger.info(f"Cache SET для: {cache_key[:30]}... (timeout: {timeout}s)")
                 
-            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            except ValueError as e:
                 logger.warning(f"Не вдалося кешувати відповідь: {str(e)}")
         
         return response
@@ -138,76 +143,141 @@ class TranslationsCacheMiddleware:
         return cache_key
 
 
-class CorsMiddleware:
+class ApiEdgeMiddleware:
     """
-    Спрощений CORS middleware для API перекладів
+    Єдиний edge middleware: CORS (замість corsheaders.CorsMiddleware),
+    безпекові заголовки API та кеш перекладів.
+
+    Маршрути та CORS налаштування компілюються один раз при старті,
+    заголовки зберігаються готовими кортежами. Preflight OPTIONS
+    відповідається одразу, без проходу рештою middleware та view.
+    Кешування перекладів делегується TranslationsCacheMiddleware.
     """
-    
+
+    # Один regex на все: префікс API та (необов'язково) маршрут перекладів
+    ROUTE_RE = re.compile(r'^/api/(?:v1/(?P<translations>translations|dynamic-translations|po-translations)(?:/|$))?')
+
+    SECURITY_HEADERS = (
+        ('X-Content-Type-Options', 'nosniff'),
+        ('X-Frame-Options', 'DENY'),
+        ('X-XSS-Protection', '1; mode=block'),
+    )
+    NO_STORE = 'no-cache, no-store, must-revalidate'
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.translations = TranslationsCacheMiddleware(get_response)
+
+        cors_regex = getattr(settings, 'CORS_URLS_REGEX', r'^.*$')
+        self.cors_paths = None if cors_regex in (r'^.*$', '.*') else re.compile(cors_regex)
+        self.allow_all_origins = getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False)
+        self.allow_credentials = getattr(settings, 'CORS_ALLOW_CREDENTIALS', False)
+        self.allowed_origins = frozenset(
+            self._normalize_origin(origin) for origin in getattr(settings, 'CORS_ALLOWED_ORIGINS', ())
+        )
+        self.origin_regexes = tuple(
+            re.compile(pattern) for pattern in getattr(settings, 'CORS_ALLOWED_ORIGIN_REGEXES', ())
+        )
+
+        origin_headers = []
+        if self.allow_credentials:
+            origin_headers.append(('Access-Control-Allow-Credentials', 'true'))
+        expose_headers = getattr(settings, 'CORS_EXPOSE_HEADERS', ())
+        if expose_headers:
+            origin_headers.append(('Access-Control-Expose-Headers', ', '.join(expose_headers)))
+        self.origin_headers = tuple(origin_headers)
+
+        preflight_headers = [
+            ('Access-Control-Allow-Headers', ', '.join(getattr(settings, 'CORS_ALLOW_HEADERS', ()))),
+            ('Access-Control-Allow-Methods', ', '.join(getattr(settings, 'CORS_ALLOW_METHODS', ()))),
+        ]
+        max_age = getattr(settings, 'CORS_PREFLIGHT_MAX_AGE', 86400)
+        if max_age:
+            preflight_headers.append(('Access-Control-Max-Age', str(max_age)))
+        self.preflight_headers = tuple(preflight_headers)
+
+        self.translations_cache_control = TRANSLATIONS_POLICY.header
+        self.translations_surrogate_key = f'{SurrogateKeys.GLOBAL_KEY} {SurrogateKeys.TRANSLATIONS_KEY}'
 
     def __call__(self, request):
-        # Додаємо CORS заголовки для всіх API запитів
-        if request.path.startswith('/api/'):
-            if request.method == 'OPTIONS':
-                response = JsonResponse({})
-                response['Access-Control-Allow-Origin'] = self._get_allowed_origin(request)
-                response['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-                response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Requested-With'
-                response['Access-Control-Allow-Credentials'] = 'true'
-                response['Access-Control-Max-Age'] = '86400'
-                return response
-        
-        response = self.get_response(request)
-        
-        # Додаємо CORS заголовки до відповіді
-        if request.path.startswith('/api/'):
-            response['Access-Control-Allow-Origin'] = self._get_allowed_origin(request)
-            response['Access-Control-Allow-Credentials'] = 'true'
-        
+        path = request.path_info
+        route = self.ROUTE_RE.match(path)
+        cors_enabled = self.cors_paths is None or self.cors_paths.match(path) is not None
+        origin = request.META.get('HTTP_ORIGIN') if cors_enabled else None
+
+        # Preflight - відповідаємо одразу
+        if cors_enabled and request.method == 'OPTIONS' and 'HTTP_ACCESS_CONTROL_REQUEST_METHOD' in request.META:
+            response = HttpResponse(headers={'Content-Length': '0'})
+            self._add_cors_headers(response, origin, preflight=True)
+            return response
+
+        if route is not None and route.group('translations') and not self._needs_ssl_redirect(request):
+            response = self.translations._process_translations_request(request)
+        else:
+            response = self.get_response(request)
+
+        if route is not None:
+            self._add_api_headers(request, response, route)
+        if cors_enabled:
+            self._add_cors_headers(response, origin, preflight=request.method == 'OPTIONS')
         return response
-    
-    def _get_allowed_origin(self, request):
-        """Визначає дозволений origin"""
-        origin = request.META.get('HTTP_ORIGIN', '')
-        
-        allowed_origins = getattr(settings, 'CORS_ALLOWED_ORIGINS', [
-            'http://localhost:3000',
-            'http://127.0.0.1:3000'
-        ])
-        
-        if origin in allowed_origins:
-            return origin
-        
-        # В режимі DEBUG дозволяємо localhost
-        if settings.DEBUG and ('localhost' in origin or '127.0.0.1' in origin):
-            return origin
-            
-        # За замовчуванням
-        return allowed_origins[0] if allowed_origins else '*'
 
+    @staticmethod
+    def _needs_ssl_redirect(request):
+        # Кеш перекладів не повинен обходити редирект SecurityMiddleware на HTTPS
+        return getattr(settings, 'SECURE_SSL_REDIRECT', False) and not request.is_secure()
 
-class SecurityHeadersMiddleware:
-    """
-    Додає безпекові заголовки для API
-    """
-    
-    def __init__(self, get_response):
-        self.get_response = get_response
+    def _add_api_headers(self, request, response, route):
+        headers = response.headers
+        for name, value in self.SECURITY_HEADERS:
+            headers[name] = value
 
-    def __call__(self, request):
-        response = self.get_response(request)
-        
-        # Додаємо безпекові заголовки тільки для API
-        if request.path.startswith('/api/'):
-            response['X-Content-Type-Options'] = 'nosniff'
-            response['X-Frame-Options'] = 'DENY'
-            response['X-XSS-Protection'] = '1; mode=block'
-            
-            # Для перекладів додаємо кешування
-            if 'translations' in request.path:
-                response['Cache-Control'] = 'public, max-age=1800'  # 30 хвилин
-            else:
-                response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        
-        return response
\ No newline at end of file
+        # Політику з реєстру (CachePolicyMixin) не перезаписуємо
+        if getattr(response, 'cache_policy', None) is not None:
+            return
+        if route.group('translations') and request.method in ('GET', 'HEAD') and response.status_code == 200:
+            # Відповіді з кешу перекладів не проходять через view
+            headers['Cache-Control'] = self.translations_cache_control
+            if 'Surrogate-Key' not in headers:
+                headers['Surrogate-Key'] = self.translations_surrogate_key
+        else:
+            headers['Cache-Control'] = self.NO_STORE
+
+    def _add_cors_headers(self, response, origin, preflight=False):
+        headers = response.headers
+        vary = headers.get('Vary')
+        if not vary:
+            headers['Vary'] = 'origin'
+        elif 'origin' not in vary.lower():
+            patch_vary_headers(response, ('origin',))
+
+        if not origin or not self._origin_allowed(origin):
+            return
+
+        if self.allow_all_origins and not self.allow_credentials:
+            headers['Access-Control-Allow-Origin'] = '*'
+        else:
+            headers['Access-Control-Allow-Origin'] = origin
+        for name, value in self.origin_headers:
+            headers[name] = value
+        if preflight:
+            for name, value in self.preflight_headers:
+                headers[name] = value
+
+    def _origin_allowed(self, origin):
+        if self.allow_all_origins or origin in self.allowed_origins:
+            return True
+        if origin != 'null' and self._normalize_origin(origin) in self.allowed_origins:
+            return True
+        return any(regex.match(origin) for regex in self.origin_regexes)
+
+    @staticmethod
+    def _normalize_origin(origin):
+        """scheme://netloc без шляху, як порівнює corsheaders"""
+        if origin == 'null':
+            return origin
+        try:
+            parts = urlsplit(origin)
+        except ValueError:
+            return origin
+        return f'{parts.scheme}://{parts.netloc}'
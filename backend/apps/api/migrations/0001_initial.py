@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата створення')),
+                ('method', models.CharField(max_length=10, verbose_name='Метод')),
+                ('path', models.CharField(db_index=True, max_length=500, verbose_name='Шлях')),
+                ('query_string', models.CharField(blank=True, max_length=1000, verbose_name='Параметри запиту')),
+                ('view_name', models.CharField(blank=True, max_length=200, verbose_name='View')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='Статус')),
+                ('trigger', models.CharField(choices=[('sample', 'Вибірка'), ('header', 'Підписаний заголовок')], max_length=20, verbose_name='Причина')),
+                ('backend', models.CharField(max_length=20, verbose_name='Профайлер')),
+                ('duration_ms', models.FloatField(verbose_name='Тривалість, мс')),
+                ('cpu_ms', models.FloatField(default=0, verbose_name='CPU, мс')),
+                ('query_count', models.PositiveIntegerField(default=0, verbose_name='SQL запитів')),
+                ('query_time_ms', models.FloatField(default=0, verbose_name='Час SQL, мс')),
+                ('sample_count', models.PositiveIntegerField(default=0, verbose_name='Обсяг профілю')),
+                ('sample_unit', models.CharField(default='samples', max_length=20, verbose_name='Одиниця')),
+                ('collapsed_stacks', models.TextField(blank=True, verbose_name='Collapsed stacks')),
+                ('flamegraph_svg', models.TextField(blank=True, verbose_name='Flamegraph (SVG)')),
+            ],
+            options={
+                'verbose_name': 'Профіль запиту',
+                'verbose_name_plural': 'Профілі запитів',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
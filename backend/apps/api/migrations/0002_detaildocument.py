@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DetailDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100, verbose_name='Модель')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name="ID об'єкта")),
+                ('locale', models.CharField(max_length=10, verbose_name='Мова')),
+                ('base_url', models.CharField(max_length=200, verbose_name='Базовий URL')),
+                ('version', models.CharField(max_length=32, verbose_name='Версія серіалізатора')),
+                ('body', models.TextField(verbose_name='JSON')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Оновлено')),
+            ],
+            options={
+                'verbose_name': 'Документ деталей',
+                'verbose_name_plural': 'Документи деталей',
+                'constraints': [models.UniqueConstraint(fields=('model_label', 'object_id', 'locale', 'base_url'), name='api_detaildocument_key')],
+            },
+        ),
+    ]
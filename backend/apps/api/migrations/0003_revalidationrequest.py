@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_detaildocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevalidationRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500, verbose_name='Шлях')),
+                ('locale', models.CharField(max_length=10, verbose_name='Мова')),
+                ('status', models.CharField(choices=[('pending', 'Очікує'), ('failed', 'Помилка')], default='pending', max_length=10, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Спроб')),
+                ('available_at', models.DateTimeField(verbose_name='Наступна спроба')),
+                ('last_error', models.TextField(blank=True, verbose_name='Остання помилка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата створення')),
+            ],
+            options={
+                'verbose_name': 'Запит ревалідації',
+                'verbose_name_plural': 'Запити ревалідації',
+                'ordering': ['available_at', 'id'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='api_revalidation_due')],
+                'constraints': [models.UniqueConstraint(fields=('path', 'locale'), name='api_revalidationrequest_page')],
+            },
+        ),
+    ]
@@ -0,0 +1,111 @@
+# backend/apps/api/mock_cdn.py
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.utils import timezone
+import json
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MockCDNHandler(BaseHTTPRequestHandler):
+    """
+    Локальний CDN для перевірки очищення кешу та ревалідації сторінок.
+    Записує всі POST запити (Surrogate-Key, тіло) і віддає їх на GET /_requests,
+    DELETE /_requests очищує журнал.
+    """
+
+    server_version = 'MockCDN/1.0'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw_body or b'null')
+        except ValueError:
+            body = raw_body.decode('utf-8', errors='replace')
+
+        record = {
+            'received_at': timezone.now().isoformat(),
+            'path': self.path,
+            'surrogate_keys': (self.headers.get('Surrogate-Key') or '').split(),
+            'authorization': bool(self.headers.get('Authorization')),
+            'body': body,
+        }
+        if self.server.take_failure():
+            record['status'] = 503
+            self.server.record(record)
+            self._send_json(503, {'error': 'unavailable'})
+            return
+        self.server.record(record)
+        self._send_json(200, {'status': 'ok', 'id': len(self.server.requests)})
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/_requests':
+            self._send_json(200, self.server.requests)
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_DELETE(self):
+        if self.path.rstrip('/') == '/_requests':
+            self.server.clear()
+            self._send_json(200, {'status': 'cleared'})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def _send_json(self, status, payload):
+        content = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logger.debug(f"MockCDN: {format % args}")
+
+
+class MockCDNServer(ThreadingHTTPServer):
+    """HTTP сервер mock CDN з журналом запитів у пам'яті та JSONL файлі"""
+
+    daemon_threads = True
+
+    def __init__(self, address, log_file=None, on_request=None):
+        super().__init__(address, MockCDNHandler)
+        self.requests = []
+        self.log_file = log_file
+        self.on_request = on_request
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def record(self, record):
+        with self._lock:
+            self.requests.append(record)
+            if self.log_file:
+                with open(self.log_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        if self.on_request:
+            self.on_request(record)
+
+    def fail_next(self, count=1):
+        """Наступні `count` POST запитів отримають 503 (перевірка повторних спроб)"""
+        with self._lock:
+            self.failures = count
+
+    def take_failure(self):
+        with self._lock:
+            if self.failures > 0:
+                self.failures -= 1
+                return True
+            return False
+
+    def clear(self):
+        with self._lock:
+            self.requests = []
+
+    def start_in_background(self):
+        """Запускає сервер у фоновому потоці (для тестів); повертає URL"""
+        thread = threading.Thread(target=self.serve_forever, name='mock-cdn', daemon=True)
+        thread.start()
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/'
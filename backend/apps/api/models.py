@@ -1,3 +1,109 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class RequestProfile(models.Model):
+    """Профіль API запиту, знятий ProfilingMiddleware"""
+    TRIGGERS = [
+        ('sample', _('Вибірка')),
+        ('header', _('Підписаний заголовок')),
+    ]
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name=_("Дата створення"))
+    method = models.CharField(max_length=10, verbose_name=_("Метод"))
+    path = models.CharField(max_length=500, db_index=True, verbose_name=_("Шлях"))
+    query_string = models.CharField(max_length=1000, blank=True, verbose_name=_("Параметри запиту"))
+    view_name = models.CharField(max_length=200, blank=True, verbose_name=_("View"))
+    status_code = models.PositiveSmallIntegerField(verbose_name=_("Статус"))
+
+    trigger = models.CharField(max_length=20, choices=TRIGGERS, verbose_name=_("Причина"))
+    backend = models.CharField(max_length=20, verbose_name=_("Профайлер"))
+
+    duration_ms = models.FloatField(verbose_name=_("Тривалість, мс"))
+    cpu_ms = models.FloatField(default=0, verbose_name=_("CPU, мс"))
+    query_count = models.PositiveIntegerField(default=0, verbose_name=_("SQL запитів"))
+    query_time_ms = models.FloatField(default=0, verbose_name=_("Час SQL, мс"))
+
+    sample_count = models.PositiveIntegerField(default=0, verbose_name=_("Обсяг профілю"))
+    sample_unit = models.CharField(max_length=20, default='samples', verbose_name=_("Одиниця"))
+    collapsed_stacks = models.TextField(blank=True, verbose_name=_("Collapsed stacks"))
+    flamegraph_svg = models.TextField(blank=True, verbose_name=_("Flamegraph (SVG)"))
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = _("Профіль запиту")
+        verbose_name_plural = _("Профілі запитів")
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} мс)"
+
+    @classmethod
+    def prune(cls, keep):
+        """Залишає лише `keep` найновіших профілів"""
+        stale = cls.objects.order_by('-created_at').values_list('pk', flat=True)[keep:keep + 1000]
+        stale_ids = list(stale)
+        if stale_ids:
+            cls.objects.filter(pk__in=stale_ids).delete()
+
+
+class DetailDocument(models.Model):
+    """
+    Готовий JSON детальної відповіді API для (об'єкт, мова, базовий URL).
+    Перебудовується сигналами, див. apps/api/documents.py
+    """
+    model_label = models.CharField(max_length=100, verbose_name=_("Модель"))
+    object_id = models.PositiveBigIntegerField(verbose_name=_("ID об'єкта"))
+    locale = models.CharField(max_length=10, verbose_name=_("Мова"))
+    # Медіа посилання абсолютні, тому документ залежить від хоста запиту
+    base_url = models.CharField(max_length=200, verbose_name=_("Базовий URL"))
+    version = models.CharField(max_length=32, verbose_name=_("Версія серіалізатора"))
+    body = models.TextField(verbose_name=_("JSON"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Оновлено"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['model_label', 'object_id', 'locale', 'base_url'],
+                name='api_detaildocument_key',
+            ),
+        ]
+        verbose_name = _("Документ деталей")
+        verbose_name_plural = _("Документи деталей")
+
+    def __str__(self):
+        return f"{self.model_label}:{self.object_id} [{self.locale}] {self.base_url}"
+
+
+class RevalidationRequest(models.Model):
+    """
+    Сторінка фронтенду, яку треба перегенерувати (outbox).
+    Записується сигналами в транзакції зміни контенту, відправляється
+    пакетами після коміту, див. apps/api/revalidation.py
+    """
+    STATUSES = [
+        ('pending', _('Очікує')),
+        ('failed', _('Помилка')),
+    ]
+
+    path = models.CharField(max_length=500, verbose_name=_("Шлях"))
+    locale = models.CharField(max_length=10, verbose_name=_("Мова"))
+    status = models.CharField(max_length=10, choices=STATUSES, default='pending', verbose_name=_("Статус"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Спроб"))
+    available_at = models.DateTimeField(verbose_name=_("Наступна спроба"))
+    last_error = models.TextField(blank=True, verbose_name=_("Остання помилка"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Дата створення"))
+
+    class Meta:
+        ordering = ['available_at', 'id']
+        verbose_name = _("Запит ревалідації")
+        verbose_name_plural = _("Запити ревалідації")
+        constraints = [
+            # Одна сторінка - один запис: повторні зміни до відправки не дублюють запити
+            models.UniqueConstraint(fields=['path', 'locale'], name='api_revalidationrequest_page'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='api_revalidation_due'),
+        ]
+
+    def __str__(self):
+        return f"{self.path} ({self.locale})"
@@ -0,0 +1,451 @@
+# backend/apps/api/profiling.py
+from django.conf import settings
+from django.db import connections
+from django.utils.crypto import constant_time_compare, salted_hmac
+from collections import Counter
+from contextlib import ExitStack
+from html import escape
+import cProfile
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import zlib
+import logging
+from .metrics import MetricsMiddleware, QueryCounter
+
+logger = logging.getLogger(__name__)
+
+
+def get_profiling_config():
+    profiling_settings = getattr(settings, 'PROFILING_SETTINGS', {})
+    return {
+        'enabled': profiling_settings.get('ENABLED', False),
+        'sample_rate': profiling_settings.get('SAMPLE_RATE', 0.0),
+        'backend': profiling_settings.get('BACKEND', 'sampling'),
+        'interval': profiling_settings.get('INTERVAL', 0.002),
+        'header': profiling_settings.get('HEADER', 'X-Profile'),
+        'signature_max_age': profiling_settings.get('SIGNATURE_MAX_AGE', 60 * 60),
+        'path_prefixes': tuple(profiling_settings.get('PATH_PREFIXES', ('/api/',))),
+        'min_duration_ms': profiling_settings.get('MIN_DURATION_MS', 0),
+        'max_profiles': profiling_settings.get('MAX_PROFILES', 500),
+    }
+
+
+def short_path(filename):
+    """Шлях файлу відносно проєкту або site-packages"""
+    base_dir = str(settings.BASE_DIR)
+    if filename.startswith(base_dir):
+        return os.path.relpath(filename, base_dir)
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.sep.join(filename.split(os.sep)[-2:])
+
+
+def frame_label(code):
+    return f'{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})'
+
+
+# ---- підпис заголовка ----
+
+class ProfileSignature:
+    """
+    Підписаний заголовок для примусового профілювання запиту:
+    `<timestamp>:<hmac(timestamp:path)>`, дійсний SIGNATURE_MAX_AGE секунд
+    """
+
+    SALT = 'apps.api.profiling'
+
+    @classmethod
+    def sign(cls, path, timestamp=None):
+        timestamp = int(timestamp if timestamp is not None else time.time())
+        digest = salted_hmac(cls.SALT, f'{timestamp}:{path}', algorithm='sha256').hexdigest()
+        return f'{timestamp}:{digest}'
+
+    @classmethod
+    def verify(cls, value, path):
+        timestamp, _, digest = (value or '').partition(':')
+        if not timestamp.isdigit() or not digest:
+            return False
+        if abs(time.time() - int(timestamp)) > get_profiling_config()['signature_max_age']:
+            return False
+        return constant_time_compare(cls.sign(path, timestamp), value)
+
+
+# ---- профайлери ----
+
+class StackSampler:
+    """
+    Семплюючий профайлер на stdlib: фоновий потік через sys._current_frames()
+    знімає стек потоку запиту кожні `interval` секунд (фактично не частіше
+    за sys.getswitchinterval(), бо семплеру потрібен GIL).
+    Результат - {стек 'a;b;c': кількість семплів}.
+    """
+
+    name = 'sampling'
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = None
+        self._root_depth = 0
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        # Кадри вище middleware (WSGI сервер) у стеки не потрапляють
+        frame, depth = sys._getframe(1), 0
+        while frame is not None:
+            depth += 1
+            frame = frame.f_back
+        self._root_depth = depth
+        self._sampler = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            stack = stack[self._root_depth:]
+            if stack:
+                self.stacks[';'.join(stack)] += 1
+
+    def collapsed(self):
+        return dict(self.stacks)
+
+
+class CProfileProfiler:
+    """
+    Детермінований профайлер cProfile. pstats зберігає лише граф викликів,
+    тому стеки відновлюються наближено: час розподіляється між шляхами
+    пропорційно кумулятивному часу на ребрах caller → callee.
+    Одиниця - мікросекунди.
+    """
+
+    name = 'cprofile'
+    MAX_DEPTH = 64
+    # Гілки легші за цю частку загального часу відкидаються, інакше
+    # кількість шляхів у графі викликів росте експоненційно
+    MIN_SHARE = 0.001
+
+    def __init__(self, interval=None):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def collapsed(self):
+        stats = pstats.Stats(self.profile).stats
+        labels = {func: self.label(func) for func in stats}
+        children = {}
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, (_, _, _, edge_cumulative) in callers.items():
+                children.setdefault(caller, []).append((func, edge_cumulative))
+
+        stacks = Counter()
+        # Запит починається з profiled_request; ланцюжок middleware рекурсивний,
+        # тому шукати корені лише серед функцій без викликачів недостатньо
+        roots = [(func, stats[func][3]) for func in stats if func == PROFILE_ROOT] or [
+            (func, cumulative)
+            for func, (_, _, _, cumulative, callers) in stats.items()
+            if not callers
+        ]
+        threshold = sum(cumulative for _, cumulative in roots) * self.MIN_SHARE
+
+        def walk(func, path, weight):
+            _, _, own_time, cumulative, _ = stats[func]
+            path = path + [labels[func]]
+            edges = children.get(func, ())
+            edges_total = sum(edge_cumulative for _, edge_cumulative in edges)
+
+            # Час гілки зберігається: власна частка + решта між дочірніми
+            # пропорційно ребрам (так рекурсія не роздуває загальну суму);
+            # надто легкі гілки та все глибше MAX_DEPTH лишаються у батька
+            own = min(weight, own_time * weight / cumulative) if cumulative else weight
+            branches = []
+            if len(path) < self.MAX_DEPTH and edges_total:
+                for child, edge_cumulative in edges:
+                    child_weight = (weight - own) * edge_cumulative / edges_total
+                    if child_weight >= threshold:
+                        branches.append((child, child_weight))
+            own = weight - sum(child_weight for _, child_weight in branches)
+
+            own_us = int(own * 1_000_000)
+            if own_us > 0:
+                stacks[';'.join(path)] += own_us
+            for child, child_weight in branches:
+                walk(child, path, child_weight)
+
+        for func, cumulative in roots:
+            walk(func, [], cumulative)
+        return dict(stacks)
+
+    @staticmethod
+    def label(func):
+        filename, line, name = func
+        if filename == '~':
+            return name
+        return f'{name} ({short_path(filename)}:{line})'
+
+
+class PyinstrumentProfiler:
+    """Обгортка pyinstrument (якщо встановлено); одиниця - мікросекунди"""
+
+    name = 'pyinstrument'
+
+    def __init__(self, interval):
+        from pyinstrument import Profiler
+        self.profiler = Profiler(interval=interval)
+
+    def start(self):
+        self.profiler.start()
+
+    def stop(self):
+        self.profiler.stop()
+
+    def collapsed(self):
+        stacks = Counter()
+        session = self.profiler.last_session
+        root = session.root_frame() if session else None
+
+        def walk(frame, path):
+            label = f'{frame.function} ({short_path(frame.file_path or "")}:{frame.line_no})'
+            path = path + [label]
+            self_us = int(frame.total_self_time * 1_000_000)
+            if self_us:
+                stacks[';'.join(path)] += self_us
+            for child in frame.children:
+                walk(child, path)
+
+        if root is not None:
+            walk(root, [])
+        return dict(stacks)
+
+
+PROFILERS = {
+    StackSampler.name: StackSampler,
+    CProfileProfiler.name: CProfileProfiler,
+    PyinstrumentProfiler.name: PyinstrumentProfiler,
+}
+
+
+def create_profiler(backend, interval):
+    """Профайлер за назвою; без pyinstrument або _current_frames - cProfile"""
+    profiler_class = PROFILERS.get(backend, CProfileProfiler)
+    if profiler_class is StackSampler and not hasattr(sys, '_current_frames'):
+        profiler_class = CProfileProfiler
+    try:
+        return profiler_class(interval)
+    except ImportError:
+        logger.warning(f"Профайлер {backend} недоступний, використовується cProfile")
+        return CProfileProfiler(interval)
+
+
+# ---- формати ----
+
+def render_collapsed(stacks):
+    """Формат collapsed stacks (flamegraph.pl, speedscope, inferno)"""
+    return '\n'.join(f'{stack} {int(count)}' for stack, count in sorted(stacks.items())) + '\n'
+
+
+class FlameGraph:
+    """Статичний SVG flamegraph з collapsed stacks (підказки через <title>)"""
+
+    WIDTH = 1200
+    ROW_HEIGHT = 16
+    FONT_SIZE = 11
+    MIN_WIDTH = 0.5
+    CHAR_WIDTH = 6.5
+
+    def __init__(self, stacks, title='', unit='samples'):
+        self.stacks = stacks
+        self.title = title
+        self.unit = unit
+
+    def build_tree(self):
+        root = {'name': 'all', 'value': 0, 'children': {}}
+        for stack, count in self.stacks.items():
+            root['value'] += count
+            node = root
+            for name in stack.split(';'):
+                node = node['children'].setdefault(name, {'name': name, 'value': 0, 'children': {}})
+                node['value'] += count
+        return root
+
+    def render(self):
+        root = self.build_tree()
+        total = root['value'] or 1
+        rects = []
+        max_depth = 0
+
+        def place(node, x, depth):
+            nonlocal max_depth
+            width = node['value'] / total * self.WIDTH
+            if width < self.MIN_WIDTH:
+                return
+            max_depth = max(max_depth, depth)
+            rects.append((node, x, depth, width))
+            offset = x
+            for child in sorted(node['children'].values(), key=lambda child: child['name']):
+                place(child, offset, depth + 1)
+                offset += child['value'] / total * self.WIDTH
+
+        place(root, 0.0, 0)
+
+        top = 30
+        height = top + (max_depth + 1) * self.ROW_HEIGHT + 10
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.WIDTH}" height="{height}" '
+            f'viewBox="0 0 {self.WIDTH} {height}" font-family="Verdana, sans-serif" font-size="{self.FONT_SIZE}">',
+            '<rect width="100%" height="100%" fill="#fdfdf6"/>',
+            f'<text x="{self.WIDTH / 2}" y="18" text-anchor="middle" font-size="14">{escape(self.title)}</text>',
+        ]
+        for node, x, depth, width in rects:
+            # Корінь знизу, листя вгорі
+            y = height - 10 - (depth + 1) * self.ROW_HEIGHT
+            share = node['value'] / total * 100
+            tooltip = escape(f"{node['name']} — {node['value']} {self.unit} ({share:.2f}%)")
+            parts.append(
+                f'<g><title>{tooltip}</title>'
+                f'<rect x="{x:.2f}" y="{y}" width="{width:.2f}" height="{self.ROW_HEIGHT - 1}" '
+                f'rx="2" fill="{self.color(node["name"])}"/>'
+            )
+            max_chars = int((width - 6) / self.CHAR_WIDTH)
+            if max_chars >= 3:
+                label = node['name'] if len(node['name']) <= max_chars else node['name'][:max_chars - 2] + '..'
+                parts.append(f'<text x="{x + 3:.2f}" y="{y + self.ROW_HEIGHT - 4}">{escape(label)}</text>')
+            parts.append('</g>')
+        parts.append('</svg>')
+        return '\n'.join(parts)
+
+    @staticmethod
+    def color(name):
+        """Стабільний «теплий» колір для функції"""
+        seed = zlib.crc32(name.encode('utf-8'))
+        red = 205 + seed % 50
+        green = 80 + (seed >> 8) % 130
+        blue = 40 + (seed >> 16) % 50
+        return f'rgb({red},{green},{blue})'
+
+
+# ---- middleware ----
+
+def profiled_request(get_response, request):
+    """Корінь профілю: усе, що викликано звідси, належить запиту"""
+    return get_response(request)
+
+
+PROFILE_ROOT = (
+    profiled_request.__code__.co_filename,
+    profiled_request.__code__.co_firstlineno,
+    profiled_request.__code__.co_name,
+)
+
+class ProfilingMiddleware:
+    """
+    Профілювання вибраних API запитів (вимкнене за замовчуванням).
+
+    Профілюється частка SAMPLE_RATE запитів під PATH_PREFIXES та кожен запит
+    з валідним підписаним заголовком (див. `manage.py profile_header`).
+    Зберігаються collapsed stacks, SVG flamegraph, тривалість та кількість
+    SQL запитів; переглядати - в адмінці «Профілі запитів».
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_profiling_config()
+        self.header_meta = 'HTTP_' + self.config['header'].upper().replace('-', '_')
+
+    def __call__(self, request):
+        if not self.config['enabled']:
+            return self.get_response(request)
+
+        trigger = self.get_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        profiler = create_profiler(self.config['backend'], self.config['interval'])
+        counter = QueryCounter()
+
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            try:
+                profiler.start()
+            except ValueError as e:
+                # cProfile/pyinstrument вже активні в цьому процесі (паралельний запит)
+                logger.warning(f"Профілювання запиту пропущено: {str(e)}")
+                return self.get_response(request)
+            try:
+                response = profiled_request(self.get_response, request)
+            finally:
+                profiler.stop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        cpu_ms = (time.process_time() - cpu_started) * 1000
+
+        if trigger == 'header' or duration_ms >= self.config['min_duration_ms']:
+            profile = self.store(request, response, profiler, trigger, duration_ms, cpu_ms, counter)
+            if profile is not None and trigger == 'header':
+                response['X-Profile-Id'] = str(profile.pk)
+        return response
+
+    def get_trigger(self, request):
+        if not request.path_info.startswith(self.config['path_prefixes']):
+            return None
+        signature = request.META.get(self.header_meta)
+        if signature and ProfileSignature.verify(signature, request.path_info):
+            return 'header'
+        if self.config['sample_rate'] and random.random() < self.config['sample_rate']:
+            return 'sample'
+        return None
+
+    def store(self, request, response, profiler, trigger, duration_ms, cpu_ms, counter):
+        from .models import RequestProfile
+
+        try:
+            stacks = profiler.collapsed()
+            unit = 'samples' if profiler.name == StackSampler.name else 'µs'
+            view, action = MetricsMiddleware.resolve_labels(request)
+            title = f'{request.method} {request.get_full_path()} — {duration_ms:.1f} ms'
+            profile = RequestProfile.objects.create(
+                method=request.method,
+                path=request.path_info[:500],
+                query_string=request.META.get('QUERY_STRING', '')[:1000],
+                view_name=f'{view}.{action}'[:200],
+                status_code=response.status_code,
+                trigger=trigger,
+                backend=profiler.name,
+                duration_ms=duration_ms,
+                cpu_ms=cpu_ms,
+                query_count=counter.count,
+                query_time_ms=counter.duration * 1000,
+                sample_count=int(sum(stacks.values())),
+                sample_unit=unit,
+                collapsed_stacks=render_collapsed(stacks),
+                flamegraph_svg=FlameGraph(stacks, title=title, unit=unit).render(),
+            )
+            RequestProfile.prune(self.config['max_profiles'])
+            logger.info(f"Збережено профіль запиту {profile.pk}: {title}")
+            return profile
+        except Exception as e:
+            logger.error(f"Не вдалося зберегти профіль запиту: {str(e)}")
+            return None
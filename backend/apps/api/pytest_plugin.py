@@ -0,0 +1,41 @@
+# backend/apps/api/pytest_plugin.py
+"""
+pytest плагін бюджетів SQL запитів (потрібен pytest-django для доступу до БД):
+
+    pytest -p apps.api.pytest_plugin
+
+    @pytest.mark.query_budget(max_queries=3, max_ms=200)
+    def test_projects_list(client):
+        client.get('/api/v1/projects/')
+
+    def test_services(client, query_budget):
+        with query_budget(max_queries=2):
+            client.get('/api/v1/services/')
+"""
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'query_budget(max_queries, max_ms=None, using="default"): '
+        'максимум SQL запитів (і мілісекунд) на весь тест',
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker('query_budget')
+    if marker is None:
+        return (yield)
+
+    from .query_budget import assert_query_budget
+    with assert_query_budget(*marker.args, label=item.nodeid, **marker.kwargs):
+        return (yield)
+
+
+@pytest.fixture
+def query_budget():
+    """Контекстний менеджер assert_query_budget для частини тесту"""
+    from .query_budget import assert_query_budget
+    return assert_query_budget
@@ -0,0 +1,208 @@
+# backend/apps/api/query_budget.py
+"""
+Бюджети SQL запитів для API ендпоінтів:
+
+    with assert_query_budget(max_queries=3, max_ms=200, label='GET /api/v1/projects/'):
+        client.get('/api/v1/projects/')
+
+Перевищення піднімає QueryBudgetExceeded зі звітом, де запити згруповані
+за місцем виклику - видно, який серіалізатор чи view робить запит на кожен рядок.
+Бюджети ендпоінтів оголошуються через QueryBudget і перевіряються run_query_budget
+(apps/api/tests.py), для pytest є маркер у apps.api.pytest_plugin.
+"""
+from contextlib import contextmanager, nullcontext
+from unittest import mock
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+import json
+import os
+import sys
+import time
+import django
+from .metrics import QueryCounter
+
+DJANGO_DIR = os.path.dirname(django.__file__) + os.sep
+# Кадри самого вимірювання та обгорток метрик не є місцем виклику
+SKIPPED_FILES = {
+    os.path.normcase(os.path.abspath(__file__)),
+    os.path.normcase(os.path.abspath(sys.modules[QueryCounter.__module__].__file__)),
+}
+CALL_SITE_DEPTH = 3
+REPORT_SQL_LENGTH = 300
+
+
+def short_path(filename):
+    """Шлях файлу відносно проєкту або site-packages"""
+    base_dir = str(settings.BASE_DIR) + os.sep
+    if filename.startswith(base_dir):
+        return filename[len(base_dir):]
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return filename
+
+
+def call_site(frame, depth=CALL_SITE_DEPTH):
+    """
+    Місце виклику запиту: перший кадр поза Django ORM (серіалізатор, пагінатор DRF...)
+    та найближчі кадри коду проєкту (apps/) над ним
+    """
+    apps_dir = os.path.join(str(settings.BASE_DIR), 'apps') + os.sep
+    labels = []
+    while frame is not None and len(labels) < depth:
+        filename = frame.f_code.co_filename
+        if not filename.startswith(DJANGO_DIR) and os.path.normcase(filename) not in SKIPPED_FILES:
+            if not labels or filename.startswith(apps_dir):
+                labels.append(f'{short_path(filename)}:{frame.f_lineno} {frame.f_code.co_name}')
+        frame = frame.f_back
+    return tuple(labels) or ('<django>',)
+
+
+class CapturedQuery:
+    """Один виконаний SQL запит"""
+
+    __slots__ = ('sql', 'duration', 'call_site')
+
+    def __init__(self, sql, duration, call_site):
+        self.sql = sql
+        self.duration = duration
+        self.call_site = call_site
+
+
+class QueryRecorder(QueryCounter):
+    """execute_wrapper, що крім кількості та часу запам'ятовує SQL і місце виклику"""
+
+    def __init__(self):
+        super().__init__()
+        self.queries = []
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            self.queries.append(CapturedQuery(sql, duration, call_site(sys._getframe(1))))
+
+    def grouped(self):
+        """[(місце виклику, [запити])] - найчастіші першими"""
+        groups = {}
+        for query in self.queries:
+            groups.setdefault(query.call_site, []).append(query)
+        return sorted(groups.items(), key=lambda item: -len(item[1]))
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Ендпоінт виконав більше SQL запитів або працював довше за бюджет"""
+
+    def __init__(self, label, recorder, max_queries, max_ms=None):
+        self.recorder = recorder
+        self.max_queries = max_queries
+        self.max_ms = max_ms
+        super().__init__(format_report(label, recorder, max_queries, max_ms))
+
+
+def format_report(label, recorder, max_queries, max_ms=None):
+    limits = f'ліміт {max_queries}' + (f', {max_ms} ms' if max_ms is not None else '')
+    lines = [
+        f'Бюджет запитів перевищено: {label or "блок"} - '
+        f'{recorder.count} SQL ({limits}), {recorder.elapsed * 1000:.1f} ms, '
+        f'з них у БД {recorder.duration * 1000:.1f} ms',
+    ]
+    for site, queries in recorder.grouped():
+        lines.append(f'\n  {len(queries)}× {site[0]}')
+        lines.extend(f'       ← {frame}' for frame in site[1:])
+
+        statements = {}
+        for query in queries:
+            statements.setdefault(query.sql, []).append(query.duration)
+        for sql, durations in sorted(statements.items(), key=lambda item: -len(item[1])):
+            text = sql if len(sql) <= REPORT_SQL_LENGTH else f'{sql[:REPORT_SQL_LENGTH]}…'
+            lines.append(f'       [{len(durations)}×, {sum(durations) * 1000:.1f} ms] {text}')
+    return '\n'.join(lines)
+
+
+@contextmanager
+def assert_query_budget(max_queries, max_ms=None, using='default', label=''):
+    """
+    Перевіряє кількість SQL запитів (і, якщо задано, тривалість у ms) блоку.
+    Якщо блок сам завершився помилкою, бюджет не перевіряється.
+    """
+    recorder = QueryRecorder()
+    started = time.perf_counter()
+    with connections[using].execute_wrapper(recorder):
+        yield recorder
+    recorder.elapsed = time.perf_counter() - started
+
+    if recorder.count > max_queries or (max_ms is not None and recorder.elapsed * 1000 > max_ms):
+        raise QueryBudgetExceeded(label, recorder, max_queries, max_ms)
+
+
+class QueryBudget:
+    """
+    Бюджет одного ендпоінту: шлях (може містити {pk}), параметри (dict або фабрика),
+    розмір сторінки та максимум SQL запитів / мілісекунд на холодний запит (кеш очищено)
+    """
+
+    def __init__(self, name, path, max_queries, max_ms=None, page_size=None, params=None,
+                 method='get', data=None, status=200, locale=None, login=False):
+        self.name = name
+        self.path = path
+        self.max_queries = max_queries
+        self.max_ms = max_ms
+        self.page_size = page_size
+        self.params = params or {}
+        self.method = method
+        self.data = data
+        self.status = status
+        self.locale = locale
+        self.login = login
+
+    def __repr__(self):
+        return f'<QueryBudget {self}>'
+
+    def __str__(self):
+        return self.name if self.page_size is None else f'{self.name}[page_size={self.page_size}]'
+
+    def url(self, **kwargs):
+        path = self.path.format(**kwargs)
+        # Параметри, що залежать від даних, задаються фабрикою
+        params = self.params() if callable(self.params) else self.params
+        return f'{path}?{urlencode(params)}' if params else path
+
+    def page_size_patch(self):
+        """Розмір сторінки пагінатора DRF за замовчуванням на час запиту"""
+        if self.page_size is None:
+            return nullcontext()
+        from rest_framework.settings import api_settings
+        return mock.patch.object(api_settings.DEFAULT_PAGINATION_CLASS, 'page_size', self.page_size)
+
+    def request(self, client, url):
+        headers = {'HTTP_ACCEPT_LANGUAGE': self.locale} if self.locale else {}
+        if self.method == 'get':
+            return client.get(url, **headers)
+        return getattr(client, self.method)(
+            url, json.dumps(self.data or {}), content_type='application/json', **headers
+        )
+
+
+def run_query_budget(client, budget, using='default', **path_kwargs):
+    """Виконує запит бюджету з холодним кешем; повертає (response, recorder)"""
+    url = budget.url(**path_kwargs)
+    cache.clear()
+    with budget.page_size_patch():
+        with assert_query_budget(budget.max_queries, budget.max_ms, using=using,
+                                 label=f'{budget.method.upper()} {url} ({budget})') as recorder:
+            response = budget.request(client, url)
+
+    if response.status_code != budget.status:
+        raise AssertionError(
+            f'{budget}: {budget.method.upper()} {url} повернув {response.status_code}, '
+            f'очікувався {budget.status}'
+        )
+    return response, recorder
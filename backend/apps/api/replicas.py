@@ -0,0 +1,197 @@
+# backend/apps/api/replicas.py
+"""
+Читання API з реплік PostgreSQL.
+
+ReplicaMiddleware для безпечних запитів (GET/HEAD/OPTIONS) до PATHS
+вибирає здорову репліку, і ReplicaRouter направляє на неї читання цього
+запиту. Решта (адмінка, запис, фонові потоки, транзакції) - основна БД.
+
+Після успішного запису клієнт отримує cookie і PIN_SECONDS читає з
+основної БД (бачить власні зміни, поки репліка наздоганяє). Зміна
+контенту (сигнали, як інвалідація кешу відповідей) закріплює за основною
+БД читання всіх клієнтів через позначку в спільному кеші - інакше інший
+клієнт прочитав би з репліки старі дані й записав їх у кеш відповідей
+під новою версією тегів. Позначка діє max(PIN_SECONDS, MAX_LAG): репліку
+з більшим відставанням і так пропущено. Репліка з
+відставанням понад MAX_LAG або недоступна пропускається; недоступна
+перевіряється знову через DOWN_RETRY секунд.
+
+    DB_REPLICA_URLS=postgres://ugc@replica1/ugc,postgres://ugc@replica2/ugc
+"""
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections, transaction
+import random
+import threading
+import time
+import logging
+from .metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('ugc_read_alias', default=None)
+
+
+def get_config():
+    """Налаштування з DATABASE_REPLICA_SETTINGS"""
+    replica_settings = getattr(settings, 'DATABASE_REPLICA_SETTINGS', {})
+    return {
+        'aliases': list(replica_settings.get('ALIASES', [])),
+        'paths': tuple(replica_settings.get('PATHS', ('/api/',))),
+        'pin_seconds': replica_settings.get('PIN_SECONDS', 5),
+        'pin_cookie': replica_settings.get('PIN_COOKIE', 'ugc_primary_pin'),
+        'write_key': replica_settings.get('WRITE_KEY', 'ugc_replica_primary_until'),
+        'max_lag': replica_settings.get('MAX_LAG', 10),
+        'check_interval': replica_settings.get('CHECK_INTERVAL', 5),
+        'down_retry': replica_settings.get('DOWN_RETRY', 30),
+    }
+
+
+class ReplicaHealth:
+    """Стан реплік процесу: відставання перевіряється не частіше CHECK_INTERVAL"""
+
+    _lock = threading.Lock()
+    _status = {}  # alias: (перевірено, лаг або None - недоступна)
+
+    @staticmethod
+    def lag(alias):
+        """Відставання репліки в секундах (0 - не PostgreSQL або немає реплікації)"""
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            connection.ensure_connection()
+            return 0.0
+        with connection.cursor() as cursor:
+            # Без нових транзакцій на primary час відтворення старіє - тоді лаг 0
+            cursor.execute(
+                "SELECT CASE WHEN NOT pg_is_in_recovery() "
+                "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            )
+            value = cursor.fetchone()[0]
+        return float(value or 0)
+
+    @classmethod
+    def check(cls, alias, config):
+        with cls._lock:
+            checked_at, lag = cls._status.get(alias, (None, None))
+        now = time.monotonic()
+        interval = config['check_interval'] if lag is not None else config['down_retry']
+        if checked_at is not None and now - checked_at < interval:
+            return lag
+
+        try:
+            lag = cls.lag(alias)
+        except DatabaseError as e:
+            logger.warning(f"Репліка {alias} недоступна: {str(e)}")
+            lag = None
+            connections[alias].close()
+        with cls._lock:
+            cls._status[alias] = (now, lag)
+        return lag
+
+    @classmethod
+    def available(cls, config):
+        """Репліки з допустимим відставанням"""
+        healthy = []
+        for alias in config['aliases']:
+            lag = cls.check(alias, config)
+            if lag is not None and lag <= config['max_lag']:
+                healthy.append(alias)
+        return healthy
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._status.clear()
+
+
+class RecentWrite:
+    """Глобальне закріплення читань за основною БД після зміни контенту"""
+
+    @staticmethod
+    def window(config):
+        return max(config['pin_seconds'], config['max_lag'])
+
+    @classmethod
+    def mark(cls):
+        """Після коміту: читання всіх клієнтів - з основної БД протягом вікна"""
+        config = get_config()
+        if config['aliases']:
+            transaction.on_commit(lambda: cls.pin(config))
+
+    @classmethod
+    def pin(cls, config):
+        window = cls.window(config)
+        cache.set(config['write_key'], time.time() + window, int(window) + 1)
+
+    @classmethod
+    def active(cls, config):
+        return (cache.get(config['write_key']) or 0) > time.time()
+
+
+class ReplicaRouter:
+    """DATABASE_ROUTERS: читання запиту - на вибрану middleware репліку, запис - основна БД"""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections['default'].in_atomic_block:
+            # У транзакції читаємо те, що щойно записали
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Репліки містять ті самі дані, що й основна БД
+        return True
+
+
+class ReplicaMiddleware:
+    """Вибір БД для читань запиту та закріплення клієнта за основною БД після запису"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = get_config()
+        if not config['aliases']:
+            return self.get_response(request)
+
+        alias, reason = self.choose(request, config)
+        Metrics.inc('ugc_db_read_routing_total', (('database', alias or 'default'), ('reason', reason)))
+        token = _read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                config['pin_cookie'], str(int(time.time()) + config['pin_seconds']),
+                max_age=config['pin_seconds'], httponly=True, samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
+
+    @staticmethod
+    def choose(request, config):
+        """(репліка або None, причина)"""
+        if request.method not in SAFE_METHODS or not request.path.startswith(config['paths']):
+            return None, 'write' if request.method not in SAFE_METHODS else 'path'
+        try:
+            pinned_until = int(request.COOKIES.get(config['pin_cookie'], 0))
+        except ValueError:
+            pinned_until = 0
+        if pinned_until > time.time():
+            return None, 'pinned'
+        if RecentWrite.active(config):
+            return None, 'recent_write'
+        healthy = ReplicaHealth.available(config)
+        if not healthy:
+            return None, 'fallback'
+        return random.choice(healthy), 'replica'
+
@@ -0,0 +1,377 @@
+# backend/apps/api/resilient_cache.py
+"""
+Кеш, що переживає недоступність Redis.
+
+ResilientRedisClient (CLIENT_CLASS django_redis поверх TieredRedisClient)
+рахує поспіль помилки з'єднання з Redis (короткі SOCKET_TIMEOUT у
+CACHES). Після FAILURE_THRESHOLD помилок запобіжник розмикається: операції
+кешу без мережі йдуть у локальний LocMem процесу, тож throttle,
+кеш перекладів і cache_page працюють, а дані читаються з БД. Через
+RESET_TIMEOUT одна операція перевіряє Redis (half-open); успіх замикає
+запобіжник.
+
+Ключі, змінені під час збою, після відновлення видаляються з Redis
+(версії тегів кешу відповідей, переклади), щоб не віддавати дані, старші
+за локальні зміни. Замки (ключі за LOCK_PATTERNS: CacheLock, замок
+експорту перекладів) під час збою не видаються: локальний замок не
+виключав би інші воркери, тож add повертає False і завдання
+повторюється після відновлення. Якщо змінених ключів більше за REPLAY_LIMIT, після
+відновлення видаляються шаблони OVERFLOW_PATTERNS (кеш відповідей разом
+з версіями тегів, переклади, індекс slug) - дорожче, але без застарілих
+даних. Стан запобіжника - метрика ugc_cache_breaker_state.
+"""
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django_redis.client import DefaultClient
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+import fnmatch
+import inspect
+import threading
+import time
+import logging
+from .metrics import Metrics
+from .tiered_cache import TieredRedisClient
+
+logger = logging.getLogger(__name__)
+
+OUTAGE_ERRORS = (RedisConnectionError, RedisTimeoutError, TimeoutError, OSError)
+
+# Операції, що змінюють ключі: після відновлення ці ключі видаляються з Redis
+WRITE_OPERATIONS = ('set', 'set_many', 'add', 'delete', 'delete_many', 'incr', 'decr', 'touch', 'expire', 'persist')
+
+# Забагато змінених ключів: після відновлення видаляються всі похідні дані
+OVERFLOW_PATTERNS = (
+    'response_cache*',
+    'unified_translations_*',
+    'static_translations_*',
+    'dynamic_translations_*',
+    'po_translations_*',
+    'translations_*',
+    'trans_cache_*',
+    'slug_index*',
+)
+
+# Міжпроцесні замки (CacheLock.for_path, RUN_LOCK_KEY експорту): під час збою не видаються
+LOCK_PATTERNS = ('*_lock', '*_lock:*')
+
+
+def get_config():
+    """Налаштування з CACHE_BREAKER_SETTINGS"""
+    breaker_settings = getattr(settings, 'CACHE_BREAKER_SETTINGS', {})
+    return {
+        'enabled': breaker_settings.get('ENABLED', True),
+        'failure_threshold': breaker_settings.get('FAILURE_THRESHOLD', 3),
+        'reset_timeout': breaker_settings.get('RESET_TIMEOUT', 10),
+        'fallback_max_entries': breaker_settings.get('FALLBACK_MAX_ENTRIES', 2000),
+        'replay_limit': breaker_settings.get('REPLAY_LIMIT', 10000),
+        'overflow_patterns': tuple(breaker_settings.get('OVERFLOW_PATTERNS', OVERFLOW_PATTERNS)),
+        'lock_patterns': tuple(breaker_settings.get('LOCK_PATTERNS', LOCK_PATTERNS)),
+    }
+
+
+def is_outage(error):
+    """Помилка з'єднання/таймаут (ResponseError - помилка команди, не збій)"""
+    if isinstance(error, ConnectionInterrupted):
+        error = error.__cause__
+    return isinstance(error, OUTAGE_ERRORS)
+
+
+class CircuitBreaker:
+    """Запобіжник одного кешу, спільний для всіх потоків процесу"""
+
+    CLOSED, HALF_OPEN, OPEN = 'closed', 'half_open', 'open'
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    _breakers = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name, failure_threshold, reset_timeout):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+        Metrics.set_gauge('ugc_cache_breaker_state', (('cache', name),), 0)
+
+    @classmethod
+    def get(cls, name, config):
+        with cls._registry_lock:
+            if name not in cls._breakers:
+                cls._breakers[name] = cls(name, config['failure_threshold'], config['reset_timeout'])
+            return cls._breakers[name]
+
+    @classmethod
+    def is_available(cls):
+        """Чи варто звертатися до Redis напряму (метрики)"""
+        return all(breaker.state == cls.CLOSED for breaker in list(cls._breakers.values()))
+
+    def allow(self):
+        """Чи виконувати операцію в Redis; після RESET_TIMEOUT пропускає одну пробну (HALF_OPEN)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._transition(self.HALF_OPEN)
+                return self.HALF_OPEN
+            return False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def failure(self, error):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                logger.error(f"Кеш {self.name} недоступний, перехід на локальний кеш: {str(error)}")
+                self.opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+    def _transition(self, state):
+        self.state = state
+        labels = (('cache', self.name),)
+        Metrics.set_gauge('ugc_cache_breaker_state', labels, self.STATE_VALUES[state])
+        Metrics.inc('ugc_cache_breaker_transitions_total', labels + (('state', state),))
+        if state == self.CLOSED:
+            logger.warning(f"Кеш {self.name} відновлено")
+
+
+class ResilientRedisClient(TieredRedisClient):
+    """Клієнт django_redis із запобіжником та локальним кешем на час збою"""
+
+    # Аргументи операцій за сигнатурами DefaultClient
+    SIGNATURES = {
+        name: inspect.signature(getattr(DefaultClient, name))
+        for name in (
+            'get', 'get_many', 'set', 'set_many', 'add', 'delete', 'delete_many', 'delete_pattern',
+            'clear', 'incr', 'decr', 'touch', 'expire', 'persist', 'has_key', 'ttl', 'keys',
+        )
+    }
+
+    _dirty = {}  # кеш: {(ключ, версія)} або None - забагато змін, видаляються OVERFLOW_PATTERNS
+    _dirty_patterns = {}
+    _dirty_lock = threading.Lock()
+
+    def __init__(self, server, params, backend):
+        super().__init__(server, params, backend)
+        self.breaker_config = get_config()
+        # Мітка метрик - KEY_PREFIX (LOCATION може містити пароль)
+        self.cache_name = backend.key_prefix or 'default'
+        self.breaker = CircuitBreaker.get(self.cache_name, self.breaker_config) if self.breaker_config['enabled'] else None
+        self.fallback = LocMemCache(f'ugc-fallback-{self.cache_name}', {
+            'TIMEOUT': backend.default_timeout,
+            'OPTIONS': {'MAX_ENTRIES': self.breaker_config['fallback_max_entries']},
+        })
+        self._guarding = False
+
+    def _call(self, name, args, kwargs):
+        operation = getattr(TieredRedisClient, name)
+        # Вкладені виклики (add -> set, pipeline set_many) рахуються як одна операція
+        if self.breaker is None or self._guarding or kwargs.get('client') is not None:
+            return operation(self, *args, **kwargs)
+
+        permit = self.breaker.allow()
+        if not permit:
+            return self._fallback(name, args, kwargs, 'open')
+        self._guarding = True
+        try:
+            if permit == CircuitBreaker.HALF_OPEN:
+                # Пробна операція: спершу очищення ключів, змінених під час збою
+                self._replay()
+            result = operation(self, *args, **kwargs)
+        except Exception as e:
+            if is_outage(e):
+                self.breaker.failure(e)
+                return self._fallback(name, args, kwargs, 'error')
+            # Помилка команди: Redis відповів
+            self._succeeded()
+            raise
+        finally:
+            self._guarding = False
+        self._succeeded()
+        return result
+
+    def _succeeded(self):
+        self.breaker.success()
+        if self._dirty.get(self.cache_name) or self._dirty_patterns.get(self.cache_name):
+            # Поодинока помилка без розмикання теж лишила застарілі ключі
+            try:
+                self._replay()
+            except Exception as e:
+                logger.error(f"Не вдалося очистити змінені під час збою ключі кешу {self.cache_name}: {str(e)}")
+
+    # ---- локальний кеш ----
+
+    def _fallback(self, name, args, kwargs, reason):
+        Metrics.inc('ugc_cache_fallback_total', (('cache', self.cache_name), ('operation', name), ('reason', reason)))
+        bound = self.SIGNATURES[name].bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        params = bound.arguments
+        if self._is_lock(name, params):
+            # Локальний замок не виключав би інші процеси - відмова, завдання повториться.
+            # Ключ не запам'ятовується: після відновлення замок іншого процесу не видаляємо
+            return False
+        self._remember(name, params)
+        local = self.fallback
+        version = params.get('version')
+
+        if name == 'get':
+            return local.get(params['key'], params['default'], version=version)
+        if name == 'get_many':
+            return local.get_many(params['keys'], version=version)
+        if name == 'set':
+            if params['nx']:
+                return local.add(params['key'], params['value'], params['timeout'], version=version)
+            if params['xx'] and not local.has_key(params['key'], version=version):
+                return False
+            local.set(params['key'], params['value'], params['timeout'], version=version)
+            return True
+        if name == 'set_many':
+            local.set_many(params['data'], params['timeout'], version=version)
+            return None
+        if name == 'add':
+            return local.add(params['key'], params['value'], params['timeout'], version=version)
+        if name == 'delete':
+            return int(local.delete(params['key'], version=version))
+        if name == 'delete_many':
+            local.delete_many(params['keys'], version=version)
+            return None
+        if name in ('delete_pattern', 'clear'):
+            # LocMem не вміє видаляти за шаблоном
+            local.clear()
+            return 0
+        if name == 'incr':
+            if params['ignore_key_check']:
+                local.add(params['key'], 0, version=version)
+            return local.incr(params['key'], params['delta'], version=version)
+        if name == 'decr':
+            return local.decr(params['key'], params['delta'], version=version)
+        if name == 'touch':
+            return local.touch(params['key'], params['timeout'], version=version)
+        if name == 'has_key':
+            return local.has_key(params['key'], version=version)
+        if name in ('expire', 'persist'):
+            return local.has_key(params['key'], version=version)
+        if name == 'ttl':
+            return None
+        return []
+
+    def _is_lock(self, name, params):
+        """add / set(nx) ключа замка"""
+        if name != 'add' and not (name == 'set' and params['nx']):
+            return False
+        return any(fnmatch.fnmatchcase(str(params['key']), pattern) for pattern in self.breaker_config['lock_patterns'])
+
+    def _remember(self, name, params):
+        """Ключі, змінені під час збою, - на видалення з Redis після відновлення"""
+        if name not in WRITE_OPERATIONS and name not in ('delete_pattern', 'clear'):
+            return
+        with self._dirty_lock:
+            if name in ('delete_pattern', 'clear'):
+                self._dirty_patterns.setdefault(self.cache_name, set()).add(
+                    (params.get('pattern', '*'), params.get('version'))
+                )
+                return
+            dirty = self._dirty.setdefault(self.cache_name, set())
+            if dirty is None:
+                return
+            keys = params['data'] if name == 'set_many' else params['keys'] if name == 'delete_many' else [params['key']]
+            dirty.update((key, params.get('version')) for key in keys)
+            if len(dirty) > self.breaker_config['replay_limit']:
+                logger.error(
+                    f"Забагато змін кешу {self.cache_name} під час збою, після відновлення "
+                    f"буде очищено кеш відповідей та перекладів"
+                )
+                self._dirty[self.cache_name] = None
+                self._dirty_patterns.setdefault(self.cache_name, set()).update(
+                    (pattern, None) for pattern in self.breaker_config['overflow_patterns']
+                )
+
+    def _replay(self):
+        """
+        Видаляє з Redis змінені під час збою ключі; локальний кеш більше не потрібен.
+        Помилка з'єднання повертає ключі до списку і пробрасується далі.
+        """
+        with self._dirty_lock:
+            overflow = self.cache_name in self._dirty and self._dirty[self.cache_name] is None
+            dirty = self._dirty.pop(self.cache_name, None) or set()
+            patterns = self._dirty_patterns.pop(self.cache_name, set())
+        try:
+            self.get_client(write=True).ping()
+            for pattern, version in patterns:
+                TieredRedisClient.delete_pattern(self, pattern, version=version)
+            by_version = {}
+            for key, version in dirty:
+                by_version.setdefault(version, []).append(key)
+            for version, keys in by_version.items():
+                TieredRedisClient.delete_many(self, keys, version=version)
+        except Exception:
+            with self._dirty_lock:
+                current = self._dirty.setdefault(self.cache_name, set())
+                if current is not None and not overflow:
+                    current.update(dirty)
+                else:
+                    self._dirty[self.cache_name] = None
+                self._dirty_patterns.setdefault(self.cache_name, set()).update(patterns)
+            raise
+        self.fallback.clear()
+        if dirty or patterns:
+            logger.warning(f"Кеш {self.cache_name}: очищено {len(dirty)} ключів та {len(patterns)} шаблонів після збою")
+
+    # ---- операції ----
+
+    def get(self, *args, **kwargs):
+        return self._call('get', args, kwargs)
+
+    def get_many(self, *args, **kwargs):
+        return self._call('get_many', args, kwargs)
+
+    def set(self, *args, **kwargs):
+        return self._call('set', args, kwargs)
+
+    def set_many(self, *args, **kwargs):
+        return self._call('set_many', args, kwargs)
+
+    def add(self, *args, **kwargs):
+        return self._call('add', args, kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self._call('delete', args, kwargs)
+
+    def delete_many(self, *args, **kwargs):
+        return self._call('delete_many', args, kwargs)
+
+    def delete_pattern(self, *args, **kwargs):
+        return self._call('delete_pattern', args, kwargs)
+
+    def clear(self, *args, **kwargs):
+        return self._call('clear', args, kwargs)
+
+    def incr(self, *args, **kwargs):
+        return self._call('incr', args, kwargs)
+
+    def decr(self, *args, **kwargs):
+        return self._call('decr', args, kwargs)
+
+    def touch(self, *args, **kwargs):
+        return self._call('touch', args, kwargs)
+
+    def expire(self, *args, **kwargs):
+        return self._call('expire', args, kwargs)
+
+    def persist(self, *args, **kwargs):
+        return self._call('persist', args, kwargs)
+
+    def has_key(self, *args, **kwargs):
+        return self._call('has_key', args, kwargs)
+
+    def ttl(self, *args, **kwargs):
+        return self._call('ttl', args, kwargs)
+
+    def keys(self, *args, **kwargs):
+        return self._call('keys', args, kwargs)
@@ -0,0 +1,182 @@
+# backend/apps/api/response_cache.py
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+from rest_framework import filters, serializers
+from rest_framework.response import Response
+import hashlib
+import json
+import time
+import logging
+from .metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheTags:
+    """
+    Версії тегів залежностей кешу відповідей.
+
+    Тег - це модель ('projects.project'). Поточні версії тегів входять у ключ
+    кешу, тому зміна моделі миттєво робить недійсними всі відповіді,
+    що від неї залежать; старі записи просто доживають свій TTL.
+    """
+
+    KEY_TEMPLATE = 'response_cache_tag:{tag}'
+    TIMEOUT = None  # версії тегів не протухають
+
+    @staticmethod
+    def tag_for_model(model):
+        return model._meta.concrete_model._meta.label_lower
+
+    @classmethod
+    def get_versions(cls, tags):
+        """Повертає {тег: версія}, ініціалізуючи відсутні теги"""
+        keys = {cls.KEY_TEMPLATE.format(tag=tag): tag for tag in tags}
+        stored = cache.get_many(list(keys))
+
+        versions = {}
+        for key, tag in keys.items():
+            version = stored.get(key)
+            if version is None:
+                cache.add(key, time.time_ns(), cls.TIMEOUT)
+                version = cache.get(key)
+            versions[tag] = version
+        return versions
+
+    @classmethod
+    def bump(cls, *models):
+        """Інвалідує всі відповіді, залежні від моделей"""
+        tags = {cls.tag_for_model(model) for model in models}
+        # Нова версія - час у наносекундах, щоб не повторити версію після витіснення ключа
+        cache.set_many({cls.KEY_TEMPLATE.format(tag=tag): time.time_ns() for tag in tags}, cls.TIMEOUT)
+        logger.debug(f"Кеш відповідей інвалідовано для: {', '.join(sorted(tags))}")
+
+
+class ResponseCacheMixin:
+    """
+    Декларативний кеш відповідей для read-only viewset.
+
+    `response_cache` - {дія: TTL у секундах}; дії без TTL не кешуються.
+    Ключ будується з активної мови, хоста, аргументів URL та нормалізованих
+    параметрів фільтрації (лише тих, що впливають на відповідь).
+    Залежності - модель queryset, моделі вкладених серіалізаторів та
+    `cache_dependencies`; їх зміна інвалідує записи через сигнали.
+    """
+
+    # {'list': 60 * 60 * 24, 'featured': 60 * 60 * 24}
+    response_cache = {}
+    cache_dependencies = ()
+    response_cache_params = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        timeout = self.get_response_cache_timeout()
+        method = request.method.lower()
+        if timeout and method in ('get', 'head') and ResponseCacheMixin.is_enabled():
+            handler = getattr(self, method)
+            setattr(self, method, self._wrap_cached_handler(handler, timeout))
+
+    @staticmethod
+    def is_enabled():
+        return getattr(settings, 'RESPONSE_CACHE_SETTINGS', {}).get('ENABLED', True)
+
+    def get_response_cache_timeout(self):
+        return self.response_cache.get(self.action)
+
+    def _wrap_cached_handler(self, handler, timeout):
+        def cached_handler(request, *args, **kwargs):
+            cache_key = self.get_response_cache_key(request)
+            cached = cache.get(cache_key)
+            Metrics.cache_access('response_cache', cached is not None, view=f'{type(self).__name__}.{self.action}')
+            if cached is not None:
+                response = Response(cached['data'], status=cached['status'])
+                response['X-Response-Cache'] = 'HIT'
+                return response
+
+            response = handler(request, *args, **kwargs)
+            if response.status_code == 200 and isinstance(response, Response):
+                try:
+                    cache.set(cache_key, {'data': response.data, 'status': response.status_code}, timeout)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Не вдалося закешувати відповідь {cache_key}: {str(e)}")
+            response['X-Response-Cache'] = 'MISS'
+            return response
+
+        return cached_handler
+
+    # ---- ключ ----
+
+    def get_response_cache_params(self):
+        """Параметри запиту, що впливають на відповідь цієї дії"""
+        params = set(self.response_cache_params)
+        params.update(getattr(self, 'filterset_fields', None) or ())
+
+        for backend in getattr(self, 'filter_backends', ()):
+            if issubclass(backend, filters.SearchFilter):
+                params.add(backend.search_param)
+            elif issubclass(backend, filters.OrderingFilter):
+                params.add(backend.ordering_param)
+
+        paginator = self.paginator
+        if paginator is not None:
+            for attr in ('page_query_param', 'page_size_query_param', 'limit_query_param', 'offset_query_param'):
+                value = getattr(paginator, attr, None)
+                if value:
+                    params.add(value)
+        return params
+
+    def get_response_cache_key(self, request):
+        allowed = self.get_response_cache_params()
+        query = sorted(
+            (name, sorted(value for value in values if value != ''))
+            for name, values in request.query_params.lists()
+            if name in allowed
+        )
+        query = [(name, values) for name, values in query if values]
+
+        versions = ResponseCacheTags.get_versions(self.get_response_cache_tags())
+        parts = {
+            'locale': get_language() or settings.LANGUAGE_CODE,
+            'host': request.build_absolute_uri('/'),
+            'kwargs': sorted((name, str(value)) for name, value in self.kwargs.items()),
+            'query': query,
+            'versions': sorted(versions.items()),
+        }
+        digest = hashlib.md5(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+        return f'response_cache:{self.__class__.__name__}:{self.action}:{digest}'
+
+    # ---- залежності ----
+
+    def get_response_cache_tags(self):
+        return sorted(ResponseCacheTags.tag_for_model(model) for model in view_dependency_models(self))
+
+
+def view_dependency_models(view):
+    """Моделі, від яких залежить відповідь viewset"""
+    queryset = view.queryset if view.queryset is not None else view.get_queryset()
+    models = {queryset.model}
+    models.update(getattr(view, 'cache_dependencies', ()))
+    models.update(serializer_models(view.get_serializer_class()))
+    return models
+
+
+def serializer_models(serializer_class, seen=None):
+    """Моделі серіалізатора та всіх вкладених серіалізаторів"""
+    seen = set() if seen is None else seen
+    if serializer_class in seen:
+        return set()
+    seen.add(serializer_class)
+
+    models = set()
+    meta = getattr(serializer_class, 'Meta', None)
+    if meta is not None and getattr(meta, 'model', None) is not None:
+        models.add(meta.model)
+
+    for field in getattr(serializer_class, '_declared_fields', {}).values():
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, serializers.BaseSerializer):
+            models.update(serializer_models(type(field), seen))
+    return models
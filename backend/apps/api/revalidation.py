@@ -0,0 +1,301 @@
+# backend/apps/api/revalidation.py
+"""
+On-demand ревалідація ISR сторінок Next.js фронтенду (outbox).
+
+Сигнали моделей у тій самій транзакції записують сторінки, які показують
+змінений об'єкт: детальну сторінку (за слагом кожної мови, включно зі
+старим слагом), списки та головну. Запис - upsert за (шлях, мова), тож
+серія збережень дає один запис на сторінку. Після коміту фоновий потік
+відправляє пакети POST {"paths": [...]} на REVALIDATION_SETTINGS['URL'];
+невдалі пакети повторюються з експоненційною затримкою, після
+MAX_ATTEMPTS запис отримує статус failed (видно в адмінці).
+
+    python manage.py revalidate_pages             # відправити накопичене
+    python manage.py mock_cdn                     # локальна заглушка ендпоінта
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from modeltranslation import settings as mt_settings
+import json
+import requests
+import logging
+from apps.common.jobs import DebouncedWorker
+from .metrics import Metrics
+from .models import RevalidationRequest
+
+logger = logging.getLogger(__name__)
+
+# Сторінки списків, які показують модель: {модель: (шаблони з {locale})}
+REVALIDATION_PATHS = {
+    'projects.Project': ('/{locale}/', '/{locale}/work/'),
+    'projects.ProjectCategory': ('/{locale}/work/',),
+    'projects.ProjectImage': (),
+    'services.Service': ('/{locale}/',),
+    'services.ServiceFeature': (),
+    'jobs.JobPosition': ('/{locale}/job/',),
+    'jobs.WorkplacePhoto': ('/{locale}/job/',),
+    'content.HomePage': ('/{locale}/',),
+    'content.AboutPage': ('/{locale}/about/',),
+    'contacts.Office': ('/{locale}/contact/',),
+    'partners.PartnershipInfo': ('/{locale}/about/',),
+}
+
+# Детальні сторінки залежних моделей: {модель: (розділ sitemap, lookup кореня)}
+DETAIL_DEPENDENCIES = {
+    'projects.ProjectImage': ('projects', 'project'),
+    'projects.ProjectCategory': ('projects', 'category'),
+    'services.ServiceFeature': ('services', 'service'),
+}
+
+
+def get_config():
+    """Налаштування з REVALIDATION_SETTINGS"""
+    revalidation_settings = getattr(settings, 'REVALIDATION_SETTINGS', {})
+    return {
+        'enabled': revalidation_settings.get('ENABLED', False),
+        'url': revalidation_settings.get('URL', ''),
+        'token': revalidation_settings.get('TOKEN', ''),
+        'timeout': revalidation_settings.get('TIMEOUT', 5),
+        'lease': revalidation_settings.get('LEASE', 60),
+        'batch_size': revalidation_settings.get('BATCH_SIZE', 100),
+        'max_attempts': revalidation_settings.get('MAX_ATTEMPTS', 8),
+        'retry_delay': revalidation_settings.get('RETRY_DELAY', 5),
+        'max_retry_delay': revalidation_settings.get('MAX_RETRY_DELAY', 600),
+        'async': revalidation_settings.get('ASYNC', True),
+        'delay': revalidation_settings.get('DELAY', 1),
+        'paths': {**REVALIDATION_PATHS, **revalidation_settings.get('PATHS', {})},
+    }
+
+
+def is_enabled():
+    config = get_config()
+    return config['enabled'] and bool(config['url'])
+
+
+class RevalidationPaths:
+    """Сторінки фронтенду, які показують об'єкт: [(шлях, мова)]"""
+
+    _previous = {}
+
+    @staticmethod
+    def sections():
+        from apps.common.sitemaps import sections
+
+        return {section.name: section for section in sections()}
+
+    @classmethod
+    def section_for(cls, model):
+        for section in cls.sections().values():
+            if section.model is model:
+                return section
+        return None
+
+    @staticmethod
+    def detail_paths(section, slugs):
+        """slugs - значення колонок slug_<мова>"""
+        return [(section.page_path(locale, slug), locale) for locale, slug in section.localize(slugs).items()]
+
+    @classmethod
+    def remember(cls, instance):
+        """pre_save: старі слаги - сторінка за старою адресою теж має оновитись"""
+        section = cls.section_for(type(instance))
+        if section is None or instance.pk is None:
+            return
+        slugs = section.model._base_manager.filter(pk=instance.pk).values_list(*section.columns()).first()
+        if slugs:
+            cls._previous[(section.name, instance.pk)] = slugs
+
+    @classmethod
+    def for_instance(cls, instance):
+        model = type(instance)
+        label = model._meta.label
+        config = get_config()
+        locales = list(mt_settings.AVAILABLE_LANGUAGES)
+        paths = set()
+
+        for template in config['paths'].get(label, ()):
+            paths.update((template.format(locale=locale), locale) for locale in locales)
+
+        section = cls.section_for(model)
+        if section is not None:
+            slugs = [getattr(instance, column) for column in section.columns()]
+            paths.update(cls.detail_paths(section, slugs))
+            previous = cls._previous.pop((section.name, instance.pk), None)
+            if previous:
+                paths.update(cls.detail_paths(section, previous))
+
+        if label in DETAIL_DEPENDENCIES:
+            name, lookup = DETAIL_DEPENDENCIES[label]
+            section = cls.sections()[name]
+            if any(f.name == lookup for f in model._meta.get_fields() if f.concrete):
+                # Дочірній об'єкт (зображення проєкту) - сторінка його кореня
+                roots = section.model._base_manager.filter(pk=getattr(instance, f'{lookup}_id'))
+            else:
+                # Батьківський об'єкт (категорія) - сторінки всіх коренів
+                roots = section.model._base_manager.filter(**{lookup: instance.pk})
+            for slugs in roots.values_list(*section.columns()):
+                paths.update(cls.detail_paths(section, slugs))
+        return sorted(paths)
+
+    @classmethod
+    def all(cls):
+        """Усі сторінки: списки та детальні сторінки активних об'єктів"""
+        config = get_config()
+        paths = set()
+        for templates in config['paths'].values():
+            for template in templates:
+                paths.update((template.format(locale=locale), locale) for locale in mt_settings.AVAILABLE_LANGUAGES)
+        for section in cls.sections().values():
+            for slugs in section.get_queryset().values_list(*section.columns()).iterator():
+                paths.update(cls.detail_paths(section, slugs))
+        return sorted(paths)
+
+
+class Revalidator:
+    """
+    Outbox ревалідації: запис сторінок у транзакції зміни та пакетна
+    відправка фоновим потоком після коміту (ASYNC=False - одразу, тести).
+    Кілька процесів можуть відправляти одночасно: пакет береться в оренду
+    короткою транзакцією (available_at - кінець оренди), POST іде поза
+    транзакцією, і лише потім записи видаляються або відкладаються.
+    """
+
+    worker = DebouncedWorker('revalidation', lambda pending: Revalidator.run_pending(), get_config)
+
+    # ---- запис ----
+
+    @classmethod
+    def object_saving(cls, instance):
+        if is_enabled():
+            RevalidationPaths.remember(instance)
+
+    @classmethod
+    def object_changed(cls, instance):
+        """post_save / post_delete: сторінки об'єкта в outbox"""
+        if not is_enabled():
+            return
+        cls.record(RevalidationPaths.for_instance(instance))
+
+    @classmethod
+    def record(cls, paths):
+        """Upsert сторінок; запис у помилці чи з відкладеною спробою стає актуальним"""
+        if not paths:
+            return 0
+        now = timezone.now()
+        RevalidationRequest.objects.bulk_create(
+            [
+                RevalidationRequest(path=path, locale=locale, status='pending', attempts=0, available_at=now, last_error='')
+                for path, locale in paths
+            ],
+            update_conflicts=True,
+            unique_fields=['path', 'locale'],
+            update_fields=['status', 'attempts', 'available_at', 'last_error'],
+        )
+        transaction.on_commit(cls.wake)
+        return len(paths)
+
+    # ---- відправка ----
+
+    @classmethod
+    def wake(cls):
+        if not get_config()['async']:
+            cls.drain()
+            return
+        cls.worker.add()
+
+    @classmethod
+    def run_pending(cls):
+        cls.drain()
+        # Потік чекає найближчу повторну спробу; якщо нічого немає - завершується
+        next_attempt = (
+            RevalidationRequest.objects.filter(status='pending')
+            .order_by('available_at').values_list('available_at', flat=True).first()
+        )
+        if next_attempt is not None:
+            cls.worker.add(delay=max(get_config()['delay'], (next_attempt - timezone.now()).total_seconds()))
+
+    @classmethod
+    def due(cls, batch_size, now):
+        queryset = RevalidationRequest.objects.filter(status='pending', available_at__lte=now)
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        return list(queryset.order_by('available_at', 'id').values_list('id', flat=True)[:batch_size])
+
+    @classmethod
+    def claim(cls, batch_size, lease):
+        """
+        Бере пакет в оренду до `now + lease`: інші процеси його пропускають,
+        а якщо процес завершився під час відправки - пакет знову стає доступним.
+        Повертає (пакет, кінець оренди).
+        """
+        now = timezone.now()
+        lease_until = now + timedelta(seconds=lease)
+        with transaction.atomic():
+            ids = cls.due(batch_size, now)
+            if not ids:
+                return [], lease_until
+            # Умова due повторюється: без SKIP LOCKED (SQLite) пакет, узятий іншим процесом, не перехоплюється
+            RevalidationRequest.objects.filter(
+                pk__in=ids, status='pending', available_at__lte=now,
+            ).update(available_at=lease_until)
+        batch = RevalidationRequest.objects.filter(pk__in=ids, available_at=lease_until)
+        return list(batch.values('id', 'path', 'locale', 'attempts')), lease_until
+
+    @classmethod
+    def drain(cls):
+        """Відправляє всі сторінки, час яких настав; після невдачі зупиняється. Повертає кількість відправлених"""
+        config = get_config()
+        sent = 0
+        while True:
+            batch, lease_until = cls.claim(config['batch_size'], config['lease'])
+            if not batch:
+                return sent
+            error = cls.send([item['path'] for item in batch], config)
+            # Сторінка, записана знову під час відправки (upsert скидає available_at), лишається в outbox
+            leased = RevalidationRequest.objects.filter(pk__in=[item['id'] for item in batch], available_at=lease_until)
+            if error is not None:
+                cls.retry(leased, batch, error, config)
+                return sent
+            leased.delete()
+            sent += len(batch)
+            Metrics.inc('ugc_revalidation_paths_total', (('result', 'sent'),), len(batch))
+
+    @staticmethod
+    def send(paths, config):
+        """POST пакета; None - успіх, інакше текст помилки"""
+        headers = {'Content-Type': 'application/json'}
+        if config['token']:
+            headers['Authorization'] = f"Bearer {config['token']}"
+        try:
+            response = requests.post(
+                config['url'],
+                data=json.dumps({'paths': sorted(set(paths))}),
+                headers=headers,
+                timeout=config['timeout'],
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Помилка ревалідації ({len(paths)} сторінок): {str(e)}")
+            return str(e)
+        logger.info(f"Ревалідовано сторінок: {len(paths)}")
+        return None
+
+    @staticmethod
+    def retry(leased, batch, error, config):
+        """Експоненційна затримка за кількістю спроб; після max_attempts - failed"""
+        now = timezone.now()
+        by_attempts = {}
+        for item in batch:
+            by_attempts.setdefault(item['attempts'] + 1, []).append(item['id'])
+        for attempts, ids in by_attempts.items():
+            delay = min(config['retry_delay'] * 2 ** (attempts - 1), config['max_retry_delay'])
+            failed = attempts >= config['max_attempts']
+            leased.filter(pk__in=ids).update(
+                attempts=attempts,
+                status='failed' if failed else 'pending',
+                available_at=now + timedelta(seconds=delay),
+                last_error=error[:1000],
+            )
+            Metrics.inc('ugc_revalidation_paths_total', (('result', 'failed' if failed else 'retry'),), len(ids))
@@ -5,9 +5,97 @@ from apps.projects.models import Project, ProjectCategory, ProjectImage
 from apps.jobs.models import JobPosition, JobApplication, WorkplacePhoto
 from apps.partners.models import PartnershipInfo, WorkStage, PartnerInquiry
 from apps.contacts.models import Office, ContactInquiry
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Q
 
 
-class HomePageSerializer(serializers.ModelSerializer):
+class RenderedHTMLField(serializers.Field):
+    """Віддає готовий HTML поля з rendered_html моделі для активної мови"""
+    
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, instance):
+        return instance.get_rendered_html(self.field_name)
+
+
+class RenderedHTMLMixin:
+    """Замінює RichText поля серіалізатора на HTML, відрендерений при збереженні"""
+    
+    @classmethod
+    def get_rendered_fields(cls):
+        model = cls.Meta.model
+        if not hasattr(model, 'get_richtext_fields'):
+            return []
+        richtext_fields = model.get_richtext_fields()
+        return [
+            name for name in cls.Meta.fields
+            if name in richtext_fields and name not in cls._declared_fields
+        ]
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.get_rendered_fields():
+            fields[name] = RenderedHTMLField()
+        return fields
+
+
+class LocalizedProjectionMixin:
+    """
+    Проєкція queryset лише на колонки, які віддає серіалізатор,
+    причому перекладні поля - тільки для активної мови та її fallback
+    """
+    
+    @classmethod
+    def get_projection(cls):
+        """Повертає (поля для only(), зв'язки для select_related())"""
+        model = cls.Meta.model
+        fields = []
+        related = []
+        
+        # RichText поля читаються з rendered_html, сирі колонки не потрібні
+        rendered_fields = cls.get_rendered_fields() if issubclass(cls, RenderedHTMLMixin) else []
+        if rendered_fields:
+            fields.append('rendered_html')
+        
+        for name in cls.Meta.fields:
+            declared = cls._declared_fields.get(name)
+            
+            if name in rendered_fields:
+                continue
+            if declared is None:
+                try:
+                    model_field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    continue
+                if model_field.concrete:
+                    fields.append(name)
+            
+            elif isinstance(declared, LocalizedProjectionMixin):
+                # Вкладений об'єкт по ForeignKey - тягнемо через JOIN
+                source = declared.source or name
+                nested_fields, nested_related = declared.get_projection()
+                fields.append(source)
+                fields.extend(f'{source}__{field}' for field in nested_fields)
+                related.append(source)
+                related.extend(f'{source}__{rel}' for rel in nested_related)
+        
+        return fields, related
+    
+    @classmethod
+    def project_queryset(cls, queryset):
+        """Застосовує проєкцію до queryset"""
+        if not hasattr(queryset, 'localized_only'):
+            return queryset
+        fields, related = cls.get_projection()
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.localized_only(*fields)
+
+
+class HomePageSerializer(RenderedHTMLMixin, LocalizedProjectionMixin, serializers.ModelSerializer):
     """Сериализатор для главной страницы"""
     
     class Meta:
@@ -24,7 +112,7 @@ class HomePageSerializer(serializers.ModelSerializer):
         ]
 
 
-class TeamMemberSerializer(serializers.ModelSerializer):
+class TeamMemberSerializer(RenderedHTMLMixin, serializers.ModelSerializer):
     """Сериализатор для команды"""
     
     class Meta:
@@ -73,7 +161,7 @@ class ProductionPhotoSerializer(serializers.ModelSerializer):
         ]
 
 
-class AboutPageSerializer(serializers.ModelSerializer):
+class AboutPageSerializer(RenderedHTMLMixin, LocalizedProjectionMixin, serializers.ModelSerializer):
     """Сериализатор для страницы О нас"""
     team_members = TeamMemberSerializer(many=True, read_only=True, source='teammember_set')
     certificates = CertificateSerializer(many=True, read_only=True, source='certificate_set')
@@ -92,7 +180,7 @@ class AboutPageSerializer(serializers.ModelSerializer):
         ]
 
 
-class ServiceFeatureSerializer(serializers.ModelSerializer):
+class ServiceFeatureSerializer(RenderedHTMLMixin, serializers.ModelSerializer):
     """Сериализатор для особенностей услуг"""
     
     class Meta:
@@ -106,7 +194,7 @@ class ServiceFeatureSerializer(serializers.ModelSerializer):
         ]
 
 
-class ServiceListSerializer(serializers.ModelSerializer):
+class ServiceListSerializer(LocalizedProjectionMixin, serializers.ModelSerializer):
     """Сериализатор для списка услуг"""
     
     class Meta:
@@ -114,7 +202,7 @@ class ServiceListSerializer(serializers.ModelSerializer):
         fields = [
             'id',
             'name',
-            'short_description',
+            'excerpt',
             'slug',
             'icon',
             'main_image',
@@ -123,7 +211,7 @@ class ServiceListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ServiceDetailSerializer(serializers.ModelSerializer):
+class ServiceDetailSerializer(RenderedHTMLMixin, LocalizedProjectionMixin, serializers.ModelSerializer):
     """Детальный сериализатор для услуг"""
     features = ServiceFeatureSerializer(many=True, read_only=True)
     
@@ -145,7 +233,7 @@ class ServiceDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProjectCategorySerializer(serializers.ModelSerializer):
+class ProjectCategorySerializer(RenderedHTMLMixin, LocalizedProjectionMixin, serializers.ModelSerializer):
     """Сериализатор для категорий проектов"""
     projects_count = serializers.SerializerMethodField()
     
@@ -161,8 +249,22 @@ class ProjectCategorySerializer(serializers.ModelSerializer):
             'projects_count'
         ]
     
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        return queryset.annotate(active_projects_count=Count('projects', filter=Q(projects__is_active=True)))
+    
     def get_projects_count(self, obj):
-        return obj.projects.filter(is_active=True).count()
+        count = getattr(obj, 'active_projects_count', None)
+        if count is not None:
+            return count
+        # Вкладена категорія (список проєктів) - один агрегатний запит на весь серіалізатор
+        counts = self.context.get('_active_projects_counts')
+        if counts is None:
+            counts = self.context['_active_projects_counts'] = dict(
+                Project.objects.filter(is_active=True).order_by()
+                .values_list('category').annotate(total=Count('pk'))
+            )
+        return counts.get(obj.pk, 0)
 
 
 class ProjectImageSerializer(serializers.ModelSerializer):
@@ -178,7 +280,7 @@ class ProjectImageSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(LocalizedProjectionMixin, serializers.ModelSerializer):
     """Сериализатор для списка проектов"""
     category = ProjectCategorySerializer(read_only=True)
     
@@ -187,7 +289,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
         fields = [
             'id',
             'title',
-            'short_description',
+            'excerpt',
             'slug',
             'category',
             'client_name',
@@ -197,7 +299,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProjectDetailSerializer(serializers.ModelSerializer):
+class ProjectDetailSerializer(RenderedHTMLMixin, LocalizedProjectionMixin, serializers.ModelSerializer):
     """Детальный сериализатор для проектов"""
     category = ProjectCategorySerializer(read_only=True)
     images = ProjectImageSerializer(many=True, read_only=True)
@@ -226,7 +328,7 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class JobPositionListSerializer(serializers.ModelSerializer):
+class JobPositionListSerializer(LocalizedProjectionMixin, serializers.ModelSerializer):
     """Сериализатор для списка вакансий"""
     applications_count = serializers.SerializerMethodField()
     
@@ -246,11 +348,16 @@ class JobPositionListSerializer(serializers.ModelSerializer):
             'applications_count'
         ]
     
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        return queryset.annotate(applications_total=Count('applications'))
+    
     def get_applications_count(self, obj):
-        return obj.applications.count()
+        count = getattr(obj, 'applications_total', None)
+        return obj.applications.count() if count is None else count
 
 
-class JobPositionDetailSerializer(serializers.ModelSerializer):
+class JobPositionDetailSerializer(RenderedHTMLMixin, LocalizedProjectionMixin, serializers.ModelSerializer):
     """Детальный сериализатор для вакансий"""
     
     class Meta:
@@ -294,7 +401,7 @@ class JobApplicationSerializer(serializers.ModelSerializer):
         return JobApplication.objects.create(**validated_data)
 
 
-class WorkplacePhotoSerializer(serializers.ModelSerializer):
+class WorkplacePhotoSerializer(LocalizedProjectionMixin, serializers.ModelSerializer):
     """Сериализатор для фото рабочих мест"""
     
     class Meta:
@@ -308,7 +415,7 @@ class WorkplacePhotoSerializer(serializers.ModelSerializer):
         ]
 
 
-class OfficeSerializer(serializers.ModelSerializer):
+class OfficeSerializer(RenderedHTMLMixin, LocalizedProjectionMixin, serializers.ModelSerializer):
     """Сериализатор для офисов"""
     
     class Meta:
@@ -362,7 +469,7 @@ class WorkStageSerializer(serializers.ModelSerializer):
         ]
 
 
-class PartnershipInfoSerializer(serializers.ModelSerializer):
+class PartnershipInfoSerializer(RenderedHTMLMixin, LocalizedProjectionMixin, serializers.ModelSerializer):
     """Сериализатор для информации о партнерстве"""
     work_stages = WorkStageSerializer(many=True, read_only=True, source='workstage_set')
     
@@ -1,7 +1,35 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
+from apps.common.recommendations import RecommendationJob
+from apps.common.sitemaps import SitemapJob
+from .cache_policy import SurrogateKeyPurger, SurrogateKeys
+from .documents import DetailDocumentStore
+from .replicas import RecentWrite
+from .response_cache import ResponseCacheTags
+from .revalidation import Revalidator
+from .slugs import SlugIndex
+from .snapshots import SnapshotJob
 from .utils import TranslationManager
 
+
+# Моделі, які редагують в адмінці та показує API. Форми сайту (заявки,
+# відгуки на вакансії) і похідні таблиці (рекомендації, службові моделі
+# apps.api) сюди не входять: їх запис не змінює жодної відповіді API
+CONTENT_MODELS = frozenset({
+    'contacts.Office',
+    'content.HomePage', 'content.AboutPage', 'content.TeamMember', 'content.Certificate', 'content.ProductionPhoto',
+    'jobs.JobPosition', 'jobs.WorkplacePhoto',
+    'partners.PartnershipInfo', 'partners.WorkStage',
+    'projects.ProjectCategory', 'projects.Project', 'projects.ProjectImage',
+    'services.Service', 'services.ServiceFeature',
+})
+
+
+def is_content_model(sender):
+    """Модель контенту: її зміна інвалідує кеші, CDN, документи, sitemap, знімок і ревалідацію"""
+    return sender._meta.label in CONTENT_MODELS
+
+
 # Підключаємо сигнали для автоматичного очищення кешу при зміні контенту
 @receiver([post_save, post_delete])
 def invalidate_translations_cache(sender, **kwargs):
@@ -15,4 +43,81 @@ def invalidate_translations_cache(sender, **kwargs):
     
     if sender.__name__ in translatable_models:
         TranslationManager.invalidate_translations_cache()
-        print(f"Очищено кеш перекладів через зміну {sender.__name__}")
\ No newline at end of file
+        print(f"Очищено кеш перекладів через зміну {sender.__name__}")
+
+
+@receiver([post_save, post_delete])
+def invalidate_response_cache(sender, **kwargs):
+    """Інвалідує кеш відповідей API, що залежать від зміненої моделі"""
+    if is_content_model(sender):
+        ResponseCacheTags.bump(sender)
+
+
+@receiver([post_save, post_delete])
+def pin_reads_to_primary(sender, **kwargs):
+    """Після зміни контенту всі клієнти читають з основної БД, поки репліки наздоганяють"""
+    if is_content_model(sender):
+        RecentWrite.mark()
+
+
+@receiver([post_save, post_delete])
+def purge_cdn_cache(sender, instance, **kwargs):
+    """Очищає в CDN відповіді, що містять змінений об'єкт"""
+    if is_content_model(sender):
+        SurrogateKeyPurger.purge(SurrogateKeys.for_instance(instance))
+
+
+@receiver(pre_save)
+def remember_detail_document_state(sender, instance, **kwargs):
+    """Запам'ятовує групу об'єкта (категорію проєкту) до збереження"""
+    if is_content_model(sender):
+        DetailDocumentStore.remember(instance)
+
+
+@receiver([post_save, post_delete])
+def rebuild_detail_documents(sender, instance, signal, created=False, **kwargs):
+    """Перебудовує документи деталей, що містять змінений об'єкт"""
+    if is_content_model(sender):
+        DetailDocumentStore.object_changed(instance, created=created, deleted=signal is post_delete)
+
+
+@receiver([post_save, post_delete])
+def invalidate_slug_index(sender, **kwargs):
+    """Нова версія індексу слагів після зміни слага чи активності об'єкта"""
+    if is_content_model(sender):
+        SlugIndex.object_changed(sender)
+
+
+@receiver([post_save, post_delete])
+def update_recommendations(sender, instance, **kwargs):
+    """Перебудовує схожі проєкти/послуги після зміни тексту (з затримкою)"""
+    if is_content_model(sender):
+        RecommendationJob.object_changed(instance)
+
+
+@receiver([post_save, post_delete])
+def update_sitemaps(sender, instance, **kwargs):
+    """Перезаписує файли sitemap з блоком id зміненого об'єкта"""
+    if is_content_model(sender):
+        SitemapJob.object_changed(instance)
+
+
+@receiver([post_save, post_delete])
+def update_api_snapshot(sender, instance, **kwargs):
+    """Перерендерює статичний знімок API для зміненого об'єкта"""
+    if is_content_model(sender):
+        SnapshotJob.object_changed(instance)
+
+
+@receiver(pre_save)
+def remember_revalidation_slugs(sender, instance, **kwargs):
+    """Старі слаги: сторінка за попередньою адресою теж ревалідується"""
+    if is_content_model(sender):
+        Revalidator.object_saving(instance)
+
+
+@receiver([post_save, post_delete])
+def record_revalidation(sender, instance, **kwargs):
+    """Записує в outbox сторінки фронтенду, що показують змінений об'єкт"""
+    if is_content_model(sender):
+        Revalidator.object_changed(instance)
@@ -0,0 +1,148 @@
+# backend/apps/api/slugs.py
+"""
+Індекс слаг → id для детальних сторінок за SEO URL.
+
+Слаги перекладні (slug_uk, slug_en): для кожної мови індекс містить
+слаг з урахуванням fallback (порожній slug_en - діє slug_uk), а також
+слаги всіх мов, щоб посилання іншою мовою теж відкривалось.
+Індекс моделі зберігається в кеші (Redis) під версією та копіюється
+в пам'ять процесу; зміна моделі після коміту змінює версію.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+from modeltranslation import settings as mt_settings, utils as mt_utils
+from modeltranslation.utils import build_localized_fieldname, resolution_order
+from rest_framework.decorators import action
+import time
+import logging
+from .metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+
+class SlugIndex:
+    """
+    resolve(Project, 'my-project') -> pk або None.
+
+    Перевірка актуальності - один GET версії з кешу, сам індекс береться
+    з пам'яті процесу; після зміни версії - з кешу або одним запитом до БД.
+    """
+
+    VERSION_KEY = 'slug_index_version:{label}'
+    INDEX_KEY = 'slug_index:{label}:{version}'
+    TIMEOUT = 60 * 60 * 24
+    ANY_LANGUAGE = '*'
+
+    _querysets = {}
+    _local = {}
+
+    @staticmethod
+    def label(model):
+        return model._meta.concrete_model._meta.label_lower
+
+    @classmethod
+    def register(cls, queryset):
+        """Індексуються лише об'єкти queryset (активні)"""
+        cls._querysets[cls.label(queryset.model)] = queryset
+
+    @classmethod
+    def is_registered(cls, model):
+        return cls.label(model) in cls._querysets
+
+    @classmethod
+    def get_version(cls, label):
+        key = cls.VERSION_KEY.format(label=label)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def build(cls, label):
+        """{мова: {слаг: pk}} та {'*': {слаг будь-якої мови: pk}}"""
+        queryset = cls._querysets[label]
+        model = queryset.model
+        languages = list(mt_settings.AVAILABLE_LANGUAGES)
+        columns = [build_localized_fieldname('slug', lang) for lang in languages]
+        fallback_languages = getattr(model, 'slug').fallback_languages
+
+        index = {lang: {} for lang in languages}
+        index[cls.ANY_LANGUAGE] = {}
+        for pk, *slugs in queryset.order_by().values_list('pk', *columns):
+            values = dict(zip(languages, slugs))
+            for lang in languages:
+                for candidate in resolution_order(lang, fallback_languages):
+                    if values.get(candidate):
+                        index[lang][values[candidate]] = pk
+                        break
+            for slug in slugs:
+                if slug:
+                    index[cls.ANY_LANGUAGE].setdefault(slug, pk)
+        return index
+
+    @classmethod
+    def get_index(cls, model):
+        label = cls.label(model)
+        version = cls.get_version(label)
+        local = cls._local.get(label)
+        if local is not None and local[0] == version:
+            Metrics.cache_access('slug_index', True)
+            return local[1]
+
+        Metrics.cache_access('slug_index', False)
+        key = cls.INDEX_KEY.format(label=label, version=version)
+        index = cache.get(key)
+        if index is None:
+            index = cls.build(label)
+            cache.set(key, index, cls.TIMEOUT)
+            logger.debug(f"Індекс слагів {label} побудовано: {len(index[cls.ANY_LANGUAGE])} слагів")
+        cls._local[label] = (version, index)
+        return index
+
+    @classmethod
+    def resolve(cls, model, slug, language=None):
+        """pk за слагом активної мови, інакше за слагом будь-якої мови"""
+        index = cls.get_index(model)
+        language = language or mt_utils.get_language() or settings.LANGUAGE_CODE
+        pk = index.get(language, {}).get(slug)
+        if pk is None:
+            pk = index[cls.ANY_LANGUAGE].get(slug)
+        return pk
+
+    @classmethod
+    def invalidate(cls, model):
+        """Нова версія індексу моделі для всіх воркерів"""
+        label = cls.label(model)
+        cache.set(cls.VERSION_KEY.format(label=label), time.time_ns(), None)
+        cls._local.pop(label, None)
+
+    @classmethod
+    def object_changed(cls, model):
+        """post_save / post_delete: індекс перебудовується з закомічених даних"""
+        if cls.is_registered(model):
+            transaction.on_commit(lambda: cls.invalidate(model))
+
+
+class SlugLookupMixin:
+    """
+    Маршрут `<prefix>/slug/<slug>/` - деталі за слагом будь-якої мови.
+    Після пошуку id працює звичайний retrieve (документ деталей, політика кешу).
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if getattr(cls, 'queryset', None) is not None:
+            SlugIndex.register(cls.queryset)
+
+    @action(detail=False, methods=['get'], url_path=r'slug/(?P<slug>[-\w]+)')
+    def by_slug(self, request, slug=None):
+        """Отримати об'єкт за слагом"""
+        pk = SlugIndex.resolve(self.queryset.model, slug)
+        if pk is None:
+            raise Http404
+        self.action = 'retrieve'
+        self.kwargs = {self.lookup_url_kwarg or self.lookup_field: str(pk)}
+        return self.retrieve(request)
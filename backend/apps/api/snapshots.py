@@ -0,0 +1,443 @@
+# backend/apps/api/snapshots.py
+"""
+Статичний знімок публічного API для CDN та збірки фронтенду.
+
+Кожен GET маршрут роутера рендериться тими самими view (без HTTP, без
+обмеження частоти) для кожної мови і записується JSON файлом:
+
+    <ROOT>/<мова>/<шлях>/index.json               - /api/v1/projects/
+    <ROOT>/<мова>/<шлях>/category=3,page=2.json   - /api/v1/projects/?category=3&page=2
+    <ROOT>/manifest.json                          - маршрут -> файл, etag, розмір
+
+Маршрути: списки всіх сторінок і комбінацій фільтрів з SNAPSHOT_FILTERS
+(лише наявні в БД значення), додаткові GET дії, деталі (за id, за слагом
+мови, дії деталей) та бандли перекладів. Файл перезаписується лише при
+зміні вмісту, тож etag у маніфесті стабільний.
+
+Інкрементно (сигнали, після коміту): зміна об'єкта перерендерює списки
+його viewset та деталі самого об'єкта; зміна залежності (категорія,
+зображення) - деталі пов'язаних об'єктів. Повний знімок:
+
+    python manage.py snapshot_api --base-url https://api.example.com/
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from urllib.parse import urlencode
+from django.conf import settings
+from django.http import QueryDict
+from django.urls import resolve, Resolver404
+from django.utils.translation import override
+from modeltranslation import settings as mt_settings
+from modeltranslation.utils import build_localized_fieldname, resolution_order
+import hashlib
+import os
+import tempfile
+import time
+import logging
+from apps.common.jobs import CacheLock, DebouncedWorker
+from .benchmark import API_PREFIX, TRANSLATION_NAMESPACES
+from .documents import DocumentRequest
+from .json_codec import JSONCodec
+from .slugs import SlugLookupMixin
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+TRANSLATIONS_GROUP = 'translations'
+# Усі деталі viewset (залежність без зв'язку з конкретними об'єктами)
+ALL = None
+
+# Комбінації фільтрів списків, які використовує фронтенд: {basename: [(поля)]}
+SNAPSHOT_FILTERS = {
+    'services': [('is_featured',)],
+    'projects': [('category',), ('is_featured',), ('category', 'is_featured')],
+    'jobs': [('employment_type',), ('is_urgent',)],
+    'offices': [('office_type',)],
+}
+
+# Списки, що агрегують інші моделі: {basename: (модель)}
+SNAPSHOT_DEPENDENCIES = {
+    'projectcategory': ('projects.Project',),
+}
+
+
+def get_config():
+    """Налаштування з SNAPSHOT_SETTINGS"""
+    snapshot_settings = getattr(settings, 'SNAPSHOT_SETTINGS', {})
+    return {
+        'root': Path(snapshot_settings.get('ROOT', Path(settings.BASE_DIR) / 'snapshots')),
+        'base_url': snapshot_settings.get('BASE_URL', 'http://localhost:8000/'),
+        'filters': snapshot_settings.get('FILTERS', SNAPSHOT_FILTERS),
+        'enabled': snapshot_settings.get('ENABLED', False),
+        'async': snapshot_settings.get('ASYNC', True),
+        'delay': snapshot_settings.get('DELAY', 2),
+        'lock_timeout': snapshot_settings.get('LOCK_TIMEOUT', 600),
+        'lock_wait': snapshot_settings.get('LOCK_WAIT', 60),
+    }
+
+
+def query_string(params):
+    return urlencode(sorted(params.items()))
+
+
+class SnapshotRoute:
+    """
+    Маршрут знімка. `group` - що його перерендерює: '<basename>:list',
+    '<basename>:<pk>' або 'translations'
+    """
+
+    def __init__(self, path, params=None, group=''):
+        self.path = path
+        self.params = dict(params or {})
+        self.group = group
+
+    @property
+    def key(self):
+        query = query_string(self.params)
+        return f'{self.path}?{query}' if query else self.path
+
+    def file_name(self, locale):
+        name = query_string(self.params).replace('&', ',') or 'index'
+        return f"{locale}/{self.path[len(API_PREFIX):].strip('/')}/{name}.json"
+
+    def page(self, number):
+        return SnapshotRoute(self.path, {**self.params, 'page': number}, self.group)
+
+    def __repr__(self):
+        return f'<SnapshotRoute {self.key}>'
+
+
+class SnapshotRoutes:
+    """Перелік маршрутів знімка з роутера apps.api.urls"""
+
+    def __init__(self):
+        from .urls import router
+
+        self.registry = [(f'{API_PREFIX}{prefix}/', viewset, basename) for prefix, viewset, basename in router.registry]
+        self.filters = get_config()['filters']
+
+    def viewsets(self):
+        return {basename: (base, viewset) for base, viewset, basename in self.registry if hasattr(viewset, 'list')}
+
+    @staticmethod
+    def get_actions(viewset, detail):
+        return [
+            action for action in viewset.get_extra_actions()
+            if action.detail == detail and 'get' in action.mapping and action.__name__ != 'by_slug'
+        ]
+
+    def list_routes(self, basename):
+        """Списки (перша сторінка; наступні - за посиланням next) та дії списку"""
+        base, viewset = self.viewsets()[basename]
+        group = f'{basename}:list'
+        routes = [SnapshotRoute(base, group=group)]
+        for fields in self.filters.get(basename, ()):
+            values = viewset.queryset.order_by().values_list(*fields).distinct()
+            for combination in sorted(values, key=str):
+                if any(value is None for value in combination):
+                    continue
+                params = {
+                    field: str(value).lower() if isinstance(value, bool) else value
+                    for field, value in zip(fields, combination)
+                }
+                routes.append(SnapshotRoute(base, params, group))
+
+        for action in self.get_actions(viewset, detail=False):
+            path = f'{base}{action.url_path}/'
+            if action.__name__ == 'by_category':
+                from apps.projects.models import ProjectCategory
+
+                for slug in ProjectCategory.objects.filter(is_active=True).order_by('pk').values_list('slug', flat=True):
+                    routes.append(SnapshotRoute(path, {'category': slug}, group))
+            else:
+                routes.append(SnapshotRoute(path, group=group))
+        return routes
+
+    def detail_pks(self, basename):
+        _, viewset = self.viewsets()[basename]
+        return list(viewset.queryset.order_by('pk').values_list('pk', flat=True))
+
+    def detail_routes(self, basename, pks, locale):
+        """Деталі за id, дії деталей та деталі за слагом мови"""
+        base, viewset = self.viewsets()[basename]
+        routes = []
+        slugs = self.localized_slugs(viewset, pks, locale) if issubclass(viewset, SlugLookupMixin) else {}
+        actions = self.get_actions(viewset, detail=True)
+        for pk in pks:
+            group = f'{basename}:{pk}'
+            routes.append(SnapshotRoute(f'{base}{pk}/', group=group))
+            for action in actions:
+                routes.append(SnapshotRoute(f'{base}{pk}/{action.url_path}/', group=group))
+            if pk in slugs:
+                routes.append(SnapshotRoute(f'{base}slug/{slugs[pk]}/', group=group))
+        return routes
+
+    @staticmethod
+    def localized_slugs(viewset, pks, locale):
+        """{pk: слаг мови з fallback}"""
+        model = viewset.queryset.model
+        languages = list(mt_settings.AVAILABLE_LANGUAGES)
+        columns = [build_localized_fieldname('slug', lang) for lang in languages]
+        order = resolution_order(locale, getattr(model, 'slug').fallback_languages)
+        slugs = {}
+        for pk, *values in model._base_manager.filter(pk__in=list(pks)).values_list('pk', *columns):
+            values = dict(zip(languages, values))
+            slug = next((values[lang] for lang in order if values.get(lang)), None)
+            if slug:
+                slugs[pk] = slug
+        return slugs
+
+    @staticmethod
+    def translation_routes(locale):
+        return [
+            SnapshotRoute(
+                f'{API_PREFIX}translations/{locale}/',
+                {'namespace': namespace} if namespace else {},
+                TRANSLATIONS_GROUP,
+            )
+            for namespace in TRANSLATION_NAMESPACES
+        ]
+
+    def affected(self, instance):
+        """{basename: {pk} або ALL} - деталі, які змінює об'єкт; списки цих viewset теж"""
+        model = type(instance)
+        affected = {}
+        for basename, (_, viewset) in self.viewsets().items():
+            root = viewset.queryset.model
+            if model is root:
+                affected.setdefault(basename, set()).add(instance.pk)
+            if model._meta.label in SNAPSHOT_DEPENDENCIES.get(basename, ()):
+                affected[basename] = ALL
+
+            lookup = getattr(viewset, 'document_dependencies', {}).get(model)
+            if lookup is None or affected.get(basename, set()) is ALL:
+                continue
+            field = lookup.split('__')[0]
+            if any(f.name == field for f in model._meta.get_fields() if f.concrete):
+                pks = {getattr(instance, f'{field}_id')}
+            else:
+                pks = set(root._base_manager.filter(**{lookup: instance.pk}).values_list('pk', flat=True))
+            affected.setdefault(basename, set()).update(pk for pk in pks if pk is not None)
+        return affected
+
+
+class SnapshotWriter:
+    """
+    Рендер маршрутів та запис файлів; маніфест - {ключ маршруту: {мова: запис}}.
+    Читання, зміна та запис маніфесту - під замком каталогу для всіх воркерів.
+    """
+
+    _views = {}
+
+    def __init__(self, base_url=None):
+        config = get_config()
+        self.config = config
+        self.root = config['root']
+        self.base_url = base_url or config['base_url']
+        self.locales = [code for code, _ in settings.LANGUAGES]
+        self.routes = SnapshotRoutes()
+        self.stats = {'rendered': 0, 'written': 0, 'deleted': 0}
+
+    # ---- рендер ----
+
+    @classmethod
+    def get_view(cls, func):
+        """View маршруту без throttle: знімок - не відвідувач"""
+        if func not in cls._views:
+            initkwargs = {**getattr(func, 'initkwargs', {}), 'throttle_classes': ()}
+            if getattr(func, 'actions', None):
+                cls._views[func] = func.cls.as_view(func.actions, **initkwargs)
+            else:
+                cls._views[func] = func.cls.as_view(**initkwargs)
+        return cls._views[func]
+
+    def render(self, route, locale):
+        """(статус, bytes) відповіді GET маршруту"""
+        try:
+            match = resolve(route.path)
+        except Resolver404:
+            return 404, b''
+        request = DocumentRequest(self.base_url)
+        request.method = 'GET'
+        request.path = request.path_info = route.path
+        request.GET = QueryDict(query_string(route.params))
+        request.META['HTTP_ACCEPT_LANGUAGE'] = locale
+        with override(locale):
+            response = self.get_view(match.func)(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        self.stats['rendered'] += 1
+        return response.status_code, response.content
+
+    def render_pages(self, route, locale):
+        """[(маршрут, вміст)] маршруту та всіх наступних сторінок списку"""
+        results = []
+        page, number = route, 1
+        while page is not None:
+            status, content = self.render(page, locale)
+            if status != 200:
+                break
+            results.append((page, content))
+            data = JSONCodec.loads(content)
+            number += 1
+            page = route.page(number) if isinstance(data, dict) and data.get('next') else None
+        return results
+
+    # ---- файли ----
+
+    def lock(self):
+        return CacheLock.for_path(
+            'api_snapshot', self.root, timeout=self.config['lock_timeout'], wait=self.config['lock_wait'],
+        )
+
+    def load_manifest(self):
+        path = self.root / MANIFEST_NAME
+        if not path.exists():
+            return {'routes': {}}
+        return JSONCodec.load_file(path)
+
+    def save_manifest(self, manifest):
+        manifest['generated_at'] = datetime.now(dt_timezone.utc).isoformat(timespec='seconds')
+        manifest['base_url'] = self.base_url
+        manifest['routes'] = OrderedDict(sorted(manifest['routes'].items()))
+        self.write_file(MANIFEST_NAME, JSONCodec.dumps(manifest, indent=True))
+
+    def write_file(self, name, content):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+
+    def store(self, manifest, route, locale, content):
+        entries = manifest['routes'].setdefault(route.key, {})
+        etag = hashlib.md5(content).hexdigest()
+        name = route.file_name(locale)
+        previous = entries.get(locale)
+        if previous is None or previous['etag'] != etag or not (self.root / name).exists():
+            self.write_file(name, content)
+            self.stats['written'] += 1
+        entries[locale] = {'file': name, 'etag': etag, 'size': len(content), 'group': route.group}
+
+    def remove_stale(self, manifest, groups, rendered):
+        """Видаляє файли маршрутів груп `groups`, яких немає серед `rendered` ((ключ, мова))"""
+        for key in list(manifest['routes']):
+            entries = manifest['routes'][key]
+            for locale in list(entries):
+                entry = entries[locale]
+                if entry['group'] in groups and (key, locale) not in rendered:
+                    (self.root / entry['file']).unlink(missing_ok=True)
+                    del entries[locale]
+                    self.stats['deleted'] += 1
+            if not entries:
+                del manifest['routes'][key]
+
+    def snapshot(self, manifest, routes, locale, rendered, paginate=False):
+        for route in routes:
+            pages = self.render_pages(route, locale) if paginate else []
+            if not paginate:
+                status, content = self.render(route, locale)
+                pages = [(route, content)] if status == 200 else []
+            for page, content in pages:
+                self.store(manifest, page, locale, content)
+                rendered.add((page.key, locale))
+
+    # ---- повний та інкрементний знімок ----
+
+    def build(self):
+        """Повний знімок: усі маршрути, зайві файли видаляються"""
+        with self.lock():
+            manifest = self.load_manifest()
+            rendered = set()
+            for locale in self.locales:
+                for basename in self.routes.viewsets():
+                    self.snapshot(manifest, self.routes.list_routes(basename), locale, rendered, paginate=True)
+                    routes = self.routes.detail_routes(basename, self.routes.detail_pks(basename), locale)
+                    self.snapshot(manifest, routes, locale, rendered)
+                self.snapshot(manifest, self.routes.translation_routes(locale), locale, rendered)
+            groups = {entry['group'] for entries in manifest['routes'].values() for entry in entries.values()}
+            self.remove_stale(manifest, groups, rendered)
+            self.save_manifest(manifest)
+        return self.stats
+
+    def update(self, changes, translations=False):
+        """Інкрементно: {basename: {pk} або ALL} - списки viewset та деталі цих об'єктів"""
+        with self.lock():
+            manifest = self.load_manifest()
+            rendered, groups = set(), set()
+            for basename, pks in changes.items():
+                groups.add(f'{basename}:list')
+                if pks is ALL:
+                    pks = self.routes.detail_pks(basename)
+                    groups.update(
+                        entry['group'] for entries in manifest['routes'].values() for entry in entries.values()
+                        if entry['group'].startswith(f'{basename}:')
+                    )
+                groups.update(f'{basename}:{pk}' for pk in pks)
+                for locale in self.locales:
+                    self.snapshot(manifest, self.routes.list_routes(basename), locale, rendered, paginate=True)
+                    self.snapshot(manifest, self.routes.detail_routes(basename, sorted(pks), locale), locale, rendered)
+            if translations:
+                groups.add(TRANSLATIONS_GROUP)
+                for locale in self.locales:
+                    self.snapshot(manifest, self.routes.translation_routes(locale), locale, rendered)
+            self.remove_stale(manifest, groups, rendered)
+            self.save_manifest(manifest)
+        return self.stats
+
+
+class SnapshotJob:
+    """
+    Відкладене інкрементне оновлення знімка (SNAPSHOT_SETTINGS['ENABLED']).
+    Зміни ставляться в чергу після коміту, фоновий потік через DELAY
+    секунд обробляє їх пакетом. ASYNC=False - одразу після коміту (тести).
+    """
+
+    @staticmethod
+    def merge(queued, changes):
+        """Черга - ({basename: {pk} або ALL}, переклади)"""
+        if queued is None:
+            return changes
+        if changes is None:
+            return queued
+        affected = dict(queued[0])
+        for basename, pks in changes[0].items():
+            if pks is ALL or affected.get(basename, set()) is ALL:
+                affected[basename] = ALL
+            else:
+                affected[basename] = affected.get(basename, set()) | pks
+        return affected, queued[1] or changes[1]
+
+    worker = DebouncedWorker(
+        'api-snapshot', lambda pending: SnapshotJob.run_pending(pending), get_config, merge=merge,
+    )
+
+    @classmethod
+    def object_changed(cls, instance):
+        """post_save / post_delete"""
+        if not get_config()['enabled']:
+            return
+        affected = SnapshotRoutes().affected(instance)
+        if affected:
+            # Бандли перекладів містять динамічні переклади моделей
+            cls.worker.add_on_commit((affected, True))
+
+    @classmethod
+    def translations_changed(cls):
+        """Після зміни файлів перекладів (hot reload)"""
+        if get_config()['enabled']:
+            cls.worker.add(({}, True))
+
+    @classmethod
+    def run_pending(cls, pending):
+        affected, translations = pending
+        started = time.perf_counter()
+        stats = SnapshotWriter().update(affected, translations=translations)
+        logger.debug(
+            f"Знімок API оновлено ({', '.join(sorted(affected)) or TRANSLATIONS_GROUP}): "
+            f"{stats['rendered']} маршрутів, {stats['written']} записано, {stats['deleted']} видалено "
+            f"за {(time.perf_counter() - started) * 1000:.0f} мс"
+        )
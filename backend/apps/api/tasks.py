@@ -0,0 +1,174 @@
+# backend/apps/api/tasks.py
+from django.core.cache import cache
+from django.conf import settings
+from django.utils import timezone
+import os
+import time
+import logging
+from apps.common.jobs import DebouncedWorker
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationExportJob:
+    """
+    Відкладений (debounced) експорт перекладів для фронтенду.
+
+    Кожне збереження в Rosetta лише відмічає час запиту. Локальний
+    фоновий потік чекає, поки запити не вщухнуть на DEBOUNCE_SECONDS,
+    і виконує один експорт на всю серію збережень. Стан і блокування
+    зберігаються в кеші, тому між воркерами виконується лише один експорт.
+    """
+
+    STATUS_KEY = 'translation_export_status'
+    LAST_REQUEST_KEY = 'translation_export_last_request'
+    REQUEST_COUNT_KEY = 'translation_export_request_count'
+    RUN_LOCK_KEY = 'translation_export_lock'
+    STATE_TIMEOUT = 60 * 60 * 24
+
+    worker = DebouncedWorker(
+        'translation-export-worker',
+        lambda pending: TranslationExportJob.run_pending(),
+        lambda: TranslationExportJob.get_config(),
+    )
+
+    @classmethod
+    def get_config(cls):
+        """Налаштування експорту з TRANSLATION_EXPORT_SETTINGS"""
+        export_settings = getattr(settings, 'TRANSLATION_EXPORT_SETTINGS', {})
+        return {
+            'output_dir': export_settings.get(
+                'OUTPUT_DIR', os.path.join(settings.BASE_DIR, 'translations')
+            ),
+            'debounce': export_settings.get('DEBOUNCE_SECONDS', 10),
+            'delay': export_settings.get('DEBOUNCE_SECONDS', 10),
+            'lock_timeout': export_settings.get('LOCK_TIMEOUT', 300),
+        }
+
+    @classmethod
+    def enqueue(cls, reason='webhook'):
+        """Ставить експорт у чергу та повертає поточний статус"""
+        config = cls.get_config()
+        now = time.time()
+        cache.set(cls.LAST_REQUEST_KEY, now, cls.STATE_TIMEOUT)
+        # Лічильник окремим ключем: incr атомарний між воркерами
+        cache.add(cls.REQUEST_COUNT_KEY, 0, cls.STATE_TIMEOUT)
+        cache.incr(cls.REQUEST_COUNT_KEY)
+
+        status = cls.get_status()
+        status.update({
+            'state': 'running' if status.get('state') == 'running' else 'pending',
+            'pending': True,
+            'requested_at': timezone.now().isoformat(),
+            'scheduled_for': timezone.now().timestamp() + config['debounce'],
+            'reason': reason,
+        })
+        cls._save_status(status)
+
+        cls.worker.add()
+        return status
+
+    @classmethod
+    def get_status(cls):
+        """Повертає статус останнього/запланованого експорту"""
+        status = cache.get(cls.STATUS_KEY) or {
+            'state': 'idle',
+            'pending': False,
+        }
+        status['requests_since_last_run'] = cache.get(cls.REQUEST_COUNT_KEY, 0)
+        return status
+
+    @classmethod
+    def _save_status(cls, status):
+        status = {key: value for key, value in status.items() if key != 'requests_since_last_run'}
+        cache.set(cls.STATUS_KEY, status, cls.STATE_TIMEOUT)
+
+    @classmethod
+    def run_pending(cls):
+        """Крок воркера: чекаємо тиші, потім експортуємо"""
+        config = cls.get_config()
+        last_request = cache.get(cls.LAST_REQUEST_KEY)
+        if last_request is None:
+            return
+
+        # Запит вже оброблено іншим воркером або попереднім прогоном
+        status = cls.get_status()
+        if status.get('covered_until', 0) >= last_request:
+            return
+
+        wait = last_request + config['debounce'] - time.time()
+        if wait > 0:
+            cls.worker.add(delay=wait)
+            return
+
+        # Повторна перевірка не частіше раза на секунду (DEBOUNCE_SECONDS може бути 0)
+        retry = max(config['debounce'], 1)
+        if not cache.add(cls.RUN_LOCK_KEY, os.getpid(), config['lock_timeout']):
+            # Експорт вже виконується в іншому воркері; його прогін може не покрити
+            # наші запити, тож перевіряємо знову (covered_until відсіє зайвий прогін)
+            cls.worker.add(delay=retry)
+            return
+
+        try:
+            status = cls.run_export(covered_until=last_request)
+        finally:
+            cache.delete(cls.RUN_LOCK_KEY)
+        if status.get('pending'):
+            # Збереження під час експорту - ще один прогін після тиші
+            cls.worker.add(delay=retry)
+
+    @classmethod
+    def run_export(cls, covered_until=None):
+        """Виконує експорт синхронно та оновлює статус"""
+        from .utils import TranslationManager
+
+        config = cls.get_config()
+        started = time.monotonic()
+
+        status = cls.get_status()
+        requests_in_run = status.get('requests_since_last_run', 0)
+        status.update({
+            'state': 'running',
+            'started_at': timezone.now().isoformat(),
+        })
+        cls._save_status(status)
+
+        try:
+            TranslationManager.invalidate_translations_cache()
+            exported = TranslationManager.export_to_frontend(config['output_dir'])
+        except Exception as e:
+            logger.error(f"Помилка відкладеного експорту перекладів: {str(e)}")
+            status = cls.get_status()
+            # Не повторюємо прогон до наступного збереження
+            status.update({
+                'state': 'failed',
+                'pending': False,
+                'covered_until': covered_until or cache.get(cls.LAST_REQUEST_KEY) or 0,
+                'error': str(e),
+                'finished_at': timezone.now().isoformat(),
+            })
+            cls._save_status(status)
+            return status
+
+        status = cls.get_status()
+        last_request = cache.get(cls.LAST_REQUEST_KEY) or 0
+        covered_until = covered_until if covered_until is not None else last_request
+        has_new_requests = last_request > covered_until
+        status.update({
+            'state': 'pending' if has_new_requests else 'done',
+            'pending': has_new_requests,
+            'covered_until': covered_until,
+            'finished_at': timezone.now().isoformat(),
+            'duration_ms': round((time.monotonic() - started) * 1000, 1),
+            'exported': exported,
+            'error': None,
+        })
+        cls._save_status(status)
+        if requests_in_run:
+            try:
+                cache.decr(cls.REQUEST_COUNT_KEY, requests_in_run)
+            except ValueError:
+                # Ключ лічильника вже прострочено
+                pass
+        logger.info(f"Відкладений експорт перекладів завершено: {exported}")
+        return status
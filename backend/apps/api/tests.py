@@ -1,3 +1,1636 @@
-from django.test import TestCase
+# backend/apps/api/tests.py
+"""
+Бюджети SQL запитів для всіх viewset з apps/api/views.py,
+ідентичність CompiledSerializer звичайним серіалізаторам
+перебудова документів деталей сигналами, індекс слагів,
+інкрементне оновлення схожих проєктів, файлів sitemap та знімка API,
+ревалідація сторінок фронтенду, пул з'єднань, читання з реплік, L1 кеш
+та запобіжник кешу під час збою Redis.
 
-# Create your tests here.
+    DJANGO_SETTINGS_MODULE=ugc_backend.settings_bench python manage.py test apps.api.tests
+
+Дані генерує LoadDataGenerator (масштаб QUERY_BUDGET_SCALE, за замовчуванням tiny).
+Бюджет не повинен залежати від масштабу та розміру сторінки - запит на кожен
+рядок видно як перевищення зі списком SQL, згрупованих за місцем виклику.
+"""
+from pathlib import Path
+from xml.etree import ElementTree
+from django.conf import settings as django_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connection, connections, transaction
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone, translation
+from django.utils.translation import gettext_lazy
+from django_redis import get_redis_connection
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from decouple import config
+from io import StringIO
+import json
+import os
+import shutil
+import sys
+import tempfile
+from unittest import mock, skipUnless
+from uuid import UUID
+from redis import ConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+import threading
+import time
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from apps.api.benchmark import (
+    API_PREFIX, BenchmarkRunner, Scenario, category_params, contact_inquiry_payload, discover_scenarios, partner_inquiry_payload,
+    sample_search_term,
+)
+from apps.api.cache_policy import SurrogateKeyPurger
+from apps.api.compiled import CompiledSerializer
+from apps.api.documents import DetailDocumentStore
+from apps.api.hot_reload import TranslationFileWatcher, TranslationReloader
+from apps.api.json_codec import FastJSONRenderer, JSONCodec, OrjsonBackend, RedisJSONSerializer
+from apps.api.metrics import Metrics
+from apps.api.mock_cdn import MockCDNServer
+from apps.api.models import DetailDocument, RequestProfile, RevalidationRequest
+from apps.api.profiling import ProfileSignature
+from apps.api.replicas import ReplicaHealth
+from apps.api.resilient_cache import CircuitBreaker, ResilientRedisClient
+from apps.api.response_cache import ResponseCacheTags
+from apps.api.revalidation import Revalidator
+from apps.api.slugs import SlugIndex
+from apps.api.snapshots import SnapshotJob, SnapshotWriter
+from apps.api.tasks import TranslationExportJob
+from apps.api.translations_views import StaticTranslationIndex
+from apps.api.tiered_cache import L1Invalidation, LocalLRU, TieredRedisClient
+from apps.api.query_budget import QueryBudget, run_query_budget
+from apps.api.serializers import ProjectCategorySerializer, ProjectListSerializer, ServiceListSerializer, WorkplacePhotoSerializer
+from apps.api.urls import router
+from apps.api.views import ProjectViewSet, ServiceViewSet
+from apps.common.jobs import CacheLock, DebouncedWorker, LockTimeout
+from apps.common.loadgen import SCALES, LoadDataGenerator
+from apps.common.managers import localized_field_names
+from apps.common.richtext import NoDerivativesImageBuilder, get_render_config, render_richtext
+from apps.common.recommendations import RecommendationBuilder, get_spec
+from apps.common.sitemaps import SitemapGenerator, SitemapJob
+from apps.contacts.models import Office
+from apps.content.models import AboutPage, TeamMember
+from apps.jobs.models import WorkplacePhoto
+from apps.projects.models import Project, ProjectCategory, RelatedProject
+from apps.partners.models import PartnershipInfo, WorkStage
+from apps.services.models import Service
+from ugc_backend.database import configure_database
+
+QUERY_BUDGET_SCALE = config('QUERY_BUDGET_SCALE', default='tiny')
+PAGE_SIZES = (10, 50)
+# Фонові потоки не бачать транзакцію тесту - оновлення одразу після коміту
+SYNC_JOBS = {
+    'RECOMMENDATION_SETTINGS': {'ASYNC': False},
+    'SITEMAP_SETTINGS': {'ASYNC': False, 'ROOT': Path(tempfile.gettempdir()) / 'ugc-test-sitemaps'},
+}
+
+
+def list_budgets(basename, prefix, max_queries, **kwargs):
+    """Бюджет списку для кожного розміру сторінки"""
+    return [
+        QueryBudget(f'{basename}.list', f'{API_PREFIX}{prefix}/', max_queries, page_size=page_size, **kwargs)
+        for page_size in PAGE_SIZES
+    ]
+
+
+BUDGETS = [
+    QueryBudget('homepage.list', f'{API_PREFIX}homepage/', 2),
+    QueryBudget('homepage.retrieve', f'{API_PREFIX}homepage/{{pk}}/', 1),
+    QueryBudget('about.list', f'{API_PREFIX}about/', 2),
+    QueryBudget('about.retrieve', f'{API_PREFIX}about/{{pk}}/', 1),
+
+    *list_budgets('services', 'services', 2),
+    QueryBudget('services.search', f'{API_PREFIX}services/', 2,
+                params=lambda: {'search': sample_search_term(ServiceViewSet)}),
+    # Документи деталей прогріто (як build_detail_documents) - retrieve лише шукає документ
+    QueryBudget('services.retrieve', f'{API_PREFIX}services/{{pk}}/', 1),
+    # Індекс слагів будується одним запитом (кеш очищено)
+    QueryBudget('services.by_slug', f'{API_PREFIX}services/slug/{{slug}}/', 2),
+    QueryBudget('services.featured', f'{API_PREFIX}services/featured/', 1),
+    QueryBudget('services.similar', f'{API_PREFIX}services/{{pk}}/similar/', 1),
+
+    *list_budgets('projectcategory', 'project-categories', 2),
+    QueryBudget('projectcategory.retrieve', f'{API_PREFIX}project-categories/{{pk}}/', 1),
+    QueryBudget('projectcategory.by_slug', f'{API_PREFIX}project-categories/slug/{{slug}}/', 2),
+
+    *list_budgets('projects', 'projects', 3),
+    QueryBudget('projects.search', f'{API_PREFIX}projects/', 3,
+                params=lambda: {'search': sample_search_term(ProjectViewSet)}),
+    QueryBudget('projects.retrieve', f'{API_PREFIX}projects/{{pk}}/', 1),
+    QueryBudget('projects.by_slug', f'{API_PREFIX}projects/slug/{{slug}}/', 2),
+    QueryBudget('projects.featured', f'{API_PREFIX}projects/featured/', 2),
+    QueryBudget('projects.by_category', f'{API_PREFIX}projects/by_category/', 3, params=category_params),
+    # Схожі проєкти - один JOIN з таблицею зв'язків, плюс лічильники категорій
+    QueryBudget('projects.related', f'{API_PREFIX}projects/{{pk}}/related/', 2),
+
+    *list_budgets('jobs', 'jobs', 2),
+    QueryBudget('jobs.retrieve', f'{API_PREFIX}jobs/{{pk}}/', 1),
+    QueryBudget('jobs.by_slug', f'{API_PREFIX}jobs/slug/{{slug}}/', 2),
+    QueryBudget('jobs.urgent', f'{API_PREFIX}jobs/urgent/', 1),
+    QueryBudget('jobs.active', f'{API_PREFIX}jobs/active/', 1),
+    QueryBudget('jobapplications.create', f'{API_PREFIX}job-applications/', 2, method='post', status=400, login=True),
+
+    *list_budgets('offices', 'offices', 2),
+    QueryBudget('offices.retrieve', f'{API_PREFIX}offices/{{pk}}/', 1),
+    QueryBudget('offices.main', f'{API_PREFIX}offices/main/', 1),
+    QueryBudget('contactinquiries.create', f'{API_PREFIX}contact-inquiries/', 1, method='post',
+                data=contact_inquiry_payload(0), status=201),
+
+    QueryBudget('partnershipinfo.list', f'{API_PREFIX}partnership-info/', 2),
+    QueryBudget('partnershipinfo.retrieve', f'{API_PREFIX}partnership-info/{{pk}}/', 1),
+    QueryBudget('partnerinquiries.create', f'{API_PREFIX}partner-inquiries/', 1, method='post',
+                data=partner_inquiry_payload(0), status=201),
+
+    *list_budgets('workplacephotos', 'workplace-photos', 2),
+    QueryBudget('workplacephotos.retrieve', f'{API_PREFIX}workplace-photos/{{pk}}/', 1),
+]
+
+
+@override_settings(TRANSLATION_EXPORT_SETTINGS={'DEBOUNCE_SECONDS': 0})
+class TranslationExportTests(TestCase):
+    """Серія збережень у Rosetta дає один експорт; воркер без блокування його не дублює"""
+
+    KEYS = (
+        TranslationExportJob.STATUS_KEY, TranslationExportJob.LAST_REQUEST_KEY,
+        TranslationExportJob.REQUEST_COUNT_KEY, TranslationExportJob.RUN_LOCK_KEY,
+    )
+
+    def setUp(self):
+        cache.delete_many(self.KEYS)
+        self.addCleanup(cache.delete_many, self.KEYS)
+        # Крок воркера запускається вручну
+        worker = mock.patch.object(TranslationExportJob.worker, 'add')
+        worker.start()
+        self.addCleanup(worker.stop)
+        export = mock.patch('apps.api.utils.TranslationManager.export_to_frontend', return_value={'uk': 1})
+        self.export = export.start()
+        self.addCleanup(export.stop)
+
+    def test_burst_runs_one_export(self):
+        for _ in range(3):
+            self.assertEqual(self.client.post(f'{API_PREFIX}webhooks/translations/').status_code, 202)
+        self.assertEqual(TranslationExportJob.get_status()['requests_since_last_run'], 3)
+
+        TranslationExportJob.run_pending()
+        TranslationExportJob.run_pending()
+        self.export.assert_called_once()
+        status = TranslationExportJob.get_status()
+        self.assertEqual(status['state'], 'done')
+        self.assertEqual(status['requests_since_last_run'], 0)
+
+    def test_running_export_is_not_duplicated(self):
+        TranslationExportJob.enqueue()
+        cache.add(TranslationExportJob.RUN_LOCK_KEY, 'other-worker', 60)
+        TranslationExportJob.run_pending()
+        self.export.assert_not_called()
+        self.assertTrue(TranslationExportJob.get_status()['pending'])
+
+    def test_locked_export_is_rescheduled(self):
+        # Інший воркер завершив експорт, що не покрив наших запитів - прогін не губиться
+        TranslationExportJob.enqueue()
+        cache.add(TranslationExportJob.RUN_LOCK_KEY, 'other-worker', 60)
+        TranslationExportJob.worker.add.reset_mock()
+        TranslationExportJob.run_pending()
+        TranslationExportJob.worker.add.assert_called_once_with(delay=1)
+
+        cache.delete(TranslationExportJob.RUN_LOCK_KEY)
+        TranslationExportJob.run_pending()
+        self.export.assert_called_once()
+        self.assertEqual(TranslationExportJob.get_status()['state'], 'done')
+
+    def test_save_during_export_is_rescheduled(self):
+        def export(output_dir):
+            # Збереження в Rosetta, поки експорт ще пише файли
+            TranslationExportJob.enqueue()
+            cache.set(TranslationExportJob.LAST_REQUEST_KEY, time.time() + 1, 60)
+            return {'uk': 1}
+
+        self.export.side_effect = export
+        TranslationExportJob.enqueue()
+        TranslationExportJob.worker.add.reset_mock()
+        TranslationExportJob.run_pending()
+        self.assertTrue(TranslationExportJob.get_status()['pending'])
+        TranslationExportJob.worker.add.assert_called_with(delay=1)
+
+    def test_status_requires_staff(self):
+        path = f'{API_PREFIX}webhooks/translations/status/'
+        TranslationExportJob.enqueue()
+        self.assertEqual(self.client.get(path).status_code, 403)
+        self.client.force_login(get_user_model().objects.create_user('staff', is_staff=True))
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('output_dir', response.json()['job'])
+
+
+class TranslationReloadTests(TestCase):
+    """Змінений JSON перекладів підхоплюється без рестарту; підписка стартує з першим запитом"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        settings = override_settings(STATIC_TRANSLATIONS_DIR=str(self.root))
+        settings.enable()
+        self.addCleanup(settings.disable)
+        StaticTranslationIndex.reload()
+        self.addCleanup(StaticTranslationIndex.reload)
+
+    def write(self, data, mtime_ns):
+        path = self.root / 'en.json'
+        JSONCodec.dump_file(data, path)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def test_edited_file_is_reloaded(self):
+        self.assertIsNone(StaticTranslationIndex.get('en'))
+        path = self.write({'nav.home': 'Home'}, 1_000_000_000)
+        self.assertEqual(StaticTranslationIndex.get('en'), {'nav.home': 'Home'})
+        self.write({'nav.home': 'Start'}, 2_000_000_000)
+        self.assertEqual(StaticTranslationIndex.get('en'), {'nav.home': 'Start'})
+        # Watcher стежить за тим самим каталогом
+        self.assertEqual(TranslationFileWatcher(interval=1).tracked_files()[str(path)], ('static', 'en'))
+        path.unlink()
+        self.assertIsNone(StaticTranslationIndex.get('en'))
+
+    def test_reload_resets_gettext_catalogs(self):
+        from django.utils.translation import trans_real
+
+        with translation.override('en'):
+            translation.gettext('Home')
+        self.assertIn('en', trans_real._translations)
+        TranslationReloader.reload_local('en', kind='po')
+        self.assertEqual(trans_real._translations, {})
+        with translation.override('en'):
+            self.assertEqual(translation.get_language(), 'en')
+            translation.gettext('Home')
+        self.assertIn('en', trans_real._translations)
+
+    def test_subscriber_starts_on_first_request(self):
+        self.addCleanup(setattr, TranslationReloader, '_unsupported', False)
+        with mock.patch.object(TranslationReloader, '_listen') as listen:
+            TranslationReloader.on_request_started()
+            TranslationReloader._subscriber.join(1)
+            listen.assert_called_once()
+        TranslationReloader._unsupported = True
+        with mock.patch.object(TranslationReloader, 'start_subscriber') as start:
+            TranslationReloader.on_request_started()
+            start.assert_not_called()
+
+
+class LocalizedProjectionTests(TestCase):
+    """Проєкція вибирає колонки активної мови та її fallback, без дозавантаження"""
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=19, images=False).generate('tiny')
+        cls.project = Project.objects.filter(is_active=True).order_by('pk').first()
+        Project.objects.filter(pk=cls.project.pk).update(title_en=None)
+
+    def test_projection_omits_other_columns(self):
+        with translation.override('en'):
+            sql = str(ProjectListSerializer.project_queryset(Project.objects.all()).query)
+        self.assertIn('"projects_project"."title_en"', sql)
+        for column in ('title', 'detailed_description_uk', 'detailed_description_en', 'challenge_en'):
+            self.assertNotIn(f'"projects_project"."{column}"', sql)
+
+        # Без fallback - лише колонка активної мови
+        with mock.patch.object(Project.title, 'fallback_languages', {'default': ()}):
+            self.assertEqual(localized_field_names(Project, ['title', 'category__name'], 'en'), [
+                'title_en', 'category__name_en', 'category__name_uk',
+            ])
+
+    def test_fallback_without_extra_queries(self):
+        queryset = ProjectListSerializer.project_queryset(Project.objects.filter(pk=self.project.pk))
+        with translation.override('en'), self.assertNumQueries(1):
+            project = queryset.get()
+            self.assertEqual(project.title, self.project.title_uk)
+            self.assertEqual(project.category.name, project.category.name_en)
+
+
+class ExcerptTests(TestCase):
+    """Списки віддають plain-text уривок замість RichText HTML"""
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=21, images=False).generate('tiny')
+        cls.service = Service.objects.filter(is_active=True).order_by('order').first()
+
+    def test_excerpt_is_stored_on_save(self):
+        self.service.short_description_uk = '<p>Пошиття&nbsp;<strong>уніформи</strong> &amp; спецодягу</p>\n' + '<p>x</p>\n' * 400
+        self.service.save(update_fields=['short_description_uk'])
+        self.service.refresh_from_db()
+        self.assertTrue(self.service.excerpt_uk.startswith('Пошиття уніформи & спецодягу x x'))
+        self.assertLessEqual(len(self.service.excerpt_uk), 300)
+
+        item = next(
+            item for item in self.client.get(f'{API_PREFIX}services/', HTTP_ACCEPT_LANGUAGE='uk').json()['results']
+            if item['id'] == self.service.pk
+        )
+        self.assertEqual(item['excerpt'], self.service.excerpt_uk)
+        self.assertNotIn('short_description', item)
+
+
+class RichTextTests(TestCase):
+    """Санітизація HTML з CKEditor; невідрендерений запис читається без запитів і запису у сховище"""
+
+    CASES = (
+        ('<p>Hi<script>alert(1)</script></p>', '<p>Hi</p>'),
+        ('<p><SCRIPT>bad</SCRIPT>ok</p>', '<p>ok</p>'),
+        ('<p onclick="x()" onmouseover="y">Hi</p>', '<p>Hi</p>'),
+        ('<p><a href="javascript:alert(1)">x</a></p>', '<p>x</p>'),
+        ('<p><a href=" JAVASCRIPT:alert(1)">x</a></p>', '<p>x</p>'),
+        ('<p><a href="&#106;avascript:alert(1)">x</a></p>', '<p>x</p>'),
+        ('<p><a href="jav&#x09;ascript:alert(1)">x</a></p>', '<p>x</p>'),
+        ('<p><a href="data:text/html;base64,PHNjcmlwdD4=">x</a></p>', '<p>x</p>'),
+        ('<p><img src="data:image/svg+xml;base64,AAA" onerror="x"></p>', ''),
+        ('<style>p{color:red}</style><p style="color:red" class="c">x</p>', '<p>x</p>'),
+        ('<p>&lt;script&gt;</p>', '<p>&lt;script&gt;</p>'),
+        ('<p><a href="https://example.com" target="_blank">x</a></p>',
+         '<p><a href="https://example.com" target="_blank" rel="noopener noreferrer">x</a></p>'),
+    )
+
+    def test_sanitizer(self):
+        images = NoDerivativesImageBuilder(get_render_config())
+        for source, expected in self.CASES:
+            with self.subTest(source=source):
+                self.assertEqual(render_richtext(source, images), expected)
+
+    def test_unrendered_record_is_read_only(self):
+        LoadDataGenerator(seed=23, images=False).generate('tiny')
+        category = ProjectCategory.objects.order_by('pk').first()
+        ProjectCategory.objects.filter(pk=category.pk).update(
+            description_uk='<p onclick="x()">Опис<img src="/media/x.jpg"></p>', rendered_html={},
+        )
+        with mock.patch('apps.common.richtext.default_storage') as storage:
+            category = ProjectCategory.objects.get(pk=category.pk)
+            self.assertEqual(
+                category.get_rendered_html('description', 'uk'),
+                '<p>Опис<img src="/media/x.jpg" loading="lazy" decoding="async"></p>',
+            )
+            # Проєкція серіалізатора без сирих колонок - без запиту на кожен рядок
+            queryset = ProjectCategorySerializer.project_queryset(ProjectCategory.objects.filter(pk=category.pk))
+            with self.assertNumQueries(1):
+                self.assertEqual(queryset.get().get_rendered_html('description', 'uk'), '')
+        storage.open.assert_not_called()
+        storage.save.assert_not_called()
+
+
+class ResponseCacheTests(TestCase):
+    """Ключ кешу відповідей: лише значущі параметри, окремо мова та хост; зміна залежності інвалідує"""
+
+    PATH = f'{API_PREFIX}project-categories/'
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=25, images=False).generate('tiny')
+
+    def setUp(self):
+        cache.clear()
+
+    def status(self, params=None, **headers):
+        response = self.client.get(self.PATH, params or {}, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response['X-Response-Cache']
+
+    def test_key_normalisation(self):
+        self.assertEqual(self.status(), 'MISS')
+        # page_size пагінатор не приймає - на відповідь не впливає
+        self.assertEqual(self.status({'utm_source': 'newsletter', 'page': '', 'page_size': 5}), 'HIT')
+        self.assertEqual(self.status({'page': 1}), 'MISS')
+        self.assertEqual(self.status({'fbclid': 'x', 'page': 1}), 'HIT')
+
+        self.assertEqual(self.status(HTTP_ACCEPT_LANGUAGE='en'), 'MISS')
+        self.assertEqual(self.status(HTTP_ACCEPT_LANGUAGE='en'), 'HIT')
+        self.assertEqual(self.status(HTTP_HOST='api.example.com'), 'MISS')
+
+    def test_dependency_change_invalidates(self):
+        self.status()
+        self.assertEqual(self.status(), 'HIT')
+        # projects_count категорій залежить від проєктів (cache_dependencies)
+        Project.objects.filter(is_active=True).first().save()
+        self.assertEqual(self.status(), 'MISS')
+        self.assertEqual(self.status(), 'HIT')
+
+
+class CDNPurgeTests(TestCase):
+    """Збереження очищує в mock CDN ключі з Surrogate-Key відповідей; мова з cookie - не public"""
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=27, images=False).generate('tiny')
+        cls.project = Project.objects.filter(is_active=True).order_by('pk').first()
+
+    def setUp(self):
+        cache.clear()
+        self.server = MockCDNServer(('127.0.0.1', 0))
+        url = self.server.start_in_background()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        settings = override_settings(
+            **SYNC_JOBS,
+            CDN_PURGE_SETTINGS={'ENABLED': True, 'URL': f'{url}purge', 'TOKEN': 'secret', 'ASYNC': False},
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def purged_keys(self):
+        return {key for record in self.server.requests if 'status' not in record for key in record['surrogate_keys']}
+
+    def test_save_purges_response_keys(self):
+        detail = self.client.get(f'{API_PREFIX}projects/{self.project.pk}/')
+        listing = self.client.get(f'{API_PREFIX}projects/')
+        self.assertIn(f'projects.project:{self.project.pk}', detail['Surrogate-Key'].split())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+
+        purged = self.purged_keys()
+        self.assertIn(f'projects.project:{self.project.pk}', purged)
+        self.assertIn('projects.project', set(listing['Surrogate-Key'].split()) & purged)
+        self.assertTrue(all(record['path'] == '/purge' and record['authorization'] for record in self.server.requests))
+
+    def test_failed_purge_is_retried(self):
+        # окремі відправки після коміту: ключі об'єкта та кеш перекладів
+        self.server.fail_next(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        self.assertFalse(self.purged_keys())
+        self.assertIn(f'projects.project:{self.project.pk}', SurrogateKeyPurger.worker.pending)
+
+        other = Project.objects.filter(is_active=True).exclude(pk=self.project.pk).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            other.save()
+        self.assertIsNone(SurrogateKeyPurger.worker.pending)
+        self.assertLessEqual({f'projects.project:{self.project.pk}', f'projects.project:{other.pk}'}, self.purged_keys())
+
+    def test_only_failed_batch_is_requeued(self):
+        keys = ['a', 'b', 'c']
+        self.server.fail_next()
+        with override_settings(CDN_PURGE_SETTINGS={**django_settings.CDN_PURGE_SETTINGS, 'MAX_KEYS_PER_REQUEST': 1}):
+            SurrogateKeyPurger.worker.add(set(keys))
+        # Очищені пакети не повторюються
+        self.assertEqual(SurrogateKeyPurger.worker.pending, {'a'})
+        self.assertEqual(self.purged_keys(), {'b', 'c'})
+        self.addCleanup(SurrogateKeyPurger.worker.run_pending)
+
+    def test_cookie_language_is_not_public(self):
+        path = f'{API_PREFIX}projects/'
+        response = self.client.get(path, HTTP_ACCEPT_LANGUAGE='en')
+        self.assertTrue(response['Cache-Control'].startswith('public'))
+        self.assertIn('s-maxage', response['Cache-Control'])
+        self.assertIn('Accept-Language', response['Vary'])
+
+        self.client.cookies[django_settings.LANGUAGE_COOKIE_NAME] = 'en'
+        response = self.client.get(path)
+        self.assertTrue(response['Cache-Control'].startswith('private'))
+        self.assertNotIn('s-maxage', response['Cache-Control'])
+        # мова перекладів задана в URL - cookie на неї не впливає
+        response = self.client.get(f'{API_PREFIX}translations/en/')
+        self.assertTrue(response['Cache-Control'].startswith('public'))
+
+
+class CorsTests(TestCase):
+    """ApiEdgeMiddleware: preflight, чужий origin, credentials та Vary: Origin"""
+
+    ORIGIN = 'http://localhost:3000'
+    PATH = f'{API_PREFIX}project-categories/'
+
+    def preflight(self, origin, method='POST'):
+        return self.client.options(
+            f'{API_PREFIX}contact-inquiries/', HTTP_ORIGIN=origin, HTTP_ACCESS_CONTROL_REQUEST_METHOD=method,
+        )
+
+    def test_preflight(self):
+        with self.assertNumQueries(0):
+            response = self.preflight(self.ORIGIN)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Access-Control-Allow-Origin'], self.ORIGIN)
+        self.assertIn('POST', response['Access-Control-Allow-Methods'])
+        self.assertIn('content-type', response['Access-Control-Allow-Headers'])
+        self.assertEqual(response['Access-Control-Max-Age'], '86400')
+        self.assertIn('origin', response['Vary'].lower())
+
+    def test_disallowed_origin(self):
+        response = self.preflight('https://evil.example.com')
+        self.assertNotIn('Access-Control-Allow-Origin', response)
+        self.assertNotIn('Access-Control-Allow-Methods', response)
+
+        response = self.client.get(self.PATH, HTTP_ORIGIN='https://evil.example.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Access-Control-Allow-Origin', response)
+        self.assertNotIn('Access-Control-Allow-Credentials', response)
+
+    def test_credentials(self):
+        response = self.client.get(self.PATH, HTTP_ORIGIN=self.ORIGIN)
+        self.assertEqual(response['Access-Control-Allow-Origin'], self.ORIGIN)
+        self.assertEqual(response['Access-Control-Allow-Credentials'], 'true')
+
+    @override_settings(CORS_ALLOW_ALL_ORIGINS=True)
+    def test_credentials_never_use_wildcard(self):
+        response = self.client.get(self.PATH, HTTP_ORIGIN='https://any.example.com')
+        self.assertEqual(response['Access-Control-Allow-Origin'], 'https://any.example.com')
+
+    def test_vary_origin(self):
+        # Відповідь без Origin теж кешується спільно - Vary є завжди
+        for headers in ({}, {'HTTP_ORIGIN': self.ORIGIN}):
+            vary = {value.strip().lower() for value in self.client.get(self.PATH, **headers)['Vary'].split(',')}
+            self.assertLessEqual({'origin', 'accept-language'}, vary)
+
+
+class MetricsTests(TestCase):
+    """/metrics лише з токеном; прирости воркерів сумуються в Redis"""
+
+    METRICS = {'ENABLED': True, 'TOKEN': 'secret', 'FLUSH_INTERVAL': 5, 'REDIS_KEY': 'ugc:metrics:test'}
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=29, images=False).generate('tiny')
+
+    def setUp(self):
+        cache.clear()
+        settings = override_settings(METRICS_SETTINGS=self.METRICS)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.redis = get_redis_connection('default')
+        self.addCleanup(self.redis.delete, self.METRICS['REDIS_KEY'])
+        Metrics.flush()
+        self.redis.delete(self.METRICS['REDIS_KEY'])
+
+    def scrape(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        return response.content.decode('utf-8')
+
+    def test_token_required(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        with override_settings(METRICS_SETTINGS={**self.METRICS, 'TOKEN': ''}):
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code, 404)
+
+    def test_requests_and_cache_families(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get(f'{API_PREFIX}services/featured/').status_code, 200)
+        body = self.scrape()
+        self.assertIn('# TYPE ugc_http_request_duration_seconds histogram', body)
+        self.assertIn(
+            'ugc_http_requests_total{view="ServiceViewSet",action="featured",method="GET",status="200"} 2', body,
+        )
+        for result in ('hit', 'miss'):
+            self.assertIn(
+                f'ugc_cache_requests_total{{family="response_cache",result="{result}",view="ServiceViewSet.featured"}} 1',
+                body,
+            )
+
+    def test_workers_are_aggregated(self):
+        series = 'ugc_throttled_requests_total{view="test",action="get"}'
+        Metrics.inc('ugc_throttled_requests_total', (('view', 'test'), ('action', 'get')))
+        Metrics.flush()
+        # Прирости іншого воркера в тому ж hash
+        self.redis.hincrbyfloat(self.METRICS['REDIS_KEY'], series, 2)
+        Metrics.observe('ugc_db_queries_per_request', 3, (('view', 'test'), ('action', 'get')), buckets=(2, 5))
+
+        collected = Metrics.collect()
+        self.assertEqual(collected[series], 3)
+        self.assertEqual(collected['ugc_db_queries_per_request_bucket{view="test",action="get",le="2.0"}'], 0)
+        self.assertEqual(collected['ugc_db_queries_per_request_bucket{view="test",action="get",le="5.0"}'], 1)
+        self.assertEqual(collected['ugc_db_queries_per_request_count{view="test",action="get"}'], 1)
+        self.assertIn(f'{series} 3', self.scrape())
+
+    def test_outage_deltas_are_merged_on_recovery(self):
+        series = 'ugc_throttled_requests_total{view="test",action="get"}'
+        labels = (('view', 'test'), ('action', 'get'))
+        with mock.patch.object(Metrics, '_redis', return_value=None):
+            Metrics.inc('ugc_throttled_requests_total', labels, 2)
+            Metrics.flush()
+            self.assertEqual(Metrics.collect()[series], 2)
+        self.assertIsNone(self.redis.hget(self.METRICS['REDIS_KEY'], series))
+
+        # Після відновлення Redis прирости періоду збою додаються до спільного hash
+        self.redis.hincrbyfloat(self.METRICS['REDIS_KEY'], series, 5)
+        Metrics.inc('ugc_throttled_requests_total', labels)
+        self.assertEqual(Metrics.collect()[series], 8)
+        Metrics.flush()
+        self.assertEqual(float(self.redis.hget(self.METRICS['REDIS_KEY'], series)), 8)
+
+    def test_flush_at_exit_registered_by_first_request(self):
+        self.addCleanup(setattr, Metrics, '_exit_registered', Metrics._exit_registered)
+        Metrics._exit_registered = False
+        with mock.patch('apps.api.metrics.atexit.register') as register:
+            self.client.get(f'{API_PREFIX}offices/')
+            self.client.get(f'{API_PREFIX}offices/')
+        register.assert_called_once_with(Metrics.flush)
+
+
+@override_settings(PROFILING_SETTINGS={'ENABLED': True, 'SAMPLE_RATE': 0, 'BACKEND': 'cprofile'})
+class ProfilingGateTests(TestCase):
+    """Без вибірки профілюється лише запит з валідним підписом для того ж шляху"""
+
+    PATH = f'{API_PREFIX}offices/'
+
+    def get(self, signature=None, path=PATH):
+        headers = {'HTTP_X_PROFILE': signature} if signature is not None else {}
+        response = self.client.get(path, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_unsigned_requests_are_not_profiled(self):
+        expired = int(time.time()) - 2 * 60 * 60
+        for signature in (
+            None,
+            '',
+            'garbage',
+            f'{int(time.time())}:' + '0' * 64,
+            ProfileSignature.sign(f'{API_PREFIX}projects/'),
+            ProfileSignature.sign(self.PATH, expired),
+        ):
+            with self.subTest(signature=signature):
+                self.assertNotIn('X-Profile-Id', self.get(signature))
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_signed_request_is_profiled(self):
+        response = self.get(ProfileSignature.sign(self.PATH))
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual((profile.trigger, profile.path, profile.backend), ('header', self.PATH, 'cprofile'))
+        self.assertTrue(profile.collapsed_stacks)
+
+
+class BenchmarkCommandTests(TestCase):
+    """Смоук run_benchmark: звіт з усіма сценаріями, базовий прогін та порівняння з ним"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp(prefix='ugc-bench-'))
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def run_benchmark(self, *args):
+        out = StringIO()
+        call_command(
+            'run_benchmark', '--scale', 'tiny', '--iterations', '1', '--warmup', '0',
+            '--baseline', str(self.directory / 'baseline.json'), *args, stdout=out,
+        )
+        return out.getvalue()
+
+    def test_run_and_compare(self):
+        self.run_benchmark('--output', str(self.directory / 'first.json'), '--save-baseline')
+        report = json.loads((self.directory / 'first.json').read_text(encoding='utf-8'))
+        self.assertEqual(report['meta']['counts']['projects'], SCALES['tiny']['projects'])
+        names = set(report['results'])
+        for name in ('projects.list[uk]', 'projects.retrieve[en]', 'services.featured[uk]', 'translations[en:all:all]'):
+            self.assertIn(name, names)
+        self.assertIn('projects.by_slug[en]', names)
+        for name, result in report['results'].items():
+            self.assertEqual(result['requests'], 1, name)
+            self.assertEqual(result['errors'], 0, f"{name}: {result['statuses']}")
+        self.assertEqual(json.loads((self.directory / 'baseline.json').read_text(encoding='utf-8')), report)
+
+        output = self.run_benchmark('--skip-seed', '--only', 'projects.list', '--output', str(self.directory / 'second.json'))
+        self.assertIn('Порівняння з', output)
+        self.assertRegex(output, r'Регресій: \d+, сценаріїв у порівнянні: \d+')
+
+    def test_by_slug_scenarios_use_locale_slugs(self):
+        LoadDataGenerator(seed=31, images=False).generate('tiny')
+        scenarios = {scenario.name: scenario for scenario in discover_scenarios()}
+        uk, en = scenarios['projects.by_slug[uk]'].paths(), scenarios['projects.by_slug[en]'].paths()
+        project = Project.objects.order_by('pk').first()
+        self.assertEqual(uk[0], f'{API_PREFIX}projects/slug/{project.slug_uk}/')
+        self.assertEqual(en[0], f'{API_PREFIX}projects/slug/{project.slug_en}/')
+        for path in uk[:3] + en[:3]:
+            self.assertEqual(self.client.get(path).status_code, 200, path)
+
+    @override_settings(BENCHMARK_SETTINGS=None)
+    def test_requires_bench_settings(self):
+        with self.assertRaises(CommandError):
+            self.run_benchmark()
+
+
+class LoadDataCommandTests(TestCase):
+    """Смоук generate_load_data: масштаб з перевизначеннями, однаковий seed - однакові дані"""
+
+    def generate(self, *args):
+        out = StringIO()
+        call_command('generate_load_data', '--scale', 'tiny', '--no-images', '--seed', '5', *args, stdout=out)
+        return out.getvalue()
+
+    def snapshot(self):
+        return list(Project.objects.order_by('slug_uk').values_list('slug_uk', 'slug_en', 'title_en', 'category__slug'))
+
+    def child_counts(self):
+        return {model._meta.label: model.objects.count() for model in (AboutPage, TeamMember, PartnershipInfo, WorkStage)}
+
+    def test_generate_is_reproducible(self):
+        output = self.generate('--flush', '--projects', '7')
+        self.assertIn('projects=7', output)
+        self.assertEqual(Project.objects.count(), 7)
+        self.assertEqual(ProjectCategory.objects.count(), SCALES['tiny']['categories'])
+        first = self.snapshot()
+        self.assertTrue(all(slug_uk and slug_en for slug_uk, slug_en, _, _ in first))
+        counts = self.child_counts()
+
+        # дочірні записи сторінок із попереднього запуску не мають пережити --flush
+        TeamMember.objects.create(name='Стара', position='Інженер', photo='team/old.jpg')
+        WorkStage.objects.create(title='Старий етап', description='Опис')
+
+        self.generate('--flush', '--projects', '7')
+        self.assertEqual(self.snapshot(), first)
+        self.assertEqual(self.child_counts(), counts)
+
+    @override_settings(DEBUG=False, BENCHMARK_SETTINGS=None)
+    def test_refuses_production_settings(self):
+        with self.assertRaises(CommandError):
+            self.generate()
+
+
+class JSONCodecTests(TestCase):
+    """Decimal, дати, UUID та lazy рядки: той самий JSON, що й стандартні енкодери, з orjson і без нього"""
+
+    VALUE = {
+        'price': Decimal('12.50'),
+        'date': date(2024, 2, 29),
+        'created_at': datetime(2024, 2, 29, 13, 5, 7, 123456, tzinfo=dt_timezone.utc),
+        'id': UUID('12345678-1234-5678-1234-567812345678'),
+        'title': gettext_lazy('Послуги'),
+        'items': [{'amount': Decimal('0.1'), 'day': date(2024, 1, 1)}],
+    }
+
+    def setUp(self):
+        self.addCleanup(JSONCodec.reset)
+
+    def without_orjson(self):
+        # None у sys.modules - import падає з ImportError, як без пакета
+        return mock.patch.dict(sys.modules, {'orjson': None, 'msgspec': None})
+
+    def backends(self):
+        try:
+            yield OrjsonBackend()
+        except ImportError:
+            pass
+        with self.without_orjson():
+            JSONCodec.reset()
+            backend = JSONCodec.backend()
+            self.assertEqual(backend.name, 'json')
+            yield backend
+
+    def test_round_trip(self):
+        for backend in self.backends():
+            JSONCodec._backend = backend
+            for encoder_class in (JSONEncoder, DjangoJSONEncoder):
+                with self.subTest(backend=backend.name, encoder=encoder_class.__module__):
+                    expected = json.loads(json.dumps(self.VALUE, cls=encoder_class))
+                    content = JSONCodec.dumps(self.VALUE, default=encoder_class().default)
+                    self.assertEqual(JSONCodec.loads(content), expected)
+                    self.assertEqual(JSONCodec.loads(content.decode('utf-8')), expected)
+            self.assertEqual(JSONCodec.loads(JSONCodec.dumps(self.VALUE))['price'], 12.5)
+
+    def test_same_bytes_as_drf_and_redis_serializer(self):
+        serializer = RedisJSONSerializer({})
+        for backend in self.backends():
+            JSONCodec._backend = backend
+            with self.subTest(backend=backend.name):
+                self.assertEqual(FastJSONRenderer().render(self.VALUE), JSONRenderer().render(self.VALUE))
+                self.assertEqual(
+                    serializer.loads(serializer.dumps(self.VALUE)),
+                    json.loads(json.dumps(self.VALUE, cls=DjangoJSONEncoder)),
+                )
+
+
+class DebouncedWorkerTests(TestCase):
+    """Зміни невдалої обробки повертаються в чергу і обробляються разом з новими"""
+
+    def test_failed_changes_are_requeued(self):
+        calls = []
+
+        def handler(changes):
+            calls.append(changes)
+            if len(calls) == 1:
+                raise OSError('disk full')
+
+        worker = DebouncedWorker('test', handler, lambda: {'async': False, 'delay': 0})
+        worker.add({'projects': {1}})
+        self.assertEqual(worker.pending, {'projects': {1}})
+        worker.add({'projects': {2}, 'services': {3}})
+        self.assertIsNone(worker.pending)
+        self.assertEqual(calls[-1], {'projects': {1, 2}, 'services': {3}})
+
+    def test_background_retry(self):
+        calls, done = [], threading.Event()
+
+        def handler(changes):
+            calls.append(changes)
+            if len(calls) == 1:
+                raise OSError('disk full')
+            done.set()
+
+        worker = DebouncedWorker('test', handler, lambda: {'delay': 0.01, 'max_retry_delay': 0.01})
+        worker.add({1})
+        self.assertTrue(done.wait(2))
+        self.assertEqual(calls, [{1}, {1}])
+
+
+class CacheLockTests(TestCase):
+    """Замок у спільному кеші: другий власник чекає, чужий замок не звільняється"""
+
+    def setUp(self):
+        cache.delete('test_lock')
+
+    def test_exclusive(self):
+        first = CacheLock('test_lock', wait=0)
+        with first:
+            with self.assertRaises(LockTimeout):
+                CacheLock('test_lock', wait=0.1, poll=0.01).acquire()
+            # Протухлий замок, перехоплений іншим процесом, не видаляється
+            CacheLock('test_lock').release()
+            self.assertEqual(cache.get('test_lock'), first.token)
+        self.assertIsNone(cache.get('test_lock'))
+        with CacheLock('test_lock', wait=0):
+            pass
+
+    def test_waits_for_release(self):
+        first = CacheLock('test_lock')
+        first.acquire()
+        timer = threading.Timer(0.05, first.release)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        with CacheLock('test_lock', wait=2, poll=0.01) as second:
+            self.assertEqual(cache.get('test_lock'), second.token)
+
+
+@override_settings(DETAIL_DOCUMENT_SETTINGS={'BASE_URLS': ['http://testserver/']})
+class QueryBudgetTests(TestCase):
+    """Кожен ендпоінт укладається у свій бюджет SQL запитів"""
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=42, images=False).generate(QUERY_BUDGET_SCALE)
+        for name in ('projects', 'services'):
+            RecommendationBuilder(get_spec(name), 'uk').build()
+        for view_class in DetailDocumentStore.views():
+            DetailDocumentStore.rebuild(view_class, view_class.queryset.values_list('pk', flat=True))
+        cls.user = get_user_model().objects.create_user('budget', 'budget@example.com', 'budget')
+        cls.viewsets = {basename: viewset for _, viewset, basename in router.registry}
+
+    def path_kwargs(self, budget):
+        basename = budget.name.split('.')[0]
+        if '{pk}' in budget.path:
+            pk = self.viewsets[basename].queryset.values_list('pk', flat=True).first()
+            self.assertIsNotNone(pk, f'{budget}: немає даних для retrieve')
+            return {'pk': pk}
+        if '{slug}' in budget.path:
+            slug = self.viewsets[basename].queryset.values_list('slug', flat=True).first()
+            self.assertIsNotNone(slug, f'{budget}: немає даних для пошуку за слагом')
+            return {'slug': slug}
+        return {}
+
+    def test_budgets(self):
+        for budget in BUDGETS:
+            with self.subTest(budget=str(budget)):
+                if budget.login:
+                    self.client.force_login(self.user)
+                try:
+                    run_query_budget(self.client, budget, **self.path_kwargs(budget))
+                finally:
+                    self.client.logout()
+
+    def test_every_viewset_has_budget(self):
+        covered = {budget.name.split('.')[0] for budget in BUDGETS}
+        missing = sorted(set(self.viewsets) - covered)
+        self.assertEqual(missing, [], f'Немає бюджетів для viewset: {missing}')
+
+
+class CompiledSerializerTests(TestCase):
+    """CompiledSerializer віддає той самий JSON, що й ModelSerializer"""
+
+    SERIALIZERS = (
+        (ServiceListSerializer, lambda: Service.objects.filter(is_active=True).order_by('order')),
+        (ProjectListSerializer, lambda: Project.objects.filter(is_active=True).order_by('-created_at')),
+        (WorkplacePhotoSerializer, lambda: WorkplacePhoto.objects.filter(is_active=True).order_by('order')),
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=7, images=False).generate('tiny')
+
+        # Крайні випадки: немає перекладу, порожнє та нестандартне ім'я файлу, невідрендерений HTML
+        service = Service.objects.filter(is_active=True).order_by('order').first()
+        Service.objects.filter(pk=service.pk).update(name_en=None, excerpt_en='', icon='', main_image='services/фото 1 (копія).jpg')
+        photo = WorkplacePhoto.objects.filter(is_active=True).first()
+        WorkplacePhoto.objects.filter(pk=photo.pk).update(title_uk='', description_en=None, image='../workplace/./x.jpg')
+        ProjectCategory.objects.filter(pk=Project.objects.filter(is_active=True).values('category')[:1]).update(
+            rendered_html={}, image='',
+        )
+
+    def test_output_is_identical(self):
+        request = RequestFactory().get('/api/v1/', HTTP_HOST='testserver')
+        renderer = JSONRenderer()
+        for language in ('uk', 'en'):
+            for serializer_class, queryset in self.SERIALIZERS:
+                with self.subTest(serializer=serializer_class.__name__, language=language), translation.override(language):
+                    plan = CompiledSerializer.for_serializer(serializer_class)
+                    self.assertIsNotNone(plan)
+                    expected = serializer_class(
+                        serializer_class.project_queryset(queryset()), many=True, context={'request': request},
+                    ).data
+                    actual = plan.serialize(plan.rows(queryset()), {'request': request})
+                    self.assertEqual(renderer.render(actual), renderer.render(expected))
+
+
+@override_settings(**SYNC_JOBS)
+@override_settings(DETAIL_DOCUMENT_SETTINGS={'BASE_URLS': ['http://testserver/']})
+class DetailDocumentTests(TestCase):
+    """Документи деталей збігаються зі звичайним retrieve і перебудовуються сигналами"""
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=11, images=False).generate('tiny')
+        cls.project = Project.objects.filter(is_active=True).first()
+        cls.service = Service.objects.filter(is_active=True).first()
+
+    def setUp(self):
+        for view_class in (ProjectViewSet, ServiceViewSet):
+            DetailDocumentStore.rebuild(view_class, view_class.queryset.values_list('pk', flat=True))
+
+    def get(self, path, language='en', **extra):
+        response = self.client.get(f'{API_PREFIX}{path}', HTTP_ACCEPT_LANGUAGE=language, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def fresh(self, path, language='en'):
+        with override_settings(DETAIL_DOCUMENT_SETTINGS={'ENABLED': False}):
+            return self.get(path, language).content
+
+    def test_document_matches_serializer(self):
+        for path in (f'projects/{self.project.pk}/', f'services/{self.service.pk}/'):
+            for language in ('uk', 'en'):
+                with self.subTest(path=path, language=language):
+                    response = self.get(path, language)
+                    self.assertEqual(response['X-Detail-Document'], 'HIT')
+                    self.assertEqual(response.content, self.fresh(path, language))
+
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def test_read_does_not_create_documents(self):
+        path = f'projects/{self.project.pk}/'
+        DetailDocument.objects.all().delete()
+        self.assertEqual(self.get(path)['X-Detail-Document'], 'MISS')
+        # Довільний Host - звичайний retrieve без документа
+        response = self.get(path, HTTP_HOST='attacker.example')
+        self.assertNotIn('X-Detail-Document', response)
+        self.assertFalse(DetailDocument.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        self.assertEqual(self.get(path)['X-Detail-Document'], 'HIT')
+        self.assertEqual(set(DetailDocument.objects.values_list('base_url', flat=True)), {'http://testserver/'})
+
+    def test_rebuild_on_dependency_change(self):
+        path = f'projects/{self.project.pk}/'
+        sibling = Project.objects.filter(is_active=True, category=self.project.category).exclude(pk=self.project.pk).first()
+
+        changes = [
+            lambda: ProjectCategory.objects.get(pk=self.project.category_id).save(),
+            lambda: self.project.images.first().delete(),
+        ]
+        if sibling is not None:
+            # projects_count категорії в документі проєкту
+            changes.append(lambda: Project.objects.filter(pk=sibling.pk).first().delete())
+
+        for change in changes:
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            response = self.get(path)
+            self.assertEqual(response['X-Detail-Document'], 'HIT')
+            self.assertEqual(response.content, self.fresh(path))
+
+    def test_inactive_object_drops_document(self):
+        path = f'services/{self.service.pk}/'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.is_active = False
+            self.service.save()
+        self.assertIsNone(DetailDocumentStore.get(ServiceViewSet, self.service.pk, 'en', 'http://testserver/'))
+        self.assertEqual(self.client.get(f'{API_PREFIX}{path}').status_code, 404)
+
+
+@override_settings(**SYNC_JOBS)
+class SlugIndexTests(TestCase):
+    """Слаги кожної мови відкривають той самий об'єкт; зміна слага оновлює індекс"""
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=5, images=False).generate('tiny')
+        cls.project = Project.objects.filter(is_active=True).first()
+
+    def get(self, slug, language):
+        return self.client.get(f'{API_PREFIX}projects/slug/{slug}/', HTTP_ACCEPT_LANGUAGE=language)
+
+    def test_resolves_slug_of_every_language(self):
+        for language in ('uk', 'en'):
+            for slug in (self.project.slug_uk, self.project.slug_en):
+                with self.subTest(language=language, slug=slug):
+                    response = self.get(slug, language)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.json()['id'], self.project.pk)
+                    self.assertEqual(response.json()['slug'], getattr(self.project, f'slug_{language}'))
+        self.assertEqual(self.get('missing-slug', 'uk').status_code, 404)
+
+    def test_slug_change_invalidates_index(self):
+        old_slug = self.project.slug_en
+        self.assertEqual(SlugIndex.resolve(Project, old_slug, 'en'), self.project.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.slug_en = 'renamed-project'
+            self.project.save()
+        self.assertEqual(SlugIndex.resolve(Project, 'renamed-project', 'en'), self.project.pk)
+        self.assertIsNone(SlugIndex.resolve(Project, old_slug, 'en'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.is_active = False
+            self.project.save()
+        self.assertEqual(self.get('renamed-project', 'en').status_code, 404)
+
+
+@override_settings(**SYNC_JOBS)
+class RecommendationTests(TestCase):
+    """Змінений об'єкт входить у списки схожих, видалений - зникає з них"""
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=3, images=False).generate('tiny')
+        cls.spec = get_spec('projects')
+        for language in ('uk', 'en'):
+            RecommendationBuilder(cls.spec, language).build()
+        projects = Project.objects.filter(is_active=True).order_by('pk')
+        cls.source, cls.copy = projects.first(), projects.last()
+
+    def test_related_endpoint(self):
+        response = self.client.get(f'{API_PREFIX}projects/{self.source.pk}/related/')
+        self.assertEqual(response.status_code, 200)
+        expected = list(
+            RelatedProject.objects.filter(project=self.source, language='uk').values_list('related_id', flat=True)
+        )
+        self.assertEqual([item['id'] for item in response.json()], expected)
+        self.assertEqual(self.client.get(f'{API_PREFIX}projects/0/related/').status_code, 404)
+
+    def test_changed_project_enters_related(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for field in ('title_uk', 'title_en', 'short_description_uk', 'short_description_en',
+                          'detailed_description_uk', 'detailed_description_en', 'materials_used', 'category_id'):
+                setattr(self.copy, field, getattr(self.source, field))
+            self.copy.save()
+        for language in ('uk', 'en'):
+            with self.subTest(language=language):
+                top = RelatedProject.objects.filter(project=self.source, language=language).first()
+                self.assertEqual(top.related_id, self.copy.pk)
+                top = RelatedProject.objects.filter(project=self.copy, language=language).first()
+                self.assertEqual(top.related_id, self.source.pk)
+
+    def test_deleted_project_leaves_related(self):
+        related = RelatedProject.objects.filter(project=self.source).values_list('related_id', flat=True).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.get(pk=related).delete()
+        self.assertFalse(RelatedProject.objects.filter(related_id=related).exists())
+        for language in ('uk', 'en'):
+            self.assertEqual(RelatedProject.objects.filter(project=self.source, language=language).count(), 6)
+
+
+class SitemapTests(TestCase):
+    """Файли блоків з hreflang; зміна об'єкта перезаписує лише файли його блоку"""
+
+    CHUNK_SIZE = 10
+    NS = {'s': 'http://www.sitemaps.org/schemas/sitemap/0.9', 'xhtml': 'http://www.w3.org/1999/xhtml'}
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=9, images=False).generate('tiny')
+        cls.project = Project.objects.filter(is_active=True).order_by('-pk').first()
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        settings = override_settings(
+            RECOMMENDATION_SETTINGS={'ASYNC': False},
+            SITEMAP_SETTINGS={
+                'ROOT': self.root, 'CHUNK_SIZE': self.CHUNK_SIZE, 'ASYNC': False, 'LOCK_WAIT': 0,
+                'SITE_URL': 'https://ugc.example', 'FILES_URL': 'https://api.ugc.example/sitemaps/',
+            },
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        SitemapGenerator().build()
+
+    def urls(self, name):
+        tree = ElementTree.parse(self.root / name)
+        return {
+            url.findtext('s:loc', namespaces=self.NS): {
+                link.get('hreflang'): link.get('href') for link in url.findall('xhtml:link', self.NS)
+            }
+            for url in tree.getroot().findall('s:url', self.NS)
+        }
+
+    def project_file(self, language):
+        return f'projects-{language}-{self.project.pk // self.CHUNK_SIZE}.xml'
+
+    def test_build_writes_chunked_files_with_alternates(self):
+        index = ElementTree.parse(self.root / 'sitemap.xml').getroot()
+        files = [loc.text.rsplit('/', 1)[1] for loc in index.findall('s:sitemap/s:loc', self.NS)]
+        active = Project.objects.filter(is_active=True)
+        buckets = {pk // self.CHUNK_SIZE for pk in active.values_list('pk', flat=True)}
+        self.assertEqual(len([name for name in files if name.startswith('projects-uk-')]), len(buckets))
+
+        urls = {}
+        for name in files:
+            if name.startswith('projects-en-'):
+                urls.update(self.urls(name))
+        self.assertEqual(len(urls), active.count())
+        alternates = urls[f'https://ugc.example/en/work/{self.project.slug_en}/']
+        self.assertEqual(alternates, {
+            'uk': f'https://ugc.example/uk/work/{self.project.slug_uk}/',
+            'en': f'https://ugc.example/en/work/{self.project.slug_en}/',
+            'x-default': f'https://ugc.example/uk/work/{self.project.slug_uk}/',
+        })
+
+    def test_change_rewrites_only_its_chunk(self):
+        before = {path.name: path.read_bytes() for path in self.root.iterdir()}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.slug_en = 'renamed-project'
+            self.project.save()
+        changed = {path.name for path in self.root.iterdir() if path.read_bytes() != before.get(path.name)}
+        # Індекс змінюється лише разом із секундою lastmod
+        self.assertEqual(changed - {'sitemap.xml'}, {self.project_file('uk'), self.project_file('en')})
+        self.assertIn('https://ugc.example/en/work/renamed-project/', self.urls(self.project_file('en')))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.is_active = False
+            self.project.save()
+        remaining = self.urls(self.project_file('en')) if (self.root / self.project_file('en')).exists() else {}
+        self.assertNotIn('https://ugc.example/en/work/renamed-project/', remaining)
+
+    def test_locked_rewrite_is_retried(self):
+        # Файли каталогу зараз пише інший воркер - зміна лишається в черзі
+        lock = SitemapGenerator().lock()
+        lock.acquire()
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.project.slug_en = 'locked-project'
+                self.project.save()
+            self.assertIn(self.project.pk, SitemapJob.worker.pending['projects'])
+            self.assertNotIn('https://ugc.example/en/work/locked-project/', self.urls(self.project_file('en')))
+        finally:
+            lock.release()
+
+        self.assertTrue(SitemapJob.worker.run_pending())
+        self.assertIsNone(SitemapJob.worker.pending)
+        self.assertIn('https://ugc.example/en/work/locked-project/', self.urls(self.project_file('en')))
+
+    def test_files_are_served_with_last_modified(self):
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f'/sitemaps/{self.project_file("uk")}', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/sitemaps/settings.py').status_code, 404)
+
+
+class SnapshotTests(TestCase):
+    """Файли знімка збігаються з відповідями API; зміна об'єкта оновлює лише його маршрути"""
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=13, images=False).generate('tiny')
+        cls.project = Project.objects.filter(is_active=True).order_by('pk').first()
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        settings = override_settings(
+            **SYNC_JOBS,
+            SNAPSHOT_SETTINGS={
+                'ROOT': self.root, 'BASE_URL': 'http://testserver/', 'ENABLED': True, 'ASYNC': False, 'LOCK_WAIT': 0,
+            },
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # Відкат транзакції попереднього тесту не відкочує кеші (індекс слагів)
+        LoadDataGenerator().invalidate_caches()
+        SnapshotWriter().build()
+
+    def manifest(self):
+        return JSONCodec.load_file(self.root / 'manifest.json')['routes']
+
+    def read(self, key, locale):
+        return (self.root / self.manifest()[key][locale]['file']).read_bytes()
+
+    def test_files_match_responses(self):
+        manifest = self.manifest()
+        for key in (
+            f'{API_PREFIX}projects/',
+            f'{API_PREFIX}projects/?category={self.project.category_id}',
+            f'{API_PREFIX}projects/{self.project.pk}/',
+            f'{API_PREFIX}projects/slug/{self.project.slug_en}/',
+            f'{API_PREFIX}projects/featured/',
+            f'{API_PREFIX}translations/en/?namespace=projects',
+        ):
+            with self.subTest(key=key):
+                self.assertIn(key, manifest)
+                response = self.client.get(key, HTTP_ACCEPT_LANGUAGE='en')
+                self.assertEqual(JSONCodec.loads(self.read(key, 'en')), response.json())
+
+    def test_change_updates_only_affected_routes(self):
+        other = Project.objects.filter(is_active=True).order_by('-pk').first()
+        before = {key: {locale: entry['etag'] for locale, entry in entries.items()} for key, entries in self.manifest().items()}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title_en = 'Renamed project'
+            self.project.save()
+
+        detail = f'{API_PREFIX}projects/{self.project.pk}/'
+        self.assertEqual(JSONCodec.loads(self.read(detail, 'en'))['title'], 'Renamed project')
+        self.assertNotEqual(self.manifest()[detail]['en']['etag'], before[detail]['en'])
+        other_detail = f'{API_PREFIX}projects/{other.pk}/'
+        self.assertEqual(self.manifest()[other_detail]['en']['etag'], before[other_detail]['en'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.is_active = False
+            self.project.save()
+        self.assertNotIn(detail, self.manifest())
+        self.assertFalse((self.root / 'en' / 'projects' / str(self.project.pk) / 'index.json').exists())
+
+    def test_locked_manifest_update_is_retried(self):
+        detail = f'{API_PREFIX}projects/{self.project.pk}/'
+        # Маніфест зараз змінює інший воркер - зміна лишається в черзі
+        lock = SnapshotWriter().lock()
+        lock.acquire()
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.project.title_en = 'Locked project'
+                self.project.save()
+            affected, translations = SnapshotJob.worker.pending
+            self.assertIn(self.project.pk, affected['projects'])
+            self.assertTrue(translations)
+            self.assertNotEqual(JSONCodec.loads(self.read(detail, 'en'))['title'], 'Locked project')
+        finally:
+            lock.release()
+
+        self.assertTrue(SnapshotJob.worker.run_pending())
+        self.assertEqual(JSONCodec.loads(self.read(detail, 'en'))['title'], 'Locked project')
+
+
+class RevalidationTests(TestCase):
+    """Зміна об'єкта відправляє пакет сторінок усіх мов; невдалий пакет лишається в outbox"""
+
+    @classmethod
+    def setUpTestData(cls):
+        LoadDataGenerator(seed=17, images=False).generate('tiny')
+        cls.project = Project.objects.filter(is_active=True).order_by('pk').first()
+
+    def setUp(self):
+        self.server = MockCDNServer(('127.0.0.1', 0))
+        url = self.server.start_in_background()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        settings = override_settings(
+            **SYNC_JOBS,
+            REVALIDATION_SETTINGS={
+                'ENABLED': True, 'URL': f'{url}revalidate', 'TOKEN': 'secret', 'ASYNC': False, 'RETRY_DELAY': 0,
+            },
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def sent_paths(self):
+        return [path for record in self.server.requests for path in record['body']['paths']]
+
+    def test_save_sends_pages_of_all_locales(self):
+        old_slug = self.project.slug_en
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title_uk = 'Оновлений проєкт'
+            self.project.slug_en = 'renamed-project'
+            self.project.save()
+            self.project.save()
+
+        self.assertEqual(len(self.server.requests), 1)
+        record = self.server.requests[0]
+        self.assertEqual(record['path'], '/revalidate')
+        self.assertTrue(record['authorization'])
+        paths = self.sent_paths()
+        self.assertEqual(len(paths), len(set(paths)))
+        for path in (
+            f'/uk/work/{self.project.slug_uk}/', '/en/work/renamed-project/', f'/en/work/{old_slug}/',
+            '/uk/', '/en/', '/uk/work/', '/en/work/',
+        ):
+            self.assertIn(path, paths)
+        self.assertFalse(RevalidationRequest.objects.exists())
+
+    def test_failed_batch_is_retried(self):
+        self.server.fail_next()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+
+        pending = RevalidationRequest.objects.all()
+        self.assertTrue(pending)
+        self.assertTrue(all(item.attempts == 1 and item.status == 'pending' and item.last_error for item in pending))
+
+        self.assertEqual(Revalidator.drain(), len(pending))
+        self.assertFalse(RevalidationRequest.objects.exists())
+        self.assertEqual([record['status'] for record in self.server.requests if 'status' in record], [503])
+
+    def record_pages(self):
+        with override_settings(REVALIDATION_SETTINGS={**django_settings.REVALIDATION_SETTINGS, 'ASYNC': True}):
+            with mock.patch.object(Revalidator, 'wake'), self.captureOnCommitCallbacks(execute=True):
+                self.project.save()
+        return RevalidationRequest.objects.count()
+
+    def test_claimed_batch_is_skipped_by_other_workers(self):
+        total = self.record_pages()
+        batch, lease_until = Revalidator.claim(100, 60)
+        self.assertEqual(len(batch), total)
+        self.assertEqual(Revalidator.claim(100, 60)[0], [])
+        # Процес завершився під час відправки - після оренди пакет знову доступний
+        RevalidationRequest.objects.update(available_at=timezone.now())
+        self.assertEqual(len(Revalidator.claim(100, 60)[0]), total)
+
+    def test_post_outside_transaction(self):
+        self.record_pages()
+        depth = len(connection.atomic_blocks)
+        depths, changed = [], []
+
+        def send(paths, config):
+            depths.append(len(connection.atomic_blocks))
+            if len(depths) == 1:
+                # Повторна зміна сторінки з пакета під час його відправки
+                page = RevalidationRequest.objects.values_list('path', 'locale').get(path=paths[0], locale='en')
+                Revalidator.record([page])
+                changed.append(paths[0])
+            return None
+
+        with mock.patch.object(Revalidator, 'send', side_effect=send) as sent, \
+                mock.patch('apps.api.signals.SurrogateKeyPurger.purge') as purge:
+            Revalidator.drain()
+        self.assertEqual(set(depths), {depth})
+        # Записане під час відправки не видаляється, а йде наступним пакетом
+        self.assertEqual(sent.call_args_list[-1].args[0], changed)
+        self.assertFalse(RevalidationRequest.objects.exists())
+        # Видалення відправлених не запускає сигнали контенту (очищення CDN тощо)
+        purge.assert_not_called()
+
+
+class DatabasePoolTests(TestCase):
+    """Параметри пулу psycopg3 / pgbouncer та статистика пулу в метриках"""
+
+    DATABASE = {'ENGINE': 'django.db.backends.postgresql', 'NAME': 'ugc', 'CONN_MAX_AGE': 60}
+
+    def test_pool_options(self):
+        database = configure_database(self.DATABASE, {'MIN_SIZE': 1, 'MAX_SIZE': 4})
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], 4)
+        self.assertNotIn('DISABLE_SERVER_SIDE_CURSORS', database)
+        self.assertNotIn('OPTIONS', self.DATABASE)
+
+    def test_persistent_connections_and_pgbouncer(self):
+        database = configure_database(self.DATABASE, {'ENABLED': False, 'CONN_MAX_AGE': 120, 'PGBOUNCER': True})
+        self.assertEqual(database['CONN_MAX_AGE'], 120)
+        self.assertNotIn('pool', database['OPTIONS'])
+        self.assertTrue(database['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertIsNone(database['OPTIONS']['prepare_threshold'])
+
+        sqlite = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'bench.sqlite3'}
+        self.assertEqual(configure_database(sqlite, {}), {**sqlite, 'OPTIONS': {}})
+
+    def test_pool_stats_in_metrics(self):
+        class Pool:
+            def pop_stats(self):
+                return {'pool_size': 3, 'pool_available': 2, 'requests_num': 5, 'requests_wait_ms': 1500}
+
+        connection.ensure_connection()
+        connection._connection_pools = {connection.alias: Pool()}
+        self.addCleanup(delattr, connection, '_connection_pools')
+        self.addCleanup(Metrics._gauges.clear)
+
+        Metrics.sample_database_pools()
+        gauges = {(name, labels): value for (name, labels), value in Metrics._gauges.items()}
+        size = next(value for (name, labels), value in gauges.items() if ('state', 'size') in labels)
+        self.assertEqual(size, 3)
+        pending = Metrics._pending
+        self.assertEqual(pending[('ugc_db_pool_requests_total', (('alias', 'default'),))], 5)
+        self.assertEqual(pending[('ugc_db_pool_wait_seconds_total', (('alias', 'default'),))], 1.5)
+        self.assertIn('# TYPE ugc_db_pool_connections gauge', Metrics.render_prometheus())
+
+
+@override_settings(DATABASE_REPLICA_SETTINGS={'ALIASES': ['replica'], 'PIN_SECONDS': 60})
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Безпечні запити API читають з репліки; після запису та при збої репліки - основна БД.
+    Без обгортки TestCase: у відкритій транзакції маршрутизатор читає з основної БД.
+    """
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        # Запис лише в другу БД показує, звідки прочитано відповідь
+        Office.objects.using('replica').bulk_create([
+            Office(name='Replica office', address='Kyiv', office_type='office'),
+        ])
+        ReplicaHealth.reset()
+        self.addCleanup(ReplicaHealth.reset)
+        cache.delete('ugc_replica_primary_until')
+        self.addCleanup(cache.delete, 'ugc_replica_primary_until')
+
+    def office_names(self, client=None):
+        response = (client or self.client).get(f'{API_PREFIX}offices/', {'page_size': 100})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [office['name'] for office in data.get('results', data)]
+
+    def test_reads_from_replica(self):
+        self.assertIn('Replica office', self.office_names())
+        self.assertFalse(Office.objects.filter(name='Replica office').exists())
+
+    def test_write_pins_client_to_primary(self):
+        response = self.client.post(f'{API_PREFIX}contact-inquiries/', contact_inquiry_payload(0), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('ugc_primary_pin', response.cookies)
+        self.assertNotIn('Replica office', self.office_names())
+
+    def test_inquiry_does_not_pin_reads_or_purge(self):
+        # Заявки з форм сайту не змінюють відповідей API
+        with mock.patch('apps.api.signals.SurrogateKeyPurger.purge') as purge, \
+                mock.patch('apps.api.signals.ResponseCacheTags.bump') as bump:
+            response = self.client.post(f'{API_PREFIX}contact-inquiries/', contact_inquiry_payload(0), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        purge.assert_not_called()
+        bump.assert_not_called()
+        self.assertIsNone(cache.get('ugc_replica_primary_until'))
+        self.assertIn('Replica office', self.office_names(Client()))
+
+    def test_content_change_pins_other_clients_to_primary(self):
+        # Клієнт A змінює контент, клієнт B без cookie не має читати стару репліку
+        Office.objects.create(name='Primary office', address='Lviv', office_type='office')
+        names = self.office_names(Client())
+        self.assertIn('Primary office', names)
+        self.assertNotIn('Replica office', names)
+
+    @override_settings(DATABASE_REPLICA_SETTINGS={'ALIASES': ['replica'], 'PIN_SECONDS': 0, 'MAX_LAG': 0})
+    def test_recent_write_expires(self):
+        Office.objects.create(name='Primary office', address='Lviv', office_type='office')
+        self.assertIn('Replica office', self.office_names(Client()))
+
+    def test_unavailable_replica_falls_back_to_primary(self):
+        with mock.patch.object(ReplicaHealth, 'lag', side_effect=DatabaseError('down')):
+            self.assertNotIn('Replica office', self.office_names())
+        # Недоступна репліка не перевіряється повторно до DOWN_RETRY
+        self.assertNotIn('Replica office', self.office_names())
+
+    def test_reads_in_transaction_use_primary(self):
+        with transaction.atomic():
+            self.assertNotIn('Replica office', self.office_names())
+
+    def test_lagging_replica_is_skipped(self):
+        with mock.patch.object(ReplicaHealth, 'lag', return_value=60.0):
+            self.assertNotIn('Replica office', self.office_names())
+
+    def test_benchmark_counts_replica_queries(self):
+        scenario = Scenario('offices.list', f'{API_PREFIX}offices/', params={'page_size': 99})
+        with CaptureQueriesContext(connections['replica']) as replica:
+            sample = BenchmarkRunner([scenario]).execute(scenario, scenario.paths()[0], 0)
+        self.assertEqual(sample['status'], 200)
+        self.assertTrue(replica.captured_queries)
+        self.assertGreaterEqual(sample['queries'], len(replica.captured_queries))
+
+
+@skipUnless(isinstance(getattr(cache, 'client', None), TieredRedisClient), 'Потрібен Redis (BENCH_REDIS_URL або fakeredis)')
+class TieredCacheTests(TestCase):
+    """L1 віддає гарячі ключі з пам'яті, зміни інвалідуються через pub/sub"""
+
+    KEY = 'unified_translations_uk_all_all'
+
+    def setUp(self):
+        cache.delete(self.KEY)
+        cache.get(self.KEY)
+        self.assertTrue(L1Invalidation.listening.wait(2))
+        self.redis = cache.client.get_client(write=True)
+        self.full_key = str(cache.client.make_key(self.KEY))
+
+    def test_hot_key_served_from_memory(self):
+        cache.set(self.KEY, {'greeting': 'Привіт'}, 60)
+        self.assertEqual(cache.get(self.KEY), {'greeting': 'Привіт'})
+        # Запис в обхід клієнта (без інвалідації) не видно, поки L1 актуальний
+        self.redis.set(self.full_key, cache.client.encode({'greeting': 'Hello'}))
+        self.assertEqual(cache.get(self.KEY), {'greeting': 'Привіт'})
+
+        # Повідомлення іншого воркера викидає ключ з L1
+        self.redis.publish('ugc:cache:l1', JSONCodec.dumps({'origin': 'worker', 'keys': [self.full_key]}))
+        deadline = time.monotonic() + 2
+        while self.full_key in L1Invalidation.lru.entries and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cache.get(self.KEY), {'greeting': 'Hello'})
+
+    def test_writes_evict_and_ttl_is_capped(self):
+        cache.set(self.KEY, 1, 2)
+        self.assertEqual(cache.get(self.KEY), 1)
+        _, expires, _ = L1Invalidation.lru.entries[self.full_key]
+        self.assertLessEqual(expires - time.monotonic(), 2)
+
+        cache.set_many({self.KEY: 2}, 60)
+        self.assertEqual(cache.get_many([self.KEY, 'throttle_x']), {self.KEY: 2})
+        cache.delete_pattern('unified_translations_uk_*')
+        self.assertIsNone(cache.get(self.KEY))
+        # Ключі поза KEY_PATTERNS в L1 не потрапляють
+        cache.set('throttle_x', [1], 60)
+        cache.get('throttle_x')
+        self.assertNotIn(str(cache.client.make_key('throttle_x')), L1Invalidation.lru.entries)
+
+    def test_lru_bounds(self):
+        lru = LocalLRU(max_entries=2, max_bytes=1000)
+        for key in ('a', 'b'):
+            lru.put(key, key, 60, 10, lru.generation)
+        lru.get('a')
+        lru.put('c', 'c', 60, 10, lru.generation)
+        self.assertEqual(list(lru.entries), ['a', 'c'])
+        # Значення, прочитане до інвалідації, не записується
+        generation = lru.generation
+        lru.evict(keys=['a'])
+        self.assertFalse(lru.put('a', 'stale', 60, 10, generation))
+        self.assertFalse(lru.put('big', 'x', 60, 500, lru.generation))
+
+
+@skipUnless(isinstance(getattr(cache, 'client', None), ResilientRedisClient), 'Потрібен Redis (BENCH_REDIS_URL або fakeredis)')
+class CacheBreakerTests(TestCase):
+    """Під час збою Redis кеш працює локально, після відновлення змінені ключі очищуються"""
+
+    def setUp(self):
+        self.breaker = cache.client.breaker
+        self.addCleanup(self.breaker.success)
+        self.addCleanup(setattr, self.breaker, 'reset_timeout', self.breaker.reset_timeout)
+
+    def outage(self):
+        return mock.patch.object(ConnectionPool, 'get_connection', side_effect=RedisConnectionError('Redis down'))
+
+    def test_outage_falls_back_and_recovers(self):
+        cache.set('breaker_key', 'redis', 60)
+        with self.outage():
+            for _ in range(self.breaker.failure_threshold):
+                self.assertIsNone(cache.get('missing_key'))
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+            self.assertFalse(CircuitBreaker.is_available())
+
+            # Запис і читання - у локальному кеші, API відповідає без Redis
+            cache.set('breaker_key', 'local', 60)
+            self.assertEqual(cache.get('breaker_key'), 'local')
+            self.assertEqual(self.client.get(f'{API_PREFIX}offices/').status_code, 200)
+            self.assertIn(
+                'ugc_cache_breaker_state{cache="ugc_api",pid=',
+                Metrics.render_prometheus(),
+            )
+
+        self.breaker.reset_timeout = 0
+        # Пробна операція замикає запобіжник; ключ, змінений під час збою, видалено з Redis
+        self.assertIsNone(cache.get('breaker_key'))
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        cache.set('breaker_key', 'redis', 60)
+        self.assertEqual(cache.get('breaker_key'), 'redis')
+
+    def test_replay_overflow_clears_derived_caches(self):
+        ResponseCacheTags.bump(Office)
+        cache.set('unified_translations_uk_all_all', {'greeting': 'Привіт'}, 60)
+        cache.set('breaker_key', 'redis', 60)
+        with self.outage(), mock.patch.dict(cache.client.breaker_config, {'replay_limit': 2}):
+            for _ in range(self.breaker.failure_threshold):
+                cache.get('missing_key')
+            cache.set_many({f'overflow_{index}': index for index in range(3)}, 60)
+
+        self.breaker.reset_timeout = 0
+        cache.get('missing_key')
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        # Окремі ключі вже не відстежувались - очищено кеш відповідей і перекладів цілком
+        self.assertIsNone(cache.get('unified_translations_uk_all_all'))
+        self.assertEqual(cache.keys('response_cache*'), [])
+        self.assertEqual(cache.get('breaker_key'), 'redis')
+
+    def test_locks_fail_closed_during_outage(self):
+        lock = CacheLock.for_path('sitemaps', '/srv/sitemaps', wait=0)
+        with self.outage():
+            for _ in range(self.breaker.failure_threshold):
+                cache.get('missing_key')
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+            # Локальний замок не виключав би інші воркери
+            with self.assertRaises(LockTimeout):
+                lock.acquire()
+            self.assertFalse(cache.add(TranslationExportJob.RUN_LOCK_KEY, 'worker', 60))
+            self.assertTrue(cache.add('breaker_counter', 0, 60))
+
+        self.breaker.reset_timeout = 0
+        with lock:
+            self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+            self.assertEqual(cache.get(lock.key), lock.token)
+
+    def test_failed_probe_reopens(self):
+        with self.outage():
+            for _ in range(self.breaker.failure_threshold):
+                cache.get('missing_key')
+            self.breaker.reset_timeout = 0
+            cache.get('missing_key')
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
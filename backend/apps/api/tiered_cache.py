@@ -0,0 +1,359 @@
+# backend/apps/api/tiered_cache.py
+"""
+Дворівневий кеш: LRU у пам'яті процесу (L1) перед Redis (django_redis).
+
+Ключі з L1_CACHE_SETTINGS['KEY_PATTERNS'] (бандли перекладів, кеш
+відповідей, cache_page) після першого читання з Redis лежать у процесі
+вже десеріалізованими, тож гарячі ключі не потребують ні мережі, ні
+JSON. Час життя запису L1 - не більше MAX_TTL і не більше залишку TTL
+у Redis; розмір обмежений кількістю записів та сумою байтів значень.
+
+Кожна зміна такого ключа (set, delete, delete_pattern, incr, ...)
+публікується в Redis pub/sub, і всі воркери викидають його з L1.
+L1 працює лише поки підписка активна: після обриву з'єднання L1
+очищується і читання йдуть у Redis до повторної підписки.
+
+Значення з L1 спільні для всіх запитів процесу - їх не можна змінювати.
+
+    CACHES['default']['OPTIONS']['CLIENT_CLASS'] = 'apps.api.tiered_cache.TieredRedisClient'
+"""
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from django.conf import settings
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.client import DefaultClient
+from redis.client import Pipeline
+import json
+import os
+import threading
+import time
+import uuid
+import logging
+from .metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def get_config():
+    """Налаштування з L1_CACHE_SETTINGS"""
+    l1_settings = getattr(settings, 'L1_CACHE_SETTINGS', {})
+    return {
+        'enabled': l1_settings.get('ENABLED', True),
+        'max_entries': l1_settings.get('MAX_ENTRIES', 5000),
+        'max_bytes': l1_settings.get('MAX_BYTES', 64 * 1024 * 1024),
+        'max_ttl': l1_settings.get('MAX_TTL', 30),
+        'key_patterns': tuple(l1_settings.get('KEY_PATTERNS', ())),
+        'channel': l1_settings.get('CHANNEL', 'ugc:cache:l1'),
+    }
+
+
+class LocalLRU:
+    """
+    L1 одного процесу: OrderedDict {повний ключ: (значення, expires, розмір)}.
+
+    Кожна інвалідація збільшує generation; значення, прочитане з Redis до
+    інвалідації, не потрапляє в L1 (інакше воно пережило б свою зміну).
+    """
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires, _ = entry
+            if expires <= time.monotonic():
+                self._pop(key)
+                return _MISSING
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, ttl, size, generation):
+        if ttl <= 0 or size > self.max_bytes // 10:
+            return False
+        with self._lock:
+            if generation != self.generation:
+                return False
+            self._pop(key)
+            self.entries[key] = (value, time.monotonic() + ttl, size)
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self._pop(next(iter(self.entries)))
+            return True
+
+    def evict(self, keys=None, pattern=None):
+        """Без аргументів - очищає все"""
+        with self._lock:
+            self.generation += 1
+            if keys is None and pattern is None:
+                self.entries.clear()
+                self.size = 0
+                return
+            if pattern is not None:
+                keys = [key for key in self.entries if fnmatchcase(key, pattern)]
+            for key in keys:
+                self._pop(key)
+
+    def _pop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+
+class L1Invalidation:
+    """
+    Спільний L1 процесу та підписка на канал інвалідацій.
+
+    Django створює клієнт кешу в кожному потоці, тому L1 і потік підписки -
+    одні на процес (після fork створюються заново).
+    """
+
+    _lock = threading.Lock()
+    _pid = None
+    lru = None
+    origin = None
+    listening = threading.Event()
+    _subscriber = None
+
+    @classmethod
+    def is_current(cls):
+        return cls._pid == os.getpid()
+
+    @classmethod
+    def ensure(cls, client, config):
+        if not cls.is_current():
+            with cls._lock:
+                if not cls.is_current():
+                    cls.lru = LocalLRU(config['max_entries'], config['max_bytes'])
+                    cls.origin = uuid.uuid4().hex
+                    cls.listening = threading.Event()
+                    cls._subscriber = None
+                    cls._pid = os.getpid()
+        if cls._subscriber is None or not cls._subscriber.is_alive():
+            with cls._lock:
+                if cls._subscriber is None or not cls._subscriber.is_alive():
+                    cls._subscriber = threading.Thread(
+                        target=cls._listen, args=(client, config['channel']),
+                        name='l1-cache-invalidation', daemon=True,
+                    )
+                    cls._subscriber.start()
+        return cls.lru
+
+    @classmethod
+    def _listen(cls, client, channel):
+        """Слухає канал; при обриві L1 вимикається до повторної підписки"""
+        while True:
+            pubsub = None
+            try:
+                pubsub = client.get_client(write=False).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                # Зміни до підписки могли бути пропущені
+                cls.lru.evict()
+                cls.listening.set()
+                # get_message з таймаутом: SOCKET_TIMEOUT кешу не обриває тиху підписку
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        cls.apply(message['data'])
+            except Exception as e:
+                logger.warning(f"Підписка L1 кешу перервана: {str(e)}")
+            finally:
+                cls.listening.clear()
+                cls.lru.evict()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(1)
+
+    @classmethod
+    def apply(cls, data):
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if payload.get('origin') == cls.origin:
+            return
+        if payload.get('all'):
+            cls.lru.evict()
+        elif payload.get('pattern'):
+            cls.lru.evict(pattern=payload['pattern'])
+        else:
+            cls.lru.evict(keys=payload.get('keys', []))
+
+    @classmethod
+    def publish(cls, client, channel, **payload):
+        try:
+            client.get_client(write=True).publish(channel, json.dumps({'origin': cls.origin, **payload}))
+        except Exception as e:
+            # Інші воркери не дізнаються про зміну - їхні записи доживуть MAX_TTL
+            logger.warning(f"Не вдалося розіслати інвалідацію L1: {str(e)}")
+
+
+class TieredRedisClient(DefaultClient):
+    """Клієнт django_redis з L1 для ключів KEY_PATTERNS"""
+
+    def __init__(self, server, params, backend):
+        super().__init__(server, params, backend)
+        self.l1_config = get_config()
+
+    # ---- L1 ----
+
+    def _l1(self):
+        config = self.l1_config
+        if not config['enabled'] or not config['key_patterns']:
+            return None
+        lru = L1Invalidation.ensure(self, config)
+        return lru if L1Invalidation.listening.is_set() else None
+
+    def _eligible(self, key):
+        return isinstance(key, str) and any(fnmatchcase(key, pattern) for pattern in self.l1_config['key_patterns'])
+
+    def _invalidate(self, keys=None, pattern=None, version=None):
+        """
+        Після запису: викидає ключі з L1 процесу та розсилає іншим воркерам.
+        Розсилка і з процесів без L1 (адмінка, команди) - там теж змінюють дані.
+        """
+        if not self.l1_config['enabled'] or not self.l1_config['key_patterns']:
+            return
+        if pattern is not None:
+            payload = {'pattern': str(self.make_pattern(pattern, version=version))}
+        elif keys is None:
+            payload = {'all': True}
+        else:
+            full_keys = [str(self.make_key(key, version=version)) for key in keys if self._eligible(key)]
+            if not full_keys:
+                return
+            payload = {'keys': full_keys}
+
+        lru = L1Invalidation.lru
+        if lru is not None and L1Invalidation.is_current():
+            lru.evict(keys=payload.get('keys'), pattern=payload.get('pattern'))
+        L1Invalidation.publish(self, self.l1_config['channel'], **payload)
+
+    def _fetch(self, lru, keys, version, client):
+        """GET + PTTL одним pipeline; значення потрапляють в L1 з TTL не більше залишку в Redis"""
+        generation = lru.generation
+        full_keys = [self.make_key(key, version=version) for key in keys]
+        pipeline = (client or self.get_client(write=False)).pipeline(transaction=False)
+        for full_key in full_keys:
+            pipeline.get(full_key)
+            pipeline.pttl(full_key)
+        results = pipeline.execute()
+
+        found = {}
+        max_ttl = self.l1_config['max_ttl']
+        for key, full_key, raw, pttl in zip(keys, full_keys, results[::2], results[1::2]):
+            if raw is None:
+                continue
+            value = self.decode(raw)
+            found[key] = value
+            ttl = max_ttl if pttl == -1 else min(max_ttl, pttl / 1000)
+            size = len(raw) if isinstance(raw, (bytes, str)) else 8
+            lru.put(str(full_key), value, ttl, size, generation)
+        return found
+
+    # ---- читання ----
+
+    def get(self, key, default=None, version=None, client=None):
+        lru = self._l1() if self._eligible(key) else None
+        if lru is None:
+            return super().get(key, default=default, version=version, client=client)
+
+        value = lru.get(str(self.make_key(key, version=version)))
+        Metrics.cache_access('l1', value is not _MISSING)
+        if value is not _MISSING:
+            return value
+        return self._fetch(lru, [key], version, client).get(key, default)
+
+    def get_many(self, keys, version=None, client=None):
+        lru = self._l1()
+        if lru is None:
+            return super().get_many(keys, version=version, client=client)
+
+        local, remote, fetch = {}, [], []
+        for key in keys:
+            if not self._eligible(key):
+                remote.append(key)
+                continue
+            value = lru.get(str(self.make_key(key, version=version)))
+            Metrics.cache_access('l1', value is not _MISSING)
+            if value is _MISSING:
+                fetch.append(key)
+            else:
+                local[key] = value
+        if fetch:
+            local.update(self._fetch(lru, fetch, version, client))
+        if remote:
+            local.update(super().get_many(remote, version=version, client=client))
+        return OrderedDict((key, local[key]) for key in keys if key in local)
+
+    # ---- запис ----
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None, nx=False, xx=False):
+        result = super().set(key, value, timeout, version=version, client=client, nx=nx, xx=xx)
+        # У pipeline (set_many) запис ще не виконано - інвалідація після execute
+        if not isinstance(client, Pipeline) and (result or not nx):
+            self._invalidate([key], version=version)
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().set_many(data, timeout, version=version, client=client)
+        self._invalidate(list(data), version=version)
+        return result
+
+    def delete(self, key, version=None, prefix=None, client=None):
+        result = super().delete(key, version=version, prefix=prefix, client=client)
+        if prefix is None:
+            self._invalidate([key], version=version)
+        else:
+            self._invalidate()
+        return result
+
+    def delete_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        result = super().delete_many(keys, version=version, client=client)
+        self._invalidate(keys, version=version)
+        return result
+
+    def delete_pattern(self, pattern, version=None, prefix=None, client=None, itersize=None):
+        result = super().delete_pattern(pattern, version=version, prefix=prefix, client=client, itersize=itersize)
+        if prefix is None:
+            self._invalidate(pattern=pattern, version=version)
+        else:
+            self._invalidate()
+        return result
+
+    def clear(self, client=None):
+        super().clear(client=client)
+        self._invalidate()
+
+    def _incr(self, key, delta=1, version=None, client=None, ignore_key_check=False):
+        result = super()._incr(key, delta=delta, version=version, client=client, ignore_key_check=ignore_key_check)
+        self._invalidate([key], version=version)
+        return result
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().touch(key, timeout, version=version, client=client)
+        self._invalidate([key], version=version)
+        return result
+
+    def expire(self, key, timeout, version=None, client=None):
+        result = super().expire(key, timeout, version=version, client=client)
+        self._invalidate([key], version=version)
+        return result
+
+    def persist(self, key, version=None, client=None):
+        result = super().persist(key, version=version, client=client)
+        self._invalidate([key], version=version)
+        return result
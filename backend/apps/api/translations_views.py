@@ -6,30 +6,98 @@ from rest_framework.throttling import AnonRateThrottle
 from django.core.cache import cache
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
-import json
 import os
 import logging
 import polib
+from .cache_policy import CachePolicyMixin, SurrogateKeys, TRANSLATIONS_POLICY
+from .json_codec import JSONCodec
+from .metrics import Metrics
 
 logger = logging.getLogger(__name__)
 
 
 class TranslationsRateThrottle(AnonRateThrottle):
     """Спеціальний throttle для API перекладів"""
-    scope = 'translations'
-    rate = '100/min'  # 100 запитів за хвилину
+    scope = 'translations'  # ліміт у REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] (100/min)
 
 
-class UnifiedTranslationsAPIView(APIView):
+def static_translations_dir():
+    """Каталог статичних перекладів (STATIC_TRANSLATIONS_DIR)"""
+    return getattr(settings, 'STATIC_TRANSLATIONS_DIR', os.path.join(settings.BASE_DIR, 'static_translations'))
+
+
+class StaticTranslationIndex:
+    """
+    In-process індекс статичних перекладів з STATIC_TRANSLATIONS_DIR/*.json.
+    Файл перечитується, лише коли змінився його mtime (один stat на запит),
+    тож відредагований файл підхоплюється і без гарячого перезавантаження.
+    Новий індекс підміняється одним присвоєнням, тому запити ніколи не
+    бачать напівоновлений стан.
+    """
+    
+    _index = {}
+    
+    @staticmethod
+    def _path(locale):
+        return os.path.join(static_translations_dir(), f'{locale}.json')
+    
+    @classmethod
+    def _load(cls, locale):
+        """(mtime, переклади) або None, якщо файлу немає"""
+        path = cls._path(locale)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return mtime, JSONCodec.load_file(path)
+    
+    @classmethod
+    def get(cls, locale):
+        """Повертає переклади локалі або None, якщо файлу немає"""
+        index = cls._index
+        entry = index.get(locale)
+        try:
+            mtime = os.stat(cls._path(locale)).st_mtime_ns
+        except OSError:
+            mtime = None
+        if entry is None or entry[0] != mtime:
+            entry = cls._load(locale)
+            index = {key: value for key, value in index.items() if key != locale}
+            if entry is not None:
+                index[locale] = entry
+            cls._index = index
+            if entry is None:
+                return None
+        return entry[1]
+    
+    @classmethod
+    def reload(cls):
+        """Перечитує всі файли та атомарно підміняє індекс"""
+        new_index = {}
+        for lang_code, _ in settings.LANGUAGES:
+            entry = cls._load(lang_code)
+            if entry is not None:
+                new_index[lang_code] = entry
+        cls._index = new_index
+        return {locale: data for locale, (_, data) in new_index.items()}
+
+
+class UnifiedTranslationsAPIView(CachePolicyMixin, APIView):
     """
     Об'єднаний API для всіх типів перекладів
     """
     
     throttle_classes = [TranslationsRateThrottle]
+    cache_policy = {'get': TRANSLATIONS_POLICY}
+    cache_language_in_url = True
     
     SUPPORTED_LOCALES = ['uk', 'en']
     SUPPORTED_SOURCES = ['all', 'static', 'po', 'dynamic']
     
+    def get_surrogate_keys(self, response):
+        locale = self.kwargs.get('locale', 'uk')
+        return [SurrogateKeys.GLOBAL_KEY, SurrogateKeys.TRANSLATIONS_KEY, f'{SurrogateKeys.TRANSLATIONS_KEY}:{locale}']
+    
     def get(self, request, locale='uk'):
         """Повертає переклади для заданої локалі"""
         
@@ -56,6 +124,7 @@ class UnifiedTranslationsAPIView(APIView):
         # Перевіряємо кеш
         if not force_refresh:
             cached_data = cache.get(cache_key)
+            Metrics.cache_access('unified_translations', bool(cached_data))
             if cached_data:
                 logger.info(f"Використання кешованих перекладів: {cache_key}")
                 return Response(cached_data)
@@ -111,23 +180,18 @@ class UnifiedTranslationsAPIView(APIView):
     def get_static_translations(self, locale, namespace=None):
         """Статичні переклади з JSON файлів"""
         try:
-            static_file_path = os.path.join(
-                settings.BASE_DIR, 'static_translations', f'{locale}.json'
-            )
+            data = StaticTranslationIndex.get(locale)
             
-            if os.path.exists(static_file_path):
-                with open(static_file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Фільтруємо за namespace якщо потрібно
-                if namespace:
-                    filtered_data = {k: v for k, v in data.items() if k.startswith(f"{namespace}.")}
-                    return filtered_data
-                
-                return data
-            else:
-                logger.warning(f"Файл статичних перекладів не знайдено: {static_file_path}")
+            if data is None:
+                logger.warning(f"Файл статичних перекладів не знайдено для локалі: {locale}")
                 return self.get_fallback_static_translations(locale)
+            
+            # Фільтруємо за namespace якщо потрібно
+            if namespace:
+                filtered_data = {k: v for k, v in data.items() if k.startswith(f"{namespace}.")}
+                return filtered_data
+            
+            return data
         
         except Exception as e:
             logger.error(f"Помилка завантаження статичних перекладів: {str(e)}")
@@ -1,7 +1,7 @@
 # backend/apps/api/urls.py - ВИПРАВЛЕНИЙ БЕЗ КОНФЛІКТІВ
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from apps.api.webhooks import TranslationWebhookView
+from apps.api.webhooks import TranslationWebhookView, TranslationExportStatusView
 from . import views
 
 # ============================= ІМПОРТ ТІЛЬКИ НОВИХ VIEW =============================
@@ -48,4 +48,5 @@ urlpatterns = [
     
     # =============== WEBHOOKS ===============
     path('webhooks/translations/', TranslationWebhookView.as_view(), name='translation-webhook'),
+    path('webhooks/translations/status/', TranslationExportStatusView.as_view(), name='translation-webhook-status'),
 ]
\ No newline at end of file
@@ -1,7 +1,10 @@
 from django.core.cache import cache
 from django.utils import translation
-import json
 import os
+import logging
+from .json_codec import JSONCodec
+
+logger = logging.getLogger(__name__)
 
 class TranslationManager:
     """
@@ -11,22 +14,37 @@ class TranslationManager:
     @staticmethod
     def invalidate_translations_cache(locale=None):
         """Очищує кеш перекладів"""
-        if locale:
-            # Очищаємо кеш для конкретної локалі
+        from django.conf import settings
+        from .translations_views import UnifiedTranslationsAPIView
+        
+        locales = [locale] if locale else [lang_code for lang_code, _ in settings.LANGUAGES]
+        
+        for lang_code in locales:
             cache.delete_many([
-                f"static_translations_{locale}",
-                f"dynamic_translations_{locale}",
-                f"po_translations_{locale}"
+                f"static_translations_{lang_code}",
+                f"dynamic_translations_{lang_code}",
+                f"po_translations_{lang_code}"
             ])
-        else:
-            # Очищаємо весь кеш перекладів
-            from django.conf import settings
-            for lang_code, _ in settings.LANGUAGES:
+            
+            # Ключі UnifiedTranslationsAPIView
+            if hasattr(cache, 'delete_pattern'):
+                cache.delete_pattern(f"unified_translations_{lang_code}_*")
+            else:
                 cache.delete_many([
-                    f"static_translations_{lang_code}",
-                    f"dynamic_translations_{lang_code}",
-                    f"po_translations_{lang_code}"
+                    f"unified_translations_{lang_code}_{source}_{namespace}"
+                    for source in UnifiedTranslationsAPIView.SUPPORTED_SOURCES
+                    for namespace in ('all', 'services', 'projects')
                 ])
+        
+        # Ключі TranslationsCacheMiddleware хешовані, тому локаль з них не визначити
+        if hasattr(cache, 'delete_pattern'):
+            cache.delete_pattern("trans_cache_*")
+        
+        # Відповіді перекладів у CDN
+        from .cache_policy import SurrogateKeyPurger, SurrogateKeys
+        SurrogateKeyPurger.purge([
+            f'{SurrogateKeys.TRANSLATIONS_KEY}:{locale}' if locale else SurrogateKeys.TRANSLATIONS_KEY
+        ])
     
     @staticmethod
     def preload_translations():
@@ -44,44 +62,38 @@ class TranslationManager:
                 dynamic_view = DynamicTranslationsAPIView()
                 dynamic_data = dynamic_view.get(None, lang_code)
                 
-                print(f"Попередньо завантажено переклади для {lang_code}")
+                logger.debug(f"Попередньо завантажено переклади для {lang_code}")
                 
             except Exception as e:
-                print(f"Помилка при попередньому завантаженні для {lang_code}: {e}")
+                logger.error(f"Помилка при попередньому завантаженні для {lang_code}: {e}")
 
     @staticmethod
     def export_to_frontend(output_path):
-        """Експортує переклади для фронтенду"""
+        """Експортує переклади для фронтенду, повертає кількість ключів по локалях"""
         from django.conf import settings
-        from .translations_views import TranslationsAPIView, DynamicTranslationsAPIView
+        from .translations_views import UnifiedTranslationsAPIView
         
         os.makedirs(output_path, exist_ok=True)
+        view = UnifiedTranslationsAPIView()
+        exported = {}
         
         for lang_code, _ in settings.LANGUAGES:
             try:
-                # Отримуємо всі переклади
-                translations_view = TranslationsAPIView()
-                static_response = translations_view.get(None, lang_code)
-                
-                dynamic_view = DynamicTranslationsAPIView()
-                dynamic_response = dynamic_view.get(None, lang_code)
-                
                 # Об'єднуємо переклади
                 all_translations = {}
-                if hasattr(static_response, 'data') and 'translations' in static_response.data:
-                    all_translations.update(static_response.data['translations'])
-                
-                if hasattr(dynamic_response, 'data') and 'translations' in dynamic_response.data:
-                    all_translations.update(dynamic_response.data['translations'])
+                all_translations.update(view.get_static_translations(lang_code))
+                all_translations.update(view.get_dynamic_translations(lang_code))
                 
-                # Зберігаємо в файл
+                # Зберігаємо атомарно, щоб фронтенд не прочитав напівзаписаний файл
                 output_file = os.path.join(output_path, f"{lang_code}.json")
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(all_translations, f, ensure_ascii=False, indent=2)
+                tmp_file = f"{output_file}.tmp"
+                JSONCodec.dump_file(all_translations, tmp_file)
+                os.replace(tmp_file, output_file)
                 
-                print(f"Експортовано {len(all_translations)} перекладів для {lang_code}")
+                exported[lang_code] = len(all_translations)
+                logger.info(f"Експортовано {len(all_translations)} перекладів для {lang_code}")
                 
             except Exception as e:
-                print(f"Помилка експорту для {lang_code}: {e}")
-
-
+                logger.error(f"Помилка експорту для {lang_code}: {e}")
+        
+        return exported
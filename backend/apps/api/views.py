@@ -5,13 +5,58 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.throttling import AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
-from django.core.cache import cache
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.conf import settings
+from django.http import Http404
+from modeltranslation import utils as mt_utils
+from .cache_policy import CachePolicyMixin, CONTENT_POLICY, LISTING_POLICY
+from .compiled import CompiledSerializerMixin
+from .documents import DetailDocumentMixin
+from .response_cache import ResponseCacheMixin
+from .slugs import SlugIndex, SlugLookupMixin
 from .serializers import *
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.viewsets import GenericViewSet
 
+class LocalizedProjectionViewSetMixin:
+    """
+    Обмежує вибірку колонками активної мови, які виводить серіалізатор дії
+    (LocalizedProjectionMixin.project_queryset за Meta.fields).
+    Агрегати серіалізатора (annotate_queryset) рахуються в тому ж запиті.
+    """
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        
+        if hasattr(serializer_class, 'project_queryset'):
+            queryset = serializer_class.project_queryset(queryset)
+        
+        if hasattr(serializer_class, 'annotate_queryset'):
+            queryset = serializer_class.annotate_queryset(queryset)
+        return queryset
+
+
+class RecommendationViewSetMixin:
+    """Схожі об'єкти з таблиці зв'язків (apps/common/recommendations.py) одним запитом"""
+    
+    def recommendations_response(self, pk, source_field, serializer_class):
+        if not str(pk).isdigit():
+            raise Http404
+        queryset = self.get_queryset().filter(**{
+            f'recommended_in__{source_field}': pk,
+            'recommended_in__language': mt_utils.get_language(),
+        }).order_by('recommended_in__rank')
+        data = self.serialize_many(queryset, serializer_class)
+        # Порожній список - або рекомендацій ще немає, або об'єкта не існує
+        if not data and not self.get_queryset().filter(pk=pk).exists():
+            raise Http404
+        return Response(data)
+
+
+# Кеш відповідей інвалідується сигналами, тому TTL може бути довгим
+RESPONSE_CACHE_TTL = getattr(settings, 'RESPONSE_CACHE_SETTINGS', {}).get('TIMEOUT', 60 * 60 * 24)
+
+
 # Rate throttle для перекладів
 class TranslationsRateThrottle(AnonRateThrottle):
     """Спеціальний throttle для API перекладів"""
@@ -19,32 +64,39 @@ class TranslationsRateThrottle(AnonRateThrottle):
     rate = '30/min'  # 30 запитів за хвилину
 
 
-class HomePageViewSet(viewsets.ReadOnlyModelViewSet):
+class HomePageViewSet(CachePolicyMixin, ResponseCacheMixin, LocalizedProjectionViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """API для головної сторінки"""
     queryset = HomePage.objects.filter(is_active=True)
     serializer_class = HomePageSerializer
-    
-    @method_decorator(cache_page(60 * 15))  # Кеш на 15 хвилин
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    response_cache = {'list': RESPONSE_CACHE_TTL}
+    cache_policy = {'list': CONTENT_POLICY}
 
 
-class AboutPageViewSet(viewsets.ReadOnlyModelViewSet):
+class AboutPageViewSet(CachePolicyMixin, ResponseCacheMixin, LocalizedProjectionViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """API для сторінки Про нас"""
     queryset = AboutPage.objects.filter(is_active=True)
     serializer_class = AboutPageSerializer
-    
-    @method_decorator(cache_page(60 * 30))  # Кеш на 30 хвилин
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    response_cache = {'list': RESPONSE_CACHE_TTL}
+    cache_policy = {'list': CONTENT_POLICY}
 
 
-class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
+class ServiceViewSet(CachePolicyMixin, ResponseCacheMixin, SlugLookupMixin, DetailDocumentMixin, RecommendationViewSetMixin, CompiledSerializerMixin, LocalizedProjectionViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """API для послуг"""
     queryset = Service.objects.filter(is_active=True).order_by('order')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['is_featured']
     search_fields = ['name', 'short_description']
+    cache_policy = {
+        'list': CONTENT_POLICY,
+        'retrieve': CONTENT_POLICY,
+        'featured': CONTENT_POLICY,
+        'similar': LISTING_POLICY,
+    }
+    
+    response_cache = {'featured': RESPONSE_CACHE_TTL}
+    compiled_actions = ('list', 'featured', 'similar')
+    document_dependencies = {ServiceFeature: 'service'}
+    document_prefetch = ('features',)
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -54,33 +106,44 @@ class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Отримати рекомендовані послуги"""
-        cache_key = 'featured_services'
-        featured_services = cache.get(cache_key)
-        
-        if not featured_services:
-            featured_services = self.queryset.filter(is_featured=True)[:6]
-            cache.set(cache_key, featured_services, 60 * 30)  # 30 хвилин
-        
-        serializer = ServiceListSerializer(featured_services, many=True, context={'request': request})
-        return Response(serializer.data)
+        featured_services = self.get_queryset().filter(is_featured=True)[:6]
+        return Response(self.serialize_many(featured_services, ServiceListSerializer))
+    
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Отримати схожі послуги"""
+        return self.recommendations_response(pk, 'service', ServiceListSerializer)
 
 
-class ProjectCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class ProjectCategoryViewSet(CachePolicyMixin, ResponseCacheMixin, SlugLookupMixin, LocalizedProjectionViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """API для категорій проектів"""
     queryset = ProjectCategory.objects.filter(is_active=True).order_by('order')
     serializer_class = ProjectCategorySerializer
-    
-    @method_decorator(cache_page(60 * 60))  # Кеш на 1 годину
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    response_cache = {'list': RESPONSE_CACHE_TTL}
+    # projects_count рахується по проєктах
+    cache_dependencies = (Project,)
+    cache_policy = {'list': CONTENT_POLICY, 'retrieve': CONTENT_POLICY}
 
 
-class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
+class ProjectViewSet(CachePolicyMixin, SlugLookupMixin, DetailDocumentMixin, RecommendationViewSetMixin, CompiledSerializerMixin, LocalizedProjectionViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """API для проектів"""
     queryset = Project.objects.filter(is_active=True).order_by('-created_at')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['category', 'is_featured']
     search_fields = ['title', 'short_description']
+    cache_policy = {
+        'list': CONTENT_POLICY,
+        'retrieve': CONTENT_POLICY,
+        'featured': CONTENT_POLICY,
+        'by_category': CONTENT_POLICY,
+        'related': LISTING_POLICY,
+    }
+    
+    compiled_actions = ('list', 'featured', 'by_category', 'related')
+    document_dependencies = {ProjectImage: 'project', ProjectCategory: 'category'}
+    # projects_count категорії входить у документ кожного проєкту категорії
+    document_siblings = ('category',)
+    document_prefetch = ('images',)
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -90,9 +153,13 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Отримати рекомендовані проекти"""
-        featured_projects = self.queryset.filter(is_featured=True)[:6]
-        serializer = ProjectListSerializer(featured_projects, many=True, context={'request': request})
-        return Response(serializer.data)
+        featured_projects = self.get_queryset().filter(is_featured=True)[:6]
+        return Response(self.serialize_many(featured_projects, ProjectListSerializer))
+    
+    @action(detail=True, methods=['get'])
+    def related(self, request, pk=None):
+        """Отримати схожі проекти"""
+        return self.recommendations_response(pk, 'project', ProjectListSerializer)
     
     @action(detail=False, methods=['get'])
     def by_category(self, request):
@@ -101,21 +168,26 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
         if not category_slug:
             return Response({'error': 'Category parameter required'}, status=400)
         
-        try:
-            category = ProjectCategory.objects.get(slug=category_slug, is_active=True)
-            projects = self.queryset.filter(category=category)
-            serializer = ProjectListSerializer(projects, many=True, context={'request': request})
-            return Response(serializer.data)
-        except ProjectCategory.DoesNotExist:
+        # Слаг будь-якої мови; id активної категорії - з індексу слагів, без запиту до БД
+        category_id = SlugIndex.resolve(ProjectCategory, category_slug)
+        if category_id is None:
             return Response({'error': 'Category not found'}, status=404)
+        projects = self.get_queryset().filter(category_id=category_id)
+        return Response(self.serialize_many(projects, ProjectListSerializer))
 
 
-class JobPositionViewSet(viewsets.ReadOnlyModelViewSet):
+class JobPositionViewSet(CachePolicyMixin, SlugLookupMixin, LocalizedProjectionViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """API для вакансій"""
     queryset = JobPosition.objects.filter(is_active=True).order_by('-created_at')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['employment_type', 'is_urgent', 'location']
     search_fields = ['title', 'location']
+    cache_policy = {
+        'list': LISTING_POLICY,
+        'retrieve': LISTING_POLICY,
+        'urgent': LISTING_POLICY,
+        'active': LISTING_POLICY,
+    }
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -125,14 +197,14 @@ class JobPositionViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def urgent(self, request):
         """Отримати термінові вакансії"""
-        urgent_jobs = self.queryset.filter(is_urgent=True)
+        urgent_jobs = self.get_queryset().filter(is_urgent=True)
         serializer = JobPositionListSerializer(urgent_jobs, many=True, context={'request': request})
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def active(self, request):
         """Отримати активні вакансії"""
-        active_jobs = self.queryset.filter(expires_at__isnull=True)
+        active_jobs = self.get_queryset().filter(expires_at__isnull=True)
         serializer = JobPositionListSerializer(active_jobs, many=True, context={'request': request})
         return Response(serializer.data)
 
@@ -157,17 +229,18 @@ class JobApplicationViewSet(CreateModelMixin, GenericViewSet):
         )
 
 
-class OfficeViewSet(viewsets.ReadOnlyModelViewSet):
+class OfficeViewSet(CachePolicyMixin, LocalizedProjectionViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """API для офісів"""
     queryset = Office.objects.filter(is_active=True).order_by('order')
     serializer_class = OfficeSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['office_type', 'is_main']
+    cache_policy = {'list': CONTENT_POLICY, 'retrieve': CONTENT_POLICY, 'main': CONTENT_POLICY}
     
     @action(detail=False, methods=['get'])
     def main(self, request):
         """Отримати головний офіс"""
-        main_office = self.queryset.filter(is_main=True).first()
+        main_office = self.get_queryset().filter(is_main=True).first()
         if main_office:
             serializer = OfficeSerializer(main_office, context={'request': request})
             return Response(serializer.data)
@@ -193,14 +266,12 @@ class ContactInquiryViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
         )
 
 
-class PartnershipInfoViewSet(viewsets.ReadOnlyModelViewSet):
+class PartnershipInfoViewSet(CachePolicyMixin, ResponseCacheMixin, LocalizedProjectionViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """API для інформації про партнерство"""
     queryset = PartnershipInfo.objects.filter(is_active=True)
     serializer_class = PartnershipInfoSerializer
-    
-    @method_decorator(cache_page(60 * 60))  # Кеш на 1 годину
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    response_cache = {'list': RESPONSE_CACHE_TTL}
+    cache_policy = {'list': CONTENT_POLICY}
 
 
 class PartnerInquiryViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
@@ -222,11 +293,10 @@ class PartnerInquiryViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
         )
 
 
-class WorkplacePhotoViewSet(viewsets.ReadOnlyModelViewSet):
+class WorkplacePhotoViewSet(CachePolicyMixin, ResponseCacheMixin, CompiledSerializerMixin, LocalizedProjectionViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """API для фото робочих місць"""
     queryset = WorkplacePhoto.objects.filter(is_active=True).order_by('order')
     serializer_class = WorkplacePhotoSerializer
-    
-    @method_decorator(cache_page(60 * 30))  # Кеш на 30 хвилин
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
\ No newline at end of file
+    response_cache = {'list': RESPONSE_CACHE_TTL}
+    compiled_actions = ('list',)
+    cache_policy = {'list': CONTENT_POLICY, 'retrieve': CONTENT_POLICY}
@@ -2,7 +2,7 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
-from .utils import TranslationManager
+from .tasks import TranslationExportJob
 import json
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -11,13 +11,22 @@ class TranslationWebhookView(View):
     
     def post(self, request):
         try:
-            # Очищаємо кеш
-            TranslationManager.invalidate_translations_cache()
+            # Ставимо експорт у чергу: серія збережень дає один прогін
+            status = TranslationExportJob.enqueue(reason='rosetta')
             
-            # Експортуємо нові переклади
-            output_path = '/path/to/frontend/public/backend-translations'
-            TranslationManager.export_to_frontend(output_path)
-            
-            return JsonResponse({'status': 'success', 'message': 'Переклади оновлено'})
+            return JsonResponse({
+                'status': 'accepted',
+                'message': 'Експорт перекладів заплановано',
+                'job': status,
+            }, status=202)
         except Exception as e:
-            return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
\ No newline at end of file
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
+
+
+class TranslationExportStatusView(View):
+    """Статус відкладеного експорту перекладів (лише для персоналу)"""
+    
+    def get(self, request):
+        if not request.user.is_staff:
+            return JsonResponse({'status': 'error', 'message': 'Доступ заборонено'}, status=403)
+        return JsonResponse({'job': TranslationExportJob.get_status()})
@@ -0,0 +1,204 @@
+# backend/apps/common/jobs.py
+"""
+Відкладена пакетна обробка змін у фоновому потоці процесу.
+
+Зміни накопичуються в черзі (merge), потік через DELAY секунд обробляє
+їх одним викликом handler - серія збережень в адмінці дає один прохід.
+Якщо handler падає, зміни повертаються в чергу й повторюються з
+експоненційною затримкою (до MAX_RETRY_DELAY), тож невдале оновлення
+не губиться до наступної повної перебудови. При завершенні процесу
+(atexit) накопичене обробляється синхронно. ASYNC=False - обробка
+одразу після коміту (тести).
+
+    worker = DebouncedWorker('sitemaps', handler, get_config)
+    worker.add_on_commit({'projects': {pk}})
+
+Файли, які пишуть кілька воркерів (sitemap, знімок API), захищає
+CacheLock - замок у спільному кеші, як RUN_LOCK_KEY експорту перекладів.
+"""
+from django.core.cache import cache
+from django.db import connection, transaction
+import atexit
+import hashlib
+import os
+import threading
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 300
+
+
+def merge_changes(queued, changes):
+    """Об'єднання змін: множини, словники (по ключах), кортежі (поелементно), прапорці"""
+    if queued is None:
+        return changes
+    if changes is None:
+        return queued
+    if isinstance(queued, set):
+        return queued | changes
+    if isinstance(queued, dict):
+        merged = dict(queued)
+        for key, value in changes.items():
+            merged[key] = merge_changes(merged.get(key), value)
+        return merged
+    if isinstance(queued, tuple):
+        return tuple(merge_changes(a, b) for a, b in zip(queued, changes))
+    return queued or changes
+
+
+class PartialFailure(Exception):
+    """Частину змін оброблено: у чергу повертаються лише `remaining`"""
+
+    def __init__(self, message, remaining):
+        super().__init__(message)
+        self.remaining = remaining
+
+
+class DebouncedWorker:
+    """
+    Черга змін з фоновим потоком.
+
+    `handler(changes)` обробляє накопичене, виняток - повтор з затримкою.
+    PartialFailure(remaining) - повторюються лише `remaining`, а не все.
+    `get_config()` - словник налаштувань завдання: async, delay,
+    max_retry_delay (необов'язково).
+    """
+
+    def __init__(self, name, handler, get_config, merge=merge_changes):
+        self.name = name
+        self.handler = handler
+        self.get_config = get_config
+        self.merge = merge
+        self._pending = None
+        self._wait = None
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._worker = None
+        self._exit_registered = False
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def add_on_commit(self, changes=True):
+        transaction.on_commit(lambda: self.add(changes))
+
+    def add(self, changes=True, delay=None):
+        """Ставить зміни в чергу; delay - не раніше ніж через стільки секунд"""
+        with self._lock:
+            self._pending = self.merge(self._pending, changes)
+            if delay is not None:
+                self._wait = max(self._wait or 0, delay)
+            if self.get_config().get('async', True):
+                self._start()
+                return
+        self.run_pending()
+
+    def _start(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        if not self._exit_registered:
+            atexit.register(self.flush)
+            self._exit_registered = True
+        self._worker = threading.Thread(target=self._run_worker, name=self.name, daemon=True)
+        self._worker.start()
+
+    def _run_worker(self):
+        try:
+            while True:
+                with self._lock:
+                    wait, self._wait = self._wait, None
+                time.sleep(wait if wait is not None else self.get_config()['delay'])
+                with self._lock:
+                    if self._pending is None:
+                        self._worker = None
+                        return
+                self.run_pending()
+        finally:
+            connection.close()
+
+    def run_pending(self):
+        """Синхронно обробляє накопичене; при помилці зміни повертаються в чергу. True - успіх"""
+        with self._run_lock:
+            with self._lock:
+                pending, self._pending = self._pending, None
+            if pending is None:
+                return True
+            try:
+                self.handler(pending)
+            except Exception as e:
+                config = self.get_config()
+                if isinstance(e, PartialFailure):
+                    pending = e.remaining
+                with self._lock:
+                    self._pending = self.merge(pending, self._pending)
+                    self._failures += 1
+                    retry = min(max(config['delay'], 1) * 2 ** self._failures, config.get('max_retry_delay', MAX_RETRY_DELAY))
+                    self._wait = max(self._wait or 0, retry)
+                logger.error(
+                    f"Помилка фонового завдання {self.name} (спроба {self._failures}, "
+                    f"повтор через {retry:.0f} с): {str(e)}"
+                )
+                return False
+            with self._lock:
+                self._failures = 0
+            return True
+
+    def flush(self):
+        """Завершення процесу: накопичене обробляється синхронно"""
+        if self._pending is not None:
+            self.run_pending()
+
+
+class LockTimeout(RuntimeError):
+    """Замок утримує інший процес довше за `wait` - завдання повториться пізніше"""
+
+
+class CacheLock:
+    """
+    Міжпроцесний замок через cache.add (Redis спільний для всіх воркерів).
+
+    `timeout` - час життя замка, якщо власник завершився, не звільнивши
+    його (має перевищувати найдовший прохід); `wait` - скільки чекати,
+    далі LockTimeout. Під час збою Redis (запобіжник кешу) замок не
+    видається - LockTimeout, завдання повториться після відновлення.
+
+        with CacheLock.for_path('sitemaps', root, timeout=600):
+            ...
+    """
+
+    def __init__(self, key, timeout=300, wait=60, poll=0.05):
+        self.key = key
+        self.timeout = timeout
+        self.wait = wait
+        self.poll = poll
+        self.token = f'{os.getpid()}:{uuid.uuid4().hex}'
+
+    @classmethod
+    def for_path(cls, name, path, **kwargs):
+        """Замок каталогу: різні ROOT (тести, кілька сайтів) не блокують один одного"""
+        digest = hashlib.md5(str(path).encode('utf-8')).hexdigest()[:12]
+        return cls(f'{name}_lock:{digest}', **kwargs)
+
+    def acquire(self):
+        deadline = time.monotonic() + self.wait
+        while not cache.add(self.key, self.token, self.timeout):
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"Замок {self.key} зайнятий іншим процесом")
+            time.sleep(self.poll)
+
+    def release(self):
+        # Замок, що вже протух і перейшов до іншого процесу, не видаляємо
+        if cache.get(self.key) == self.token:
+            cache.delete(self.key)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
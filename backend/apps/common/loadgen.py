@@ -0,0 +1,454 @@
+# backend/apps/common/loadgen.py
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from datetime import date, timedelta
+from modeltranslation.utils import build_localized_fieldname
+from PIL import Image, ImageDraw
+import io
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Обсяги даних для бенчмарків та профілювання
+SCALES = {
+    'tiny': {
+        'categories': 5, 'projects': 50, 'images_per_project': 2, 'services': 10, 'features_per_service': 3,
+        'jobs': 10, 'applications': 50, 'offices': 3, 'inquiries': 100, 'partner_inquiries': 20,
+    },
+    'small': {
+        'categories': 10, 'projects': 500, 'images_per_project': 3, 'services': 50, 'features_per_service': 4,
+        'jobs': 50, 'applications': 1000, 'offices': 5, 'inquiries': 1000, 'partner_inquiries': 200,
+    },
+    'medium': {
+        'categories': 25, 'projects': 2000, 'images_per_project': 4, 'services': 200, 'features_per_service': 5,
+        'jobs': 200, 'applications': 10000, 'offices': 10, 'inquiries': 10000, 'partner_inquiries': 2000,
+    },
+    'large': {
+        'categories': 50, 'projects': 10000, 'images_per_project': 5, 'services': 1000, 'features_per_service': 6,
+        'jobs': 1000, 'applications': 50000, 'offices': 20, 'inquiries': 100000, 'partner_inquiries': 10000,
+    },
+}
+
+WORDS = {
+    'uk': (
+        'пошиття форма якість тканина швейний цех замовлення партія модель розмір '
+        'логотип вишивка друк бавовна поліестер корпоративний одяг робочий захисний '
+        'медичний кухарський футболка куртка жилет комбінезон фартух костюм '
+        'виробництво контроль термін доставка клієнт дизайн лекала крій'
+    ).split(),
+    'en': (
+        'sewing uniform quality fabric workshop order batch model size logo '
+        'embroidery print cotton polyester corporate clothing workwear protective '
+        'medical chef tshirt jacket vest overalls apron suit production control '
+        'deadline delivery client design pattern cutting'
+    ).split(),
+}
+CITIES = {
+    'uk': ['Київ', 'Львів', 'Харків', 'Дніпро', 'Одеса'],
+    'en': ['Kyiv', 'Lviv', 'Kharkiv', 'Dnipro', 'Odesa'],
+}
+LANGUAGE_CODES = [code for code, _ in settings.LANGUAGES]
+
+
+class LoadDataGenerator:
+    """
+    Детермінований генератор синтетичних даних для навантажувальних тестів.
+
+    Однаковий seed дає однакові тексти, зв'язки та прапорці, тому прогони
+    бенчмарків порівнянні. Записи створюються через bulk_create пакетами;
+    excerpt та rendered_html заповнюються до вставки, бо bulk_create
+    не викликає save().
+    """
+
+    BASE_DATE = date(2024, 1, 1)
+    PLACEHOLDER_DIR = 'loadgen'
+    PLACEHOLDER_COUNT = 12
+    PLACEHOLDER_SIZE = (1200, 800)
+
+    def __init__(self, seed=42, batch_size=1000, stdout=None, images=True):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.images = images
+        self._placeholders = []
+
+    # ---- тексти ----
+
+    def words(self, lang, count):
+        return ' '.join(self.rng.choice(WORDS[lang]) for _ in range(count))
+
+    def sentence(self, lang, count=8):
+        text = self.words(lang, count)
+        return text[:1].upper() + text[1:] + '.'
+
+    def title(self, lang, index, count=3):
+        return f'{self.words(lang, count).capitalize()} {index}'
+
+    def html(self, lang, paragraphs=2, sentences=3):
+        blocks = [
+            '<p>' + ' '.join(self.sentence(lang) for _ in range(sentences)) + '</p>'
+            for _ in range(paragraphs)
+        ]
+        if self.rng.random() < 0.5:
+            items = ''.join(f'<li>{self.words(lang, 3)}</li>' for _ in range(3))
+            blocks.append(f'<ul>{items}</ul>')
+        return ''.join(blocks)
+
+    def translated(self, instance, name, factory):
+        """Заповнює поле для всіх мов; базове поле - мова за замовчуванням"""
+        values = {lang: factory(lang) for lang in LANGUAGE_CODES}
+        # Базове поле - першим: дескриптор modeltranslation пише його ще й у поле активної мови
+        setattr(instance, name, values[settings.LANGUAGE_CODE])
+        for lang, value in values.items():
+            setattr(instance, build_localized_fieldname(name, lang), value)
+
+    @staticmethod
+    def slug(prefix, index):
+        """Фабрика слагів для translated(): окремий слаг для кожної мови, крім основної"""
+        return lambda lang: f'{prefix}-{index}' if lang == settings.LANGUAGE_CODE else f'{prefix}-{index}-{lang}'
+
+    def day(self, index):
+        return self.BASE_DATE - timedelta(days=index % 1000)
+
+    # ---- файли ----
+
+    def placeholder_images(self):
+        """
+        Невеликий набір реальних JPEG заглушок, спільний для всіх записів:
+        MEDIA не розростається, а зображення мають справжні розміри
+        """
+        if self._placeholders:
+            return self._placeholders
+
+        palette = random.Random(self.seed)
+        for index in range(self.PLACEHOLDER_COUNT):
+            name = f'{self.PLACEHOLDER_DIR}/placeholder-{index}.jpg'
+            if self.images and not default_storage.exists(name):
+                color = tuple(palette.randint(40, 215) for _ in range(3))
+                image = Image.new('RGB', self.PLACEHOLDER_SIZE, color)
+                draw = ImageDraw.Draw(image)
+                draw.rectangle((40, 40, self.PLACEHOLDER_SIZE[0] - 40, self.PLACEHOLDER_SIZE[1] - 40), outline='white', width=6)
+                draw.text((80, 80), f'UGC load data #{index}', fill='white')
+                buffer = io.BytesIO()
+                image.save(buffer, 'JPEG', quality=80)
+                name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            self._placeholders.append(name)
+        return self._placeholders
+
+    def image(self):
+        return self.rng.choice(self.placeholder_images())
+
+    def resume(self):
+        name = f'{self.PLACEHOLDER_DIR}/resume.pdf'
+        if self.images and not default_storage.exists(name):
+            name = default_storage.save(name, ContentFile(b'%PDF-1.4\n% UGC load data placeholder\n%%EOF\n'))
+        return name
+
+    # ---- збереження ----
+
+    @staticmethod
+    def prepare(instance):
+        """Те, що зазвичай робить save(): уривки та готовий HTML"""
+        if hasattr(instance, 'update_excerpts'):
+            instance.update_excerpts()
+        if hasattr(instance, 'update_rendered_html'):
+            instance.update_rendered_html()
+        return instance
+
+    def bulk_create(self, model, instances):
+        started = time.perf_counter()
+        created = []
+        for start in range(0, len(instances), self.batch_size):
+            batch = [self.prepare(instance) for instance in instances[start:start + self.batch_size]]
+            created.extend(model.objects.bulk_create(batch))
+        self.log(f'{model._meta.label}: {len(created)} за {time.perf_counter() - started:.1f} с')
+        return created
+
+    def log(self, message):
+        logger.info(message)
+        if self.stdout is not None:
+            self.stdout.write(f'   {message}')
+
+    # ---- моделі ----
+
+    def generate(self, scale='small', **counts):
+        """Створює набір даних; counts перевизначають значення масштабу"""
+        counts = {**SCALES[scale], **{name: value for name, value in counts.items() if value is not None}}
+        with transaction.atomic():
+            self.generate_pages()
+            categories = self.generate_categories(counts['categories'])
+            projects = self.generate_projects(counts['projects'], categories)
+            self.generate_project_images(projects, counts['images_per_project'])
+            services = self.generate_services(counts['services'])
+            self.generate_service_features(services, counts['features_per_service'])
+            jobs = self.generate_jobs(counts['jobs'])
+            self.generate_applications(jobs, counts['applications'])
+            self.generate_offices(counts['offices'])
+            self.generate_inquiries(counts['inquiries'])
+            self.generate_partner_inquiries(counts['partner_inquiries'])
+        self.invalidate_caches()
+        return counts
+
+    def generate_pages(self):
+        from apps.content.models import HomePage, AboutPage
+        from apps.partners.models import PartnershipInfo
+        from apps.jobs.models import WorkplacePhoto
+
+        homepage = HomePage(hero_image=self.image(), years_experience=20, employees_count=150, projects_completed=1200)
+        self.translated(homepage, 'company_description', self.html)
+        self.translated(homepage, 'mission_text', self.sentence)
+        self.translated(homepage, 'values_text', self.sentence)
+        self.bulk_create(HomePage, [homepage])
+
+        about = AboutPage()
+        for name in ('history_text', 'mission_text', 'values_text', 'social_responsibility'):
+            self.translated(about, name, self.html)
+        self.bulk_create(AboutPage, [about])
+
+        partnership = PartnershipInfo(min_order_amount=50, production_capacity='10000', work_stages_info='')
+        for name in ('cooperation_terms', 'work_stages', 'faq_content', 'benefits'):
+            self.translated(partnership, name, self.html)
+        self.bulk_create(PartnershipInfo, [partnership])
+
+        photos = []
+        for index in range(10):
+            photo = WorkplacePhoto(image=self.image(), order=index)
+            self.translated(photo, 'title', lambda lang: self.title(lang, index))
+            self.translated(photo, 'description', self.sentence)
+            photos.append(photo)
+        self.bulk_create(WorkplacePhoto, photos)
+
+    def generate_categories(self, count):
+        from apps.projects.models import ProjectCategory
+
+        categories = []
+        for index in range(count):
+            category = ProjectCategory(image=self.image(), order=index)
+            self.translated(category, 'slug', self.slug('load-category', index))
+            self.translated(category, 'name', lambda lang: self.title(lang, index, 2))
+            self.translated(category, 'description', lambda lang: self.html(lang, 1))
+            categories.append(category)
+        return self.bulk_create(ProjectCategory, categories)
+
+    def generate_projects(self, count, categories):
+        from apps.projects.models import Project
+
+        projects = []
+        for index in range(count):
+            project = Project(
+                category=self.rng.choice(categories),
+                client_name=f'Client {self.rng.randint(1, count // 5 + 1)}',
+                project_date=self.day(index),
+                quantity=self.rng.randint(10, 5000),
+                materials_used=self.words('en', 3),
+                main_image=self.image(),
+                is_featured=self.rng.random() < 0.1,
+                is_active=self.rng.random() < 0.95,
+            )
+            self.translated(project, 'title', lambda lang: self.title(lang, index))
+            self.translated(project, 'slug', self.slug('load-project', index))
+            self.translated(project, 'short_description', lambda lang: self.html(lang, 1, 2))
+            self.translated(project, 'detailed_description', lambda lang: self.html(lang, 3))
+            for name in ('challenge', 'solution', 'result'):
+                self.translated(project, name, lambda lang: self.html(lang, 1))
+            projects.append(project)
+        return self.bulk_create(Project, projects)
+
+    def generate_project_images(self, projects, per_project):
+        from apps.projects.models import ProjectImage
+
+        images = []
+        for project in projects:
+            for order in range(self.rng.randint(0, per_project * 2)):
+                images.append(ProjectImage(
+                    project=project,
+                    image=self.image(),
+                    caption=self.sentence('uk', 4),
+                    order=order,
+                ))
+        return self.bulk_create(ProjectImage, images)
+
+    def generate_services(self, count):
+        from apps.services.models import Service
+
+        services = []
+        for index in range(count):
+            service = Service(
+                main_image=self.image(),
+                icon=self.image(),
+                min_order_quantity=self.rng.choice([None, 10, 50, 100]),
+                production_time=f'{self.rng.randint(3, 30)} днів',
+                order=index,
+                is_featured=self.rng.random() < 0.2,
+                is_active=self.rng.random() < 0.95,
+            )
+            self.translated(service, 'name', lambda lang: self.title(lang, index))
+            self.translated(service, 'slug', self.slug('load-service', index))
+            self.translated(service, 'short_description', lambda lang: self.html(lang, 1, 2))
+            self.translated(service, 'detailed_description', lambda lang: self.html(lang, 3))
+            self.translated(service, 'benefits', lambda lang: self.html(lang, 1))
+            services.append(service)
+        return self.bulk_create(Service, services)
+
+    def generate_service_features(self, services, per_service):
+        from apps.services.models import ServiceFeature
+
+        features = []
+        for service in services:
+            for order in range(per_service):
+                feature = ServiceFeature(service=service, icon=f'icon-{self.rng.randint(1, 20)}', order=order)
+                self.translated(feature, 'title', lambda lang: self.words(lang, 2).capitalize())
+                self.translated(feature, 'description', lambda lang: self.html(lang, 1, 1))
+                features.append(feature)
+        return self.bulk_create(ServiceFeature, features)
+
+    def generate_jobs(self, count):
+        from apps.jobs.models import JobPosition
+
+        employment_types = [value for value, _ in JobPosition._meta.get_field('employment_type').choices]
+        jobs = []
+        for index in range(count):
+            salary_from = self.rng.randint(15, 40) * 1000
+            job = JobPosition(
+                employment_type=self.rng.choice(employment_types),
+                salary_from=salary_from,
+                salary_to=salary_from + self.rng.randint(5, 20) * 1000,
+                is_urgent=self.rng.random() < 0.15,
+                is_active=self.rng.random() < 0.9,
+            )
+            self.translated(job, 'title', lambda lang: self.title(lang, index))
+            self.translated(job, 'slug', self.slug('load-job', index))
+            years = self.rng.randint(0, 5)
+            self.translated(job, 'experience_required', lambda lang: f"{years}+ {'років' if lang == 'uk' else 'years'}")
+            city = self.rng.randrange(len(CITIES['uk']))
+            self.translated(job, 'location', lambda lang: CITIES[lang][city])
+            for name in ('description', 'requirements', 'responsibilities', 'benefits'):
+                self.translated(job, name, lambda lang: self.html(lang, 1))
+            jobs.append(job)
+        return self.bulk_create(JobPosition, jobs)
+
+    def generate_applications(self, jobs, count):
+        from apps.jobs.models import JobApplication
+
+        if not jobs:
+            return []
+        resume = self.resume()
+        applications = [
+            JobApplication(
+                position=self.rng.choice(jobs),
+                first_name=f'Name{index}',
+                last_name=f'Surname{index}',
+                email=f'applicant{index}@example.com',
+                phone=f'+380{self.rng.randint(100000000, 999999999)}',
+                cover_letter=self.sentence('uk', 20),
+                resume=resume,
+                is_reviewed=self.rng.random() < 0.5,
+            )
+            for index in range(count)
+        ]
+        return self.bulk_create(JobApplication, applications)
+
+    def generate_offices(self, count):
+        from apps.contacts.models import Office
+
+        office_types = [value for value, _ in Office._meta.get_field('office_type').choices]
+        offices = []
+        for index in range(count):
+            office = Office(
+                office_type=self.rng.choice(office_types),
+                phone=f'+380{self.rng.randint(100000000, 999999999)}',
+                email=f'office{index}@example.com',
+                working_hours='09:00-18:00',
+                order=index,
+                is_main=index == 0,
+            )
+            self.translated(office, 'name', lambda lang: self.title(lang, index, 2))
+            self.translated(office, 'address', lambda lang: f'<p>{self.words(lang, 4)}, {index}</p>')
+            self.translated(office, 'description', lambda lang: self.html(lang, 1))
+            offices.append(office)
+        return self.bulk_create(Office, offices)
+
+    def generate_inquiries(self, count):
+        from apps.contacts.models import ContactInquiry
+
+        inquiry_types = [value for value, _ in ContactInquiry.INQUIRY_TYPES]
+        inquiries = []
+        for index in range(count):
+            inquiry = ContactInquiry(
+                email=f'client{index}@example.com',
+                phone=f'+380{self.rng.randint(100000000, 999999999)}',
+                inquiry_type=self.rng.choice(inquiry_types),
+                is_processed=self.rng.random() < 0.7,
+            )
+            self.translated(inquiry, 'name', lambda lang: f'Client {index}')
+            self.translated(inquiry, 'subject', lambda lang: self.sentence(lang, 4))
+            self.translated(inquiry, 'message', lambda lang: self.html(lang, 1))
+            inquiries.append(inquiry)
+        return self.bulk_create(ContactInquiry, inquiries)
+
+    def generate_partner_inquiries(self, count):
+        from apps.partners.models import PartnerInquiry
+
+        inquiry_types = [value for value, _ in PartnerInquiry._meta.get_field('inquiry_type').choices]
+        inquiries = [
+            PartnerInquiry(
+                company_name=f'Company {index}',
+                contact_person=f'Contact {index}',
+                email=f'partner{index}@example.com',
+                phone=f'+380{self.rng.randint(100000000, 999999999)}',
+                inquiry_type=self.rng.choice(inquiry_types),
+                message=self.sentence('uk', 20),
+                project_description=self.sentence('uk', 12),
+                estimated_quantity=str(self.rng.randint(50, 10000)),
+                is_processed=self.rng.random() < 0.6,
+            )
+            for index in range(count)
+        ]
+        return self.bulk_create(PartnerInquiry, inquiries)
+
+    @staticmethod
+    def generated_models():
+        """Моделі генератора: залежні раніше за батьківські"""
+        from apps.content.models import HomePage, AboutPage, TeamMember, Certificate, ProductionPhoto
+        from apps.partners.models import PartnershipInfo, PartnerInquiry, WorkStage
+        from apps.jobs.models import JobPosition, JobApplication, WorkplacePhoto
+        from apps.projects.models import ProjectCategory, Project, ProjectImage, RelatedProject
+        from apps.services.models import Service, ServiceFeature, SimilarService
+        from apps.contacts.models import Office, ContactInquiry
+
+        return [
+            RelatedProject, SimilarService, ProjectImage, ServiceFeature, JobApplication, PartnerInquiry, ContactInquiry, Office,
+            JobPosition, Service, Project, ProjectCategory, WorkplacePhoto,
+            TeamMember, Certificate, ProductionPhoto, AboutPage, WorkStage, PartnershipInfo, HomePage,
+        ]
+
+    def flush(self):
+        """
+        Видаляє всі записи моделей генератора. Видалення без сигналів
+        (сотні тисяч post_delete надто повільні), кеші скидаються одним разом.
+        """
+        with transaction.atomic():
+            for model in self.generated_models():
+                deleted = model.objects.all()._raw_delete(model.objects.db)
+                self.log(f'{model._meta.label}: видалено {deleted}')
+        self.invalidate_caches()
+
+    def invalidate_caches(self):
+        """bulk_create та видалення без сигналів не інвалідують кеші - робимо це явно"""
+        from apps.api.documents import DetailDocumentStore
+        from apps.api.response_cache import ResponseCacheTags
+        from apps.api.slugs import SlugIndex
+        from apps.api.utils import TranslationManager
+
+        ResponseCacheTags.bump(*self.generated_models())
+        DetailDocumentStore.clear()
+        for model in self.generated_models():
+            if SlugIndex.is_registered(model):
+                SlugIndex.invalidate(model)
+        TranslationManager.invalidate_translations_cache()
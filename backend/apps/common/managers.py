@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import get_language
+from modeltranslation.translator import translator, NotRegistered
+from modeltranslation.utils import build_localized_fieldname, resolution_order
+
+
+def localized_field_names(model, fields, language=None):
+    """
+    Перетворює імена полів на колонки modeltranslation лише для активної мови
+    та її fallback мов: 'title' -> ['title_en', 'title_uk'].
+    Підтримує поля пов'язаних моделей через '__' (наприклад 'category__name').
+    """
+    language = language or get_language() or settings.LANGUAGE_CODE
+
+    try:
+        translated_fields = translator.get_options_for_model(model).all_fields
+    except NotRegistered:
+        translated_fields = {}
+
+    names = []
+    for name in fields:
+        head, _, rest = name.partition('__')
+
+        if rest:
+            related_model = model._meta.get_field(head).related_model
+            names.extend(
+                f'{head}__{related_name}'
+                for related_name in localized_field_names(related_model, [rest], language)
+            )
+        elif head in translated_fields:
+            fallback_languages = getattr(model, head).fallback_languages
+            names.extend(
+                build_localized_fieldname(head, lang)
+                for lang in resolution_order(language, fallback_languages)
+            )
+        else:
+            names.append(head)
+
+    return list(dict.fromkeys(names))
+
+
+class LocalizedQuerySetMixin:
+    """Проєкції queryset на колонки активної мови"""
+
+    def localized_only(self, *fields):
+        """
+        Як only(), але для перекладних полів вибирає лише колонки активної мови
+        та fallback мов замість усіх field/field_uk/field_en.
+        """
+        return self.only(*localized_field_names(self.model, fields))
+
+
+class LocalizedQuerySet(LocalizedQuerySetMixin, models.QuerySet):
+    pass
+
+
+LocalizedManager = models.Manager.from_queryset(LocalizedQuerySet)
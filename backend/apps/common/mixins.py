@@ -0,0 +1,127 @@
+import html
+import re
+from ckeditor.fields import RichTextField
+from django.conf import settings
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+from django.utils.translation import get_language
+from modeltranslation.fields import TranslationField
+from modeltranslation.translator import translator, NotRegistered
+from modeltranslation.utils import build_localized_fieldname, resolution_order
+from .richtext import NoDerivativesImageBuilder, get_render_config, render_fields, render_richtext
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def html_to_excerpt(value, length=300):
+    """Перетворює RichText HTML на короткий plain-text уривок"""
+    if not value:
+        return ''
+    text = html.unescape(strip_tags(value))
+    text = WHITESPACE_RE.sub(' ', text).strip()
+    return Truncator(text).chars(length)
+
+
+class ExcerptMixin:
+    """
+    Заповнює перекладне поле excerpt з HTML поля excerpt_source при збереженні,
+    щоб списки віддавали готовий plain-text без RichText HTML
+    """
+
+    excerpt_source = 'short_description'
+    excerpt_length = 300
+
+    def update_excerpts(self):
+        for lang, _ in settings.LANGUAGES:
+            source = getattr(self, build_localized_fieldname(self.excerpt_source, lang), '')
+            setattr(
+                self,
+                build_localized_fieldname('excerpt', lang),
+                html_to_excerpt(source, self.excerpt_length),
+            )
+
+    def save(self, *args, **kwargs):
+        self.update_excerpts()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                'excerpt', *(build_localized_fieldname('excerpt', lang) for lang, _ in settings.LANGUAGES)
+            }
+        super().save(*args, **kwargs)
+
+
+class RenderedRichTextMixin:
+    """
+    Зберігає санітизований та мінімізований HTML усіх RichText полів
+    (для кожної мови) в JSON полі rendered_html, щоб API віддавало
+    готовий HTML без обробки на кожен запит
+    """
+
+    @classmethod
+    def get_richtext_fields(cls):
+        """{ім'я RichText поля: чи перекладне}"""
+        try:
+            translated = translator.get_options_for_model(cls).all_fields
+        except NotRegistered:
+            translated = {}
+        return {
+            field.name: field.name in translated
+            for field in cls._meta.concrete_fields
+            if isinstance(field, RichTextField) and not isinstance(field, TranslationField)
+        }
+
+    def update_rendered_html(self):
+        self.rendered_html = render_fields(self, self.get_richtext_fields())
+
+    def get_rendered_html(self, name, language=None):
+        """Готовий HTML поля для мови з урахуванням fallback мов modeltranslation"""
+        rendered = self.rendered_html or {}
+        if not rendered:
+            # Запис ще не рендерився (bulk_create, update()): лише санітизація вже
+            # завантажених колонок - читання не пише копії зображень і не робить запитів
+            return render_richtext(
+                self.get_loaded_richtext(name, language), NoDerivativesImageBuilder(get_render_config()),
+            )
+
+        if not self.get_richtext_fields().get(name):
+            return rendered.get(name, '')
+
+        for column in self.get_richtext_columns(name, language):
+            value = rendered.get(column)
+            if value:
+                return value
+        return ''
+
+    def get_richtext_columns(self, name, language=None):
+        """Колонки перекладного поля в порядку fallback мов modeltranslation"""
+        language = language or get_language() or settings.LANGUAGE_CODE
+        return [
+            build_localized_fieldname(name, lang)
+            for lang in resolution_order(language, getattr(type(self), name).fallback_languages)
+        ]
+
+    def get_loaded_richtext(self, name, language=None):
+        """Сирий HTML поля з уже завантажених колонок (відкладені пропускаються)"""
+        deferred = self.get_deferred_fields()
+        if not self.get_richtext_fields().get(name):
+            return '' if name in deferred else getattr(self, name)
+        for column in self.get_richtext_columns(name, language):
+            value = '' if column in deferred else getattr(self, column)
+            if value:
+                return value
+        return ''
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.update_rendered_html()
+        else:
+            sources = set()
+            for name, translated in self.get_richtext_fields().items():
+                sources.add(name)
+                if translated:
+                    sources.update(build_localized_fieldname(name, lang) for lang, _ in settings.LANGUAGES)
+            if sources & set(update_fields):
+                self.update_rendered_html()
+                kwargs['update_fields'] = set(update_fields) | {'rendered_html'}
+        super().save(*args, **kwargs)
@@ -0,0 +1,321 @@
+# backend/apps/common/recommendations.py
+"""
+Рекомендації «схожі проєкти» та «схожі послуги» за TF-IDF.
+
+Для кожної мови тексти об'єктів (HTML без тегів, перекладні поля з
+fallback, назва категорії та токен самої категорії) перетворюються на
+розріджені TF-IDF вектори (scipy.sparse, сублінійний tf, L2 нормування).
+Косинусна схожість - добуток матриць пакетами рядків, top-k сусідів
+зберігаються в таблиці зв'язків (RelatedProject, SimilarService), тож
+API віддає список одним запитом.
+
+    python manage.py build_recommendations            # повна перебудова
+    RecommendationJob.schedule(spec)                  # після зміни об'єкта
+
+Зміна одного документа змінює idf усього корпусу, тож після змін
+таблиця перебудовується повністю; серія збережень в адмінці дає один
+прохід завдяки затримці DELAY.
+"""
+from collections import Counter
+from django.conf import settings
+from django.db import transaction
+from django.utils.html import strip_tags
+from modeltranslation import settings as mt_settings
+from modeltranslation.translator import translator, NotRegistered
+from modeltranslation.utils import build_localized_fieldname, resolution_order
+from scipy import sparse
+import html
+import re
+import time
+import logging
+import numpy as np
+from .jobs import DebouncedWorker
+
+logger = logging.getLogger(__name__)
+
+# Слова з літер (будь-якого алфавіту), від 3 символів
+TOKEN_RE = re.compile(r'[^\W\d_]{3,}')
+
+
+def get_config():
+    """Налаштування з RECOMMENDATION_SETTINGS"""
+    recommendation_settings = getattr(settings, 'RECOMMENDATION_SETTINGS', {})
+    return {
+        'top_k': recommendation_settings.get('TOP_K', 6),
+        'batch_size': recommendation_settings.get('BATCH_SIZE', 256),
+        'async': recommendation_settings.get('ASYNC', True),
+        'delay': recommendation_settings.get('DELAY', 2),
+    }
+
+
+def tokenize(value):
+    if not value:
+        return []
+    text = html.unescape(strip_tags(str(value)))
+    return TOKEN_RE.findall(text.lower())
+
+
+class RecommendationSpec:
+    """
+    Що і з чого рекомендувати.
+
+    `fields` - {шлях поля: вага}, шлях може йти через FK ('category__name');
+    `group` - FK, спільне значення якого саме по собі робить об'єкти схожими;
+    `dependencies` - моделі, зміна яких (назва категорії) теж перебудовує
+    рекомендації.
+    """
+
+    def __init__(self, name, model, link_model, source_field, fields, group=None, dependencies=None):
+        self.name = name
+        self.model = model
+        self.link_model = link_model
+        self.source_field = source_field
+        self.fields = fields
+        self.group = group
+        self.dependencies = tuple(dependencies or ())
+
+    def __repr__(self):
+        return f'<RecommendationSpec {self.name}>'
+
+    def get_queryset(self):
+        return self.model._base_manager.filter(is_active=True).order_by('pk')
+
+    def links(self, language):
+        return self.link_model.objects.filter(language=language)
+
+    def columns(self):
+        """[(шлях, вага, {мова: колонка} або None, fallback мови)]"""
+        columns = []
+        for path, weight in self.fields.items():
+            *relations, name = path.split('__')
+            target = self.model
+            for relation in relations:
+                target = target._meta.get_field(relation).related_model
+            try:
+                translated = name in translator.get_options_for_model(target).all_fields
+            except NotRegistered:
+                translated = False
+            if translated:
+                prefix = path[:-len(name)]
+                localized = {
+                    lang: prefix + build_localized_fieldname(name, lang)
+                    for lang in mt_settings.AVAILABLE_LANGUAGES
+                }
+                columns.append((path, weight, localized, getattr(target, name).fallback_languages))
+            else:
+                columns.append((path, weight, None, None))
+        return columns
+
+    def corpus(self, language):
+        """(ids, [токени]) активних об'єктів для мови - один запит"""
+        columns = self.columns()
+        names = ['pk']
+        for path, _, localized, _ in columns:
+            names.extend(localized.values() if localized else [path])
+        if self.group:
+            names.append(f'{self.group}_id')
+
+        ids, documents = [], []
+        for row in self.get_queryset().values(*names):
+            tokens = []
+            for path, weight, localized, fallback_languages in columns:
+                if localized:
+                    value = next(
+                        (row[localized[lang]] for lang in resolution_order(language, fallback_languages)
+                         if row.get(localized[lang])),
+                        '',
+                    )
+                else:
+                    value = row[path]
+                tokens.extend(tokenize(value) * weight)
+            if self.group and row[f'{self.group}_id'] is not None:
+                tokens.append(f"#{self.group}:{row[f'{self.group}_id']}")
+            ids.append(row['pk'])
+            documents.append(tokens)
+        return ids, documents
+
+
+def specs():
+    """Зареєстровані рекомендації"""
+    from apps.projects.models import Project, ProjectCategory, RelatedProject
+    from apps.services.models import Service, SimilarService
+
+    return [
+        RecommendationSpec(
+            'projects', Project, RelatedProject, 'project',
+            fields={
+                'title': 3,
+                'short_description': 2,
+                'detailed_description': 1,
+                'materials_used': 2,
+                'category__name': 2,
+            },
+            group='category',
+            dependencies=(ProjectCategory,),
+        ),
+        RecommendationSpec(
+            'services', Service, SimilarService, 'service',
+            fields={
+                'name': 3,
+                'short_description': 2,
+                'detailed_description': 1,
+                'benefits': 1,
+            },
+        ),
+    ]
+
+
+def get_spec(name):
+    for spec in specs():
+        if spec.name == name:
+            return spec
+    raise KeyError(name)
+
+
+def tfidf_matrix(documents):
+    """L2-нормовані TF-IDF вектори (csr_matrix, рядок на документ)"""
+    document_frequency = Counter()
+    for tokens in documents:
+        document_frequency.update(set(tokens))
+    vocabulary = {token: index for index, token in enumerate(sorted(document_frequency))}
+
+    rows, cols, values = [], [], []
+    for row, tokens in enumerate(documents):
+        for token, count in Counter(tokens).items():
+            rows.append(row)
+            cols.append(vocabulary[token])
+            values.append(count)
+
+    count = len(documents)
+    if not vocabulary:
+        return sparse.csr_matrix((count, 0))
+    matrix = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float64), (rows, cols)),
+        shape=(count, len(vocabulary)),
+    )
+    matrix.data = 1.0 + np.log(matrix.data)
+
+    frequencies = np.zeros(len(vocabulary))
+    for token, frequency in document_frequency.items():
+        frequencies[vocabulary[token]] = frequency
+    idf = np.log((1.0 + count) / (1.0 + frequencies)) + 1.0
+    matrix = (matrix @ sparse.diags(idf)).tocsr()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return (sparse.diags(1.0 / norms) @ matrix).tocsr()
+
+
+def nearest(matrix, rows, top_k, batch_size):
+    """{рядок: [(рядок сусіда, схожість)]} - top-k за косинусом, без себе та нульових"""
+    transposed = matrix.T.tocsc()
+    count = matrix.shape[0]
+    k = min(top_k, count - 1)
+    result = {}
+    if k <= 0:
+        return {row: [] for row in rows}
+
+    rows = np.asarray(rows)
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        similarity = (matrix[batch] @ transposed).toarray()
+        similarity[np.arange(len(batch)), batch] = 0.0
+        candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        for offset, row in enumerate(batch):
+            scores = similarity[offset, candidates[offset]]
+            order = np.argsort(-scores, kind='stable')
+            result[int(row)] = [
+                (int(candidates[offset][index]), float(scores[index]))
+                for index in order if scores[index] > 0
+            ]
+    return result
+
+
+class RecommendationBuilder:
+    """Повна перебудова таблиці зв'язків для однієї мови"""
+
+    def __init__(self, spec, language, top_k=None, batch_size=None):
+        config = get_config()
+        self.spec = spec
+        self.language = language
+        self.top_k = top_k or config['top_k']
+        self.batch_size = batch_size or config['batch_size']
+        self.ids, documents = spec.corpus(language)
+        self.positions = {pk: index for index, pk in enumerate(self.ids)}
+        self.matrix = tfidf_matrix(documents)
+
+    def neighbours(self, pks):
+        """{pk: [(pk сусіда, схожість)]} для активних об'єктів"""
+        rows = [self.positions[pk] for pk in pks if pk in self.positions]
+        found = nearest(self.matrix, rows, self.top_k, self.batch_size) if rows else {}
+        return {
+            self.ids[row]: [(self.ids[neighbour], score) for neighbour, score in items]
+            for row, items in found.items()
+        }
+
+    def store(self, neighbours):
+        """Замінює всі зв'язки мови на нові"""
+        source_id = f'{self.spec.source_field}_id'
+        link_model = self.spec.link_model
+        with transaction.atomic():
+            self.spec.links(self.language).delete()
+            link_model.objects.bulk_create(
+                [
+                    link_model(**{
+                        source_id: source,
+                        'related_id': related,
+                        'language': self.language,
+                        'score': round(score, 6),
+                        'rank': rank,
+                    })
+                    for source, items in neighbours.items()
+                    for rank, (related, score) in enumerate(items, start=1)
+                ],
+                batch_size=1000,
+            )
+
+    def build(self):
+        """Повна перебудова мови; повертає кількість зв'язків"""
+        neighbours = self.neighbours(self.ids)
+        self.store(neighbours)
+        return sum(len(items) for items in neighbours.values())
+
+
+class RecommendationJob:
+    """
+    Відкладена перебудова після збереження в адмінці.
+
+    Назви змінених рекомендацій ставляться в чергу після коміту транзакції,
+    фоновий потік через DELAY секунд перебудовує їх (серія збережень - один
+    прохід на мову). ASYNC=False - перебудова одразу після коміту (тести).
+    """
+
+    worker = DebouncedWorker('recommendations', lambda pending: RecommendationJob.run_pending(pending), get_config)
+
+    @classmethod
+    def schedule(cls, spec):
+        cls.worker.add_on_commit({spec.name})
+
+    @classmethod
+    def run_pending(cls, pending):
+        """{назва} з черги"""
+        for name in sorted(pending):
+            cls.run(get_spec(name))
+
+    @classmethod
+    def run(cls, spec):
+        """Синхронна перебудова всіх мов"""
+        started = time.perf_counter()
+        for language in mt_settings.AVAILABLE_LANGUAGES:
+            RecommendationBuilder(spec, language).build()
+        logger.debug(f"Рекомендації {spec.name} перебудовано за {(time.perf_counter() - started) * 1000:.0f} мс")
+
+    # ---- сигнали ----
+
+    @classmethod
+    def object_changed(cls, instance):
+        """post_save / post_delete об'єкта чи залежності (назва категорії)"""
+        model = type(instance)
+        for spec in specs():
+            if model is spec.model or model in spec.dependencies:
+                cls.schedule(spec)
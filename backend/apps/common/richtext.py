@@ -0,0 +1,350 @@
+import html
+import io
+import logging
+import os
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Дозволені теги та атрибути після санітизації
+ALLOWED_TAGS = {
+    'p', 'br', 'hr', 'strong', 'b', 'em', 'i', 'u', 's', 'sub', 'sup', 'small',
+    'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'blockquote', 'pre', 'code',
+    'a', 'img', 'figure', 'figcaption',
+    'table', 'thead', 'tbody', 'tfoot', 'tr', 'th', 'td', 'caption',
+}
+ALLOWED_ATTRS = {
+    'a': {'href', 'title', 'target'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    'ol': {'start'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'td': {'colspan', 'rowspan'},
+}
+# Теги, які видаляються разом із вмістом
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'noscript', 'template', 'svg', 'math', 'head', 'title'}
+VOID_TAGS = {'br', 'hr', 'img'}
+BLOCK_TAGS = {
+    'p', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'blockquote', 'pre', 'hr', 'br',
+    'figure', 'figcaption', 'table', 'thead', 'tbody', 'tfoot', 'tr', 'th', 'td', 'caption',
+}
+# Блоки, які не мають сенсу без вмісту (<p>&nbsp;</p> з CKEditor)
+DROP_EMPTY_TAGS = {'p', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'blockquote', 'strong', 'b', 'em', 'i', 'u', 's', 'small', 'a'}
+ALLOWED_URL_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+
+WHITESPACE_RE = re.compile(r'[ \t\r\n\f]+')
+STYLE_SIZE_RE = re.compile(r'(?:^|;)\s*(width|height)\s*:\s*(\d+)px', re.I)
+DERIVATIVE_FORMATS = {'JPEG', 'PNG', 'WEBP'}
+
+
+def get_render_config():
+    """Налаштування з RICHTEXT_RENDER_SETTINGS"""
+    render_settings = getattr(settings, 'RICHTEXT_RENDER_SETTINGS', {})
+    return {
+        'image_widths': tuple(render_settings.get('IMAGE_WIDTHS', (480, 960, 1440))),
+        'image_quality': render_settings.get('IMAGE_QUALITY', 82),
+        'derivatives_dir': render_settings.get('DERIVATIVES_DIR', 'derivatives'),
+        'media_hosts': set(render_settings.get('MEDIA_HOSTS', ())),
+    }
+
+
+class ResponsiveImageBuilder:
+    """Готує адаптивні копії зображень з медіа-сховища та атрибути srcset"""
+
+    def __init__(self, config):
+        self.config = config
+        self._cache = {}
+
+    def media_name(self, src):
+        """Відносний шлях у сховищі для /media/... URL або None"""
+        path = urlsplit(src).path
+        if not path.startswith(settings.MEDIA_URL):
+            return None
+        return path[len(settings.MEDIA_URL):]
+
+    def derivative_name(self, name, width):
+        directory, filename = os.path.split(name)
+        base, ext = os.path.splitext(filename)
+        return os.path.join(directory, self.config['derivatives_dir'], f'{base}-{width}w{ext}')
+
+    def build(self, src):
+        """
+        Повертає (width, height, [(url, width), ...]) для зображення
+        або None, якщо файл недоступний чи не підтримується
+        """
+        name = self.media_name(src)
+        if not name:
+            return None
+        if name in self._cache:
+            return self._cache[name]
+
+        result = None
+        try:
+            with default_storage.open(name, 'rb') as source:
+                image = Image.open(source)
+                image.load()
+        except (OSError, UnidentifiedImageError, ValueError) as e:
+            logger.warning(f"Не вдалося відкрити зображення {name}: {str(e)}")
+        else:
+            width, height = image.size
+            candidates = []
+            if image.format in DERIVATIVE_FORMATS and not getattr(image, 'is_animated', False):
+                for target in self.config['image_widths']:
+                    if target >= width:
+                        break
+                    derivative = self.derivative_name(name, target)
+                    if self.ensure_derivative(image, derivative, target):
+                        candidates.append((settings.MEDIA_URL + derivative.replace(os.sep, '/'), target))
+            candidates.append((settings.MEDIA_URL + name, width))
+            result = (width, height, candidates)
+
+        self._cache[name] = result
+        return result
+
+    def ensure_derivative(self, image, name, width):
+        """Створює зменшену копію, якщо її ще немає у сховищі"""
+        if default_storage.exists(name):
+            return True
+
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        if image.format == 'JPEG' and resized.mode not in ('RGB', 'L'):
+            resized = resized.convert('RGB')
+
+        buffer = io.BytesIO()
+        try:
+            resized.save(buffer, format=image.format, quality=self.config['image_quality'], optimize=True)
+            default_storage.save(name, ContentFile(buffer.getvalue()))
+        except OSError as e:
+            logger.warning(f"Не вдалося зберегти копію зображення {name}: {str(e)}")
+            return False
+        return True
+
+
+class NoDerivativesImageBuilder(ResponsiveImageBuilder):
+    """Без звернень до сховища: зображення лишаються як є (рендер на шляху читання)"""
+
+    def build(self, src):
+        return None
+
+
+class RichTextRenderer(HTMLParser):
+    """
+    Санітизує та мінімізує HTML з CKEditor:
+    прибирає стилі, класи, скрипти та коментарі, згортає пробіли,
+    робить посилання на медіа відносними, додає до <img> srcset
+    з адаптивних копій і loading="lazy".
+    """
+
+    def __init__(self, images=None, config=None):
+        super().__init__(convert_charrefs=True)
+        self.config = config or get_render_config()
+        self.images = images or ResponsiveImageBuilder(self.config)
+        self.out = []
+        self.stack = []
+        self.drop_depth = 0
+        self.pre_depth = 0
+
+    # ---- обробка токенів ----
+
+    def handle_starttag(self, tag, attrs):
+        if self.drop_depth:
+            if tag in DROP_CONTENT_TAGS:
+                self.drop_depth += 1
+            return
+        if tag in DROP_CONTENT_TAGS:
+            self.drop_depth = 1
+            return
+        if tag not in ALLOWED_TAGS:
+            # Невідомі обгортки (span, div, font, o:p) розгортаємо, зберігаючи вміст
+            return
+
+        attrs = self.clean_attrs(tag, dict(attrs))
+        if attrs is None:
+            return
+        if tag in BLOCK_TAGS:
+            self.strip_trailing_space()
+
+        self.out.append(self.format_tag(tag, attrs))
+        if tag == 'pre':
+            self.pre_depth += 1
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, len(self.out) - 1))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.drop_depth:
+            if tag in DROP_CONTENT_TAGS:
+                self.drop_depth -= 1
+            return
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+
+        # Закриваємо незакриті вкладені теги
+        while self.stack:
+            open_tag, start = self.stack.pop()
+            if open_tag == 'pre':
+                self.pre_depth -= 1
+            if open_tag in BLOCK_TAGS:
+                self.strip_trailing_space()
+            content = ''.join(self.out[start + 1:]).replace('<br>', '')
+            if open_tag in DROP_EMPTY_TAGS and not content.strip(' \xa0'):
+                del self.out[start:]
+            else:
+                self.out.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.drop_depth:
+            return
+        if not self.pre_depth:
+            data = WHITESPACE_RE.sub(' ', data)
+            if data == ' ' and (not self.out or self.last_is_block_boundary()):
+                return
+            if self.last_is_block_boundary() or (self.out and self.out[-1].endswith(' ')):
+                data = data.lstrip(' ')
+        if data:
+            self.out.append(html.escape(data, quote=False))
+
+    def handle_comment(self, data):
+        # Коментарі (в т.ч. умовні з MS Word) не потрапляють у результат
+        return
+
+    # ---- атрибути ----
+
+    def clean_attrs(self, tag, attrs):
+        allowed = ALLOWED_ATTRS.get(tag, set())
+        cleaned = {name: value for name, value in attrs.items() if name in allowed and value is not None}
+
+        if tag == 'a':
+            href = self.clean_url(cleaned.get('href', ''))
+            if not href:
+                # Посилання без безпечної адреси розгортаємо в текст
+                return None
+            cleaned['href'] = href
+            if cleaned.get('target') == '_blank':
+                cleaned['rel'] = 'noopener noreferrer'
+            else:
+                cleaned.pop('target', None)
+
+        elif tag == 'img':
+            src = self.clean_url(cleaned.get('src', ''))
+            if not src:
+                return None
+            cleaned['src'] = src
+            # CKEditor задає розмір через style="width:..px; height:..px"
+            for name, value in STYLE_SIZE_RE.findall(attrs.get('style') or ''):
+                cleaned.setdefault(name.lower(), value)
+            self.make_responsive(cleaned)
+
+        return cleaned
+
+    def clean_url(self, url):
+        """Відкидає небезпечні схеми, абсолютні посилання на медіа робить відносними"""
+        url = (url or '').strip()
+        if not url:
+            return ''
+        parts = urlsplit(url)
+        if parts.scheme.lower() not in ALLOWED_URL_SCHEMES:
+            return ''
+        if parts.netloc and parts.path.startswith(settings.MEDIA_URL) and self.is_media_host(parts.hostname):
+            url = parts.path + (f'?{parts.query}' if parts.query else '')
+        return url
+
+    def is_media_host(self, hostname):
+        hosts = self.config['media_hosts'] or {
+            host.lstrip('.') for host in settings.ALLOWED_HOSTS if host and host != '*'
+        }
+        return hostname in hosts or any(hostname.endswith(f'.{host}') for host in hosts)
+
+    def make_responsive(self, attrs):
+        attrs['loading'] = 'lazy'
+        attrs['decoding'] = 'async'
+
+        image = self.images.build(attrs['src'])
+        if not image:
+            return
+        width, height, candidates = image
+
+        display_width = int(attrs['width']) if str(attrs.get('width', '')).isdigit() else width
+        if 'height' not in attrs or not str(attrs['height']).isdigit():
+            attrs['height'] = str(max(1, round(height * display_width / width)))
+        attrs['width'] = str(display_width)
+
+        if len(candidates) > 1:
+            attrs['srcset'] = ', '.join(f'{url} {candidate_width}w' for url, candidate_width in candidates)
+            attrs['sizes'] = f'(max-width: {display_width}px) 100vw, {display_width}px'
+
+    # ---- допоміжні ----
+
+    @staticmethod
+    def format_tag(tag, attrs):
+        rendered = ''.join(f' {name}="{html.escape(str(value))}"' for name, value in attrs.items())
+        return f'<{tag}{rendered}>'
+
+    def last_is_block_boundary(self):
+        if not self.out:
+            return True
+        last = self.out[-1]
+        if not last.startswith('<'):
+            return False
+        name = last.strip('</>').split(' ', 1)[0]
+        return name in BLOCK_TAGS
+
+    def strip_trailing_space(self):
+        if self.out and not self.out[-1].startswith('<'):
+            self.out[-1] = self.out[-1].rstrip(' ')
+            if not self.out[-1]:
+                self.out.pop()
+
+    def render(self, value):
+        self.feed(value)
+        self.close()
+        while self.stack:
+            self.handle_endtag(self.stack[-1][0])
+        return ''.join(self.out).strip()
+
+
+def render_richtext(value, images=None):
+    """Санітизований, мінімізований HTML з адаптивними зображеннями"""
+    if not value:
+        return ''
+    return RichTextRenderer(images=images).render(value)
+
+
+def render_fields(instance, fields, images=None):
+    """
+    Рендерить RichText поля об'єкта у словник для rendered_html.
+    fields - {ім'я поля: чи перекладне}; перекладні зберігаються
+    під ключами field_uk/field_en, інші - під власним ім'ям.
+    """
+    images = images or ResponsiveImageBuilder(get_render_config())
+    rendered = {}
+    for name, translated in fields.items():
+        keys = [f'{name}_{lang}' for lang, _ in settings.LANGUAGES] if translated else [name]
+        for key in keys:
+            rendered[key] = render_richtext(getattr(instance, key, ''), images)
+    return rendered
+
+
+def backfill_rendered_html(app_label, model_name, fields):
+    """RunPython для міграцій: заповнює rendered_html для існуючих записів"""
+
+    def forwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        images = ResponsiveImageBuilder(get_render_config())
+        for obj in model.objects.all().iterator():
+            obj.rendered_html = render_fields(obj, fields, images)
+            obj.save(update_fields=['rendered_html'])
+
+    return forwards
@@ -0,0 +1,353 @@
+# backend/apps/common/sitemaps.py
+"""
+Sitemap для пошукових систем: проєкти, послуги та вакансії на всіх мовах.
+
+Файли (SITEMAP_SETTINGS['ROOT']):
+
+    sitemap.xml                     - індекс усіх файлів
+    projects-uk-0.xml, ...          - <розділ>-<мова>-<блок>.xml
+
+Блок - діапазон id (id // CHUNK_SIZE), тож у файлі не більше CHUNK_SIZE
+(≤ 50 000) адрес, а зміна об'єкта перезаписує лише файли його блоку.
+Рядки читаються values_list().iterator() і пишуться одразу в усі мовні
+файли блоку - пам'ять не залежить від кількості об'єктів. Кожна адреса
+містить hreflang альтернативи всіх мов та x-default (мова за замовчуванням).
+Час зміни файлу - найпізніший lastmod його адрес, його ж віддає індекс
+і заголовок Last-Modified.
+
+    python manage.py build_sitemaps      # повна побудова
+    SitemapJob.object_changed(instance)  # сигнали: блок об'єкта після коміту
+"""
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404
+from django.views.static import serve
+from modeltranslation import settings as mt_settings
+from modeltranslation.utils import build_localized_fieldname, resolution_order
+import os
+import re
+import tempfile
+import time
+import logging
+from .jobs import CacheLock, DebouncedWorker
+
+logger = logging.getLogger(__name__)
+
+# Обмеження протоколу sitemaps.org на один файл
+MAX_URLS_PER_FILE = 50000
+INDEX_NAME = 'sitemap.xml'
+FILE_RE = re.compile(r'^(?P<section>[a-z]+)-(?P<locale>[a-z-]+)-(?P<bucket>\d+)\.xml$')
+
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+    'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n'
+)
+URLSET_CLOSE = '</urlset>\n'
+
+
+def get_config():
+    """Налаштування з SITEMAP_SETTINGS"""
+    sitemap_settings = getattr(settings, 'SITEMAP_SETTINGS', {})
+    return {
+        'root': Path(sitemap_settings.get('ROOT', Path(settings.BASE_DIR) / 'sitemaps')),
+        'site_url': sitemap_settings.get('SITE_URL', 'http://localhost:3000').rstrip('/'),
+        'files_url': sitemap_settings.get('FILES_URL', 'http://localhost:8000/sitemaps/').rstrip('/') + '/',
+        'sections': sitemap_settings.get('SECTIONS', {}),
+        'chunk_size': min(sitemap_settings.get('CHUNK_SIZE', MAX_URLS_PER_FILE), MAX_URLS_PER_FILE),
+        'iterator_chunk_size': sitemap_settings.get('ITERATOR_CHUNK_SIZE', 2000),
+        'async': sitemap_settings.get('ASYNC', True),
+        'delay': sitemap_settings.get('DELAY', 2),
+        'lock_timeout': sitemap_settings.get('LOCK_TIMEOUT', 600),
+        'lock_wait': sitemap_settings.get('LOCK_WAIT', 60),
+    }
+
+
+def format_lastmod(value):
+    """W3C Datetime в UTC"""
+    if isinstance(value, (int, float)):
+        value = datetime.fromtimestamp(value, tz=dt_timezone.utc)
+    return value.astimezone(dt_timezone.utc).isoformat(timespec='seconds')
+
+
+class SitemapSection:
+    """
+    Розділ sitemap: модель з перекладним slug та шаблон адреси на фронтенді.
+    Шаблон (`path`) отримує {locale} та {slug} мови адреси.
+    """
+
+    def __init__(self, name, model, path):
+        self.name = name
+        self.model = model
+        self.path = path
+
+    def __repr__(self):
+        return f'<SitemapSection {self.name}>'
+
+    def get_queryset(self):
+        return self.model._base_manager.filter(is_active=True)
+
+    @staticmethod
+    def columns():
+        return [build_localized_fieldname('slug', lang) for lang in mt_settings.AVAILABLE_LANGUAGES]
+
+    def localize(self, slugs):
+        """{мова: слаг з fallback} для значень колонок columns()"""
+        languages = list(mt_settings.AVAILABLE_LANGUAGES)
+        fallback_languages = getattr(self.model, 'slug').fallback_languages
+        values = dict(zip(languages, slugs))
+        localized = {}
+        for lang in languages:
+            for candidate in resolution_order(lang, fallback_languages):
+                if values.get(candidate):
+                    localized[lang] = values[candidate]
+                    break
+        return localized
+
+    def page_path(self, locale, slug):
+        return self.path.format(locale=locale, slug=slug)
+
+    def rows(self, buckets=None):
+        """(pk, updated_at, {мова: слаг з fallback}) у порядку id - потоково"""
+        config = get_config()
+        queryset = self.get_queryset().order_by('pk')
+        if buckets is not None:
+            size = config['chunk_size']
+            ranges = Q()
+            for bucket in buckets:
+                ranges |= Q(pk__gte=bucket * size, pk__lt=(bucket + 1) * size)
+            queryset = queryset.filter(ranges)
+        rows = queryset.values_list('pk', 'updated_at', *self.columns()).iterator(
+            chunk_size=config['iterator_chunk_size'],
+        )
+        for pk, updated_at, *slugs in rows:
+            localized = self.localize(slugs)
+            if localized:
+                yield pk, updated_at, localized
+
+
+def sections():
+    """Розділи sitemap; шаблони адрес можна перевизначити в SITEMAP_SETTINGS['SECTIONS']"""
+    from apps.jobs.models import JobPosition
+    from apps.projects.models import Project
+    from apps.services.models import Service
+
+    paths = {
+        'projects': '/{locale}/work/{slug}/',
+        'services': '/{locale}/services/{slug}/',
+        'jobs': '/{locale}/job/{slug}/',
+        **get_config()['sections'],
+    }
+    return [
+        SitemapSection('projects', Project, paths['projects']),
+        SitemapSection('services', Service, paths['services']),
+        SitemapSection('jobs', JobPosition, paths['jobs']),
+    ]
+
+
+class SitemapFile:
+    """
+    Потоковий запис одного файлу: тимчасовий файл у тому ж каталозі,
+    після закриття - атомарна заміна, тож веб-сервер ніколи не віддає
+    половину файлу
+    """
+
+    def __init__(self, root, name):
+        self.path = root / name
+        fd, self.tmp_path = tempfile.mkstemp(dir=root, prefix=f'.{name}.', suffix='.tmp')
+        self.file = os.fdopen(fd, 'w', encoding='utf-8')
+        self.file.write(URLSET_OPEN)
+        self.count = 0
+        self.lastmod = None
+
+    def write(self, loc, lastmod, alternates):
+        parts = [f'<url><loc>{escape(loc)}</loc>']
+        if lastmod is not None:
+            parts.append(f'<lastmod>{format_lastmod(lastmod)}</lastmod>')
+            if self.lastmod is None or lastmod > self.lastmod:
+                self.lastmod = lastmod
+        for hreflang, href in alternates:
+            parts.append(f'<xhtml:link rel="alternate" hreflang="{hreflang}" href={quoteattr(href)}/>')
+        parts.append('</url>\n')
+        self.file.write(''.join(parts))
+        self.count += 1
+
+    def close(self, touched=None):
+        self.file.write(URLSET_CLOSE)
+        self.file.close()
+        os.chmod(self.tmp_path, 0o644)
+        os.replace(self.tmp_path, self.path)
+        mtimes = [value.timestamp() for value in (self.lastmod, touched) if value is not None]
+        if mtimes:
+            os.utime(self.path, (max(mtimes), max(mtimes)))
+
+    def discard(self):
+        self.file.close()
+        os.unlink(self.tmp_path)
+
+
+class SitemapGenerator:
+    """
+    Повна та інкрементна (за блоками id) побудова файлів sitemap.
+    Запис файлів та індексу - під замком каталогу для всіх воркерів.
+    """
+
+    def __init__(self):
+        self.config = get_config()
+        self.root = self.config['root']
+        self.languages = list(mt_settings.AVAILABLE_LANGUAGES)
+        self.default_language = mt_settings.DEFAULT_LANGUAGE
+
+    def lock(self):
+        return CacheLock.for_path(
+            'sitemaps', self.root, timeout=self.config['lock_timeout'], wait=self.config['lock_wait'],
+        )
+
+    def file_name(self, section, locale, bucket):
+        return f'{section.name}-{locale}-{bucket}.xml'
+
+    def bucket(self, pk):
+        return pk // self.config['chunk_size']
+
+    def url(self, section, locale, slug):
+        return self.config['site_url'] + section.page_path(locale, slug)
+
+    def section_files(self, section):
+        """{ім'я: (мова, блок)} наявних файлів розділу"""
+        files = {}
+        if self.root.is_dir():
+            for path in self.root.iterdir():
+                match = FILE_RE.match(path.name)
+                if match and match['section'] == section.name:
+                    files[path.name] = (match['locale'], int(match['bucket']))
+        return files
+
+    def write_section(self, section, buckets=None, touched=None):
+        """
+        Перезаписує файли блоків `buckets` (None - усі); блоки без активних
+        об'єктів видаляються. Повертає (файлів, адрес).
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        written, urls = set(), 0
+        current, writers = None, {}
+
+        def close_writers():
+            for writer in writers.values():
+                writer.close(touched)
+                written.add(writer.path.name)
+
+        try:
+            for pk, updated_at, localized in section.rows(buckets):
+                bucket = self.bucket(pk)
+                if bucket != current:
+                    close_writers()
+                    current = bucket
+                    writers = {
+                        locale: SitemapFile(self.root, self.file_name(section, locale, bucket))
+                        for locale in self.languages
+                    }
+                alternates = [
+                    (lang, self.url(section, lang, localized[lang]))
+                    for lang in self.languages if lang in localized
+                ]
+                if self.default_language in localized:
+                    alternates.append(('x-default', self.url(section, self.default_language, localized[self.default_language])))
+                for locale, writer in writers.items():
+                    if locale in localized:
+                        writer.write(self.url(section, locale, localized[locale]), updated_at, alternates)
+                urls += len(localized)
+            close_writers()
+        except BaseException:
+            for writer in writers.values():
+                if not writer.file.closed:
+                    writer.discard()
+            raise
+
+        for name, (locale, bucket) in self.section_files(section).items():
+            if name not in written and (buckets is None or bucket in buckets):
+                os.unlink(self.root / name)
+        return len(written), urls
+
+    def write_index(self):
+        """sitemap.xml з усіх файлів розділів; lastmod - час зміни файлу"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        names = []
+        for section in sections():
+            files = self.section_files(section)
+            names.extend(sorted(files, key=files.get))
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f'.{INDEX_NAME}.', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for name in names:
+                mtime = (self.root / name).stat().st_mtime
+                f.write(
+                    f'<sitemap><loc>{escape(self.config["files_url"] + name)}</loc>'
+                    f'<lastmod>{format_lastmod(mtime)}</lastmod></sitemap>\n'
+                )
+            f.write('</sitemapindex>\n')
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self.root / INDEX_NAME)
+        return len(names)
+
+    def build(self, section_names=None):
+        """Повна побудова; повертає {розділ: (файлів, адрес)}"""
+        result = {}
+        with self.lock():
+            for section in sections():
+                if section_names and section.name not in section_names:
+                    continue
+                result[section.name] = self.write_section(section)
+            self.write_index()
+        return result
+
+    def update(self, changes):
+        """Інкрементно: {назва розділу: {id}} - перезапис лише блоків цих id"""
+        touched = datetime.now(dt_timezone.utc)
+        with self.lock():
+            for section in sections():
+                pks = changes.get(section.name)
+                if pks:
+                    self.write_section(section, {self.bucket(pk) for pk in pks}, touched=touched)
+            self.write_index()
+
+
+class SitemapJob:
+    """
+    Відкладене оновлення після збереження в адмінці: id ставляться в чергу
+    після коміту, фоновий потік через DELAY секунд перезаписує їх блоки
+    пакетом. ASYNC=False - одразу після коміту (тести).
+    """
+
+    worker = DebouncedWorker('sitemaps', lambda pending: SitemapJob.run_pending(pending), get_config)
+
+    @classmethod
+    def object_changed(cls, instance):
+        """post_save / post_delete"""
+        for section in sections():
+            if type(instance) is section.model and instance.pk is not None:
+                cls.worker.add_on_commit({section.name: {instance.pk}})
+
+    @classmethod
+    def run_pending(cls, pending):
+        """{назва розділу: {id}} з черги"""
+        started = time.perf_counter()
+        SitemapGenerator().update(pending)
+        logger.debug(
+            f"Sitemap оновлено для {sum(len(pks) for pks in pending.values())} об'єктів "
+            f"за {(time.perf_counter() - started) * 1000:.0f} мс"
+        )
+
+
+def sitemap_view(request, path=INDEX_NAME):
+    """
+    Віддає готові файли (Last-Modified, 304 на If-Modified-Since).
+    У production каталог ROOT краще віддавати веб-сервером напряму.
+    """
+    if path != INDEX_NAME and not FILE_RE.match(path):
+        raise Http404
+    return serve(request, path, document_root=get_config()['root'])
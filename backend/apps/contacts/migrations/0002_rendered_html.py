@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:01
+
+from django.db import migrations, models
+from apps.common.richtext import backfill_rendered_html
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactinquiry',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.AddField(
+            model_name='office',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.RunPython(
+            backfill_rendered_html('contacts', 'Office', {'address': True, 'description': True}),
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 13:33
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0002_rendered_html'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='contactinquiry',
+            name='rendered_html',
+        ),
+    ]
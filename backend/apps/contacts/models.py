@@ -1,12 +1,15 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from ckeditor_uploader.fields import RichTextUploadingField
+from apps.common.managers import LocalizedManager
+from apps.common.mixins import RenderedRichTextMixin
 
-class Office(models.Model):
+class Office(RenderedRichTextMixin, models.Model):
     """Офіси та фабрики"""
     name=models.CharField(max_length=100, verbose_name=_("Назва"))
     address=RichTextUploadingField(verbose_name=_("Адреса"))
     description=RichTextUploadingField(blank=True, verbose_name=_("Опис"))
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
     
     office_type = models.CharField(
         max_length=50,
@@ -29,6 +32,8 @@ class Office(models.Model):
     is_main = models.BooleanField(default=False, verbose_name=_("Головний офіс"))
     is_active = models.BooleanField(default=True, verbose_name=_("Активний"))
 
+    objects = LocalizedManager()
+
     class Meta:
         ordering = ['order']
         verbose_name = _("Офіс/Фабрика")
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:01
+
+from django.db import migrations, models
+from apps.common.richtext import backfill_rendered_html
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutpage',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.AddField(
+            model_name='homepage',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.RunPython(
+            backfill_rendered_html('content', 'AboutPage', {'history_text': True, 'mission_text': True, 'values_text': True, 'social_responsibility': True}),
+            migrations.RunPython.noop,
+        ),
+        migrations.RunPython(
+            backfill_rendered_html('content', 'HomePage', {'company_description': True}),
+            migrations.RunPython.noop,
+        ),
+        migrations.RunPython(
+            backfill_rendered_html('content', 'TeamMember', {'bio': True}),
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -1,10 +1,13 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from ckeditor_uploader.fields import RichTextUploadingField
+from apps.common.managers import LocalizedManager
+from apps.common.mixins import RenderedRichTextMixin
 
-class HomePage(models.Model):
+class HomePage(RenderedRichTextMixin, models.Model):
     """Контент главной страницы"""
     company_description=RichTextUploadingField(verbose_name=_("Короткий опис компанії"))
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
     mission_text=models.TextField(verbose_name=_("Місія"), blank=True)
     values_text=models.TextField(verbose_name=_("Цінності"), blank=True)
     
@@ -16,31 +19,37 @@ class HomePage(models.Model):
     is_active = models.BooleanField(default=True, verbose_name=_("Активна"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Оновлено"))
 
+    objects = LocalizedManager()
+
     class Meta:
         verbose_name = _("Головна сторінка")
         verbose_name_plural = _("Головна сторінка")
 
 
-class AboutPage(models.Model):
+class AboutPage(RenderedRichTextMixin, models.Model):
     """Страница О нас"""
     history_text=RichTextUploadingField(verbose_name=_("Історія компанії"))
     mission_text=RichTextUploadingField(verbose_name=_("Місія"))
     values_text=RichTextUploadingField(verbose_name=_("Цінності"))
     social_responsibility=RichTextUploadingField(verbose_name=_("Соціальна відповідальність"), blank=True)
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
     
     is_active = models.BooleanField(default=True, verbose_name=_("Активна"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Оновлено"))
 
+    objects = LocalizedManager()
+
     class Meta:
         verbose_name = _("Сторінка 'Про нас'")
         verbose_name_plural = _("Сторінка 'Про нас'")
 
 
-class TeamMember(models.Model):
+class TeamMember(RenderedRichTextMixin, models.Model):
     """Команда/Руководство"""
     name=models.CharField(max_length=100, verbose_name=_("Ім'я"))
     position=models.CharField(max_length=100, verbose_name=_("Посада"))
     bio=RichTextUploadingField(blank=True, verbose_name=_("Біографія"))
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
     
     photo = models.ImageField(upload_to='team/', verbose_name=_("Фото"))
     email = models.EmailField(blank=True, verbose_name=_("Електронна пошта"))
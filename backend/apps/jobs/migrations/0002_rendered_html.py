@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:01
+
+from django.db import migrations, models
+from apps.common.richtext import backfill_rendered_html
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposition',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.RunPython(
+            backfill_rendered_html('jobs', 'JobPosition', {'description': True, 'requirements': True, 'responsibilities': True, 'benefits': True}),
+            migrations.RunPython.noop,
+        ),
+    ]
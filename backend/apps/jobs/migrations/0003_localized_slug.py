@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_default_slugs(apps, schema_editor):
+    """Наявні слаги стають слагами мови за замовчуванням"""
+    field = f"slug_{settings.MODELTRANSLATION_DEFAULT_LANGUAGE}"
+    for name in ['JobPosition']:
+        model = apps.get_model('jobs', name)
+        model.objects.update(**{field: models.F('slug')})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_rendered_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposition',
+            name='slug_en',
+            field=models.SlugField(null=True, unique=True, verbose_name='URL'),
+        ),
+        migrations.AddField(
+            model_name='jobposition',
+            name='slug_uk',
+            field=models.SlugField(null=True, unique=True, verbose_name='URL'),
+        ),
+        migrations.RunPython(fill_default_slugs, migrations.RunPython.noop),
+    ]
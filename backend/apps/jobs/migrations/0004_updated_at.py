@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def fill_updated_at(apps, schema_editor):
+    """Для наявних записів дата зміни - дата створення"""
+    model = apps.get_model('jobs', 'JobPosition')
+    model.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_localized_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposition',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Оновлено'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,17 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from ckeditor_uploader.fields import RichTextUploadingField
+from apps.common.managers import LocalizedManager
+from apps.common.mixins import RenderedRichTextMixin
 
-class JobPosition(models.Model):
+class JobPosition(RenderedRichTextMixin, models.Model):
     """Вакансии"""
     title=models.CharField(max_length=200, verbose_name=_("Назва вакансії"))
     description=RichTextUploadingField(verbose_name=_("Опис"))
     requirements=RichTextUploadingField(verbose_name=_("Вимоги"))
     responsibilities=RichTextUploadingField(verbose_name=_("Обов'язки"))
     benefits=RichTextUploadingField(blank=True, verbose_name=_("Переваги"))
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
         
     slug = models.SlugField(unique=True, verbose_name=_("URL"))
     
@@ -27,8 +30,11 @@ class JobPosition(models.Model):
     is_active = models.BooleanField(default=True, verbose_name=_("Активна"))
     is_urgent = models.BooleanField(default=False, verbose_name=_("Терміново"))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Створено"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Оновлено"))
     expires_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Термін дії"))
 
+    objects = LocalizedManager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = _("Вакансія")
@@ -62,6 +68,8 @@ class WorkplacePhoto(models.Model):
     order = models.PositiveIntegerField(default=0, verbose_name=_("Порядок"))
     is_active = models.BooleanField(default=True, verbose_name=_("Активний"))
 
+    objects = LocalizedManager()
+
     class Meta:
         ordering = ['order']
         verbose_name = _("Фото робочого місця")
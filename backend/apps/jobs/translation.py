@@ -2,7 +2,9 @@ from modeltranslation.translator import translator, TranslationOptions
 from .models import JobPosition, JobApplication, WorkplacePhoto
 
 class JobPositionTranslationOptions(TranslationOptions):
-    fields = ('title', 'description', 'requirements', 'responsibilities', 'benefits', 'experience_required', 'location')
+    fields = ('title', 'slug', 'description', 'requirements', 'responsibilities', 'benefits', 'experience_required', 'location')
+    # Порожній слаг мови - NULL, щоб не порушувати унікальність
+    empty_values = {'slug': None}
 
 class WorkplacePhotoTranslationOptions(TranslationOptions):
     fields = ('title', 'description')
@@ -1,13 +1,16 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from ckeditor_uploader.fields import RichTextUploadingField
+from apps.common.managers import LocalizedManager
+from apps.common.mixins import RenderedRichTextMixin
 
-class PartnershipInfo(models.Model):
+class PartnershipInfo(RenderedRichTextMixin, models.Model):
     """Информация для партнеров"""
     cooperation_terms=RichTextUploadingField(verbose_name=_("Умови співпраці"))
     work_stages=RichTextUploadingField(verbose_name=_("Етапи роботи"))
     faq_content=RichTextUploadingField(verbose_name=_("FAQ для замовників"))
     benefits=RichTextUploadingField(verbose_name=_("Переваги співпраці"), blank=True)
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
     
     min_order_amount = models.PositiveIntegerField(null=True, blank=True, verbose_name=_("Мін. сума замовлення"))
     production_capacity = models.CharField(max_length=200, blank=True, verbose_name=_("Виробнича потужність"))
@@ -15,6 +18,8 @@ class PartnershipInfo(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Оновлено"))
     work_stages_info = models.TextField()
 
+    objects = LocalizedManager()
+
     class Meta:
         verbose_name = _("Інформація для партнерів")
         verbose_name_plural = _("Інформація для партнерів")
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:01
+
+from django.db import migrations, models
+from apps.common.richtext import backfill_rendered_html
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.AddField(
+            model_name='projectcategory',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.RunPython(
+            backfill_rendered_html('projects', 'Project', {'short_description': True, 'detailed_description': True, 'challenge': True, 'solution': True, 'result': True}),
+            migrations.RunPython.noop,
+        ),
+        migrations.RunPython(
+            backfill_rendered_html('projects', 'ProjectCategory', {'description': True}),
+            migrations.RunPython.noop,
+        ),
+    ]
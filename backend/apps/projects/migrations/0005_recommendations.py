@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_localized_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=10, verbose_name='Мова')),
+                ('score', models.FloatField(verbose_name='Схожість')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Позиція')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='projects.project', verbose_name='Проєкт')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommended_in', to='projects.project', verbose_name='Схожий проєкт')),
+            ],
+            options={
+                'verbose_name': 'Схожий проєкт',
+                'verbose_name_plural': 'Схожі проєкти',
+                'ordering': ['project', 'language', 'rank'],
+                'indexes': [models.Index(fields=['project', 'language', 'rank'], name='projects_re_project_7766f7_idx')],
+            },
+        ),
+    ]
@@ -1,24 +1,29 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from ckeditor_uploader.fields import RichTextUploadingField
+from apps.common.managers import LocalizedManager
+from apps.common.mixins import ExcerptMixin, RenderedRichTextMixin
 
-class ProjectCategory(models.Model):
+class ProjectCategory(RenderedRichTextMixin, models.Model):
     """Категории проектов"""
     name=models.CharField(max_length=100, verbose_name=_("Назва"))
     description=RichTextUploadingField(blank=True, verbose_name=_("Опис"))
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
     
     slug = models.SlugField(unique=True, verbose_name=_("Слаг"))
     image = models.ImageField(upload_to='project_categories/', blank=True, verbose_name=_("Зображення"))
     order = models.PositiveIntegerField(default=0, verbose_name=_("Порядок"))
     is_active = models.BooleanField(default=True, verbose_name=_("Активна"))
 
+    objects = LocalizedManager()
+
     class Meta:
         ordering = ['order']
         verbose_name = _("Категорія проєктів")
         verbose_name_plural = _("Категорії проєктів")
 
 
-class Project(models.Model):
+class Project(ExcerptMixin, RenderedRichTextMixin, models.Model):
     """Проекты/Портфолио"""
     title=models.CharField(max_length=200, verbose_name=_("Назва"))
     short_description=RichTextUploadingField(verbose_name=_("Короткий опис"))
@@ -26,6 +31,8 @@ class Project(models.Model):
     challenge=RichTextUploadingField(blank=True, verbose_name=_("Завдання"))
     solution=RichTextUploadingField(blank=True, verbose_name=_("Рішення"))
     result=RichTextUploadingField(blank=True, verbose_name=_("Результат"))
+    excerpt=models.TextField(blank=True, editable=False, verbose_name=_("Уривок для списків"))
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
     
     category = models.ForeignKey(ProjectCategory, on_delete=models.CASCADE, related_name='projects', verbose_name=_("Категорія"))
     slug = models.SlugField(unique=True, verbose_name=_("Слаг"))
@@ -39,6 +46,9 @@ class Project(models.Model):
     is_featured = models.BooleanField(default=False, verbose_name=_("Рекомендований"))
     is_active = models.BooleanField(default=True, verbose_name=_("Активний"))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Створено"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Оновлено"))
+
+    objects = LocalizedManager()
 
     class Meta:
         ordering = ['-project_date']
@@ -57,3 +67,21 @@ class ProjectImage(models.Model):
         ordering = ['order']
         verbose_name = _("Зображення проєкту")
         verbose_name_plural = _("Зображення проєктів")
+
+
+class RelatedProject(models.Model):
+    """Схожі проєкти (TF-IDF), будує python manage.py build_recommendations"""
+    project = models.ForeignKey(Project, related_name='recommendations', on_delete=models.CASCADE, verbose_name=_("Проєкт"))
+    related = models.ForeignKey(Project, related_name='recommended_in', on_delete=models.CASCADE, verbose_name=_("Схожий проєкт"))
+    language = models.CharField(max_length=10, verbose_name=_("Мова"))
+    score = models.FloatField(verbose_name=_("Схожість"))
+    rank = models.PositiveSmallIntegerField(verbose_name=_("Позиція"))
+
+    class Meta:
+        ordering = ['project', 'language', 'rank']
+        indexes = [models.Index(fields=['project', 'language', 'rank'])]
+        verbose_name = _("Схожий проєкт")
+        verbose_name_plural = _("Схожі проєкти")
+
+    def __str__(self):
+        return f"{self.project_id} → {self.related_id} [{self.language}] {self.score:.3f}"
@@ -2,10 +2,13 @@ from modeltranslation.translator import translator, TranslationOptions
 from .models import ProjectCategory, Project, ProjectImage
 
 class ProjectCategoryTranslationOptions(TranslationOptions):
-    fields = ('name', 'description')
+    fields = ('name', 'description', 'slug')
+    # Порожній слаг мови - NULL, щоб не порушувати унікальність
+    empty_values = {'slug': None}
 
 class ProjectTranslationOptions(TranslationOptions):
-    fields = ('title', 'short_description', 'detailed_description', 'challenge', 'solution', 'result')
+    fields = ('title', 'slug', 'short_description', 'detailed_description', 'challenge', 'solution', 'result', 'excerpt')
+    empty_values = {'slug': None}
 
 
 translator.register(ProjectCategory, ProjectCategoryTranslationOptions)
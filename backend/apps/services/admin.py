@@ -4,7 +4,6 @@ from unfold.contrib.filters.admin import (
     RangeDateFilter,
     RangeNumericFilter,
 )
-from parler.admin import TranslatableAdmin
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
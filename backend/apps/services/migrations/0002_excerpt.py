@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-19 11:57
+
+from django.conf import settings
+from django.db import migrations, models
+from apps.common.mixins import html_to_excerpt
+
+
+def fill_excerpts(apps, schema_editor):
+    """Заповнює уривки для існуючих записів"""
+    Service = apps.get_model('services', 'Service')
+    languages = [lang for lang, _ in settings.LANGUAGES]
+    for obj in Service.objects.all().iterator():
+        for lang in languages:
+            source = getattr(obj, f'short_description_{lang}', '') or ''
+            setattr(obj, f'excerpt_{lang}', html_to_excerpt(source))
+        obj.excerpt = html_to_excerpt(obj.short_description)
+        obj.save(update_fields=['excerpt', *(f'excerpt_{lang}' for lang in languages)])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Уривок для списків'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='excerpt_en',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='Уривок для списків'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='excerpt_uk',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='Уривок для списків'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:01
+
+from django.db import migrations, models
+from apps.common.richtext import backfill_rendered_html
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0002_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.AddField(
+            model_name='servicefeature',
+            name='rendered_html',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Готовий HTML'),
+        ),
+        migrations.RunPython(
+            backfill_rendered_html('services', 'Service', {'short_description': True, 'detailed_description': True, 'benefits': True}),
+            migrations.RunPython.noop,
+        ),
+        migrations.RunPython(
+            backfill_rendered_html('services', 'ServiceFeature', {'description': True}),
+            migrations.RunPython.noop,
+        ),
+    ]
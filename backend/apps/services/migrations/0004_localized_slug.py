@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_default_slugs(apps, schema_editor):
+    """Наявні слаги стають слагами мови за замовчуванням"""
+    field = f"slug_{settings.MODELTRANSLATION_DEFAULT_LANGUAGE}"
+    for name in ['Service']:
+        model = apps.get_model('services', name)
+        model.objects.update(**{field: models.F('slug')})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0003_rendered_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='slug_en',
+            field=models.SlugField(null=True, unique=True, verbose_name='Слаг'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='slug_uk',
+            field=models.SlugField(null=True, unique=True, verbose_name='Слаг'),
+        ),
+        migrations.RunPython(fill_default_slugs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0004_localized_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarService',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=10, verbose_name='Мова')),
+                ('score', models.FloatField(verbose_name='Схожість')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Позиція')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommended_in', to='services.service', verbose_name='Схожа послуга')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='services.service', verbose_name='Послуга')),
+            ],
+            options={
+                'verbose_name': 'Схожа послуга',
+                'verbose_name_plural': 'Схожі послуги',
+                'ordering': ['service', 'language', 'rank'],
+                'indexes': [models.Index(fields=['service', 'language', 'rank'], name='services_si_service_bbfc27_idx')],
+            },
+        ),
+    ]
@@ -1,14 +1,17 @@
 from django.db import models
-from parler.models import TranslatableModel, TranslatedFields
 from ckeditor_uploader.fields import RichTextUploadingField
 from django.utils.translation import gettext_lazy as _
+from apps.common.managers import LocalizedManager
+from apps.common.mixins import ExcerptMixin, RenderedRichTextMixin
 
-class Service(TranslatableModel):
+class Service(ExcerptMixin, RenderedRichTextMixin, models.Model):
     """Услуги компании"""
     name=models.CharField(max_length=200, verbose_name=_("Назва"))
     short_description=RichTextUploadingField(verbose_name=_("Короткий опис"))
     detailed_description=RichTextUploadingField(verbose_name=_("Детальний опис"))
     benefits=RichTextUploadingField(blank=True, verbose_name=_("Переваги"))
+    excerpt=models.TextField(blank=True, editable=False, verbose_name=_("Уривок для списків"))
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
     
     slug = models.SlugField(unique=True, verbose_name=_("Слаг"))
     icon = models.ImageField(upload_to='services/icons/', blank=True, verbose_name=_("Іконка"))
@@ -19,6 +22,9 @@ class Service(TranslatableModel):
     is_featured = models.BooleanField(default=False, verbose_name=_("Рекомендована"))
     is_active = models.BooleanField(default=True, verbose_name=_("Активна"))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Створено"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Оновлено"))
+
+    objects = LocalizedManager()
 
     class Meta:
         ordering = ['order']
@@ -26,11 +32,12 @@ class Service(TranslatableModel):
         verbose_name_plural = _("Послуги")
 
 
-class ServiceFeature(TranslatableModel):
+class ServiceFeature(RenderedRichTextMixin, models.Model):
     """Особенности услуги"""
     service = models.ForeignKey(Service, related_name='features', on_delete=models.CASCADE, verbose_name=_("Послуга"))
     title=models.CharField(max_length=100, verbose_name=_("Назва"))
     description=RichTextUploadingField(verbose_name=_("Опис"))
+    rendered_html=models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Готовий HTML"))
       
     icon = models.CharField(max_length=50, blank=True, help_text=_("CSS клас для іконки"), verbose_name=_("Іконка"))
     order = models.PositiveIntegerField(default=0, verbose_name=_("Порядок"))
@@ -39,3 +46,21 @@ class ServiceFeature(TranslatableModel):
         ordering = ['order']
         verbose_name = _("Особливість послуги")
         verbose_name_plural = _("Особливості послуг")
+
+
+class SimilarService(models.Model):
+    """Схожі послуги (TF-IDF), будує python manage.py build_recommendations"""
+    service = models.ForeignKey(Service, related_name='recommendations', on_delete=models.CASCADE, verbose_name=_("Послуга"))
+    related = models.ForeignKey(Service, related_name='recommended_in', on_delete=models.CASCADE, verbose_name=_("Схожа послуга"))
+    language = models.CharField(max_length=10, verbose_name=_("Мова"))
+    score = models.FloatField(verbose_name=_("Схожість"))
+    rank = models.PositiveSmallIntegerField(verbose_name=_("Позиція"))
+
+    class Meta:
+        ordering = ['service', 'language', 'rank']
+        indexes = [models.Index(fields=['service', 'language', 'rank'])]
+        verbose_name = _("Схожа послуга")
+        verbose_name_plural = _("Схожі послуги")
+
+    def __str__(self):
+        return f"{self.service_id} → {self.related_id} [{self.language}] {self.score:.3f}"
@@ -2,7 +2,9 @@ from modeltranslation.translator import translator, TranslationOptions
 from .models import Service, ServiceFeature
 
 class ServiceTranslationOptions(TranslationOptions):
-    fields = ('name', 'short_description', 'detailed_description', 'benefits')
+    fields = ('name', 'slug', 'short_description', 'detailed_description', 'benefits', 'excerpt')
+    # Порожній слаг мови - NULL, щоб не порушувати унікальність
+    empty_values = {'slug': None}
 
 class ServiceFeatureTranslationOptions(TranslationOptions):
     fields = ('title', 'description')
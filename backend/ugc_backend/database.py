@@ -0,0 +1,51 @@
+# backend/ugc_backend/database.py
+"""
+Параметри з'єднань PostgreSQL з DATABASE_POOL_SETTINGS.
+
+Пул psycopg3 (Django 5.1+, пакет psycopg-pool) тримає теплі з'єднання
+в процесі: запит бере з'єднання з пулу і повертає його після відповіді,
+без TCP/TLS рукостискання та автентифікації. Розмір пулу:
+
+    MAX_SIZE  ~ кількість потоків воркера (gunicorn --threads, ASGI - паралельні запити до БД)
+    воркери x MAX_SIZE < max_connections PostgreSQL (або default_pool_size pgbouncer)
+    MIN_SIZE  - з'єднання, відкриті постійно (1-2 для малого трафіку)
+
+Без пулу з'єднання живе CONN_MAX_AGE секунд між запитами (persistent
+connections). В обох режимах перед повторним використанням з'єднання
+перевіряється (CONN_HEALTH_CHECKS).
+
+PGBOUNCER=True - режим transaction pooling pgbouncer: сервер-сайд курсори
+(QuerySet.iterator()) та підготовлені запити вимкнені, бо наступна
+транзакція може потрапити на інше серверне з'єднання.
+"""
+
+
+def configure_database(database, pool_settings):
+    """Копія DATABASES['default'] з параметрами пулу / persistent з'єднань"""
+    database = {**database, 'OPTIONS': {**database.get('OPTIONS', {})}}
+    if 'postgresql' not in database.get('ENGINE', ''):
+        return database
+
+    database['CONN_HEALTH_CHECKS'] = True
+    if pool_settings.get('ENABLED', True):
+        # Django не дозволяє пул разом з persistent з'єднаннями
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = {
+            'min_size': pool_settings.get('MIN_SIZE', 2),
+            'max_size': pool_settings.get('MAX_SIZE', 10),
+            'timeout': pool_settings.get('TIMEOUT', 10),
+            'max_idle': pool_settings.get('MAX_IDLE', 300),
+            'max_lifetime': pool_settings.get('MAX_LIFETIME', 1800),
+            'name': pool_settings.get('NAME', 'ugc'),
+        }
+    else:
+        database['CONN_MAX_AGE'] = pool_settings.get('CONN_MAX_AGE', 60)
+
+    if pool_settings.get('PGBOUNCER', False):
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+        database['OPTIONS']['prepare_threshold'] = None
+        database['OPTIONS'].pop('server_side_binding', None)
+    elif pool_settings.get('PREPARE_THRESHOLD') is not None:
+        # Прямий PostgreSQL: повторювані запити готуються на сервері
+        database['OPTIONS']['prepare_threshold'] = pool_settings['PREPARE_THRESHOLD']
+    return database
@@ -1,9 +1,11 @@
 from pathlib import Path
 import os
-from decouple import config
+from decouple import Csv, config
+import dj_database_url
 from django.urls import reverse_lazy
 from django.templatetags.static import static
 from django.utils.translation import gettext_lazy as _
+from .database import configure_database
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -61,7 +63,16 @@ UNFOLOD = [
 INSTALLED_APPS = UNFOLOD + DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware',
+    # CORS, безпекові заголовки та кеш перекладів для API (замість corsheaders).
+    # Першим: заголовки отримують і відповіді решти middleware, preflight та
+    # кешовані переклади віддаються без метрик, профілювання та реплік
+    'apps.api.middleware.ApiEdgeMiddleware',
+    # Метрики запитів для /metrics
+    'apps.api.metrics.MetricsMiddleware',
+    # Профілювання вибраних запитів (PROFILING_ENABLED)
+    'apps.api.profiling.ProfilingMiddleware',
+    # Читання безпечних запитів API з реплік БД (DB_REPLICA_URLS)
+    'apps.api.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -70,7 +81,6 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.locale.LocaleMiddleware',
-    'apps.api.middleware.TranslationsCacheMiddleware', 
 ]
 
 ROOT_URLCONF = 'ugc_backend.urls'
@@ -105,6 +115,40 @@ DATABASES = {
     }
 }
 
+# Пул з'єднань psycopg3 та режим pgbouncer (див. ugc_backend/database.py)
+DATABASE_POOL_SETTINGS = {
+    'ENABLED': config('DB_POOL_ENABLED', default=True, cast=bool),
+    'MIN_SIZE': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+    'MAX_SIZE': config('DB_POOL_MAX_SIZE', default=10, cast=int),  # ~ потоки воркера
+    'TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=float),  # очікування вільного з'єднання, с
+    'MAX_IDLE': 300,  # закривати зайві з'єднання після простою, с
+    'MAX_LIFETIME': 1800,  # перевідкривати з'єднання, с
+    'NAME': 'ugc',
+    'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),  # без пулу
+    'PGBOUNCER': config('DB_PGBOUNCER', default=False, cast=bool),  # transaction pooling
+    'PREPARE_THRESHOLD': None,  # без pgbouncer: напр. 5 - готувати повторювані запити на сервері
+}
+DATABASES['default'] = configure_database(DATABASES['default'], DATABASE_POOL_SETTINGS)
+
+# Репліки для читань API (apps/api/replicas.py): DB_REPLICA_URLS через кому
+for _index, _url in enumerate(config('DB_REPLICA_URLS', default='', cast=Csv()), start=1):
+    DATABASES[f'replica{_index}'] = configure_database(
+        {**dj_database_url.parse(_url), 'OPTIONS': {'connect_timeout': 2}},
+        {**DATABASE_POOL_SETTINGS, 'NAME': f'ugc-replica{_index}'},
+    )
+
+DATABASE_REPLICA_SETTINGS = {
+    'ALIASES': [alias for alias in DATABASES if alias.startswith('replica')],
+    'PATHS': ('/api/',),  # безпечні запити з цими префіксами читають з реплік
+    'PIN_SECONDS': config('DB_REPLICA_PIN_SECONDS', default=5, cast=int),  # читання з основної БД після запису
+    'PIN_COOKIE': 'ugc_primary_pin',
+    'WRITE_KEY': 'ugc_replica_primary_until',  # позначка в кеші: читання всіх клієнтів з основної БД після зміни контенту
+    'MAX_LAG': config('DB_REPLICA_MAX_LAG', default=10, cast=float),  # секунди, далі - основна БД
+    'CHECK_INTERVAL': 5,  # секунди між перевірками відставання
+    'DOWN_RETRY': 30,  # секунди до повторної перевірки недоступної репліки
+}
+DATABASE_ROUTERS = ['apps.api.replicas.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -392,6 +436,17 @@ UNFOLD = {
                     },
                 ],
             },
+            {
+                "title": _("Діагностика"),
+                "separator": True,
+                "items": [
+                    {
+                        "title": _("Профілі запитів"),
+                        "icon": "local_fire_department",
+                        "link": lambda request: reverse_lazy("admin:api_requestprofile_changelist"),
+                    },
+                ],
+            },
         ],
     },
     "TABS": [
@@ -587,10 +642,10 @@ CORS_ALLOWED_ORIGINS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.api.json_codec.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'apps.api.json_codec.FastJSONParser',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
@@ -613,14 +668,50 @@ CACHES = {
         'BACKEND': 'django_redis.cache.RedisCache',
         'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
         'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-            'SERIALIZER': 'django_redis.serializers.json.JSONSerializer',
+            # L1 у пам'яті процесу перед Redis (L1_CACHE_SETTINGS) та запобіжник (CACHE_BREAKER_SETTINGS)
+            'CLIENT_CLASS': 'apps.api.resilient_cache.ResilientRedisClient',
+            'SERIALIZER': 'apps.api.json_codec.RedisJSONSerializer',
+            # Короткі таймаути: повільний Redis не тримає запити, а розмикає запобіжник
+            'SOCKET_CONNECT_TIMEOUT': config('REDIS_CONNECT_TIMEOUT', default=0.5, cast=float),
+            'SOCKET_TIMEOUT': config('REDIS_SOCKET_TIMEOUT', default=0.5, cast=float),
         },
         'KEY_PREFIX': 'ugc_api',
         'TIMEOUT': 300,  # 5 хвилин за замовчуванням
     }
 }
 
+# Запобіжник кешу (apps/api/resilient_cache.py): під час збою Redis - локальний кеш процесу
+CACHE_BREAKER_SETTINGS = {
+    'ENABLED': config('CACHE_BREAKER_ENABLED', default=True, cast=bool),
+    'FAILURE_THRESHOLD': 3,  # помилок поспіль до розмикання
+    'RESET_TIMEOUT': 10,  # секунди до пробної операції
+    'FALLBACK_MAX_ENTRIES': 2000,
+    'REPLAY_LIMIT': 10000,  # змінених під час збою ключів, що видаляються з Redis після відновлення
+    # понад REPLAY_LIMIT - видалення за шаблонами (типово OVERFLOW_PATTERNS з resilient_cache.py)
+    'LOCK_PATTERNS': ('*_lock', '*_lock:*'),  # замки, які під час збою не видаються (add -> False)
+}
+
+# L1 кеш процесу (apps/api/tiered_cache.py), інвалідація через Redis pub/sub
+L1_CACHE_SETTINGS = {
+    'ENABLED': config('L1_CACHE_ENABLED', default=True, cast=bool),
+    'MAX_ENTRIES': 5000,
+    'MAX_BYTES': 64 * 1024 * 1024,  # за розміром значень у Redis
+    'MAX_TTL': 30,  # секунди; не більше залишку TTL у Redis
+    # Лише ключі, що читаються значно частіше, ніж змінюються (не throttle/лічильники)
+    'KEY_PATTERNS': (
+        'static_translations_*',
+        'dynamic_translations_*',
+        'po_translations_*',
+        'unified_translations_*',
+        'trans_cache_*',
+        'response_cache:*',
+        'response_cache_tag:*',
+        'views.decorators.cache.cache_page.*',
+        'views.decorators.cache.cache_header.*',
+    ),
+    'CHANNEL': 'ugc:cache:l1',
+}
+
 # Дозволені методи
 CORS_ALLOW_METHODS = [
     'DELETE',
@@ -745,4 +836,130 @@ TRANSLATION_EXPORT_SETTINGS = {
     'CACHE_TIMEOUT': 1800,  # 30 хвилин
     'BATCH_SIZE': 1000,
     'MAX_EXPORT_SIZE': 10000,
-}
\ No newline at end of file
+    # Відкладений експорт з Rosetta webhook
+    'OUTPUT_DIR': config(
+        'TRANSLATION_EXPORT_DIR',
+        default=os.path.join(BASE_DIR.parent, 'frontend', 'public', 'backend-translations'),
+    ),
+    'DEBOUNCE_SECONDS': config('TRANSLATION_EXPORT_DEBOUNCE', default=10, cast=int),
+    'LOCK_TIMEOUT': 300,
+}
+
+# Ліміт запитів до API перекладів з одного IP за хвилину (кеш перекладів у ApiEdgeMiddleware)
+TRANSLATIONS_RATE_LIMIT = config('TRANSLATIONS_RATE_LIMIT', default=100, cast=int)
+
+# Гаряче перезавантаження .po та статичних перекладів (watch_translations + Redis pub/sub)
+TRANSLATION_HOT_RELOAD = {
+    'ENABLED': config('TRANSLATION_HOT_RELOAD', default=False, cast=bool),
+    'CHANNEL': 'ugc:translations:reload',
+    'POLL_INTERVAL': 2,  # секунди
+}
+
+# Обробка RichText HTML при збереженні (санітизація, мінімізація, адаптивні зображення)
+RICHTEXT_RENDER_SETTINGS = {
+    'IMAGE_WIDTHS': (480, 960, 1440),
+    'IMAGE_QUALITY': 82,
+    'DERIVATIVES_DIR': 'derivatives',
+    # Хости, абсолютні посилання на /media/ яких стають відносними (за замовчуванням ALLOWED_HOSTS)
+    'MEDIA_HOSTS': [host for host in config('RICHTEXT_MEDIA_HOSTS', default='').split(',') if host],
+}
+
+# Кеш відповідей API (ResponseCacheMixin), інвалідується сигналами при зміні моделей
+RESPONSE_CACHE_SETTINGS = {
+    'ENABLED': config('RESPONSE_CACHE_ENABLED', default=True, cast=bool),
+    'TIMEOUT': 60 * 60 * 24,  # 24 години
+}
+
+# Очищення CDN за Surrogate-Key при зміні моделей (локально: python manage.py mock_cdn)
+CDN_PURGE_SETTINGS = {
+    'ENABLED': config('CDN_PURGE_ENABLED', default=False, cast=bool),
+    'URL': config('CDN_PURGE_URL', default=''),
+    'TOKEN': config('CDN_PURGE_TOKEN', default=''),
+    'TIMEOUT': 5,  # секунди
+    'ASYNC': True,  # False - відправка одразу після коміту (тести)
+    'BATCH_DELAY': 0.5,  # секунди, збирання ключів у пакет
+    'MAX_KEYS_PER_REQUEST': 256,
+}
+
+# Метрики Prometheus (/metrics), агрегація між воркерами через Redis
+METRICS_SETTINGS = {
+    'ENABLED': config('METRICS_ENABLED', default=True, cast=bool),
+    'TOKEN': config('METRICS_TOKEN', default=''),  # Bearer токен для /metrics, порожній - endpoint вимкнений (404)
+    'FLUSH_INTERVAL': 5,  # секунди
+    'REDIS_KEY': 'ugc:metrics',
+}
+
+# Денормалізовані документи детальних відповідей (DetailDocumentMixin), перебудовуються сигналами
+DETAIL_DOCUMENT_SETTINGS = {
+    'ENABLED': config('DETAIL_DOCUMENTS_ENABLED', default=True, cast=bool),
+    'VERSION': 1,  # збільшити, якщо вивід змінився без зміни полів серіалізаторів
+    'BATCH_SIZE': 200,  # об'єктів на пакет перебудови
+    # Базові URL API, для яких будуються документи (посилання на медіа абсолютні); інші хости - звичайний retrieve
+    'BASE_URLS': config('DETAIL_DOCUMENT_BASE_URLS', default='http://localhost:8000/', cast=Csv()),
+}
+
+# Схожі проєкти/послуги за TF-IDF (python manage.py build_recommendations), оновлюються сигналами
+RECOMMENDATION_SETTINGS = {
+    'TOP_K': 6,
+    'BATCH_SIZE': 256,  # рядків матриці схожості за раз (пам'ять: BATCH_SIZE × кількість об'єктів)
+    'ASYNC': config('RECOMMENDATIONS_ASYNC', default=True, cast=bool),  # False - одразу після коміту
+    'DELAY': 2,  # секунди, збирання змін у пакет
+}
+
+# Sitemap (python manage.py build_sitemaps), файли оновлюються сигналами; ROOT краще віддавати веб-сервером
+SITEMAP_SETTINGS = {
+    'ROOT': BASE_DIR / 'sitemaps',
+    'SITE_URL': config('SITEMAP_SITE_URL', default='http://localhost:3000'),  # фронтенд, адреси сторінок
+    'FILES_URL': config('SITEMAP_FILES_URL', default='http://localhost:8000/sitemaps/'),  # адреси файлів в індексі
+    'SECTIONS': {},  # {'projects': '/{locale}/work/{slug}/'} - шаблони адрес розділів
+    'CHUNK_SIZE': 50000,  # адрес у файлі, не більше 50 000
+    'ASYNC': config('SITEMAPS_ASYNC', default=True, cast=bool),
+    'DELAY': 2,
+    'LOCK_TIMEOUT': 600,  # секунди, замок запису файлів між воркерами
+    'LOCK_WAIT': 60,  # секунди очікування замка, далі повтор завдання
+}
+
+# Статичний знімок GET API для CDN та збірки фронтенду (python manage.py snapshot_api)
+SNAPSHOT_SETTINGS = {
+    'ROOT': BASE_DIR / 'snapshots',
+    'BASE_URL': config('SNAPSHOT_BASE_URL', default='http://localhost:8000/'),  # абсолютні посилання у відповідях
+    'ENABLED': config('SNAPSHOT_ENABLED', default=False, cast=bool),  # інкрементне оновлення сигналами
+    'ASYNC': True,
+    'DELAY': 2,
+    'LOCK_TIMEOUT': 600,  # секунди, замок маніфесту між воркерами
+    'LOCK_WAIT': 60,  # секунди очікування замка, далі повтор завдання
+}
+
+# On-demand ревалідація сторінок Next.js (outbox, python manage.py revalidate_pages)
+REVALIDATION_SETTINGS = {
+    'ENABLED': config('REVALIDATION_ENABLED', default=False, cast=bool),
+    'URL': config('REVALIDATION_URL', default=''),  # http://localhost:3000/api/revalidate
+    'TOKEN': config('REVALIDATION_TOKEN', default=''),
+    'TIMEOUT': 5,
+    'LEASE': 60,  # секунди: пакет у відправці не беруть інші процеси, після падіння - знову доступний
+    'BATCH_SIZE': 100,  # сторінок в одному запиті
+    'MAX_ATTEMPTS': 8,  # далі статус failed
+    'RETRY_DELAY': 5,  # секунди, подвоюється з кожною спробою
+    'MAX_RETRY_DELAY': 600,
+    'ASYNC': True,  # False - відправка одразу після коміту (тести)
+    'DELAY': 1,  # секунди, збирання змін у пакет
+    'PATHS': {},  # {'projects.Project': ('/{locale}/', '/{locale}/work/')} - сторінки списків моделі
+}
+
+# JSON кодек для API, кешу та експорту перекладів: auto (orjson, msgspec, json), orjson, msgspec, json
+JSON_CODEC_SETTINGS = {
+    'BACKEND': config('JSON_CODEC', default='auto'),
+}
+
+# Профілювання API запитів (flamegraph в адмінці «Профілі запитів»)
+PROFILING_SETTINGS = {
+    'ENABLED': config('PROFILING_ENABLED', default=False, cast=bool),
+    'SAMPLE_RATE': config('PROFILING_SAMPLE_RATE', default=0.0, cast=float),  # частка запитів 0..1
+    'BACKEND': config('PROFILING_BACKEND', default='sampling'),  # sampling, cprofile, pyinstrument
+    'INTERVAL': 0.002,  # інтервал семплювання, секунди
+    'HEADER': 'X-Profile',  # підпис: python manage.py profile_header /api/v1/projects/
+    'SIGNATURE_MAX_AGE': 60 * 60,
+    'PATH_PREFIXES': ['/api/'],
+    'MIN_DURATION_MS': config('PROFILING_MIN_DURATION_MS', default=0, cast=int),  # для вибірки
+    'MAX_PROFILES': 500,
+}
@@ -0,0 +1,98 @@
+# backend/ugc_backend/settings_bench.py
+"""
+Налаштування для бенчмарків API:
+
+    DJANGO_SETTINGS_MODULE=ugc_backend.settings_bench python manage.py migrate
+    DJANGO_SETTINGS_MODULE=ugc_backend.settings_bench python manage.py run_benchmark --scale small
+
+БД - BENCH_DATABASE_URL (dj-database-url), за замовчуванням SQLite у benchmarks/.
+Кеш - BENCH_REDIS_URL (локальний Redis), інакше fakeredis, якщо встановлено, інакше LocMem.
+"""
+import os
+
+# Обов'язкові змінні основних налаштувань бенчмарку не потрібні
+for name, value in {
+    'SECRET_KEY': 'benchmark-only-secret-key',
+    'DB_NAME': 'benchmark',
+    'DB_USER': 'benchmark',
+    'DB_PASSWORD': 'benchmark',
+}.items():
+    os.environ.setdefault(name, value)
+
+from .settings import *  # noqa: E402,F401,F403
+from .settings import (  # noqa: E402
+    BASE_DIR, CACHES, DATABASE_POOL_SETTINGS, DATABASE_REPLICA_SETTINGS, REST_FRAMEWORK, SITEMAP_SETTINGS, SNAPSHOT_SETTINGS, config,
+)
+from .database import configure_database  # noqa: E402
+import dj_database_url  # noqa: E402
+
+BENCHMARK_DIR = BASE_DIR / 'benchmarks'
+
+DEBUG = False
+ALLOWED_HOSTS = ['*']
+SECURE_SSL_REDIRECT = False
+SECURE_HSTS_SECONDS = 0
+
+DATABASES = {
+    'default': dj_database_url.parse(
+        config('BENCH_DATABASE_URL', default=f"sqlite:///{BENCHMARK_DIR / 'bench.sqlite3'}"),
+        conn_max_age=60,
+    ),
+}
+# PostgreSQL (BENCH_DATABASE_URL) - з тим самим пулом, що й основні налаштування
+DATABASES['default'] = configure_database(DATABASES['default'], DATABASE_POOL_SETTINGS)
+# Друга локальна БД як репліка: маршрутизація читань увімкнена лише з BENCH_REPLICA_URL
+_bench_replica_url = config('BENCH_REPLICA_URL', default='')
+DATABASES['replica'] = configure_database(
+    dj_database_url.parse(_bench_replica_url or f"sqlite:///{BENCHMARK_DIR / 'bench_replica.sqlite3'}"),
+    DATABASE_POOL_SETTINGS,
+)
+DATABASE_REPLICA_SETTINGS = {**DATABASE_REPLICA_SETTINGS, 'ALIASES': ['replica'] if _bench_replica_url else []}
+
+_bench_redis_url = config('BENCH_REDIS_URL', default='')
+if _bench_redis_url:
+    CACHES = {'default': {**CACHES['default'], 'LOCATION': _bench_redis_url}}
+else:
+    try:
+        from fakeredis import FakeConnection
+
+        CACHES = {'default': {
+            **CACHES['default'],
+            'LOCATION': 'redis://fakeredis:6379/1',
+            'OPTIONS': {
+                **CACHES['default']['OPTIONS'],
+                'CONNECTION_POOL_KWARGS': {'connection_class': FakeConnection},
+            },
+        }}
+    except ImportError:
+        CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+MEDIA_ROOT = BENCHMARK_DIR / 'media'
+SITEMAP_SETTINGS = {**SITEMAP_SETTINGS, 'ROOT': BENCHMARK_DIR / 'sitemaps'}
+SNAPSHOT_SETTINGS = {**SNAPSHOT_SETTINGS, 'ROOT': BENCHMARK_DIR / 'snapshots'}
+
+# Обмеження частоти зіпсувало б вимірювання
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {scope: '1000000/min' for scope in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']},
+}
+
+TRANSLATIONS_RATE_LIMIT = 10 ** 9
+
+CDN_PURGE_SETTINGS = {'ENABLED': False}
+PROFILING_SETTINGS = {'ENABLED': False}
+TRANSLATION_HOT_RELOAD = {'ENABLED': False}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    # 4xx відповіді потрапляють у результати як помилки сценарію
+    'loggers': {'django.request': {'level': 'ERROR'}},
+}
+
+BENCHMARK_SETTINGS = {
+    'RESULTS_DIR': BENCHMARK_DIR / 'results',
+    'BASELINE': BENCHMARK_DIR / 'baseline.json',
+}
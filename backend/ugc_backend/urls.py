@@ -1,14 +1,19 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
 
 from rest_framework import permissions
+from apps.api.metrics import metrics_view
+from apps.common.sitemaps import sitemap_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include('apps.api.urls')),
+    path('metrics', metrics_view, name='metrics'),
+    path('sitemap.xml', sitemap_view, name='sitemap'),
+    re_path(r'^sitemaps/(?P<path>[-\w]+\.xml)$', sitemap_view, name='sitemap-file'),
     path('rosetta/', include('rosetta.urls')),
     path('ckeditor/', include('ckeditor_uploader.urls')),  # Важливо!
  